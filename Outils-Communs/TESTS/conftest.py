@@ -0,0 +1,21 @@
+"""
+Configuration pytest pour les tests des outils communs
+"""
+
+import sys
+import os
+
+# Ajout des répertoires des outils et des TPs au path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+outils_dir = os.path.dirname(current_dir)
+project_root = os.path.dirname(outils_dir)
+sys.path.insert(0, outils_dir)
+for tp in ("Resolution-DF-1D", "Resolution-VF-1D"):
+    sys.path.append(os.path.join(project_root, tp))
+
+
+def pytest_configure(config):
+    """Configuration globale de pytest"""
+    config.addinivalue_line(
+        "markers", "performance: marque les tests de performance (lents)"
+    )
@@ -0,0 +1,1184 @@
+"""
+TESTS DES OUTILS COMMUNS AUX TPs
+================================
+
+Un groupe de tests par module de Outils-Communs.
+"""
+
+import os
+import sys
+import warnings
+import subprocess
+
+import pytest
+import numpy as np
+
+from rendu_figures import (
+    FileRendu, EXTENSION_DONNEES, charger_donnees_figure, rendre_donnees_stockees
+)
+from cache_resultats import CacheResultats, cle_cache
+from decimation import decimer_pour_trace, format_trace
+from ordre_convergence import estimer_ordre_convergence, detecter_plateau, plateau_atteint, pentes_successives
+from planification import PlanificateurBalayage
+from stockage_runs import StockageRuns, lignes_depuis_resultats, resultats_depuis_lignes
+from normes_erreur import erreurs_normes, poids_noeuds, poids_cellules, NORMES
+from estimation_gci import EstimateurGCI, estimer_convergence_gci, reduire_aux_points_communs
+from solveurs_lineaires import (
+    resoudre_tridiagonal, thomas, matrice_dense, residu_tridiagonal, estimer_conditionnement
+)
+from registre_cas import RegistreCas, CasTest, REGISTRE, vectoriser
+import solutions_manufacturees
+from solutions_manufacturees import GenerateurSolutions, cas_manufacture
+from collecte_pytest import lire_flux
+from tests_paralleles import repartir, executer_en_parallele, charger_durees
+import tracemalloc
+import suivi_phases
+from suivi_phases import SuiviPhases
+from benchmarks import niveaux_N, mesurer, comparer, empreinte_machine, executer_benchmarks, exposant_complexite
+from processus_calcul import SCHEMAS, chemins_import, initialiser_worker, Progression
+from lancer_analyses import valider_configuration, matrice_jobs, executer_matrice, resumer_series
+import time
+import pickle
+import pstats
+import profilage
+import io
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import journal
+import urllib.request
+import urllib.error
+import metriques
+import threading
+import service_resolution
+import cache_solutions
+from cache_solutions import CacheSolutions
+from interpolation_solutions import SolutionDiscrete
+from service_resolution import ServiceEnFond, ClientResolution
+
+
+def tracer_test(donnees, fichier):
+    """Fonction de tracé minimale (écrit les données en texte)"""
+    with open(fichier, 'w', encoding='utf-8') as f:
+        f.write(f"{donnees['titre']} {np.sum(donnees['y']):.1f}")
+
+
+class TestRenduFigures:
+    """Tests de la file de rendu des figures"""
+
+    def test_mode_inconnu(self):
+        with pytest.raises(ValueError):
+            FileRendu("interactif")
+
+    def test_mode_sync(self, tmp_path):
+        fichier = str(tmp_path / "figure.png")
+        with FileRendu("sync") as rendu:
+            rendu.soumettre(tracer_test, {'titre': 'sync', 'y': np.ones(3)}, fichier)
+        assert open(fichier, encoding='utf-8').read() == "sync 3.0"
+
+    def test_mode_aucune(self, tmp_path):
+        fichier = str(tmp_path / "figure.png")
+        with FileRendu("aucune") as rendu:
+            assert rendu.soumettre(tracer_test, {'titre': 'x', 'y': np.ones(3)}, fichier) is None
+        assert not os.listdir(tmp_path)
+
+    def test_mode_lazy_puis_rendu(self, tmp_path):
+        fichier = str(tmp_path / "figure.png")
+        with FileRendu("lazy") as rendu:
+            rendu.soumettre(tracer_test, {'titre': 'lazy', 'y': np.arange(4.0)}, fichier)
+        assert not os.path.exists(fichier)
+
+        chemin = str(tmp_path / ("figure" + EXTENSION_DONNEES))
+        nom_module, nom_fonction, donnees, cible = charger_donnees_figure(chemin)
+        assert (nom_module, nom_fonction, cible) == (__name__, "tracer_test", fichier)
+        assert donnees['titre'] == 'lazy'
+        np.testing.assert_array_equal(donnees['y'], np.arange(4.0))
+
+        assert rendre_donnees_stockees(str(tmp_path), workers=1) == [fichier]
+        assert open(fichier, encoding='utf-8').read() == "lazy 6.0"
+        # Déjà rendu: rien à refaire
+        assert rendre_donnees_stockees(str(tmp_path), workers=1) == []
+
+    def test_mode_async(self, tmp_path):
+        fichiers = [str(tmp_path / f"figure_{i}.png") for i in range(3)]
+        with FileRendu("async", workers=1) as rendu:
+            for i, fichier in enumerate(fichiers):
+                rendu.soumettre(tracer_test, {'titre': 'async', 'y': np.full(2, float(i))}, fichier)
+        assert rendu.fichiers == fichiers
+        assert open(fichiers[2], encoding='utf-8').read() == "async 4.0"
+
+    def test_erreur_dans_le_bloc(self, tmp_path):
+        with pytest.raises(ValueError, match="analyse"):
+            with FileRendu("async", workers=1) as rendu:
+                for i in range(4):
+                    rendu.soumettre(tracer_test, {'titre': 'x', 'y': np.ones(2)}, str(tmp_path / f"f{i}.png"))
+                raise ValueError("échec de l'analyse")
+        assert rendu._executor is None and rendu._travaux == []
+
+
+class TestCacheResultats:
+    """Tests du cache adressé par contenu"""
+
+    def test_cle_depend_de_la_definition(self):
+        def fabrique(a):
+            return lambda x: a * x
+
+        assert cle_cache(fabrique(1.0), 10) == cle_cache(fabrique(1.0), 10)
+        assert cle_cache(fabrique(1.0), 10) != cle_cache(fabrique(2.0), 10)
+        assert cle_cache(fabrique(1.0), 10) != cle_cache(fabrique(1.0), 20)
+        assert cle_cache(np.zeros(3)) != cle_cache(np.zeros(4))
+
+    def test_resultat_succes_echec(self, tmp_path):
+        cache = CacheResultats(str(tmp_path))
+        cle = cle_cache("cas", 10)
+        assert cache.charger_resultat(cle) is None
+
+        cache.stocker_resultat(cle, u=np.arange(5.0), erreur=1.5e-3)
+        resultat = cache.charger_resultat(cle)
+        np.testing.assert_array_equal(resultat['u'], np.arange(5.0))
+        assert resultat['erreur'] == 1.5e-3
+        assert (cache.succes, cache.echecs) == (1, 1)
+
+    def test_figure_via_file_rendu(self, tmp_path):
+        cache = CacheResultats(str(tmp_path / "cache"))
+        cle = cle_cache("cas", 10)
+        for run in ("run_1", "run_2"):
+            os.makedirs(tmp_path / run)
+            fichier = str(tmp_path / run / "figure.png")
+            with FileRendu("sync") as rendu:
+                cache.tracer(rendu, cle, tracer_test, {'titre': run, 'y': np.ones(2)}, fichier)
+        # Le second run réutilise la figure du premier sans la retracer
+        assert open(fichier, encoding='utf-8').read() == "run_1 2.0"
+        assert cache.succes == 1
+
+    def test_taille_entree_remplacee(self, tmp_path):
+        cache = CacheResultats(str(tmp_path))
+        cle = cle_cache("cas", 10)
+        for _ in range(5):
+            cache.stocker_resultat(cle, u=np.zeros(1000))
+        assert cache.taille == cache._taille_disque() == os.path.getsize(cache._chemin(cle, '.npz'))
+
+    def test_eviction_lru(self, tmp_path):
+        cache = CacheResultats(str(tmp_path))
+        cles = [cle_cache("cas", N) for N in range(4)]
+        cache.stocker_resultat(cles[0], u=np.zeros(1000))
+        cache.taille_max = 3 * cache.taille  # place pour trois entrées
+        for i, cle in enumerate(cles[:3]):
+            cache.stocker_resultat(cle, u=np.zeros(1000))
+            os.utime(cache._chemin(cle, '.npz'), (i, i))
+        cache.charger_resultat(cles[0])  # cles[0] redevient la plus récente
+
+        cache.stocker_resultat(cles[3], u=np.zeros(1000))
+
+        assert cache.taille <= cache.taille_max
+        assert cache.charger_resultat(cles[1]) is None
+        assert cache.charger_resultat(cles[0]) is not None
+        assert cache.charger_resultat(cles[3]) is not None
+
+
+class TestDecimation:
+    """Tests de la décimation min/max des tracés"""
+
+    def test_petite_serie_inchangee(self):
+        x = np.linspace(0, 1, 11)
+        x_d, (y_d,) = decimer_pour_trace(x, x**2, n_max=100)
+        np.testing.assert_array_equal(x_d, x)
+        np.testing.assert_array_equal(y_d, x**2)
+
+    @pytest.mark.parametrize("n", [10**5 + 1, 10**6 + 1])
+    def test_enveloppe_et_pic_conserves(self, n):
+        rng = np.random.default_rng(0)
+        x = np.linspace(0, 1, n)
+        u = np.sin(40 * np.pi * x) + 1e-3 * rng.standard_normal(n)
+        erreur = np.abs(rng.standard_normal(n)) * 1e-6
+        erreur[n // 3] = 1.0
+
+        x_d, (u_d, erreur_d) = decimer_pour_trace(x, u, erreur, n_max=2000)
+
+        assert len(x_d) <= 2010
+        assert x_d[0] == x[0] and x_d[-1] == x[-1]
+        assert np.all(np.diff(x_d) > 0)
+        assert u_d.max() == u.max() and u_d.min() == u.min()
+        assert x[n // 3] in x_d and erreur_d.max() == 1.0
+
+    def test_format_sans_marqueurs_au_dela_du_seuil(self):
+        assert format_trace('bo-', 50) == 'bo-'
+        assert format_trace('bo-', 10**5) == 'b-'
+        assert format_trace('go', 10**5) == 'g-'
+
+
+class TestOrdreConvergence:
+    """Tests de l'estimateur robuste de l'ordre de convergence"""
+
+    N_values = np.array([10 * 2**k for k in range(8)])
+
+    def test_ordre_exact_et_intervalle(self):
+        erreurs = 0.8 / self.N_values**2.0
+        estimation = estimer_ordre_convergence(self.N_values, erreurs)
+        assert estimation.ordre == pytest.approx(2.0, abs=1e-10)
+        assert estimation.constante == pytest.approx(0.8, rel=1e-8)
+        assert estimation.debut_plateau is None
+        bas, haut = estimation.intervalle
+        assert bas <= 2.0 <= haut
+
+    def test_point_aberrant_sans_effet(self):
+        erreurs = 0.8 / self.N_values**2.0
+        erreurs[3] *= 3.0
+        estimation = estimer_ordre_convergence(self.N_values, erreurs)
+        assert estimation.ordre == pytest.approx(2.0, abs=0.05)
+
+    def test_plateau_arrondi_exclu(self):
+        # Erreur de troncature puis arrondi croissant en ε·N² (cas réel à grand N)
+        N_values = np.array([10 * 2**k for k in range(14)])
+        erreurs = 0.8 / N_values**2.0 + 1e-16 * N_values**2.0
+        estimation = estimer_ordre_convergence(N_values, erreurs)
+        assert estimation.debut_plateau is not None
+        assert estimation.debut_plateau >= 8
+        assert estimation.ordre == pytest.approx(2.0, abs=0.1)
+        assert plateau_atteint(N_values, erreurs)
+        assert not plateau_atteint(N_values[:6], erreurs[:6])
+
+    @pytest.mark.parametrize("ordre", [1.0, 0.4])
+    def test_ordre_faible_sans_plateau(self, ordre):
+        # Une méthode d'ordre ≤ 1 converge lentement mais ne stagne pas
+        erreurs = 0.5 / self.N_values**ordre
+        estimation = estimer_ordre_convergence(self.N_values, erreurs)
+        assert estimation.debut_plateau is None
+        assert estimation.ordre == pytest.approx(ordre, abs=1e-10)
+        stagnation = np.maximum(erreurs, erreurs[5])               # l'erreur cesse de décroître
+        assert detecter_plateau(self.N_values, stagnation) == 6
+        assert estimer_ordre_convergence(self.N_values, stagnation).ordre == pytest.approx(ordre, abs=1e-10)
+
+    def test_precision_machine_non_estimable(self):
+        erreurs = [1.1e-16, 3.3e-16, 2.0e-15, 1.1e-15, 5.4e-15, 1.6e-14]
+        estimation = estimer_ordre_convergence(self.N_values[:6], erreurs)
+        assert detecter_plateau(self.N_values[:6], erreurs) == 0
+        assert np.isnan(estimation.ordre)
+
+    def test_pentes_erreur_nulle(self):
+        # Une erreur nulle (solution exacte reproduite) ne donne ni -inf ni avertissement
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            pentes = pentes_successives(self.N_values[:4], [1e-2, 2.5e-3, 0.0, 1e-4])
+        assert pentes[0] == pytest.approx(2.0)
+        assert np.isnan(pentes[1]) and np.isnan(pentes[2])
+        assert len(pentes_successives([10], [1e-2])) == 0
+
+
+class TestPlanificateurBalayage:
+    """Tests du choix automatique des N sous budget et erreur cible"""
+
+    @staticmethod
+    def balayer(planificateur, erreur, duree=None):
+        for N in planificateur:
+            planificateur.enregistrer(N, erreur(N), duree(N) if duree else None)
+        return planificateur.N_values
+
+    def test_arret_erreur_cible(self):
+        planificateur = PlanificateurBalayage(erreur_cible=1e-6)
+        N_values = self.balayer(planificateur, lambda N: 1.0 / N**2)
+        assert N_values == [10 * 2**k for k in range(len(N_values))]
+        assert N_values[-1] == 1280 and planificateur.raison_arret == "erreur_cible"
+
+    def test_arret_ordre_stable(self):
+        planificateur = PlanificateurBalayage()
+        N_values = self.balayer(planificateur, lambda N: 1.0 / N**2)
+        assert planificateur.raison_arret == "ordre_stable"
+        assert len(N_values) == 4
+        assert planificateur.ordres_estimes[-1] == pytest.approx(2.0)
+
+    def test_arret_plateau(self):
+        planificateur = PlanificateurBalayage(erreur_cible=1e-30)
+        self.balayer(planificateur, lambda N: 1.0 / N**2 + 1e-16 * N**2)
+        assert planificateur.raison_arret == "plateau"
+        assert planificateur.N_values[-1] < 10 * 2**12
+
+    def test_arret_budget_par_extrapolation(self):
+        # Coût en N^3 mesuré: 10 → 1 ms, 20 → 8 ms, 40 → 64 ms, 80 → 0.5 s (prévu)
+        planificateur = PlanificateurBalayage(budget=0.3, erreur_cible=1e-30)
+        self.balayer(planificateur, lambda N: 1.0 / N**2, lambda N: 1e-3 * (N / 10)**3)
+        assert planificateur.raison_arret == "budget"
+        assert planificateur.N_values == [10, 20, 40]
+        assert planificateur.modele_cout()[1] == pytest.approx(3.0)
+
+    def test_premiere_resolution_lente(self):
+        # Démarrage à froid de 0.5 s, puis coût linéaire 0.2 ms · N: seul 10240 (≈ 2.05 s) dépasse
+        planificateur = PlanificateurBalayage(budget=2.0, erreur_cible=1e-30)
+        self.balayer(planificateur, lambda N: 1.0 / N**2, lambda N: 0.5 if N == 10 else 2e-4 * N)
+        assert planificateur.raison_arret == "budget"
+        assert planificateur.N_values[-1] == 5120
+        a, exposant = planificateur.modele_cout()
+        assert exposant == pytest.approx(1.0) and a == pytest.approx(2e-4)
+
+    def test_resultat_non_enregistre(self):
+        planificateur = PlanificateurBalayage()
+        iterateur = iter(planificateur)
+        next(iterateur)
+        with pytest.raises(RuntimeError):
+            next(iterateur)
+
+
+class TestStockageRuns:
+    """Tests du stockage colonnaire des runs"""
+
+    @staticmethod
+    def resultats(facteur=1.0):
+        return [
+            {'nom': "u(x) = sin(πx)", 'N_values': [10, 20, 40],
+             'erreurs': [facteur * 1e-2, facteur * 2.5e-3, facteur * 6.25e-4],
+             'ordres': [2.0, 2.0], 'ordre_moyen': 2.0, 'durees': [1e-3, None, 4e-3],
+             'description': 'trigonométrique'},
+            {'nom': "u(x) = x²", 'N_values': [10, 20], 'erreurs': [1e-16, 2e-16],
+             'ordres': [-1.0], 'ordre_moyen': np.nan, 'description': 'précision machine'},
+        ]
+
+    def test_aller_retour(self, tmp_path):
+        stockage = StockageRuns(str(tmp_path))
+        resultats = self.resultats()
+        run = stockage.ajouter_run("VF", lignes_depuis_resultats(resultats, colonnes_cas=('description',)))
+        relus = resultats_depuis_lignes(stockage.charger_run(run), colonnes_cas=('description',))
+
+        assert [r['nom'] for r in relus] == [r['nom'] for r in resultats]
+        assert relus[0]['N_values'] == [10, 20, 40]
+        assert relus[0]['erreurs'] == resultats[0]['erreurs']
+        assert relus[0]['ordres'] == [2.0, 2.0]
+        assert np.isnan(relus[0]['durees'][1])
+        assert np.isnan(relus[1]['ordre_moyen'])
+        assert relus[1]['description'] == 'précision machine'
+
+    def test_requete_entre_runs(self, tmp_path):
+        stockage = StockageRuns(str(tmp_path))
+        run_df = stockage.ajouter_run("DF", lignes_depuis_resultats(self.resultats()))
+        run_vf = stockage.ajouter_run("VF", lignes_depuis_resultats(self.resultats(2.0)))
+        assert run_df != run_vf
+        assert [e['run'] for e in stockage.runs(schema="VF")] == [run_vf]
+        assert stockage.dernier_run() == run_vf
+
+        lignes = stockage.requete(cas="u(x) = sin(πx)", N=lambda N: N >= 20,
+                                  colonnes=('run', 'schema', 'N', 'erreur_Linf'))
+        assert list(lignes['schema']) == ["DF", "DF", "VF", "VF"]
+        assert list(lignes['N']) == [20, 40, 20, 40]
+        np.testing.assert_allclose(lignes['erreur_Linf'][2:], 2.0 * lignes['erreur_Linf'][:2])
+
+        assert stockage.requete(schema="VF", N=[10])['run'].tolist() == [run_vf, run_vf]
+        assert stockage.requete(cas="inexistant") == {}
+
+    def test_identifiants_concurrents(self, tmp_path):
+        # Des runs simultanés de même identifiant ne s'écrasent pas
+        from concurrent.futures import ThreadPoolExecutor
+        stockage = StockageRuns(str(tmp_path))
+        colonnes = lignes_depuis_resultats(self.resultats())
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            runs = list(executor.map(lambda _: stockage.ajouter_run("DF", colonnes, run="meme_run"), range(8)))
+        assert sorted(runs) == sorted(["meme_run"] + [f"meme_run_{k}" for k in range(2, 9)])
+        assert sorted(e['run'] for e in stockage.runs()) == sorted(runs)
+        assert all(len(stockage.charger_run(run)['N']) == 5 for run in runs)
+
+    def test_export_csv(self, tmp_path):
+        stockage = StockageRuns(str(tmp_path / "runs"))
+        run = stockage.ajouter_run("DF", lignes_depuis_resultats(self.resultats()))
+        fichier = tmp_path / "export.csv"
+        n = stockage.exporter_csv(str(fichier), colonnes=('cas', 'N', 'erreur_Linf'), runs=[run])
+        lignes = fichier.read_text(encoding='utf-8').splitlines()
+        assert n == 5
+        assert lignes[0] == "cas,N,erreur_Linf"
+        assert lignes[1] == "u(x) = sin(πx),10,0.01"
+
+
+class TestNormesErreur:
+    """Tests du noyau d'erreurs multi-normes"""
+
+    @staticmethod
+    def centres(N):
+        return np.concatenate([[0.0], (np.arange(N) + 0.5) / N, [1.0]])
+
+    @pytest.mark.parametrize("discretisation", ["noeuds", "cellules"])
+    def test_normes_de_reference(self, discretisation):
+        # e = sin(πx): ||e||_L1 = 2/π, ||e||_L2 = 1/√2, |e|_H1 = π/√2
+        N = 2000
+        x = np.linspace(0, 1, N + 1) if discretisation == "noeuds" else self.centres(N)
+        normes = erreurs_normes(np.sin(np.pi * x), lambda x: 0.0, x, discretisation)
+        assert set(normes) == set(NORMES)
+        assert normes['Linf'] == pytest.approx(1.0, abs=1e-6)
+        assert normes['L1'] == pytest.approx(2 / np.pi, rel=1e-5)
+        assert normes['L2'] == pytest.approx(np.sqrt(0.5), rel=1e-5)
+        assert normes['H1'] == pytest.approx(np.pi / np.sqrt(2), rel=1e-5)
+        assert normes['energie'] == normes['H1']
+
+    def test_poids_et_reaction(self):
+        x = np.sort(np.random.default_rng(0).uniform(0, 1, 50))
+        x = np.concatenate([[0.0], x, [1.0]])
+        assert poids_noeuds(x).sum() == pytest.approx(1.0)
+        assert poids_cellules(x).sum() == pytest.approx(1.0)
+        assert poids_cellules(x)[0] == poids_cellules(x)[-1] == 0.0
+
+        normes = erreurs_normes(np.ones_like(x), np.zeros_like(x), x, coefficient_reaction=4.0)
+        assert normes['H1'] == 0.0
+        assert normes['energie'] == pytest.approx(2.0)
+
+    def test_entrees_non_modifiees(self):
+        x = np.linspace(0, 1, 11)
+        u = x**2
+        copie_x, copie_u = x.copy(), u.copy()
+        normes = erreurs_normes(u, lambda x: x, x)  # solution exacte partageant x
+        np.testing.assert_array_equal(x, copie_x)
+        np.testing.assert_array_equal(u, copie_u)
+        assert normes['Linf'] == pytest.approx(0.25)
+        # Tableau retourné par le callable et conservé par l'appelant
+        exacte = np.sin(np.pi * x)
+        copie_exacte = exacte.copy()
+        erreurs_normes(u, lambda x: exacte, x)
+        np.testing.assert_array_equal(exacte, copie_exacte)
+        with pytest.raises(ValueError):
+            erreurs_normes(u, u, x, discretisation="aretes")
+
+
+class TestEstimationGCI:
+    """Tests de l'estimation d'erreur sans solution exacte"""
+
+    @staticmethod
+    def solution_synthetique(N, ordre=2.0, discretisation="noeuds"):
+        # u_h = u + C·h^p·g(x): erreur connue, de signe constant
+        if discretisation == "noeuds":
+            x = np.linspace(0, 1, N + 1)
+        else:
+            x = np.concatenate([[0.0], (np.arange(N) + 0.5) / N, [1.0]])
+        erreur = 0.5 * N**-ordre * np.sin(np.pi * x)
+        return np.sin(np.pi * x) + erreur, x
+
+    @pytest.mark.parametrize("ordre", [1.0, 2.0, 4.0])
+    def test_ordre_et_erreur_estimes(self, ordre):
+        N_values = [10, 20, 40, 80]
+        estimations = estimer_convergence_gci(lambda N: self.solution_synthetique(N, ordre), N_values)
+        assert [e.N for e in estimations] == [40, 80]
+        derniere = estimations[-1]
+        assert derniere.ordre_observe == pytest.approx(ordre, rel=1e-6)
+        assert derniere.erreur_estimee == pytest.approx(0.5 * 80**-ordre, rel=1e-6)
+        assert derniere.gci == pytest.approx(1.25 * derniere.erreur_estimee)
+        assert np.isnan(estimations[0].ratio_asymptotique)
+        assert derniere.ratio_asymptotique == pytest.approx(1.0)
+        assert derniere.type_convergence == "monotone"
+        np.testing.assert_allclose(derniere.solution_extrapolee, np.sin(np.pi * derniere.x), atol=1e-12)
+
+    def test_hors_domaine_asymptotique(self):
+        # Erreur h² + 50·h⁴: le terme d'ordre 4 domine encore sur les maillages grossiers
+        def resoudre(N):
+            x = np.linspace(0, 1, N + 1)
+            return np.sin(np.pi * x) * (1 + N**-2.0 + 50 * N**-4.0), x
+        estimations = estimer_convergence_gci(resoudre, [5, 10, 20, 40])
+        assert estimations[0].ordre_observe > estimations[1].ordre_observe + 0.5
+        assert estimations[1].ratio_asymptotique < 0.7
+        proche = estimer_convergence_gci(resoudre, [40, 80, 160, 320])[-1]
+        assert proche.ratio_asymptotique == pytest.approx(1.0, abs=0.05)
+
+    def test_cellules_et_memoire_bornee(self):
+        estimateur = EstimateurGCI(2, "cellules")
+        for N in [8, 16, 32, 64, 128]:
+            estimation = estimateur.ajouter(N, *self.solution_synthetique(N, 2.0, "cellules"))
+        assert len(estimateur._reductions) == 3
+        assert all(len(u) == 8 + 2 for u in estimateur._reductions)
+        assert estimation.ordre_observe == pytest.approx(2.0, abs=1e-2)
+
+    def test_arrondi_et_maillages_non_emboites(self):
+        x = np.linspace(0, 1, 11)
+        u, x_reduit = reduire_aux_points_communs(np.linspace(0, 1, 41), np.linspace(0, 1, 41), 4)
+        np.testing.assert_array_equal(x_reduit, x)
+
+        estimations = estimer_convergence_gci(lambda N: (np.linspace(0, 1, N + 1)**2, np.linspace(0, 1, N + 1)),
+                                              [10, 20, 40])
+        assert estimations[0].type_convergence == "arrondi"
+        assert np.isnan(estimations[0].ordre_observe)
+
+        estimateur = EstimateurGCI(2)
+        estimateur.ajouter(10, *self.solution_synthetique(10))
+        with pytest.raises(ValueError):
+            estimateur.ajouter(30, *self.solution_synthetique(30))
+
+
+class TestSolveursLineaires:
+    """Tests des backends tridiagonaux"""
+
+    def test_backends_identiques(self):
+        rng = np.random.default_rng(0)
+        n = 50
+        inferieure, superieure = rng.uniform(-1, 0, n - 1), rng.uniform(-1, 0, n - 1)
+        diagonale = 3.0 + rng.uniform(0, 1, n)
+        b = rng.normal(size=n)
+        reference = np.linalg.solve(matrice_dense(inferieure, diagonale, superieure), b)
+        for u in (resoudre_tridiagonal(inferieure, diagonale, superieure, b, "dense"),
+                  resoudre_tridiagonal(inferieure, diagonale, superieure, b, "bande"),
+                  thomas(inferieure, diagonale, superieure, b)):
+            np.testing.assert_allclose(u, reference, rtol=1e-12)
+        # Plusieurs seconds membres en colonnes: une seule factorisation
+        B = rng.normal(size=(n, 3))
+        for backend in ("dense", "bande"):
+            np.testing.assert_allclose(resoudre_tridiagonal(inferieure, diagonale, superieure, B, backend),
+                                       np.linalg.solve(matrice_dense(inferieure, diagonale, superieure), B), rtol=1e-12)
+        np.testing.assert_allclose(thomas(inferieure, diagonale, superieure, B)[:, 1],
+                                   thomas(inferieure, diagonale, superieure, B[:, 1]), rtol=1e-14)
+
+    def test_backend_inconnu(self):
+        with pytest.raises(ValueError):
+            resoudre_tridiagonal([], [1.0], [], [1.0], "creux")
+
+    def test_residu_et_conditionnement(self):
+        rng = np.random.default_rng(1)
+        n = 40
+        inferieure, superieure = rng.uniform(-1, 0, n - 1), rng.uniform(-1, 0, n - 1)
+        diagonale = 2.5 + rng.uniform(0, 1, n)
+        A = matrice_dense(inferieure, diagonale, superieure)
+        u, b = rng.normal(size=n), rng.normal(size=n)
+        assert residu_tridiagonal(inferieure, diagonale, superieure, u, b) == pytest.approx(
+            np.max(np.abs(A @ u - b)), rel=1e-12)
+        # Borne inférieure, exacte à quelques pour cent près sur ces matrices
+        estimation = estimer_conditionnement(inferieure, diagonale, superieure)
+        exact = np.linalg.cond(A, 1)
+        assert 0.9 * exact <= estimation <= exact * (1 + 1e-10)
+        assert estimer_conditionnement(np.zeros(1), np.zeros(2), np.zeros(1)) == float("inf")
+
+    def test_conditionnement_matrices_quelconques(self):
+        # Borne inférieure sur des matrices non symétriques sans dominance diagonale
+        rng = np.random.default_rng(3)
+        for n in rng.integers(2, 40, size=50):
+            inferieure, diagonale, superieure = rng.normal(size=n - 1), rng.normal(size=n), rng.normal(size=n - 1)
+            exact = np.linalg.cond(matrice_dense(inferieure, diagonale, superieure), 1)
+            estimation = estimer_conditionnement(inferieure, diagonale, superieure)
+            assert 0.1 * exact <= estimation <= exact * (1 + 1e-8)
+
+
+class TestProcessusCalcul:
+    """Tests des briques partagées des processus de calcul"""
+
+    def test_chemins_et_solveurs_importables(self):
+        chemins = chemins_import()
+        assert all(os.path.isdir(chemin) for chemin in chemins)
+        initialiser_worker(chemins)
+        for schema in SCHEMAS.values():
+            module = __import__(schema["module"])
+            assert callable(getattr(module, schema["resoudre"]))
+
+    def test_progression(self, capsys):
+        barre = Progression(2)
+        barre.avancer("a")
+        barre.avancer("b")
+        sortie = capsys.readouterr().err
+        assert "2/2" in sortie and sortie.endswith("\n")
+        Progression(3, active=False).avancer()
+        assert capsys.readouterr().err == ""
+
+
+class TestLancerAnalyses:
+    """Tests du point d'entrée piloté par configuration"""
+
+    def test_configuration_et_matrice(self):
+        config = valider_configuration({"analyse": {"schemas": ["DF"], "cas": ["sin"], "backends": ["dense", "bande"]},
+                                        "maillages": {"N_initial": 10, "facteur": 2, "niveaux": 3}})
+        assert config["N_values"] == [10, 20, 40]
+        assert len(matrice_jobs(config)) == 6
+        for invalide in ({"analyse": {"schemas": ["EF"], "cas": ["sin"]}},
+                         {"analyse": {"schemas": ["DF"], "cas": ["inconnu"]}},
+                         {"analyse": {"cas": ["sin"], "backends": ["creux"]}},
+                         {"analyse": {"cas": ["sin"]}, "maillages": {"N": [1]}}):
+            with pytest.raises(ValueError):
+                valider_configuration(invalide)
+
+    def test_execution_sequentielle(self):
+        config = valider_configuration({"analyse": {"schemas": ["DF", "VF"], "cas": ["sin"], "backends": ["bande"]},
+                                        "maillages": {"N": [20, 40, 80]}})
+        lignes = executer_matrice(matrice_jobs(config), workers=1, progression=False)
+        assert all(l["echec"] is None for l in lignes)
+        ordres = {s["schema"]: s["ordres"]["L2"]["ordre"] for s in resumer_series(lignes)}
+        assert ordres["DF"] == pytest.approx(2.0, abs=0.05)
+        assert ordres["VF"] > 0.9
+
+
+class TestRegistreCas:
+    """Tests du registre central des cas tests"""
+
+    def test_chargement_paresseux(self):
+        registre = RegistreCas()
+        appels = []
+
+        @registre.enregistrer("essai", etiquettes=("polynomial",))
+        def fabrique():
+            appels.append(1)
+            return CasTest("essai", "u(x) = x", lambda x: x, lambda x: 0.0, 0.0, 1.0)
+
+        assert registre.noms("polynomial") == ["essai"] and not appels
+        assert registre["essai"] is registre["essai"]
+        assert len(appels) == 1 and registre.charges() == ["essai"]
+        with pytest.raises(ValueError):
+            registre.enregistrer("essai", fabrique)
+        with pytest.raises(KeyError):
+            registre["absent"]
+
+        registre.enregistrer("differe", "registre_cas:_cas_sin")
+        assert registre["differe"].description == "u(x) = sin(πx)"
+
+    def test_fonctions_vectorisees(self):
+        f = vectoriser(lambda x: x)
+        x = np.linspace(0, 1, 6).reshape(2, 3)
+        y = f(x)
+        assert y.shape == x.shape and not np.shares_memory(y, x)
+        assert isinstance(REGISTRE["quadratique"].terme_source(0.5), float)
+        np.testing.assert_array_equal(REGISTRE["quadratique"].terme_source(x), np.full((2, 3), -2.0))
+        sortie = np.empty(6)
+        assert REGISTRE["sin"].solution_exacte(np.linspace(0, 1, 6), out=sortie) is sortie
+
+    @pytest.mark.parametrize("nom", REGISTRE.noms())
+    def test_cas_coherents(self, nom):
+        # -u'' = f par différences centrées d'ordre 4 et conditions aux limites
+        cas = REGISTRE[nom]
+        h = 1e-2
+        x = np.linspace(0.1, 0.9, 9)
+        u = cas.solution_exacte
+        derivee_seconde = (-u(x + 2*h) + 16*u(x + h) - 30*u(x) + 16*u(x - h) - u(x - 2*h)) / (12 * h**2)
+        np.testing.assert_allclose(-derivee_seconde, cas.terme_source(x), atol=1e-6)
+        assert u(0.0) == pytest.approx(cas.u0) and u(1.0) == pytest.approx(cas.u1)
+
+
+class TestSolutionsManufacturees:
+    """Tests du générateur de solutions manufacturées"""
+
+    @pytest.mark.parametrize("nom, expression", [("sin", "sin(pi*x)"), ("cube", "x**3"),
+                                                 ("quadratique", "x**2"), ("affine", "x")])
+    def test_sources_du_registre(self, tmp_path, nom, expression):
+        pytest.importorskip("sympy")
+        cas = cas_manufacture(expression, generateur=GenerateurSolutions(str(tmp_path)))
+        reference = REGISTRE[nom]
+        x = np.linspace(0, 1, 11)
+        np.testing.assert_allclose(cas.terme_source(x), reference.terme_source(x), atol=1e-12)
+        assert (cas.u0, cas.u1) == pytest.approx((reference.u0, reference.u1))
+
+    def test_noyau_2d_et_reaction(self, tmp_path):
+        pytest.importorskip("sympy")
+        generateur = GenerateurSolutions(str(tmp_path))
+        noyau = generateur.noyau("sin(pi*x)*sin(pi*y)", ("x", "y"))
+        X, Y = np.meshgrid(np.linspace(0, 1, 5), np.linspace(0, 1, 4))
+        u, f = noyau.solution_et_source(X, Y)
+        np.testing.assert_allclose(f, 2 * np.pi**2 * u, atol=1e-12)
+        assert generateur.noyau("x*y**2", ("x", "y")).source(np.zeros(3), np.zeros((2, 1))).shape == (2, 3)
+        reaction = generateur.noyau("x**3", operateur="diffusion_reaction", coefficient=2.0)
+        assert reaction.source(2.0) == pytest.approx(-12.0 + 16.0)
+
+    def test_cache_disque_sans_sympy(self, tmp_path, monkeypatch):
+        pytest.importorskip("sympy")
+        GenerateurSolutions(str(tmp_path)).noyau("exp(x)")
+        # Démarrage à chaud: le noyau en cache se charge sans importer sympy
+        sortie = subprocess.run(
+            [sys.executable, "-c", "import sys; from solutions_manufacturees import GenerateurSolutions; "
+             f"GenerateurSolutions({str(tmp_path)!r}).noyau('exp(x)'); print('sympy' in sys.modules)"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True)
+        assert sortie.stdout.strip() == "False", sortie.stderr
+        monkeypatch.setitem(sys.modules, "sympy", None)           # sympy absent
+        generateur = GenerateurSolutions(str(tmp_path))
+        noyau = generateur.noyau("exp(x)")
+        assert generateur.noyau("exp( x )") is noyau
+        assert (generateur.generes, generateur.charges_disque, generateur.charges_memoire) == (0, 1, 1)
+        assert noyau.source(0.0) == pytest.approx(-1.0)
+        with pytest.raises(ImportError):
+            generateur.noyau("exp(2*x)")
+
+
+class TestCollectePytest:
+    """Tests du plugin de collecte structurée des résultats"""
+
+    def test_flux_resultats(self, tmp_path):
+        (tmp_path / "test_exemple.py").write_text(
+            "import pytest\n"
+            "@pytest.mark.parametrize('n', [1, 2])\n"
+            "def test_parametre(n):\n"
+            "    assert n == 1, 'n différent de 1'\n"
+            "def test_memoire():\n"
+            "    bytearray(4_000_000)\n"
+            "@pytest.mark.skip(reason='ignoré')\n"
+            "def test_ignore():\n"
+            "    pass\n"
+            "@pytest.fixture\n"
+            "def casse():\n"
+            "    raise RuntimeError('fixture cassée')\n"
+            "def test_erreur(casse):\n"
+            "    pass\n",
+            encoding="utf-8")
+        flux = tmp_path / "flux.jsonl"
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "collecte_pytest", "--flux-resultats",
+                        str(flux), "test_exemple.py"], cwd=tmp_path, env=env, capture_output=True)
+
+        debut, tests, fin = lire_flux(str(flux))
+        par_nom = {t["nodeid"].split("::")[-1]: t for t in tests}
+        assert debut is not None and fin["code_sortie"] == 1
+        assert fin["compteurs"] == {"PASSED": 2, "FAILED": 1, "ERROR": 1, "SKIPPED": 1, "XFAIL": 0, "XPASS": 0}
+        echec = par_nom["test_parametre[2]"]
+        assert echec["issue"] == "FAILED" and echec["parametres"] == {"n": "2"}
+        assert echec["message"].startswith("AssertionError: n différent de 1")
+        assert set(echec["durees"]) == {"setup", "call", "teardown"}
+        assert par_nom["test_memoire"]["memoire_pic"] >= 4_000_000
+        assert par_nom["test_erreur"]["phase_echec"] == "setup"
+        assert par_nom["test_ignore"]["issue"] == "SKIPPED"
+
+
+class TestTestsParalleles:
+    """Tests de l'exécution répartie sur plusieurs processus"""
+
+    def test_repartition_lpt(self):
+        nodeids = [f"t{i}" for i in range(7)]
+        durees = {"t0": 5.0, "t1": 4.0, "t2": 3.0, "t3": 3.0, "t4": 2.0, "t5": 2.0, "t6": 2.0}
+        groupes = repartir(nodeids, durees, 3)
+        charges = sorted(sum(durees[n] for n in g) for g in groupes)
+        assert charges == [6.0, 7.0, 8.0]     # LPT: 5|4|3, puis 3→3, 2→4, 2→5, 2→6
+        assert sorted(n for g in groupes for n in g) == nodeids
+        assert all(g == sorted(g, key=nodeids.index) for g in groupes)     # ordre de collecte conservé
+        assert len(repartir(nodeids[:2], {}, 4)) == 2                      # pas de shard vide
+
+    def test_execution_repartie(self, tmp_path):
+        (tmp_path / "test_suite.py").write_text(
+            "import pytest\n"
+            "@pytest.mark.parametrize('n', range(6))\n"
+            "def test_parametre(n):\n"
+            "    assert n != 4, 'n vaut 4'\n",
+            encoding="utf-8")
+        durees = str(tmp_path / "durees.json")
+
+        complet = executer_en_parallele("test_suite.py", str(tmp_path), shards=2, arret_premier_echec=False,
+                                        fichier_durees=durees, sortie_flux=str(tmp_path / "flux.jsonl"),
+                                        progression=False)
+        assert complet["code_sortie"] == 1 and len(complet["shards"]) == 2
+        assert complet["compteurs"]["PASSED"] == 5 and complet["compteurs"]["FAILED"] == 1
+        assert [t["id_parametres"] for t in complet["tests"]] == [str(n) for n in range(6)]
+        assert len(charger_durees(durees)) == 6
+        _, tests, fin = lire_flux(str(tmp_path / "flux.jsonl"))
+        assert len(tests) == 6 and fin["compteurs"]["FAILED"] == 1
+
+        arret = executer_en_parallele("test_suite.py", str(tmp_path), shards=1, fichier_durees=durees,
+                                      progression=False)
+        assert arret["compteurs"]["FAILED"] == 1 and arret["non_executes"] == ["test_suite.py::test_parametre[5]"]
+
+
+class TestBenchmarks:
+    """Tests des benchmarks de performance et de la comparaison aux lignes de base"""
+
+    def test_mesure(self):
+        assert niveaux_N(10, 100) == [10, 20, 40, 80]
+        statistiques = mesurer(lambda: np.zeros(100_000), repetitions=3, echauffement=1)
+        assert statistiques["mediane"] > 0 and statistiques["minimum"] <= statistiques["mediane"]
+        assert statistiques["appels_par_echantillon"] >= 1
+        assert statistiques["memoire_pic"] >= 800_000
+        assert empreinte_machine() == empreinte_machine()
+
+    def test_comparaison(self):
+        def document(mediane, memoire):
+            return {"mesures": {"b": {"100": {"mediane": mediane, "iqr": 1e-4, "memoire_pic": memoire}}}}
+
+        reference = document(1e-3, 1_000_000)
+        assert comparer(reference, document(1.1e-3, 1_100_000))[0]["regressions"] == []
+        lignes = comparer(reference, document(2e-3, 4_000_000), seuil_temps=0.25, seuil_memoire=0.25)
+        assert lignes[0]["regressions"] == ["temps", "memoire"] and lignes[0]["ratio_temps"] == pytest.approx(2.0)
+        assert comparer(reference, {"mesures": {"autre": {"100": {}}}}) == []
+
+    def test_exposant_complexite(self):
+        N = np.array([1e3, 1e4, 1e5, 1e6])
+        assert exposant_complexite(N, 3e-6 * N) == pytest.approx(1.0)
+        bruite = 3e-6 * N**2
+        bruite[1] *= 20                                  # point isolé perturbé
+        assert exposant_complexite(N, bruite) == pytest.approx(2.0)
+
+    def test_execution_resolutions(self):
+        document = executer_benchmarks("resoudre_bande", N_max=40, repetitions=2, echauffement=1,
+                                       progression=False)
+        assert set(document["mesures"]) == {"df_resoudre_bande", "vf_resoudre_bande"}
+        assert list(document["mesures"]["df_resoudre_bande"]) == ["10", "20", "40"]
+        assert document["empreinte"] == empreinte_machine()[0]
+
+
+class TestSuiviPhases:
+    """Tests de l'instrumentation par phase (durée, mémoire tracée, RSS)"""
+
+    def test_phases_imbriquees(self):
+        suivi = SuiviPhases()
+        assert not tracemalloc.is_tracing()
+        with suivi.phase("resolution"):
+            tampon = np.ones(1_000_000)
+            with suivi.phase("assemblage"):
+                interne = np.ones(250_000)
+            del interne
+        del tampon
+        assert not tracemalloc.is_tracing()            # arrêté par le suivi qui l'a démarré
+        resume = suivi.resume()
+        assert list(resume) == ["assemblage", "resolution"]
+        assert 2_000_000 <= resume["assemblage"]["memoire_pic"] < 4_000_000
+        assert resume["resolution"]["memoire_pic"] >= 10_000_000       # inclut la phase interne
+        if suivi.rss:
+            assert resume["resolution"]["rss_pic"] >= resume["resolution"]["rss_debut"]
+
+    def test_sans_suivi(self):
+        assert suivi_phases.phase(None, "source") is suivi_phases.phase(None, "assemblage")
+        suivi = suivi_phases.activer_suivi_global(SuiviPhases(rss=False))
+        try:
+            with suivi_phases.phase(None, "source"):
+                pass
+        finally:
+            suivi_phases.desactiver_suivi_global()
+        assert suivi.phases["source"]["appels"] == 1 and suivi.phases["source"]["rss_pic"] is None
+
+    def test_phases_thomas(self):
+        suivi = SuiviPhases(rss=False)
+        n = 50
+        u = thomas(-np.ones(n - 1), np.full(n, 2.0), -np.ones(n - 1), np.ones(n), suivi=suivi)
+        assert set(suivi.phases) == {"factorisation", "resolution"}
+        assert np.allclose(matrice_dense(-np.ones(n - 1), np.full(n, 2.0), -np.ones(n - 1)) @ u, 1.0)
+
+
+
+class TestProfilage:
+    """Tests du mode profilage (cProfile, piles repliées, catégories)"""
+
+    def test_categories(self):
+        assert profilage.categorie("/site-packages/scipy/linalg/_basic.py", "solve_banded") == "solveur"
+        assert profilage.categorie("/x/Resolution-VF-1D/noyau_vf_1d.py", "resoudre_equation_diff_vf") == "assemblage"
+        assert profilage.categorie("/site-packages/matplotlib/figure.py", "savefig") == "tracé"
+        assert profilage.categorie("~", "<method 'write' of '_io.TextIOWrapper' objects>") == "E/S"
+        assert profilage.categorie("/usr/lib/python3/heapq.py", "heappush") == profilage.AUTRE
+
+    def test_profileur_complet(self, tmp_path):
+        inferieure, diagonale = -np.ones(199), np.full(200, 2.0)
+        with profilage.Profileur("complet", dossier=str(tmp_path), nom="essai", intervalle=0.001,
+                                 afficher=False) as profileur:
+            debut = time.perf_counter()
+            while time.perf_counter() - debut < 0.2:
+                thomas(inferieure, diagonale, inferieure, np.ones(200))
+        stats = pstats.Stats(profileur.fichier_prof)
+        assert any(fonction == "thomas" for _, _, fonction in stats.stats)
+        cprofile, echantillons = profileur.resumes
+        assert max(cprofile["categories"], key=cprofile["categories"].get) == "solveur"
+        assert echantillons["categories"].get("solveur", 0) > 0
+        with open(profileur.fichier_piles, encoding="utf-8") as f:
+            lignes = f.read().splitlines()
+        pile, nombre = lignes[0].rsplit(" ", 1)
+        assert int(nombre) >= 1 and pile.endswith("solveurs_lineaires.py:thomas")
+
+    def test_commande(self, tmp_path):
+        script = tmp_path / "script.py"
+        script.write_text("import sys\nsum(i * i for i in range(10000))\nsys.exit(3)\n", encoding="utf-8")
+        code = profilage.main(["--mode", "cprofile", "--dossier", str(tmp_path), str(script)])
+        assert code == 3
+        assert len(list(tmp_path.glob("script_*.prof"))) == 1
+
+
+class TestJournal:
+    """Tests du journal structuré (fichier JSON lignes, rendu console, workers)"""
+
+    def test_fichier_et_console(self, tmp_path):
+        fichier, console = tmp_path / "journal.jsonl", io.StringIO()
+        journal.configurer_journal(fichier=str(fichier), flux_console=console)
+        try:
+            evenement = journal.emetteur("essai")
+            evenement("debut_cas", "📊 CAS 1", schema="DF", cas=1)
+            evenement("resultat_cas", schema="DF", ordre_moyen=float("nan"), erreurs=np.array([1e-3, 2.5e-4]))
+            evenement("detail", "100% invisible en console", logging.DEBUG)
+            evenement("echec_job", niveau=logging.WARNING, N=10)
+        finally:
+            journal.arreter_journal()
+        rendu = console.getvalue().splitlines()
+        # debut_cas: bandeau du gabarit "section"
+        assert rendu[:4] == ["", "=" * 60, "📊 CAS 1", "=" * 60]
+        assert len(rendu) == 6 and rendu[5] == "⚠️  echec_job N=10"
+        assert rendu[4].startswith("• resultat_cas schema=DF ordre_moyen=nan erreurs=")
+        lignes = [json.loads(ligne) for ligne in fichier.read_text(encoding="utf-8").splitlines()]
+        assert [ligne["evenement"] for ligne in lignes] == ["debut_cas", "resultat_cas", "detail", "echec_job"]
+        assert lignes[0]["source"] == "essai" and lignes[0]["cas"] == 1 and lignes[0]["pid"] == os.getpid()
+        assert lignes[1]["ordre_moyen"] is None and lignes[1]["erreurs"] == [1e-3, 2.5e-4]
+        assert lignes[1]["message"] is None and lignes[2]["message"] == "100% invisible en console"
+        assert lignes[3]["niveau"] == "WARNING"
+
+    def test_gabarit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(journal, "GABARITS", dict(journal.GABARITS))
+        journal.enregistrer_gabarit("tableau_essai", lambda message, champs: "\n".join(
+            [message] + [f"{N:<4} {e:.1e}" for N, e in zip(champs["N"], champs["erreurs"])]))
+        fichier, console = tmp_path / "journal.jsonl", io.StringIO()
+        journal.configurer_journal(fichier=str(fichier), flux_console=console)
+        try:
+            journal.evenement("tableau_essai", "Erreurs", source="essai", N=[10, 20], erreurs=[1e-2, 2.5e-3])
+        finally:
+            journal.arreter_journal()
+        assert console.getvalue().splitlines() == ["Erreurs", "10   1.0e-02", "20   2.5e-03"]
+        # Le fichier garde l'événement brut: un fait, ses champs
+        ligne = json.loads(fichier.read_text(encoding="utf-8"))
+        assert ligne["message"] == "Erreurs" and ligne["N"] == [10, 20]
+
+    def test_workers(self, tmp_path):
+        fichier = tmp_path / "journal.jsonl"
+        journal.configurer_journal(fichier=str(fichier), console="aucune")
+        try:
+            contexte = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(2, mp_context=contexte, initializer=journal.initialiser_worker_journal,
+                                     initargs=(journal.file_journal(),)) as pool:
+                for futur in [pool.submit(journal.evenement, "fin_job", "", logging.DEBUG, "worker") for _ in range(4)]:
+                    futur.result()
+        finally:
+            journal.arreter_journal()
+        lignes = [json.loads(ligne) for ligne in fichier.read_text(encoding="utf-8").splitlines()]
+        assert len(lignes) == 4 and all(ligne["source"] == "worker" for ligne in lignes)
+        assert os.getpid() not in {ligne["pid"] for ligne in lignes}
+
+    def test_sans_configuration(self, capsys):
+        journal.evenement("debut_cas", "invisible")
+        assert capsys.readouterr().out == ""
+
+
+class TestMetriques:
+    """Tests du registre de métriques (exposition Prometheus, solveurs instrumentés, export)"""
+
+    def test_exposition(self):
+        registre = metriques.RegistreMetriques(standard=False)
+        registre.compteur("essais_total", "Essais", ("nom",)).incrementer('a"b', valeur=2)
+        histogramme = registre.histogramme("duree_secondes", "Durée", bornes=(0.1, 1.0))
+        for valeur in (0.05, 0.1, 0.5, 3.0):
+            histogramme.observer(valeur)
+        lignes = registre.exposition().splitlines()
+        assert lignes[:3] == ["# HELP essais_total Essais", "# TYPE essais_total counter", 'essais_total{nom="a\\"b"} 2']
+        assert 'duree_secondes_bucket{le="0.1"} 2' in lignes and 'duree_secondes_bucket{le="+Inf"} 4' in lignes
+        assert "duree_secondes_count 4" in lignes and "duree_secondes_sum 3.65" in lignes
+        assert [metriques.tranche_N(N) for N in (2, 10, 11, 100, 101, 10**6)] == ["1e1", "1e1", "1e2", "1e2", "1e3", "1e6"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_solveurs_instrumentes(self, workers):
+        config = valider_configuration({"analyse": {"schemas": ["DF", "VF"], "cas": ["sin"], "backends": ["bande"]},
+                                        "maillages": {"N": [20, 200]}})
+        registre = metriques.activer_metriques()
+        try:
+            executer_matrice(matrice_jobs(config), workers=workers, progression=False)
+        finally:
+            metriques.desactiver_metriques()
+        assert registre.resolutions.valeur("DF", "bande") == 2 and registre.resolutions.valeur("VF", "bande") == 2
+        assert registre.inconnues.valeur("VF", "bande") == 220
+        assert registre.durees.nombre("DF", "bande", "1e3") == 1
+        assert 'tp_resolutions_total{schema="VF",backend="bande"} 2' in registre.exposition()
+
+    def test_echecs_et_cache(self, tmp_path):
+        from noyau_df_1d import resoudre_equation_diff
+        registre = metriques.activer_metriques()
+        try:
+            with pytest.raises(ValueError):
+                resoudre_equation_diff(np.sin, 1, 0, 0)
+            cache = CacheResultats(str(tmp_path))
+            assert cache.charger_resultat("ab" * 32) is None
+            cache.stocker_resultat("ab" * 32, erreur=1e-3)
+            assert cache.charger_resultat("ab" * 32) is not None
+        finally:
+            metriques.desactiver_metriques()
+        assert registre.resolutions_echouees.valeur("DF", "dense") == 1
+        assert registre.acces_cache.valeur("resultat", "succes") == 1
+        assert registre.taille_cache.valeur() == cache.taille > 0
+        assert "tp_cache_taux_succes 0.5" in registre.exposition().splitlines()
+        assert metriques.registre_actif() is None
+        assert resoudre_equation_diff(np.sin, 4, 0, 0)[0].shape == (5,)     # appel direct sans registre
+
+    def test_export(self, tmp_path):
+        registre = metriques.RegistreMetriques()
+        registre.observer_resolution("DF", "bande", 1000, 0.002)
+        fichier = metriques.ecrire_fichier_metriques(registre, str(tmp_path / "prom" / "tp.prom"))
+        with open(fichier, encoding="utf-8") as f:
+            assert 'tp_resolutions_total{schema="DF",backend="bande"} 1' in f.read()
+        assert [p.name for p in (tmp_path / "prom").iterdir()] == ["tp.prom"]
+        with metriques.ServeurMetriques(registre) as serveur:
+            with urllib.request.urlopen(serveur.url) as reponse:
+                assert reponse.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                assert "tp_memoire_rss_octets" in reponse.read().decode("utf-8")
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{serveur.port}/autre")
+
+
+class TestServiceResolution:
+    """Tests du service de résolution (résultats des solveurs, regroupement, contre-pression, erreurs)"""
+
+    def test_resultats_identiques(self, tmp_path):
+        from noyau_df_1d import resoudre_equation_diff
+        from noyau_vf_1d import resoudre_equation_diff_vf
+        solveurs = {"DF": resoudre_equation_diff, "VF": resoudre_equation_diff_vf}
+        f = REGISTRE["sin"].terme_source
+        with ServiceEnFond(chemin_socket=str(tmp_path / "service.sock")) as service:
+            with ClientResolution(service.adresse, delai=10) as client:
+                for schema, resoudre in solveurs.items():
+                    for backend in ("dense", "bande"):
+                        U, x = client.resoudre(f, 40, 0.5, -1.0, schema, backend)
+                        U_ref, x_ref = resoudre(f, 40, 0.5, -1.0, backend=backend)
+                        np.testing.assert_allclose(U, U_ref, rtol=1e-13, atol=1e-15)
+                        np.testing.assert_array_equal(x, x_ref)
+        assert not (tmp_path / "service.sock").exists()
+
+    def test_regroupement_et_contre_pression(self):
+        from noyau_vf_1d import resoudre_equation_diff_vf
+        problemes = [(np.cos, 200, 0.0, 0.01 * i, "VF") for i in range(300)]
+        resultats = {}
+        with ServiceEnFond(port=0, delai_lot=0.005, taille_lot=16, capacite=8) as service:
+            def client(indice):
+                with ClientResolution(service.adresse, delai=10) as c:
+                    resultats[indice] = c.resoudre_plusieurs(problemes[indice::3], fenetre=32)
+            fils = [threading.Thread(target=client, args=(i,)) for i in range(3)]
+            for fil in fils:
+                fil.start()
+            for fil in fils:
+                fil.join()
+            statistiques = dict(service.statistiques)
+        assert statistiques["requetes"] == 300 and statistiques["erreurs"] == 0
+        assert 1 < statistiques["plus_grand_lot"] <= 8          # capacité < taille_lot: lots limités à 8
+        assert statistiques["lots"] < 300
+        for indice in range(3):
+            for (f, N, U0, U1, _), (U, _) in zip(problemes[indice::3], resultats[indice]):
+                np.testing.assert_allclose(U, resoudre_equation_diff_vf(f, N, U0, U1, backend="bande")[0],
+                                           rtol=1e-12, atol=1e-15)
+
+    def test_erreurs(self, tmp_path):
+        with ServiceEnFond(chemin_socket=str(tmp_path / "service.sock")) as service:
+            with ClientResolution(service.adresse, delai=10) as client:
+                with pytest.raises(RuntimeError, match="9 valeurs"):
+                    client.resoudre(np.ones(7), 10, 0, 0)
+                with pytest.raises(ValueError):
+                    client.resoudre(np.sin, 10, 0, 0, schema="EF")
+                U, x = client.resoudre(np.zeros(9), 10, 0, 1)   # connexion toujours utilisable
+                np.testing.assert_allclose(U, x, atol=1e-14)
+            assert service.statistiques["erreurs"] == 1
+
+    def test_resoudre_lot(self):
+        valeurs = np.stack([np.ones(99), np.linspace(0, 1, 101)[1:-1]], axis=1)
+        U = service_resolution.resoudre_lot("DF", "bande", 100, valeurs, [0, 1], [0, 2])
+        assert U.shape == (2, 101) and U[0].flags["C_CONTIGUOUS"]
+        x = np.linspace(0, 1, 101)
+        np.testing.assert_allclose(U[0], x * (1 - x) / 2, atol=1e-13)       # -u'' = 1
+        assert (U[1, 0], U[1, -1]) == (1, 2)
+
+
+class TestCacheSolutions:
+    """Tests du cache persistant des solutions (empreinte, memmap, LRU, processus, service)"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = cache_solutions.activer_cache_solutions(CacheSolutions(str(tmp_path / "solutions")))
+        yield cache
+        cache_solutions.desactiver_cache_solutions()
+        cache.fermer()
+
+    def test_solveurs(self, cache):
+        from noyau_df_1d import resoudre_equation_diff
+        from noyau_vf_1d import resoudre_equation_diff_vf
+        for resoudre in (resoudre_equation_diff, resoudre_equation_diff_vf):
+            U, x = resoudre(np.sin, 500, 0, 1, backend="bande")
+            U_cache, x_cache = resoudre(np.sin, 500, 0, 1, backend="bande")
+            assert isinstance(U_cache, np.memmap) and not U_cache.flags.writeable
+            np.testing.assert_array_equal(U_cache, U)
+            np.testing.assert_array_equal(x_cache, x)
+        assert (cache.succes, cache.echecs, len(cache)) == (2, 2, 2)
+        # Empreinte par les valeurs: même terme source écrit autrement → succès
+        amplitude = 1.0
+        resoudre_equation_diff(lambda x: amplitude * np.sin(x), 500, 0, 1, backend="bande")
+        assert cache.succes == 3
+        resoudre_equation_diff(np.sin, 500, 0, 2, backend="bande")                 # autre U1
+        resoudre_equation_diff(np.sin, 500, 0, 1, backend="dense")                 # autre backend
+        resoudre_equation_diff(np.sin, 500, 0, 1, backend="bande", suivi=SuiviPhases())   # hors cache
+        assert (cache.succes, len(cache)) == (3, 4)
+        with pytest.raises(ValueError):
+            resoudre_equation_diff(np.sin, 1, 0, 0)
+
+    def test_version_solveur(self, tmp_path, monkeypatch):
+        import noyau_df_1d
+        import solveurs_lineaires
+        version = cache_solutions.version_solveur(noyau_df_1d.__file__)
+        assert service_resolution.version_noyau("DF") == version
+        copie = tmp_path / "solveurs_lineaires.py"
+        copie.write_text(open(solveurs_lineaires.__file__, encoding="utf-8").read() + "\n# modifié\n")
+        monkeypatch.setattr(solveurs_lineaires, "__file__", str(copie))
+        assert cache_solutions.version_solveur(noyau_df_1d.__file__) != version
+
+    def test_eviction_lru(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache_solutions, "RESOLUTION_ACCES", 0.0)
+        cache = CacheSolutions(str(tmp_path), quota=3 * 1800)
+        x = np.linspace(0, 1, 101)
+        for i in range(3):
+            assert cache.stocker(f"{i:02d}" * 20, np.full(101, float(i)), x)
+            time.sleep(0.01)
+        taille_entree = cache.taille // 3
+        assert cache.charger("00" * 20) is not None                  # 00 devient la plus récente
+        time.sleep(0.01)
+        cache.stocker("03" * 20, np.full(101, 3.0), x)
+        assert cache.charger("01" * 20) is None                      # la moins récemment utilisée
+        assert [cache.charger(f"{i:02d}" * 20)[0][0] for i in (0, 2, 3)] == [0.0, 2.0, 3.0]
+        assert cache.taille == 3 * taille_entree <= cache.quota
+        assert cache.evincer(taille_entree) == 2 and len(cache) == 1
+        os.remove(os.path.join(str(tmp_path), "03", "03" * 20 + ".npy"))        # fichier disparu: échec
+        assert cache.charger("03" * 20) is None and len(cache) == 0
+        assert not cache.stocker("04" * 20, np.zeros(10**4), np.zeros(10**4))  # plus grande que le quota
+
+    def test_processus_et_service(self, cache, tmp_path):
+        config = valider_configuration({"analyse": {"schemas": ["DF", "VF"], "cas": ["sin"], "backends": ["bande"]},
+                                        "maillages": {"N": [20, 40, 80]}})
+        lignes = executer_matrice(matrice_jobs(config), workers=2, progression=False)
+        assert len(cache) == 6                                       # écrites par les workers
+        assert executer_matrice(matrice_jobs(config), workers=1, progression=False)[0]["erreur_Linf"] == \
+            lignes[0]["erreur_Linf"]
+        assert cache.succes == 6
+        f = REGISTRE["sin"].terme_source
+        with ServiceEnFond(chemin_socket=str(tmp_path / "service.sock"), cache=cache) as service:
+            with ClientResolution(service.adresse, delai=10) as client:
+                U, _ = client.resoudre(f, 80, 0, 0, "VF")           # calculée par un worker
+                client.resoudre(f, 160, 0, 0, "VF")
+            assert service.statistiques["cache"] == 1
+        from noyau_vf_1d import resoudre_equation_diff_vf
+        np.testing.assert_array_equal(U, resoudre_equation_diff_vf(f, 80, 0, 0, backend="bande")[0])
+        assert len(cache) == 7 and cache.succes == 8              # solution du service relue par le solveur
+
+
+class TestInterpolationSolutions:
+    """Tests de l'évaluation vectorisée des solutions discrètes"""
+
+    @pytest.mark.parametrize("x", [np.linspace(0, 1, 41), np.concatenate([[0], (np.arange(40) + 0.5) / 40, [1]]),
+                                   np.linspace(0, 1, 2)])
+    def test_reconstructions(self, x):
+        from scipy.interpolate import PchipInterpolator
+        rng = np.random.default_rng(1)
+        U = np.sin(3 * np.pi * x) + rng.normal(0, 0.1, len(x))
+        solution = SolutionDiscrete(U, x)
+        assert solution.uniforme == (len(x) != 42)
+        p = np.concatenate([x, rng.uniform(0, 1, 10**5)])
+        np.testing.assert_allclose(solution(p), np.interp(p, x, U), rtol=0, atol=1e-13)
+        np.testing.assert_allclose(solution(p, "pchip"), PchipInterpolator(x, U)(p), rtol=0, atol=1e-13)
+        np.testing.assert_allclose(solution(x, "pchip"), U, rtol=0, atol=1e-14)
+        # Formes, hors domaine et prolongement
+        assert solution(p[:30].reshape(10, 3)).shape == (10, 3) and solution(np.empty(0)).shape == (0,)
+        assert np.ndim(solution(0.5)) == 0
+        assert np.isnan(solution([-0.1, 1.1, np.nan])).all() and solution(1.1, exterieur=0.0) == 0.0
+        assert solution(1.1, exterieur=None) == pytest.approx(U[-1] + (U[-1] - U[-2]) / (x[-1] - x[-2]) * 0.1)
+        with pytest.raises(ValueError):
+            solution(0.5, methode="spline")
+
+    def test_monotonie_pchip(self):
+        x = np.linspace(0, 1, 11)
+        U = np.where(x < 0.5, 0.0, 1.0)                     # marche: pas de dépassement
+        valeurs = SolutionDiscrete(U, x)(np.linspace(0, 1, 10001), "pchip")
+        assert valeurs.min() == 0.0 and valeurs.max() == 1.0 and np.all(np.diff(valeurs) >= 0)
+
+    def test_solveurs(self, tmp_path):
+        from noyau_df_1d import resoudre_equation_diff
+        from noyau_vf_1d import resoudre_equation_diff_vf
+        cas = REGISTRE["sin"]
+        x_exact = np.linspace(0, 1, 1000)
+        for resoudre in (resoudre_equation_diff, resoudre_equation_diff_vf):
+            solution = resoudre(cas.terme_source, 200, 0, 0, backend="bande")
+            U, x = solution
+            assert isinstance(solution, SolutionDiscrete) and solution.U is U and solution.x is x
+            np.testing.assert_allclose(solution(x_exact), cas.solution_exacte(x_exact), atol=2e-2)
+            assert isinstance(resoudre(cas.terme_source, 20, 0, 0, diagnostics=lambda d: None), SolutionDiscrete)
+            diagnostiquee = resoudre(cas.terme_source, 200, 0, 0, backend="bande", diagnostics=True)
+            U_diag, x_diag, diag = diagnostiquee
+            assert isinstance(diagnostiquee, SolutionDiscrete) and diagnostiquee.diagnostic is diag
+            assert diag.N == 200 and solution.diagnostic is None
+            np.testing.assert_array_equal(diagnostiquee.evaluer(x_exact, "pchip"), solution(x_exact, "pchip"))
+            copie = pickle.loads(pickle.dumps(solution))
+            np.testing.assert_array_equal(copie(x_exact, "pchip"), solution(x_exact, "pchip"))
+        assert resoudre_equation_diff(cas.terme_source, 20, 0, 0).uniforme
+        with ServiceEnFond(chemin_socket=str(tmp_path / "service.sock")) as service:
+            with ClientResolution(service.adresse, delai=10) as client:
+                distante = client.resoudre(cas.terme_source, 200, 0, 0, "VF")
+        assert not distante.uniforme
+        np.testing.assert_allclose(distante(x_exact), solution(x_exact), atol=1e-12)
@@ -0,0 +1,403 @@
+"""
+BENCHMARKS DE PERFORMANCE DES SOLVEURS AVEC LIGNES DE BASE
+==========================================================
+
+Mesure reproductible du temps et de la mémoire des résolutions DF / VF
+(backends dense et bande) et des pilotes d'analyse de convergence, sur une
+gamme géométrique de N:
+
+- échauffement (appels non mesurés: imports, caches, allocation initiale);
+- échantillons calibrés comme timeit (chaque échantillon dure au moins
+  DUREE_MIN_ECHANTILLON, les appels très courts sont répétés en boucle);
+- statistiques robustes: médiane, minimum, écart interquartile;
+- pic mémoire (tracemalloc) mesuré sur un appel séparé, hors chronométrage.
+
+Les résultats sont enregistrés en JSON comme ligne de base, une par machine
+(empreinte: processeur, nombre de CPU, système, versions Python et numpy),
+dans BENCHMARKS/ à la racine du projet (variable d'environnement
+TP_ANAL_NUM_BENCHMARKS pour un autre dossier). Le mode comparaison relance
+les mesures et échoue (code 1) si le temps médian ou le pic mémoire dépasse
+la ligne de base de plus du seuil donné.
+
+Utilisation:
+    python benchmarks.py executer --enregistrer       # ligne de base de cette machine
+    python benchmarks.py comparer --seuil-temps 0.25  # régression → code de sortie 1
+    python benchmarks.py executer --filtre df_ --N-max 2560 --sortie bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tempfile
+import importlib
+import statistics
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from processus_calcul import SCHEMAS, chemins_import, initialiser_worker
+from registre_cas import obtenir_cas
+
+
+VERSION_FORMAT = 1
+DUREE_MIN_ECHANTILLON = 0.02     # secondes
+SEUIL_TEMPS = 0.25               # régression si médiane > (1 + seuil) · ligne de base
+SEUIL_MEMOIRE = 0.25
+MEMOIRE_NEGLIGEABLE = 64 * 1024  # octets: écarts de pic mémoire ignorés en dessous
+
+_racine_projet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSSIER_DEFAUT = os.environ.get("TP_ANAL_NUM_BENCHMARKS", os.path.join(_racine_projet, "BENCHMARKS"))
+
+# Pilotes d'analyse de convergence par schéma (module, fonction)
+PILOTES_ANALYSE = {
+    "DF": ("analyse_df_1d", "analyser_convergence"),
+    "VF": ("analyse_vf_1d", "analyser_convergence_vf"),
+}
+
+
+class Benchmark:
+    """
+    Mesure paramétrée par N
+
+    Paramètres:
+        nom (str): Identifiant (ex: "df_resoudre_bande")
+        preparer (callable): preparer(N) -> fonction sans argument à mesurer
+        N_max (int): Plus grand N raisonnable (backend dense: O(N²) mémoire)
+    """
+
+    def __init__(self, nom, preparer, N_max):
+        self.nom = nom
+        self.preparer = preparer
+        self.N_max = N_max
+
+    def __repr__(self):
+        return f"Benchmark({self.nom!r}, N_max={self.N_max})"
+
+
+def _resolution(schema, backend):
+    def preparer(N):
+        module = importlib.import_module(SCHEMAS[schema]["module"])
+        resoudre = getattr(module, SCHEMAS[schema]["resoudre"])
+        cas = obtenir_cas("sin")
+        return lambda: resoudre(cas.terme_source, N, cas.u0, cas.u1, backend=backend)
+    return preparer
+
+
+def _analyse(schema):
+    def preparer(N):
+        module, fonction = PILOTES_ANALYSE[schema]
+        analyser = getattr(importlib.import_module(module), fonction)
+        cas = obtenir_cas("sin")
+        N_values = niveaux_N(10, N)
+        dossier = tempfile.gettempdir()
+        return lambda: analyser(cas.solution_exacte, cas.terme_source, cas.u0, cas.u1, N_values,
+                                cas.description, dossier, figures="aucune", backend="bande")
+    return preparer
+
+
+BENCHMARKS = [
+    Benchmark("df_resoudre_dense", _resolution("DF", "dense"), 1280),
+    Benchmark("df_resoudre_bande", _resolution("DF", "bande"), 81920),
+    Benchmark("vf_resoudre_dense", _resolution("VF", "dense"), 1280),
+    Benchmark("vf_resoudre_bande", _resolution("VF", "bande"), 81920),
+    Benchmark("df_analyse_convergence", _analyse("DF"), 20480),
+    Benchmark("vf_analyse_convergence", _analyse("VF"), 20480),
+]
+
+
+def niveaux_N(N_min=10, N_max=1280, facteur=2):
+    """Gamme géométrique N_min, N_min·facteur, ... ≤ N_max"""
+    niveaux = []
+    N = N_min
+    while N <= N_max:
+        niveaux.append(N)
+        N *= facteur
+    return niveaux
+
+
+# ----------------------------------------------------------------------
+# Machine
+# ----------------------------------------------------------------------
+
+def _modele_processeur():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for ligne in f:
+                if ligne.startswith("model name"):
+                    return ligne.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def empreinte_machine():
+    """
+    Description et empreinte de la machine (clé des lignes de base)
+
+    Retourne:
+        tuple: (empreinte hexadécimale courte, dict de description)
+    """
+    description = {
+        "processeur": _modele_processeur(),
+        "cpu": os.cpu_count(),
+        "architecture": platform.machine(),
+        "systeme": platform.system(),
+        "python": ".".join(platform.python_version_tuple()[:2]),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+    }
+    texte = json.dumps(description, sort_keys=True)
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()[:16], description
+
+
+def chemin_ligne_base(dossier=None, empreinte=None):
+    empreinte = empreinte or empreinte_machine()[0]
+    return os.path.join(dossier or DOSSIER_DEFAUT, f"ligne_base_{empreinte}.json")
+
+
+# ----------------------------------------------------------------------
+# Mesure
+# ----------------------------------------------------------------------
+
+def mesurer(fonction, repetitions=7, echauffement=2):
+    """
+    Temps par appel et pic mémoire d'une fonction sans argument
+
+    Retourne:
+        dict: mediane, minimum, iqr (secondes par appel), echantillons,
+            appels_par_echantillon, memoire_pic (octets)
+    """
+    for _ in range(echauffement):
+        fonction()
+
+    # Calibration: assez d'appels par échantillon pour dominer la résolution de l'horloge
+    appels = 1
+    while True:
+        debut = time.perf_counter()
+        for _ in range(appels):
+            fonction()
+        if time.perf_counter() - debut >= DUREE_MIN_ECHANTILLON or appels >= 1 << 16:
+            break
+        appels *= 2
+
+    temps = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        for _ in range(appels):
+            fonction()
+        temps.append((time.perf_counter() - debut) / appels)
+
+    deja_actif = tracemalloc.is_tracing()
+    if not deja_actif:
+        tracemalloc.start()
+    avant, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fonction()
+    _, pic = tracemalloc.get_traced_memory()
+    if not deja_actif:
+        tracemalloc.stop()
+
+    quartiles = statistics.quantiles(temps, n=4) if len(temps) > 1 else [temps[0]] * 3
+    return {
+        "mediane": statistics.median(temps),
+        "minimum": min(temps),
+        "iqr": quartiles[2] - quartiles[0],
+        "echantillons": len(temps),
+        "appels_par_echantillon": appels,
+        "memoire_pic": max(0, pic - avant),
+    }
+
+
+def exposant_complexite(N_values, valeurs):
+    """
+    Exposant p de valeurs ≈ C·N^p
+
+    Pente de Theil-Sen en log-log (médiane des pentes entre toutes les paires
+    de points): un point perturbé par la charge de la machine ne la déplace pas.
+    """
+    logN = np.log(np.asarray(N_values, dtype=float))
+    logv = np.log(np.maximum(np.asarray(valeurs, dtype=float), np.finfo(float).tiny))
+    i, j = np.triu_indices(len(logN), k=1)
+    return float(np.median((logv[j] - logv[i]) / (logN[j] - logN[i])))
+
+
+def complexite_empirique(preparer, N_values, repetitions=5, echauffement=1):
+    """
+    Temps et mémoire en fonction de N, et leurs exposants ajustés
+
+    Le temps retenu pour chaque N est le minimum des échantillons (le moins
+    affecté par les autres processus d'une machine partagée).
+
+    Paramètres:
+        preparer (callable): preparer(N) -> fonction sans argument à mesurer
+
+    Retourne:
+        dict: N, temps, memoire, exposant_temps, exposant_memoire
+    """
+    mesures = [mesurer(preparer(N), repetitions, echauffement) for N in N_values]
+    temps = [m["minimum"] for m in mesures]
+    memoire = [m["memoire_pic"] for m in mesures]
+    return {
+        "N": list(N_values), "temps": temps, "memoire": memoire,
+        "exposant_temps": exposant_complexite(N_values, temps),
+        "exposant_memoire": exposant_complexite(N_values, memoire),
+    }
+
+
+def executer_benchmarks(filtre=None, N_min=10, N_max=None, repetitions=7, echauffement=2, progression=True):
+    """
+    Exécute les benchmarks dont le nom contient filtre
+
+    Retourne:
+        dict: Document JSON (machine, date, mesures {nom: {N: statistiques}})
+    """
+    initialiser_worker(chemins_import())
+    empreinte, description = empreinte_machine()
+    mesures = {}
+    for benchmark in BENCHMARKS:
+        if filtre and filtre not in benchmark.nom:
+            continue
+        mesures[benchmark.nom] = {}
+        for N in niveaux_N(N_min, min(benchmark.N_max, N_max or benchmark.N_max)):
+            statistiques = mesurer(benchmark.preparer(N), repetitions, echauffement)
+            mesures[benchmark.nom][str(N)] = statistiques
+            if progression:
+                print(f"   {benchmark.nom:<24} N={N:<6d} {statistiques['mediane'] * 1e3:10.3f} ms "
+                      f"± {statistiques['iqr'] * 1e3:8.3f}  {statistiques['memoire_pic'] / 1024:10.1f} Kio")
+    return {
+        "version": VERSION_FORMAT,
+        "empreinte": empreinte,
+        "machine": description,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "parametres": {"repetitions": repetitions, "echauffement": echauffement},
+        "mesures": mesures,
+    }
+
+
+# ----------------------------------------------------------------------
+# Lignes de base
+# ----------------------------------------------------------------------
+
+def ecrire_json(document, chemin):
+    """Écrit un document de benchmarks (écriture atomique)"""
+    dossier = os.path.dirname(os.path.abspath(chemin))
+    os.makedirs(dossier, exist_ok=True)
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, prefix=".tmp", suffix=".json")
+    try:
+        with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=1, ensure_ascii=False)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
+
+def lire_json(chemin):
+    with open(chemin, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def comparer(reference, actuel, seuil_temps=SEUIL_TEMPS, seuil_memoire=SEUIL_MEMOIRE):
+    """
+    Compare des mesures à une ligne de base
+
+    Une régression de temps est signalée si la médiane dépasse la référence
+    de plus de seuil_temps ET de plus de l'écart interquartile de la
+    référence (bruit de mesure); une régression mémoire si le pic dépasse la
+    référence de plus de seuil_memoire et de plus de MEMOIRE_NEGLIGEABLE.
+
+    Retourne:
+        list: Lignes {benchmark, N, temps_reference, temps, ratio_temps,
+            memoire_reference, memoire, ratio_memoire, regressions}
+            pour les (benchmark, N) présents des deux côtés
+    """
+    lignes = []
+    for nom, par_N in actuel["mesures"].items():
+        for N, mesure in par_N.items():
+            ref = reference["mesures"].get(nom, {}).get(N)
+            if ref is None:
+                continue
+            ratio_temps = mesure["mediane"] / ref["mediane"] if ref["mediane"] > 0 else np.inf
+            ratio_memoire = mesure["memoire_pic"] / ref["memoire_pic"] if ref["memoire_pic"] > 0 else 1.0
+            regressions = []
+            if ratio_temps > 1 + seuil_temps and mesure["mediane"] - ref["mediane"] > ref["iqr"]:
+                regressions.append("temps")
+            if (ratio_memoire > 1 + seuil_memoire
+                    and mesure["memoire_pic"] - ref["memoire_pic"] > MEMOIRE_NEGLIGEABLE):
+                regressions.append("memoire")
+            lignes.append({
+                "benchmark": nom, "N": int(N),
+                "temps_reference": ref["mediane"], "temps": mesure["mediane"], "ratio_temps": ratio_temps,
+                "memoire_reference": ref["memoire_pic"], "memoire": mesure["memoire_pic"],
+                "ratio_memoire": ratio_memoire, "regressions": regressions,
+            })
+    return lignes
+
+
+def afficher_comparaison(lignes):
+    print(f"{'benchmark':<24} {'N':>6} {'réf (ms)':>10} {'actuel':>10} {'×temps':>7} {'×mém':>7}")
+    for ligne in lignes:
+        marque = "❌ " + "+".join(ligne["regressions"]) if ligne["regressions"] else "✅"
+        print(f"{ligne['benchmark']:<24} {ligne['N']:>6d} {ligne['temps_reference'] * 1e3:10.3f} "
+              f"{ligne['temps'] * 1e3:10.3f} {ligne['ratio_temps']:7.2f} {ligne['ratio_memoire']:7.2f}  {marque}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de performance des solveurs 1D")
+    parser.add_argument("mode", choices=["executer", "comparer"])
+    parser.add_argument("--filtre", help="Ne garder que les benchmarks dont le nom contient ce texte")
+    parser.add_argument("--N-min", type=int, default=10)
+    parser.add_argument("--N-max", type=int, help="Borne supérieure de la gamme de N")
+    parser.add_argument("--repetitions", type=int, default=7)
+    parser.add_argument("--echauffement", type=int, default=2)
+    parser.add_argument("--sortie", help="Fichier JSON des mesures")
+    parser.add_argument("--enregistrer", action="store_true",
+                        help="executer: enregistrer comme ligne de base de cette machine")
+    parser.add_argument("--ligne-base", help="comparer: fichier de référence (défaut: ligne de base de la machine)")
+    parser.add_argument("--seuil-temps", type=float, default=SEUIL_TEMPS)
+    parser.add_argument("--seuil-memoire", type=float, default=SEUIL_MEMOIRE)
+    args = parser.parse_args(argv)
+
+    reference = None
+    if args.mode == "comparer":
+        chemin_reference = args.ligne_base or chemin_ligne_base()
+        if not os.path.exists(chemin_reference):
+            print(f"❌ Pas de ligne de base: {chemin_reference} (lancer 'executer --enregistrer')")
+            return 2
+        reference = lire_json(chemin_reference)
+        if reference["empreinte"] != empreinte_machine()[0]:
+            print(f"⚠️  Ligne de base d'une autre machine ({reference['machine']['processeur']})")
+
+    empreinte, description = empreinte_machine()
+    print(f"⏱️  Benchmarks sur {description['processeur']} ({description['cpu']} CPU), empreinte {empreinte}")
+    document = executer_benchmarks(args.filtre, args.N_min, args.N_max, args.repetitions, args.echauffement)
+    if args.sortie:
+        ecrire_json(document, args.sortie)
+        print(f"💾 Mesures: {args.sortie}")
+
+    if args.mode == "executer":
+        if args.enregistrer:
+            chemin = chemin_ligne_base(empreinte=empreinte)
+            ecrire_json(document, chemin)
+            print(f"💾 Ligne de base: {chemin}")
+        return 0
+
+    lignes = comparer(reference, document, args.seuil_temps, args.seuil_memoire)
+    afficher_comparaison(lignes)
+    regressions = [ligne for ligne in lignes if ligne["regressions"]]
+    if regressions:
+        print(f"❌ {len(regressions)} régression(s) au-delà des seuils "
+              f"(temps +{args.seuil_temps:.0%}, mémoire +{args.seuil_memoire:.0%})")
+        return 1
+    print(f"✅ Aucune régression sur {len(lignes)} mesures")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
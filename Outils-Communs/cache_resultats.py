@@ -0,0 +1,291 @@
+"""
+CACHE ADRESSÉ PAR CONTENU DES RÉSULTATS ET DES FIGURES
+======================================================
+
+Évite de refaire le travail inchangé d'une analyse de convergence à l'autre.
+Chaque entrée est adressée par une empreinte SHA-256 de tout ce qui la
+détermine:
+
+- le code source du solveur (fichier du module),
+- la définition du cas (code des fonctions solution/source, u0, u1, nom),
+- N,
+- pour les figures, la fonction de tracé et ses paramètres.
+
+Les résultats (erreur, solution, points) sont stockés en .npz, les figures en
+.png. Un accès rafraîchit la date de modification de l'entrée; quand la taille
+totale dépasse la limite, les entrées les moins récemment utilisées sont
+supprimées (LRU).
+
+Emplacement par défaut: <racine du projet>/.cache_resultats, modifiable par la
+variable d'environnement TP_ANAL_NUM_CACHE.
+"""
+
+import os
+import shutil
+import hashlib
+import uuid
+import inspect
+
+import numpy as np
+
+from metriques import enregistrer_acces_cache, enregistrer_taille_cache
+
+
+TAILLE_MAX_DEFAUT = 500 * 1024 * 1024  # 500 Mo
+
+_racine_projet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSSIER_DEFAUT = os.environ.get("TP_ANAL_NUM_CACHE", os.path.join(_racine_projet, ".cache_resultats"))
+
+# Droits demandés à la création des entrées, masqués par l'umask du processus
+# (les figures liées depuis le cache doivent rester lisibles, contrairement au 0600 de mkstemp)
+DROITS_ENTREES = 0o666
+
+
+def empreinte_fichier(chemin):
+    """Empreinte SHA-256 du contenu d'un fichier"""
+    h = hashlib.sha256()
+    with open(chemin, 'rb') as f:
+        for bloc in iter(lambda: f.read(1 << 16), b''):
+            h.update(bloc)
+    return h.hexdigest()
+
+
+def empreinte_objet(objet):
+    """
+    Empreinte stable d'un objet intervenant dans la définition d'un calcul
+
+    - fonctions: code source (ou bytecode et constantes si indisponible)
+      et valeurs capturées par fermeture
+    - tableaux numpy: type, forme et octets
+    - autres objets: repr()
+    """
+    if isinstance(objet, np.ndarray):
+        return f"ndarray:{objet.dtype}:{objet.shape}:" + hashlib.sha256(np.ascontiguousarray(objet).tobytes()).hexdigest()
+
+    if callable(objet) and hasattr(objet, '__code__'):
+        try:
+            definition = inspect.getsource(objet)
+        except (OSError, TypeError):
+            code = objet.__code__
+            definition = code.co_code.hex() + repr(code.co_consts) + repr(code.co_names)
+        cellules = objet.__closure__ or ()
+        capture = [empreinte_objet(c.cell_contents) for c in cellules if _cellule_remplie(c)]
+        return f"fonction:{objet.__qualname__}:{definition}:{capture}"
+
+    return repr(objet)
+
+
+def _cellule_remplie(cellule):
+    try:
+        cellule.cell_contents
+    except ValueError:
+        return False
+    return True
+
+
+def cle_cache(*composants):
+    """Clé SHA-256 (hexadécimale) d'une liste de composants"""
+    h = hashlib.sha256()
+    for composant in composants:
+        h.update(empreinte_objet(composant).encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()
+
+
+class CacheResultats:
+    """
+    Cache disque borné des résultats de résolution et des figures
+
+    Utilisation:
+        cache = CacheResultats()
+        cle = cle_cache(empreinte_solveur, solution, source, u0, u1, N)
+        resultat = cache.charger_resultat(cle)
+        if resultat is None:
+            ...
+            cache.stocker_resultat(cle, u=u, x=x, erreur=erreur)
+    """
+
+    def __init__(self, dossier=None, taille_max=TAILLE_MAX_DEFAUT):
+        self.dossier = dossier or DOSSIER_DEFAUT
+        self.taille_max = taille_max
+        os.makedirs(self.dossier, exist_ok=True)
+        self.succes = 0
+        self.echecs = 0
+        self._taille = self._taille_disque()
+
+    # ------------------------------------------------------------------
+    # Chemins et maintenance
+    # ------------------------------------------------------------------
+
+    def _chemin(self, cle, extension):
+        return os.path.join(self.dossier, cle[:2], cle + extension)
+
+    def _entrees(self):
+        """(chemin, taille, date de dernier accès) de toutes les entrées"""
+        entrees = []
+        for sous_dossier in os.scandir(self.dossier):
+            if not sous_dossier.is_dir():
+                continue
+            for entree in os.scandir(sous_dossier.path):
+                if entree.is_file() and not entree.name.startswith('.'):
+                    stat = entree.stat()
+                    entrees.append((entree.path, stat.st_size, stat.st_mtime))
+        return entrees
+
+    def _taille_disque(self):
+        return sum(taille for _, taille, _ in self._entrees())
+
+    def _toucher(self, chemin):
+        """Marque une entrée comme récemment utilisée"""
+        try:
+            os.utime(chemin)
+        except OSError:
+            pass
+
+    def _ecrire_atomique(self, chemin, ecrire):
+        """Écrit via un fichier temporaire renommé (lecteurs concurrents jamais exposés à un fichier partiel)"""
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        temporaire = os.path.join(os.path.dirname(chemin), f".tmp{os.getpid()}_{uuid.uuid4().hex}")
+        descripteur = os.open(temporaire, os.O_WRONLY | os.O_CREAT | os.O_EXCL, DROITS_ENTREES)
+        try:
+            with os.fdopen(descripteur, 'wb') as f:
+                ecrire(f)
+            # Une entrée remplacée ne compte qu'une fois dans la taille du cache
+            try:
+                ancienne_taille = os.path.getsize(chemin)
+            except FileNotFoundError:
+                ancienne_taille = 0
+            os.replace(temporaire, chemin)
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            raise
+        self._taille += os.path.getsize(chemin) - ancienne_taille
+        if self._taille > self.taille_max:
+            self.evincer()
+        enregistrer_taille_cache(self._taille)
+
+    def evincer(self, taille_cible=None):
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à la taille cible
+
+        Retourne:
+            int: Nombre d'entrées supprimées
+        """
+        taille_cible = self.taille_max if taille_cible is None else taille_cible
+        entrees = sorted(self._entrees(), key=lambda e: e[2])
+        total = sum(taille for _, taille, _ in entrees)
+        supprimees = 0
+        for chemin, taille, _ in entrees:
+            if total <= taille_cible:
+                break
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:
+                pass
+            total -= taille
+            supprimees += 1
+        self._taille = total
+        enregistrer_taille_cache(total)
+        return supprimees
+
+    def vider(self):
+        """Supprime toutes les entrées"""
+        shutil.rmtree(self.dossier, ignore_errors=True)
+        os.makedirs(self.dossier, exist_ok=True)
+        self._taille = 0
+        enregistrer_taille_cache(0)
+
+    @property
+    def taille(self):
+        """Taille disque courante (octets)"""
+        return self._taille
+
+    @property
+    def taux_succes(self):
+        """Proportion d'accès servis par le cache"""
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+    # ------------------------------------------------------------------
+    # Résultats numériques
+    # ------------------------------------------------------------------
+
+    def charger_resultat(self, cle):
+        """
+        Recharge un résultat
+
+        Retourne:
+            dict ou None: Tableaux stockés (scalaires rendus en float), None si absent
+        """
+        chemin = self._chemin(cle, '.npz')
+        try:
+            with np.load(chemin, allow_pickle=False) as archive:
+                resultat = {k: (archive[k].item() if archive[k].ndim == 0 else archive[k])
+                            for k in archive.files}
+        except (FileNotFoundError, OSError, ValueError):
+            self.echecs += 1
+            enregistrer_acces_cache("resultat", False, self._taille)
+            return None
+        self._toucher(chemin)
+        self.succes += 1
+        enregistrer_acces_cache("resultat", True, self._taille)
+        return resultat
+
+    def stocker_resultat(self, cle, **tableaux):
+        """Stocke un résultat (tableaux numpy ou scalaires)"""
+        self._ecrire_atomique(self._chemin(cle, '.npz'),
+                              lambda f: np.savez(f, **{k: np.asarray(v) for k, v in tableaux.items()}))
+
+    # ------------------------------------------------------------------
+    # Figures
+    # ------------------------------------------------------------------
+
+    def recuperer_figure(self, cle, destination):
+        """
+        Place une figure en cache à l'emplacement demandé (lien physique ou copie)
+
+        Retourne:
+            bool: True si la figure était en cache
+        """
+        chemin = self._chemin(cle, '.png')
+        if not os.path.exists(chemin):
+            self.echecs += 1
+            enregistrer_acces_cache("figure", False, self._taille)
+            return False
+        if os.path.exists(destination):
+            os.remove(destination)
+        try:
+            os.link(chemin, destination)
+        except OSError:
+            shutil.copyfile(chemin, destination)
+        self._toucher(chemin)
+        self.succes += 1
+        enregistrer_acces_cache("figure", True, self._taille)
+        return True
+
+    def stocker_figure(self, cle, fichier):
+        """Copie une figure rendue dans le cache"""
+        def ecrire(f):
+            with open(fichier, 'rb') as source:
+                shutil.copyfileobj(source, f)
+        self._ecrire_atomique(self._chemin(cle, '.png'), ecrire)
+
+    def tracer(self, rendu, cle, fonction, donnees, fichier):
+        """
+        Produit une figure via une file de rendu en passant par le cache
+
+        La clé de la figure combine la clé du résultat tracé et la fonction de
+        tracé (son code fixe les paramètres du graphique). En cas de succès la
+        figure est recopiée sans rendu; sinon elle est soumise à la file de
+        rendu et mise en cache une fois écrite. En modes "lazy" et "aucune",
+        le cache n'intervient pas.
+        """
+        if rendu.mode not in ("sync", "async"):
+            return rendu.soumettre(fonction, donnees, fichier)
+
+        cle_figure = cle_cache(cle, fonction)
+        if self.recuperer_figure(cle_figure, fichier):
+            return fichier
+        return rendu.soumettre(fonction, donnees, fichier,
+                               apres=lambda image: self.stocker_figure(cle_figure, image))
@@ -0,0 +1,434 @@
+"""
+CACHE PERSISTANT DES SOLUTIONS PAR EMPREINTE DU PROBLÈME
+========================================================
+
+Les mêmes problèmes (terme source, N, U0, U1, schéma, backend) sont résolus
+d'un run à l'autre: analyses, lancer_analyses, service de résolution.
+Ce cache conserve leurs solutions sur disque, partagé entre processus:
+
+    with CacheSolutions("/tmp/tp_solutions", quota=2 * 1024**3) as cache:
+        activer_cache_solutions(cache)
+        U, x = resoudre_equation_diff(f, 100_000, 0, 0, backend="bande")   # résolu et stocké
+        U, x = resoudre_equation_diff(f, 100_000, 0, 0, backend="bande")   # relu (memmap)
+        desactiver_cache_solutions()
+
+Empreinte (empreinte_probleme): BLAKE2b du schéma, du backend, de N, U0,
+U1, de la version du solveur (version_solveur: fichier du noyau et
+solveurs_lineaires; modifier l'un ou l'autre invalide les solutions) et:
+- par défaut, des valeurs du terme source aux points où le solveur
+  l'évalue (nœuds intérieurs DF, centres VF): la solution discrète ne
+  dépend que de ces valeurs, l'empreinte est exacte quelle que soit la
+  façon dont f est écrite (fermeture, variable globale, tableau capturé);
+- ou, si les valeurs ne sont pas disponibles, de l'empreinte du code de f
+  (cache_resultats.empreinte_objet: source, constantes, fermeture).
+
+Stockage: un fichier .npy (2, n) par solution (U puis x), réparti dans 256
+sous-dossiers, écrit dans un temporaire puis renommé; index SQLite (mode
+WAL) des entrées: taille et date du dernier accès. Un succès retourne des
+vues en lecture seule d'un np.memmap: rien n'est copié ni lu avant usage,
+et la vue reste valide si l'entrée est évincée entre-temps (POSIX).
+
+Quota: après chaque ajout, si la taille totale dépasse le quota, les
+entrées les moins récemment utilisées sont supprimées (LRU; dates d'accès
+mises à jour au plus une fois par RESOLUTION_ACCES secondes pour ne pas
+écrire l'index à chaque succès). L'éviction se fait dans une transaction
+exclusive de l'index: plusieurs processus peuvent lire, écrire et évincer
+en même temps; une entrée dont le fichier a disparu est un échec.
+
+Activation (comme les métriques): les solveurs DF et VF sont décorés par
+solution_en_cache; rien n'est fait tant qu'aucun cache n'est actif.
+Seuls les appels sans tracé, suivi, diagnostics ni vérification passent
+par le cache. Points d'entrée: --cache-solutions [DOSSIER] et
+--quota-cache-solutions Mo (main_analysis.py, lancer_analyses.py,
+service_resolution.py).
+
+Emplacement par défaut: <racine du projet>/.cache_solutions, modifiable par
+la variable d'environnement TP_ANAL_NUM_CACHE_SOLUTIONS.
+"""
+
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import hashlib
+import inspect
+import argparse
+import tempfile
+import functools
+import threading
+import contextlib
+
+import numpy as np
+
+from cache_resultats import empreinte_fichier, empreinte_objet
+from metriques import enregistrer_acces_cache
+import solveurs_lineaires
+from interpolation_solutions import SolutionDiscrete
+
+
+QUOTA_DEFAUT = 1024 * 1024 * 1024    # 1 Go
+RESOLUTION_ACCES = 1.0               # secondes: précision des dates d'accès (LRU)
+DELAI_VERROU = 30.0                  # secondes d'attente d'un autre processus sur l'index
+
+_racine_projet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSSIER_DEFAUT = os.environ.get("TP_ANAL_NUM_CACHE_SOLUTIONS", os.path.join(_racine_projet, ".cache_solutions"))
+
+_SCHEMA_INDEX = """
+CREATE TABLE IF NOT EXISTS solutions (
+    cle TEXT PRIMARY KEY,
+    schema TEXT,
+    backend TEXT,
+    N INTEGER,
+    taille INTEGER NOT NULL,
+    cree REAL NOT NULL,
+    dernier_acces REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_acces ON solutions (dernier_acces);
+"""
+
+_cache_actif = None
+
+
+def version_solveur(chemin_noyau):
+    """Empreinte du code qui produit les solutions: fichier du noyau et solveurs linéaires (resoudre_tridiagonal)"""
+    return empreinte_fichier(chemin_noyau)[:32] + empreinte_fichier(solveurs_lineaires.__file__)[:32]
+
+
+def empreinte_probleme(schema, backend, N, U0, U1, valeurs=None, source=None, version=""):
+    """
+    Clé (hexadécimale) d'un problème discret
+
+    Paramètres:
+        valeurs: Terme source aux points du solveur (tableau ou octets float64)
+        source (callable): Terme source, utilisé si valeurs vaut None (empreinte du code)
+        version (str): Version du solveur (version_solveur)
+    """
+    h = hashlib.blake2b(digest_size=20)     # plus rapide que SHA-256 sur les grands tableaux
+    h.update(f"{schema}\x00{backend}\x00{int(N)}\x00{float(U0)!r}\x00{float(U1)!r}\x00{version}\x00".encode())
+    if valeurs is not None:
+        if not isinstance(valeurs, (bytes, bytearray, memoryview)):
+            valeurs = np.ascontiguousarray(valeurs, dtype="<f8")
+        h.update(b"valeurs\x00")
+        h.update(valeurs)
+    else:
+        h.update(b"code\x00" + empreinte_objet(source).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CacheSolutions:
+    """
+    Solutions (U, x) sur disque, index SQLite, éviction LRU sous quota
+
+    Paramètres:
+        dossier (str): Dossier du cache (créé si besoin)
+        quota (int): Taille disque maximale (octets)
+
+    Attributs:
+        succes / echecs (int): Accès de ce processus servis / non servis
+    """
+
+    def __init__(self, dossier=None, quota=QUOTA_DEFAUT):
+        self.dossier = dossier or DOSSIER_DEFAUT
+        self.quota = quota
+        self.succes = 0
+        self.echecs = 0
+        os.makedirs(self.dossier, exist_ok=True)
+        self._verrou = threading.Lock()
+        self._connexion = None
+        self._pid = None
+        with self._index():
+            pass                                # crée l'index
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def _index(self, exclusif=False):
+        """Connexion à l'index (une par processus); exclusif: transaction BEGIN IMMEDIATE (écritures)"""
+        with self._verrou:
+            if self._connexion is None or self._pid != os.getpid():      # pas de connexion héritée d'un fork
+                self._connexion = sqlite3.connect(os.path.join(self.dossier, "index.sqlite"), timeout=DELAI_VERROU,
+                                                  isolation_level=None, check_same_thread=False)
+                self._connexion.execute("PRAGMA journal_mode=WAL")
+                self._connexion.execute("PRAGMA synchronous=NORMAL")
+                self._connexion.executescript(_SCHEMA_INDEX)
+                self._pid = os.getpid()
+            connexion = self._connexion
+            if not exclusif:
+                yield connexion                 # lectures: une requête, pas de transaction explicite
+                return
+            connexion.execute("BEGIN IMMEDIATE")
+            try:
+                yield connexion
+            except BaseException:
+                connexion.execute("ROLLBACK")
+                raise
+            connexion.execute("COMMIT")
+
+    def _chemin(self, cle):
+        return os.path.join(self.dossier, cle[:2], cle + ".npy")
+
+    # ------------------------------------------------------------------
+    # Accès
+    # ------------------------------------------------------------------
+
+    def charger(self, cle):
+        """
+        Solution en cache
+
+        Retourne:
+            tuple ou None: (U, x) vues en lecture seule d'un np.memmap, None si absente
+        """
+        maintenant = time.time()
+        with self._index() as index:
+            ligne = index.execute("SELECT dernier_acces FROM solutions WHERE cle = ?", (cle,)).fetchone()
+        solution = None
+        if ligne is not None:
+            try:
+                solution = np.load(self._chemin(cle), mmap_mode="r")
+            except (FileNotFoundError, ValueError, OSError):
+                with self._index(exclusif=True) as index:             # fichier disparu ou illisible
+                    index.execute("DELETE FROM solutions WHERE cle = ?", (cle,))
+        if solution is None:
+            self.echecs += 1
+            enregistrer_acces_cache("solution", False)
+            return None
+        if maintenant - ligne[0] > RESOLUTION_ACCES:
+            with self._index(exclusif=True) as index:
+                index.execute("UPDATE solutions SET dernier_acces = ? WHERE cle = ?", (maintenant, cle))
+        self.succes += 1
+        enregistrer_acces_cache("solution", True)
+        return solution[0], solution[1]
+
+    def stocker(self, cle, U, x, schema=None, backend=None, N=None):
+        """Stocke la solution (U, x); retourne False si elle dépasse à elle seule le quota"""
+        return self.stocker_plusieurs([(cle, U, x, schema, backend, N)]) == 1
+
+    def stocker_plusieurs(self, entrees):
+        """
+        Stocke des solutions (cle, U, x, schema, backend, N) en une transaction de l'index
+
+        Retourne:
+            int: Nombre de solutions stockées
+        """
+        ecrites = []
+        for cle, U, x, schema, backend, N in entrees:
+            if 16 * len(U) > self.quota:
+                continue
+            chemin = self._chemin(cle)
+            os.makedirs(os.path.dirname(chemin), exist_ok=True)
+            descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), prefix=".tmp", suffix=".npy")
+            try:
+                with os.fdopen(descripteur, "wb") as f:
+                    np.save(f, np.stack([np.asarray(U, dtype=float), np.asarray(x, dtype=float)]))
+                os.replace(temporaire, chemin)
+            except BaseException:
+                if os.path.exists(temporaire):
+                    os.remove(temporaire)
+                raise
+            ecrites.append((cle, schema, backend, N, os.path.getsize(chemin)))
+        if not ecrites:
+            return 0
+        maintenant = time.time()
+        with self._index(exclusif=True) as index:
+            index.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              [(cle, schema, backend, N, taille, maintenant, maintenant)
+                               for cle, schema, backend, N, taille in ecrites])
+            supprimees = self._evincer(index, self.quota)
+        self._supprimer_fichiers(supprimees)
+        return len(ecrites)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _evincer(self, index, taille_cible):
+        """Retire de l'index les entrées les moins récemment utilisées au-delà de taille_cible (clés retirées)"""
+        total = index.execute("SELECT COALESCE(SUM(taille), 0) FROM solutions").fetchone()[0]
+        supprimees = []
+        if total <= taille_cible:
+            return supprimees
+        for cle, taille in index.execute("SELECT cle, taille FROM solutions ORDER BY dernier_acces").fetchall():
+            if total <= taille_cible:
+                break
+            supprimees.append(cle)
+            total -= taille
+        index.executemany("DELETE FROM solutions WHERE cle = ?", [(cle,) for cle in supprimees])
+        return supprimees
+
+    def _supprimer_fichiers(self, cles):
+        for cle in cles:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._chemin(cle))
+
+    def evincer(self, taille_cible=None):
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à la taille cible (défaut: quota)
+
+        Retourne:
+            int: Nombre d'entrées supprimées
+        """
+        with self._index(exclusif=True) as index:
+            supprimees = self._evincer(index, self.quota if taille_cible is None else taille_cible)
+        self._supprimer_fichiers(supprimees)
+        return len(supprimees)
+
+    def vider(self):
+        """Supprime toutes les entrées"""
+        with self._index(exclusif=True) as index:
+            index.execute("DELETE FROM solutions")
+            for entree in os.scandir(self.dossier):
+                if entree.is_dir():
+                    shutil.rmtree(entree.path, ignore_errors=True)
+
+    @property
+    def taille(self):
+        """Taille disque des entrées (octets)"""
+        with self._index() as index:
+            return index.execute("SELECT COALESCE(SUM(taille), 0) FROM solutions").fetchone()[0]
+
+    def __len__(self):
+        with self._index() as index:
+            return index.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    @property
+    def taux_succes(self):
+        """Proportion d'accès de ce processus servis par le cache"""
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+    def fermer(self):
+        with self._verrou:
+            if self._connexion is not None and self._pid == os.getpid():
+                self._connexion.close()
+            self._connexion = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __repr__(self):
+        return f"CacheSolutions({self.dossier!r}, quota={self.quota})"
+
+
+# ----------------------------------------------------------------------
+# Cache actif et solveurs
+# ----------------------------------------------------------------------
+
+def activer_cache_solutions(cache=None):
+    """Fait passer les résolutions des solveurs décorés par le cache; retourne le cache actif"""
+    global _cache_actif
+    _cache_actif = cache if cache is not None else CacheSolutions()
+    return _cache_actif
+
+
+def desactiver_cache_solutions():
+    global _cache_actif
+    _cache_actif = None
+
+
+def cache_actif():
+    """Cache actif, None si désactivé"""
+    return _cache_actif
+
+
+def solution_en_cache(schema, points_source):
+    """
+    Décorateur d'un solveur f(f, N, U0, U1, tracer_graphe, backend, suivi, diagnostics, verification)
+
+    points_source(N) donne les abscisses où le solveur évalue f (empreinte
+    par les valeurs). Sans cache actif, l'appel est direct; un terme
+    source qui ne s'évalue pas sur un tableau contourne le cache.
+    """
+    def decorateur(resoudre):
+        signature = inspect.signature(resoudre)
+        parametres = list(signature.parameters)
+        defauts = {nom: p.default for nom, p in signature.parameters.items() if p.default is not p.empty}
+        version = []
+
+        @functools.wraps(resoudre)
+        def resoudre_en_cache(*args, **kwargs):
+            cache = _cache_actif
+            if cache is None:
+                return resoudre(*args, **kwargs)
+            valeurs = dict(defauts)
+            valeurs.update(zip(parametres, args))
+            valeurs.update(kwargs)
+            if (valeurs["tracer_graphe"] or valeurs["suivi"] is not None or valeurs["diagnostics"]
+                    or valeurs["verification"]):
+                return resoudre(*args, **kwargs)
+            f, N, backend = valeurs["f"], valeurs["N"], valeurs["backend"]
+            try:
+                points = points_source(N)
+                echantillon = np.broadcast_to(f(points), points.shape)
+            except Exception:
+                return resoudre(*args, **kwargs)           # N invalide (erreur du solveur) ou f non vectorisée
+            if not version:
+                version.append(version_solveur(inspect.unwrap(resoudre).__code__.co_filename))
+            cle = empreinte_probleme(schema, backend, N, valeurs["U0"], valeurs["U1"], echantillon,
+                                     version=version[0])
+            solution = cache.charger(cle)
+            if solution is not None:
+                return SolutionDiscrete(*solution)
+            solution = resoudre(*args, **kwargs)
+            cache.stocker(cle, *solution, schema, backend, N)
+            return solution
+        return resoudre_en_cache
+    return decorateur
+
+
+# ----------------------------------------------------------------------
+# Options des points d'entrée
+# ----------------------------------------------------------------------
+
+def ajouter_options_cache_solutions(parser):
+    """Options --cache-solutions et --quota-cache-solutions d'un point d'entrée argparse"""
+    parser.add_argument("--cache-solutions", nargs="?", const=DOSSIER_DEFAUT, default=None, metavar="DOSSIER",
+                        help=f"Réutiliser les solutions déjà calculées, partagées entre runs et processus "
+                             f"(défaut: {DOSSIER_DEFAUT})")
+    parser.add_argument("--quota-cache-solutions", type=int, default=QUOTA_DEFAUT // (1024 * 1024), metavar="Mo",
+                        help="Taille maximale du cache des solutions en Mo (éviction LRU)")
+
+
+@contextlib.contextmanager
+def cache_solutions_depuis_arguments(args):
+    """Cache actif pendant le bloc si --cache-solutions est donné (retourne le cache ou None)"""
+    if getattr(args, "cache_solutions", None) is None:
+        yield None
+        return
+    precedent = _cache_actif
+    cache = activer_cache_solutions(CacheSolutions(args.cache_solutions, args.quota_cache_solutions * 1024 * 1024))
+    try:
+        yield cache
+    finally:
+        if precedent is not None:
+            activer_cache_solutions(precedent)
+        else:
+            desactiver_cache_solutions()
+        cache.fermer()
+
+
+def main(argv=None):
+    """État ou vidage du cache des solutions"""
+    parser = argparse.ArgumentParser(description="Cache persistant des solutions DF/VF")
+    parser.add_argument("action", choices=("etat", "vider", "evincer"))
+    parser.add_argument("--dossier", default=DOSSIER_DEFAUT)
+    parser.add_argument("--quota", type=int, default=QUOTA_DEFAUT // (1024 * 1024), metavar="Mo")
+    args = parser.parse_args(argv)
+
+    with CacheSolutions(args.dossier, args.quota * 1024 * 1024) as cache:
+        if args.action == "vider":
+            cache.vider()
+        elif args.action == "evincer":
+            print(f"🧹 {cache.evincer()} entrée(s) évincée(s)")
+        print(f"🗄️  {cache.dossier}: {len(cache)} solution(s), {cache.taille / 1024**2:.1f} Mo "
+              f"(quota {cache.quota / 1024**2:.0f} Mo)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
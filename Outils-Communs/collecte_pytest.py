@@ -0,0 +1,278 @@
+"""
+COLLECTE STRUCTURÉE DES RÉSULTATS PYTEST
+========================================
+
+Plugin pytest qui enregistre, pendant l'exécution, un flux JSON (une ligne
+par enregistrement, écrite et vidée au fil des tests) au lieu de laisser les
+outils analyser la sortie texte de pytest:
+
+    {"type": "debut", "date", "python", "pid", "racine"}
+    {"type": "collecte", "nodeids": [...]}
+    {"type": "test", "nodeid", "fichier", "classe", "nom", "parametres",
+     "id_parametres", "marqueurs", "issue", "phase_echec", "durees", "duree",
+     "memoire_pic", "phases", "message", "detail", "avertissements"}
+    {"type": "fin", "code_sortie", "duree", "compteurs", "avertissements"}
+
+issue vaut PASSED, FAILED, ERROR (échec en setup/teardown ou à la collecte),
+SKIPPED, XFAIL ou XPASS. durees donne setup/call/teardown en secondes,
+memoire_pic l'allocation maximale (octets, tracemalloc) pendant l'appel du
+test au-delà de la mémoire déjà allouée. Avec --flux-phases, phases donne
+par phase des solveurs appelés pendant le test (source, assemblage,
+factorisation, resolution, erreur, trace) la durée, le pic de mémoire tracée
+et le RSS (voir suivi_phases); sinon phases vaut null.
+
+Utilisation (le module doit être importable, ex: PYTHONPATH=Outils-Communs):
+    python -m pytest -p collecte_pytest --flux-resultats flux.jsonl
+    debut, tests, fin = lire_flux("flux.jsonl")
+
+Avec --flux-selection FICHIER, seuls les tests dont le nodeid est listé
+dans FICHIER sont exécutés (répartition des tests entre processus).
+"""
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+
+ISSUES = ("PASSED", "FAILED", "ERROR", "SKIPPED", "XFAIL", "XPASS")
+TAILLE_MAX_PARAMETRE = 80     # repr des paramètres tronquée au-delà
+
+
+def pytest_addoption(parser):
+    groupe = parser.getgroup("collecte", "Flux structuré des résultats")
+    groupe.addoption("--flux-resultats", default=None, metavar="FICHIER",
+                     help="Écrire les résultats des tests en JSON lignes dans FICHIER")
+    groupe.addoption("--flux-sans-memoire", action="store_true",
+                     help="Ne pas mesurer le pic mémoire des tests (tracemalloc)")
+    groupe.addoption("--flux-phases", action="store_true",
+                     help="Mesurer durée et mémoire par phase des solveurs (suivi_phases)")
+    groupe.addoption("--flux-selection", default=None, metavar="FICHIER",
+                     help="N'exécuter que les tests dont le nodeid est listé dans FICHIER (un par ligne)")
+
+
+def pytest_configure(config):
+    chemin = config.getoption("flux_resultats", None)
+    if chemin and not config.pluginmanager.has_plugin("collecte_pytest_flux"):
+        collecteur = CollecteurResultats(chemin, memoire=not config.getoption("flux_sans_memoire"),
+                                         phases=config.getoption("flux_phases"))
+        config.pluginmanager.register(collecteur, "collecte_pytest_flux")
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """Restriction aux tests de --flux-selection (répartition entre processus)"""
+    chemin = config.getoption("flux_selection", None)
+    if not chemin:
+        return
+    with open(chemin, encoding="utf-8") as f:
+        selection = {ligne.strip() for ligne in f if ligne.strip()}
+    retenus = [item for item in items if item.nodeid in selection]
+    config.hook.pytest_deselected(items=[item for item in items if item.nodeid not in selection])
+    items[:] = retenus
+
+
+def _repr_court(valeur):
+    texte = repr(valeur)
+    return texte if len(texte) <= TAILLE_MAX_PARAMETRE else texte[:TAILLE_MAX_PARAMETRE - 3] + "..."
+
+
+def _message_echec(report):
+    """Message court de l'exception (première ligne utile du crash)"""
+    crash = getattr(report.longrepr, "reprcrash", None)
+    if crash is not None:
+        return crash.message
+    return str(report.longrepr).strip().splitlines()[-1] if report.longrepr else None
+
+
+class CollecteurResultats:
+    """
+    Écrit le flux des résultats (instancié par pytest_configure)
+
+    Paramètres:
+        chemin (str): Fichier JSON lignes à créer
+        memoire (bool): Mesurer le pic mémoire de chaque test
+        phases (bool): Mesurer les phases des solveurs (suivi global de suivi_phases)
+    """
+
+    def __init__(self, chemin, memoire=True, phases=False):
+        self.chemin = chemin
+        self.memoire = memoire
+        self.phases = phases
+        self._suivi = None
+        self._fichier = None
+        self._debut = None
+        self._infos = {}
+        self._en_cours = {}
+        self._avertissements = {}
+        self._compteurs = {issue: 0 for issue in ISSUES}
+
+    def _ecrire(self, enregistrement):
+        self._fichier.write(json.dumps(enregistrement, ensure_ascii=False) + "\n")
+        self._fichier.flush()
+
+    # ------------------------------------------------------------------
+    # Session
+    # ------------------------------------------------------------------
+
+    def pytest_sessionstart(self, session):
+        dossier = os.path.dirname(os.path.abspath(self.chemin))
+        os.makedirs(dossier, exist_ok=True)
+        self._fichier = open(self.chemin, "w", encoding="utf-8")
+        self._debut = time.perf_counter()
+        if self.memoire and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.phases:
+            from suivi_phases import activer_suivi_global
+            self._suivi = activer_suivi_global()
+        self._ecrire({"type": "debut", "date": datetime.now().isoformat(timespec="seconds"),
+                      "python": sys.version.split()[0], "pid": os.getpid(),
+                      "racine": str(session.config.rootpath)})
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        for item in items:
+            callspec = getattr(item, "callspec", None)
+            self._infos[item.nodeid] = {
+                "fichier": item.location[0],
+                "classe": item.cls.__name__ if getattr(item, "cls", None) else None,
+                "nom": getattr(item, "originalname", item.name),
+                "parametres": {cle: _repr_court(v) for cle, v in callspec.params.items()} if callspec else {},
+                "id_parametres": callspec.id if callspec else None,
+                "marqueurs": sorted({marqueur.name for marqueur in item.iter_markers()}),
+            }
+        self._ecrire({"type": "collecte", "nodeids": [item.nodeid for item in items]})
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self._compteurs["ERROR"] += 1
+            self._ecrire({"type": "test", "nodeid": report.nodeid, "fichier": report.nodeid.split("::")[0],
+                          "classe": None, "nom": report.nodeid, "parametres": {}, "id_parametres": None,
+                          "marqueurs": [], "issue": "ERROR", "phase_echec": "collecte",
+                          "durees": {}, "duree": 0.0, "memoire_pic": None, "phases": None,
+                          "message": _message_echec(report), "detail": report.longreprtext,
+                          "avertissements": 0})
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self._fichier is None:
+            return
+        if self.memoire and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if self._suivi is not None:
+            from suivi_phases import desactiver_suivi_global
+            desactiver_suivi_global()
+            self._suivi = None
+        self._ecrire({"type": "fin", "code_sortie": int(exitstatus),
+                      "duree": time.perf_counter() - self._debut, "compteurs": self._compteurs,
+                      "avertissements": sum(self._avertissements.values())})
+        self._fichier.close()
+        self._fichier = None
+
+    # ------------------------------------------------------------------
+    # Tests
+    # ------------------------------------------------------------------
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        suivi = self._suivi
+        if suivi is not None:
+            suivi.reinitialiser()
+        mesure_memoire = self.memoire and tracemalloc.is_tracing()
+        if mesure_memoire:
+            avant, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        yield
+        etat = self._en_cours.setdefault(item.nodeid, {})
+        if mesure_memoire:
+            _, pic = tracemalloc.get_traced_memory()
+            if suivi is not None:
+                pic = max(pic, suivi.pic_trace_absolu)    # pic réinitialisé par les phases
+            etat["memoire_pic"] = max(0, pic - avant)
+        if suivi is not None and suivi.phases:
+            etat["phases"] = suivi.resume()
+
+    def pytest_warning_recorded(self, warning_message, when, nodeid, location):
+        self._avertissements[nodeid] = self._avertissements.get(nodeid, 0) + 1
+
+    def pytest_runtest_logreport(self, report):
+        etat = self._en_cours.setdefault(report.nodeid, {})
+        etat.setdefault("durees", {})[report.when] = report.duration
+        wasxfail = hasattr(report, "wasxfail")
+
+        if report.when == "setup":
+            if report.failed:
+                etat.update(issue="ERROR", phase_echec="setup", report=report)
+            elif report.skipped:
+                etat.update(issue="SKIPPED", report=report)
+        elif report.when == "call":
+            if report.passed:
+                etat["issue"] = "XPASS" if wasxfail else "PASSED"
+            elif report.skipped:
+                etat.update(issue="XFAIL" if wasxfail else "SKIPPED", report=report)
+            else:
+                etat.update(issue="FAILED", phase_echec="call", report=report)
+        elif report.when == "teardown":
+            if report.failed and etat.get("issue") in (None, "PASSED"):
+                etat.update(issue="ERROR", phase_echec="teardown", report=report)
+            self._terminer(report.nodeid)
+
+    def _terminer(self, nodeid):
+        etat = self._en_cours.pop(nodeid)
+        issue = etat.get("issue", "PASSED")
+        self._compteurs[issue] += 1
+        rapport = etat.get("report")
+        detail = rapport.longreprtext if rapport is not None and issue in ("FAILED", "ERROR", "XFAIL") else None
+        message = _message_echec(rapport) if rapport is not None and rapport.longrepr else None
+        if issue == "XFAIL":
+            message = getattr(rapport, "wasxfail", None) or message
+        infos = self._infos.get(nodeid, {"fichier": nodeid.split("::")[0], "classe": None, "nom": nodeid,
+                                         "parametres": {}, "id_parametres": None, "marqueurs": []})
+        durees = etat.get("durees", {})
+        self._ecrire({
+            "type": "test", "nodeid": nodeid, **infos,
+            "issue": issue, "phase_echec": etat.get("phase_echec"),
+            "durees": durees, "duree": sum(durees.values()),
+            "memoire_pic": etat.get("memoire_pic"),
+            "phases": etat.get("phases"),
+            "message": message, "detail": detail,
+            "avertissements": self._avertissements.get(nodeid, 0),
+        })
+
+
+def nodeids_collectes(chemin):
+    """Nodeids de l'enregistrement de collecte d'un flux (liste vide s'il manque)"""
+    with open(chemin, encoding="utf-8") as f:
+        for ligne in f:
+            try:
+                enregistrement = json.loads(ligne)
+            except json.JSONDecodeError:
+                continue
+            if enregistrement["type"] == "collecte":
+                return enregistrement["nodeids"]
+    return []
+
+
+def lire_flux(chemin):
+    """
+    Relit un flux de résultats (une dernière ligne tronquée par un arrêt brutal est ignorée)
+
+    Retourne:
+        tuple: (debut ou None, liste des enregistrements de test, fin ou None)
+    """
+    debut, tests, fin = None, [], None
+    with open(chemin, encoding="utf-8") as f:
+        for ligne in f:
+            try:
+                enregistrement = json.loads(ligne)
+            except json.JSONDecodeError:
+                continue
+            if enregistrement["type"] == "debut":
+                debut = enregistrement
+            elif enregistrement["type"] == "test":
+                tests.append(enregistrement)
+            elif enregistrement["type"] == "fin":
+                fin = enregistrement
+    return debut, tests, fin
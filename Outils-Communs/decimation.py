@@ -0,0 +1,98 @@
+"""
+DÉCIMATION ADAPTATIVE DES POINTS POUR LES TRACÉS À GRAND N
+==========================================================
+
+Au-delà de quelques milliers de points, un tracé matplotlib n'affiche rien de
+plus: les pixels se superposent, mais le rendu et la taille des PNG croissent
+avec N. Ce module réduit une série à un nombre borné de points par enveloppe
+min/max (dans l'esprit de LTTB):
+
+- l'axe est découpé en paquets de points consécutifs,
+- chaque paquet conserve son minimum et son maximum (l'enveloppe visuelle est
+  donc exacte au pixel près),
+- les extrémités et le pic |y| de chaque série sont toujours conservés
+  (localisation de l'erreur maximale).
+
+Le coût est O(N) vectorisé, et le rendu ne dépend plus de N.
+"""
+
+import numpy as np
+
+
+POINTS_MAX_DEFAUT = 2000   # points conservés par tracé
+SEUIL_MARQUEURS = 200      # au-delà, les marqueurs sont désactivés
+
+_CARACTERES_MARQUEURS = set(".,ov^<>8spP*hH+xXDd|_")
+
+
+def indices_enveloppe(y, n_paquets):
+    """
+    Indices des minima et maxima de y sur n_paquets paquets consécutifs
+
+    Paramètres:
+        y (ndarray): Série à décimer (1D)
+        n_paquets (int): Nombre de paquets
+
+    Retourne:
+        ndarray: Indices (non triés, avec doublons possibles)
+    """
+    n = len(y)
+    taille = -(-n // n_paquets)  # division entière par excès
+    n_paquets = -(-n // taille)
+    complement = n_paquets * taille - n
+
+    # Le dernier paquet est complété par des valeurs neutres pour min et max
+    y = np.asarray(y, dtype=float)
+    bas = np.concatenate([y, np.full(complement, np.inf)]).reshape(n_paquets, taille)
+    haut = np.concatenate([y, np.full(complement, -np.inf)]).reshape(n_paquets, taille)
+
+    debuts = np.arange(n_paquets) * taille
+    return np.concatenate([debuts + np.argmin(bas, axis=1), debuts + np.argmax(haut, axis=1)])
+
+
+def decimer_pour_trace(x, *series, n_max=POINTS_MAX_DEFAUT, indices_obligatoires=()):
+    """
+    Décime des séries partageant la même abscisse
+
+    Les points conservés sont l'union des enveloppes min/max de chaque série,
+    des deux extrémités, du pic |y| de chaque série et des indices obligatoires.
+
+    Paramètres:
+        x (ndarray): Abscisses communes
+        *series (ndarray): Séries y à tracer
+        n_max (int): Nombre maximal de points conservés (approximatif par excès
+            du nombre d'indices obligatoires)
+        indices_obligatoires (iterable): Indices à conserver en plus
+
+    Retourne:
+        tuple: (x_decime, [series_decimees])
+    """
+    x = np.asarray(x)
+    n = len(x)
+    if n <= n_max:
+        return x, [np.asarray(s) for s in series]
+
+    n_paquets = max(1, (n_max - 2 - len(series)) // (2 * max(1, len(series))))
+
+    morceaux = [np.array([0, n - 1]), np.asarray(list(indices_obligatoires), dtype=int)]
+    for s in series:
+        morceaux.append(indices_enveloppe(s, n_paquets))
+        morceaux.append(np.array([np.argmax(np.abs(s))]))
+    indices = np.unique(np.concatenate(morceaux))
+
+    return x[indices], [np.asarray(s)[indices] for s in series]
+
+
+def format_trace(fmt, n_points, seuil=SEUIL_MARQUEURS):
+    """
+    Format matplotlib adapté au nombre de points
+
+    Retire le marqueur d'un format ('bo-' → 'b-') au-delà du seuil. Un format
+    sans style de ligne reçoit '-' pour rester visible.
+    """
+    if n_points <= seuil:
+        return fmt
+    sans_marqueur = ''.join(c for c in fmt if c not in _CARACTERES_MARQUEURS)
+    if not any(c in sans_marqueur for c in '-:'):
+        sans_marqueur += '-'
+    return sans_marqueur
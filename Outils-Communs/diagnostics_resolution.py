@@ -0,0 +1,186 @@
+"""
+DIAGNOSTICS D'UNE RÉSOLUTION
+============================
+
+Relevé léger retourné par les solveurs sur demande (diagnostics=True):
+
+    U, x, diag = resoudre_equation_diff(f, 1000, 0, 0, backend="bande", diagnostics=True)
+    print(diag.residu, diag.conditionnement, diag.phases["resolution"]["cpu"])
+
+ou transmis à une fonction de rappel, le solveur retournant alors (U, x)
+comme d'habitude:
+
+    releves = []
+    U, x = resoudre_equation_diff_vf(f, 1000, 0, 0, diagnostics=releves.append)
+
+Le relevé contient:
+- schema, N, backend;
+- phases: temps mur et temps CPU par phase (source, assemblage,
+  factorisation, resolution), mesurés par un SuiviPhases sans tracemalloc
+  ni échantillonnage RSS (ou par le suivi passé au solveur, dont les
+  mesures sont alors cumulées s'il sert à plusieurs résolutions);
+- residu: ‖A·u - b‖∞ du système résolu, calculé en O(N) sur les trois
+  diagonales, et residu_relatif = residu / (‖A‖∞·‖u‖∞ + ‖b‖∞);
+- conditionnement: estimation de cond₁(A) (algorithme de Hager-Higham,
+  sans inverse dense, voir solveurs_lineaires.estimer_conditionnement);
+- second_membre_non_fini / premier_x_non_fini: nombre de valeurs NaN ou
+  infinies du second membre (terme source ou conditions aux limites) et
+  abscisse de la première;
+- alertes: messages des seuils dépassés (SEUIL_RESIDU_RELATIF,
+  SEUIL_CONDITIONNEMENT) et des valeurs non finies.
+
+Vérification: verification="avertir" (RuntimeWarning) ou "lever"
+(RuntimeError, comme un système singulier) contrôle chaque résolution
+avec le même relevé, sans avoir à demander les diagnostics:
+
+    U, x = resoudre_equation_diff(f, N, 0, 0, backend="bande", verification="lever")
+
+Sans diagnostics ni vérification (défaut), les solveurs ne créent ni
+suivi ni relevé: le seul coût est le test des paramètres.
+"""
+
+import warnings
+
+import numpy as np
+
+from suivi_phases import SuiviPhases
+from solveurs_lineaires import residu_tridiagonal, norme_1_tridiagonale, estimer_conditionnement
+from interpolation_solutions import SolutionDiscrete
+
+
+VERIFICATIONS = ("avertir", "lever")
+SEUIL_RESIDU_RELATIF = 1e-10     # ~1e6 fois l'epsilon machine
+SEUIL_CONDITIONNEMENT = 1e12     # au-delà, moins de 4 chiffres significatifs garantis
+
+
+class DiagnosticResolution:
+    """
+    Relevé d'une résolution (voir le docstring du module)
+
+    Attributs:
+        schema (str): "DF" ou "VF"
+        N (int): Paramètre de discrétisation
+        backend (str): Backend de résolution utilisé
+        phases (dict): {nom: {"appels", "duree", "cpu"}}
+        residu (float): ‖A·u - b‖∞
+        residu_relatif (float): residu / (‖A‖∞·‖u‖∞ + ‖b‖∞)
+        conditionnement (float): Estimation de cond₁(A)
+        second_membre_non_fini (int): Nombre de valeurs non finies du second membre
+        premier_x_non_fini (float): Abscisse de la première (None si aucune)
+        alertes (list): Seuils dépassés et valeurs non finies (vide si tout va bien)
+    """
+
+    __slots__ = ("schema", "N", "backend", "phases", "residu", "residu_relatif", "conditionnement",
+                 "second_membre_non_fini", "premier_x_non_fini", "alertes")
+
+    def __init__(self, schema, N, backend, phases, residu, residu_relatif, conditionnement,
+                 second_membre_non_fini=0, premier_x_non_fini=None, alertes=()):
+        self.schema = schema
+        self.N = N
+        self.backend = backend
+        self.phases = phases
+        self.residu = residu
+        self.residu_relatif = residu_relatif
+        self.conditionnement = conditionnement
+        self.second_membre_non_fini = second_membre_non_fini
+        self.premier_x_non_fini = premier_x_non_fini
+        self.alertes = list(alertes)
+
+    @property
+    def duree(self):
+        """Temps mur total des phases mesurées (secondes)"""
+        return sum(mesure["duree"] for mesure in self.phases.values())
+
+    @property
+    def cpu(self):
+        """Temps CPU total des phases mesurées (secondes)"""
+        return sum(mesure["cpu"] for mesure in self.phases.values())
+
+    @property
+    def valide(self):
+        return not self.alertes
+
+    def en_dict(self):
+        """Version sérialisable en JSON"""
+        return {nom: getattr(self, nom) for nom in self.__slots__}
+
+    def __repr__(self):
+        return (f"DiagnosticResolution({self.schema}, N={self.N}, backend={self.backend!r}, "
+                f"duree={self.duree:.3g}s, cpu={self.cpu:.3g}s, residu={self.residu:.3g}, "
+                f"conditionnement={self.conditionnement:.3g}, alertes={len(self.alertes)})")
+
+
+def verifier_mode(verification):
+    """Lève ValueError si le mode de vérification est inconnu (None: pas de vérification)"""
+    if verification is not None and verification not in VERIFICATIONS:
+        raise ValueError(f"Vérification inconnue: {verification!r} (attendu: None ou {VERIFICATIONS})")
+
+
+def suivi_diagnostics(diagnostics, suivi):
+    """Suivi à utiliser par le solveur: celui fourni, sinon un suivi des temps seuls si diagnostics est demandé"""
+    if not diagnostics or suivi is not None:
+        return suivi
+    return SuiviPhases(memoire=False, rss=False)
+
+
+def diagnostiquer(schema, N, backend, suivi, inferieure, diagonale, superieure, u, b, x,
+                  residu_relatif_max=SEUIL_RESIDU_RELATIF, conditionnement_max=SEUIL_CONDITIONNEMENT):
+    """
+    Relevé d'une résolution du système tridiagonal (inferieure, diagonale, superieure)·u = b
+
+    x donne l'abscisse de chaque inconnue (localisation des valeurs non
+    finies); suivi peut valoir None (phases vides).
+    """
+    alertes = []
+    non_finis = ~np.isfinite(b)
+    nombre_non_finis = int(np.count_nonzero(non_finis))
+    premier_x = float(x[np.argmax(non_finis)]) if nombre_non_finis else None
+    if nombre_non_finis:
+        alertes.append(f"{schema} N={N}: second membre non fini en {nombre_non_finis} point(s), "
+                       f"premier en x={premier_x:.6g} (terme source ou conditions aux limites NaN/inf)")
+
+    with np.errstate(invalid="ignore", over="ignore"):     # inf - inf si u n'est pas fini
+        residu = residu_tridiagonal(inferieure, diagonale, superieure, u, b)
+        norme_A = norme_1_tridiagonale(superieure, diagonale, inferieure)     # ‖A‖∞ = ‖Aᵀ‖₁
+        echelle = norme_A * float(np.max(np.abs(u))) + float(np.max(np.abs(b)))
+        residu_relatif = residu / echelle if echelle > 0 else residu
+    if not nombre_non_finis:
+        if not np.all(np.isfinite(u)):
+            alertes.append(f"{schema} N={N}: solution non finie avec un second membre fini")
+        elif not residu_relatif <= residu_relatif_max:
+            alertes.append(f"{schema} N={N}: résidu relatif {residu_relatif:.3e} > {residu_relatif_max:.1e}")
+
+    conditionnement = estimer_conditionnement(inferieure, diagonale, superieure)
+    if not conditionnement <= conditionnement_max:
+        alertes.append(f"{schema} N={N}: conditionnement estimé {conditionnement:.3e} > {conditionnement_max:.1e}")
+
+    phases = {}
+    if suivi is not None:
+        phases = {nom: {"appels": mesure["appels"], "duree": mesure["duree"], "cpu": mesure["cpu"]}
+                  for nom, mesure in suivi.resume().items()}
+    return DiagnosticResolution(
+        schema=schema, N=N, backend=backend, phases=phases,
+        residu=residu, residu_relatif=residu_relatif, conditionnement=conditionnement,
+        second_membre_non_fini=nombre_non_finis, premier_x_non_fini=premier_x, alertes=alertes,
+    )
+
+
+def verifier(diagnostic, verification):
+    """Applique le mode de vérification aux alertes du relevé (RuntimeError ou RuntimeWarning)"""
+    if not verification or not diagnostic.alertes:
+        return
+    message = "; ".join(diagnostic.alertes)
+    if verification == "lever":
+        raise RuntimeError(f"Vérification de la résolution: {message}")
+    warnings.warn(f"Vérification de la résolution: {message}", RuntimeWarning, stacklevel=3)
+
+
+def retourner(diagnostics, diagnostic, U, x):
+    """
+    SolutionDiscrete (U, x, diagnostic) si diagnostics est vrai, sinon appelle
+    diagnostics(diagnostic) et retourne la SolutionDiscrete (U, x)
+    """
+    if callable(diagnostics):
+        diagnostics(diagnostic)
+        return SolutionDiscrete(U, x)
+    return SolutionDiscrete(U, x, diagnostic)
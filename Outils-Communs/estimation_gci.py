@@ -0,0 +1,207 @@
+"""
+ESTIMATION D'ERREUR SANS SOLUTION EXACTE (GRID CONVERGENCE INDEX)
+=================================================================
+
+Quand aucune solution exacte n'est connue, l'ordre observé et l'erreur de la
+solution la plus fine s'estiment à partir de trois maillages emboîtés
+N, r·N, r²·N (extrapolation de Richardson, indice GCI de Roache):
+
+    ε32 = φ3 - φ2 (grossier - moyen),  ε21 = φ2 - φ1 (moyen - fin)
+    p   = ln(||ε32|| / ||ε21||) / ln r                  ordre observé
+    e1  ≈ ||ε21|| / (r^p - 1)                           erreur du plus fin
+    GCI = Fs · e1,  Fs = 1.25                           bande d'incertitude
+
+Les solutions sont comparées sur les points communs à tous les maillages,
+ceux du plus grossier:
+- "noeuds"   (DF): les nœuds grossiers sont des nœuds fins (un sur r^k);
+- "cellules" (VF): les centres ne coïncident pas, chaque cellule grossière
+  reçoit la moyenne de ses r^k sous-cellules (valeurs moyennes par cellule).
+
+L'estimation est en flux: chaque solution est réduite aux points grossiers dès
+son ajout, seules les trois dernières réductions (taille N0 + 1) sont gardées,
+jamais les champs complets.
+
+Utilisation:
+    estimateur = EstimateurGCI(facteur=2, discretisation="noeuds")
+    for N in [20, 40, 80, 160]:
+        u, x = resoudre(N)
+        estimation = estimateur.ajouter(N, u, x)   # None pour les deux premiers
+    print(estimation.ordre_observe, estimation.erreur_estimee)
+"""
+
+from collections import deque, namedtuple
+
+import numpy as np
+
+from normes_erreur import erreurs_normes, DISCRETISATIONS
+
+
+FACTEUR_SECURITE = 1.25    # Fs recommandé avec trois maillages
+FACTEUR_ARRONDI = 100.0    # différences sous FACTEUR_ARRONDI·ε·échelle: précision machine
+
+
+EstimationGCI = namedtuple(
+    "EstimationGCI",
+    ["N", "ordre_observe", "erreur_estimee", "gci", "ratio_asymptotique",
+     "type_convergence", "x", "solution_extrapolee"],
+)
+EstimationGCI.__doc__ = """
+Estimation obtenue sur les trois derniers maillages
+
+    N (int): Maillage le plus fin
+    ordre_observe (float): Ordre p observé (nan si non mesurable)
+    erreur_estimee (float): Erreur estimée de la solution la plus fine
+    gci (float): Indice de convergence Fs · erreur estimée (absolu)
+    ratio_asymptotique (float): GCI du maillage moyen, tiré de l'estimation
+        précédente (ordre p'), / (r^p · GCI fin) = (r^p - 1) / (r^p' - 1):
+        ≈ 1 si l'ordre observé ne varie plus (domaine asymptotique), nan
+        pour la première estimation
+    type_convergence (str): "monotone", "oscillante", "divergente" ou "arrondi"
+    x (ndarray): Points communs (maillage le plus grossier)
+    solution_extrapolee (ndarray): Extrapolation de Richardson aux points communs
+"""
+
+
+def reduire_aux_points_communs(u, x, facteur_total, discretisation="noeuds"):
+    """
+    Réduit une solution fine aux points du maillage grossier
+
+    Paramètres:
+        u, x (ndarray): Solution et points (bords inclus)
+        facteur_total (int): Rapport des tailles de maillage fin / grossier
+        discretisation (str): "noeuds" ou "cellules"
+
+    Retourne:
+        tuple: (u_reduit, x_reduit)
+    """
+    if discretisation == "noeuds":
+        return u[::facteur_total].copy(), x[::facteur_total].copy()
+
+    # Cellules: [bord, centres..., bord], moyenne des sous-cellules de chaque cellule grossière
+    centres = u[1:-1].reshape(-1, facteur_total).mean(axis=1)
+    x_centres = x[1:-1].reshape(-1, facteur_total).mean(axis=1)
+    return (np.concatenate([u[:1], centres, u[-1:]]),
+            np.concatenate([x[:1], x_centres, x[-1:]]))
+
+
+class EstimateurGCI:
+    """
+    Estimateur d'erreur en flux sur maillages emboîtés N0·r^k
+
+    Paramètres:
+        facteur (int): Rapport de raffinement r entre maillages successifs
+        discretisation (str): "noeuds" (DF) ou "cellules" (VF)
+        norme (str): Norme des différences (voir normes_erreur.NORMES)
+        securite (float): Facteur de sécurité Fs du GCI
+    """
+
+    def __init__(self, facteur=2, discretisation="noeuds", norme="Linf", securite=FACTEUR_SECURITE):
+        if discretisation not in DISCRETISATIONS:
+            raise ValueError(f"Discrétisation inconnue: {discretisation!r} (attendu: {DISCRETISATIONS})")
+        if facteur < 2:
+            raise ValueError(f"Le facteur de raffinement doit être ≥ 2 (reçu {facteur})")
+        self.facteur = int(facteur)
+        self.discretisation = discretisation
+        self.norme = norme
+        self.securite = securite
+        self.N_initial = None
+        self.x_commun = None
+        self.N_values = []
+        self.estimations = []
+        self._reductions = deque(maxlen=3)   # solutions réduites des trois derniers maillages
+
+    def _norme(self, difference):
+        return erreurs_normes(difference, np.zeros_like(difference), self.x_commun,
+                              self.discretisation)[self.norme]
+
+    def ajouter(self, N, u, x):
+        """
+        Ajoute la solution du maillage suivant (N = N0·r^k, dans l'ordre)
+
+        Retourne:
+            EstimationGCI ou None: Estimation sur les trois derniers maillages
+                (None tant que moins de trois maillages ont été ajoutés)
+        """
+        if self.N_initial is None:
+            self.N_initial = int(N)
+        niveau = len(self.N_values)
+        attendu = self.N_initial * self.facteur**niveau
+        if N != attendu:
+            raise ValueError(f"Maillages non emboîtés: N={N} reçu, N={attendu} attendu")
+
+        u_reduit, x_reduit = reduire_aux_points_communs(
+            np.asarray(u, dtype=float), np.asarray(x, dtype=float),
+            self.facteur**niveau, self.discretisation)
+        if self.x_commun is None:
+            self.x_commun = x_reduit
+        self._reductions.append(u_reduit)
+        self.N_values.append(int(N))
+
+        if len(self._reductions) < 3:
+            return None
+        estimation = self._estimer()
+        self.estimations.append(estimation)
+        return estimation
+
+    def _estimer(self):
+        grossier, moyen, fin = self._reductions
+        r = self.facteur
+        epsilon_32 = moyen - grossier
+        epsilon_21 = fin - moyen
+        norme_32 = self._norme(epsilon_32)
+        norme_21 = self._norme(epsilon_21)
+
+        echelle = max(float(np.max(np.abs(fin))), 1.0)
+        if norme_21 <= FACTEUR_ARRONDI * np.finfo(float).eps * echelle:
+            # Solutions identiques à la précision machine: erreur de discrétisation négligeable
+            return EstimationGCI(self.N_values[-1], np.nan, norme_21, self.securite * norme_21,
+                                 np.nan, "arrondi", self.x_commun, fin.copy())
+
+        # Rapport de convergence R = <ε21, ε32> / ||ε32||²: signe et amplitude
+        produit = float(np.dot(epsilon_32, epsilon_32))
+        R = float(np.dot(epsilon_21, epsilon_32)) / produit if produit > 0 else np.inf
+        if R < 0:
+            type_convergence = "oscillante"
+        elif R >= 1:
+            type_convergence = "divergente"
+        else:
+            type_convergence = "monotone"
+
+        ordre = np.log(norme_32 / norme_21) / np.log(r)
+        if not np.isfinite(ordre) or ordre <= 0:
+            return EstimationGCI(self.N_values[-1], ordre, np.nan, np.nan, np.nan,
+                                 type_convergence, self.x_commun, fin.copy())
+
+        attenuation = r**ordre - 1.0
+        erreur_fin = norme_21 / attenuation
+        gci_fin = self.securite * erreur_fin
+        # GCI du maillage moyen avec l'ordre du triplet précédent: avec l'ordre p
+        # de ce triplet, le rapport vaudrait 1 par construction
+        gci_moyen = self.estimations[-1].gci if self.estimations else np.nan
+        extrapolee = fin + epsilon_21 / attenuation
+        return EstimationGCI(self.N_values[-1], float(ordre), float(erreur_fin), float(gci_fin),
+                             float(gci_moyen / (r**ordre * gci_fin)), type_convergence,
+                             self.x_commun, extrapolee)
+
+
+def estimer_convergence_gci(resoudre, N_values, discretisation="noeuds", norme="Linf"):
+    """
+    Étude de convergence sans solution exacte
+
+    Paramètres:
+        resoudre (callable): resoudre(N) -> (u, x)
+        N_values (list): Maillages emboîtés N0·r^k (au moins trois)
+        discretisation (str): "noeuds" (DF) ou "cellules" (VF)
+        norme (str): Norme des différences entre maillages
+
+    Retourne:
+        list: EstimationGCI pour chaque maillage à partir du troisième
+    """
+    if len(N_values) < 3:
+        raise ValueError("Au moins trois maillages emboîtés sont nécessaires")
+    facteur = N_values[1] // N_values[0]
+    estimateur = EstimateurGCI(facteur, discretisation, norme)
+    for N in N_values:
+        u, x = resoudre(N)
+        estimateur.ajouter(N, u, x)
+    return estimateur.estimations
@@ -0,0 +1,188 @@
+"""
+ÉVALUATION VECTORISÉE DES SOLUTIONS DISCRÈTES
+=============================================
+
+Les solveurs DF et VF retournent une SolutionDiscrete: un tuple (U, x),
+qui se déballe comme avant (U, x = resoudre(...)), et qui s'évalue en
+tout point de [x[0], x[-1]]:
+
+    solution = resoudre_equation_diff_vf(f, 100, 0, 0)
+    u = solution(np.linspace(0, 1, 10**6))               # linéaire par morceaux
+    u = solution(capteurs, methode="pchip")              # cubique monotone
+
+Deux reconstructions:
+- "lineaire": interpolation linéaire entre valeurs consécutives;
+- "pchip":    Hermite cubique à pentes de Fritsch-Carlson (comme
+              scipy.interpolate.PchipInterpolator): pas d'oscillation, les
+              extrema restent aux points de la solution.
+
+Localisation de l'intervalle de chaque point:
+- maillage uniforme (nœuds DF): indice calculé en O(1), i = ⌊(p - x0)/h⌋;
+- maillage quelconque (VF: bords puis centres, demi-cellules aux
+  extrémités): recherche dichotomique np.searchsorted.
+
+Chaque intervalle porte les coefficients de son polynôme en t ∈ [0, 1]
+(calculés au premier appel, O(N)); un point coûte une localisation, une
+lecture de ligne et un schéma de Horner. Les points sont traités par
+paquets pour que les temporaires restent en cache.
+
+Hors de [x[0], x[-1]], le résultat vaut `exterieur` (NaN par défaut);
+exterieur=None prolonge le polynôme de l'intervalle extrême.
+"""
+
+import numpy as np
+
+
+METHODES = ("lineaire", "pchip")
+TAILLE_PAQUET = 1 << 16          # points évalués par paquet
+TOLERANCE_UNIFORME = 1e-10       # écart relatif des pas toléré pour l'indexation directe
+
+
+def pentes_pchip(U, x):
+    """
+    Pentes de Fritsch-Carlson aux points (x, U)
+
+    Moyenne harmonique pondérée des pentes voisines, nulle aux extrema
+    locaux; formule à trois points bornée aux extrémités (mêmes pentes que
+    scipy.interpolate.PchipInterpolator).
+
+    Retourne:
+        ndarray: Dérivée estimée en chaque point
+    """
+    h = np.diff(x)
+    delta = np.diff(U) / h
+    if len(U) == 2:
+        return np.array([delta[0], delta[0]])
+    d = np.zeros(len(U))
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    meme_signe = delta[:-1] * delta[1:] > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d[1:-1] = np.where(meme_signe, (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:]), 0.0)
+    d[0] = _pente_extremite(h[0], h[1], delta[0], delta[1])
+    d[-1] = _pente_extremite(h[-1], h[-2], delta[-1], delta[-2])
+    return d
+
+
+def _pente_extremite(h0, h1, delta0, delta1):
+    """Pente à trois points décentrée, ramenée à 0 ou 3·delta0 si elle casse la monotonie"""
+    d = ((2 * h0 + h1) * delta0 - h0 * delta1) / (h0 + h1)
+    if np.sign(d) != np.sign(delta0):
+        return 0.0
+    if np.sign(delta0) != np.sign(delta1) and abs(d) > abs(3 * delta0):
+        return 3 * delta0
+    return d
+
+
+class SolutionDiscrete(tuple):
+    """
+    Solution (U, x) d'un solveur, évaluable en un tableau de points
+
+    Se comporte comme le tuple (U, x) (déballage, indexation, len), ou
+    (U, x, diagnostic) quand le solveur est appelé avec diagnostics=True;
+    les coefficients des reconstructions et la nature du maillage sont
+    calculés au premier appel puis conservés.
+    """
+
+    def __new__(cls, U, x, diagnostic=None):
+        return super().__new__(cls, (U, x) if diagnostic is None else (U, x, diagnostic))
+
+    def __reduce__(self):
+        return SolutionDiscrete, tuple(self)
+
+    @property
+    def U(self):
+        return self[0]
+
+    @property
+    def x(self):
+        return self[1]
+
+    @property
+    def diagnostic(self):
+        """Relevé diagnostics_resolution.DiagnosticResolution, None sans diagnostics=True"""
+        return self[2] if len(self) == 3 else None
+
+    @property
+    def uniforme(self):
+        """Vrai si les abscisses sont équiréparties (localisation en O(1))"""
+        if "_uniforme" not in self.__dict__:
+            x = self.x
+            h = (x[-1] - x[0]) / (len(x) - 1)
+            self._uniforme = bool(h > 0 and np.allclose(np.diff(x), h, rtol=TOLERANCE_UNIFORME, atol=0))
+        return self._uniforme
+
+    def coefficients(self, methode="lineaire"):
+        """
+        Coefficients des polynômes en t ∈ [0, 1] par intervalle
+
+        Retourne:
+            ndarray: (N, 2) pour "lineaire", (N, 4) pour "pchip", degré croissant
+        """
+        if methode not in METHODES:
+            raise ValueError(f"Méthode inconnue: {methode!r} (disponibles: {', '.join(METHODES)})")
+        cache = self.__dict__.setdefault("_coefficients", {})
+        if methode not in cache:
+            U = np.asarray(self.U, dtype=float)
+            x = np.asarray(self.x, dtype=float)
+            if len(U) != len(x) or len(x) < 2:
+                raise ValueError(f"U et x doivent avoir la même longueur (au moins 2): {len(U)} et {len(x)}")
+            saut = np.diff(U)
+            if methode == "lineaire":
+                cache[methode] = np.column_stack([U[:-1], saut])
+            else:
+                hd = pentes_pchip(U, x)
+                hd = hd[:-1] * np.diff(x), hd[1:] * np.diff(x)
+                cache[methode] = np.column_stack([U[:-1], hd[0], 3 * saut - 2 * hd[0] - hd[1],
+                                                  hd[0] + hd[1] - 2 * saut])
+        return cache[methode]
+
+    def __call__(self, points, methode="lineaire", exterieur=np.nan):
+        """Raccourci de evaluer"""
+        return self.evaluer(points, methode, exterieur)
+
+    def evaluer(self, points, methode="lineaire", exterieur=np.nan):
+        """
+        Valeurs de la solution reconstruite aux points donnés
+
+        Paramètres:
+            points (float ou array_like): Abscisses, de forme quelconque
+            methode (str): "lineaire" ou "pchip"
+            exterieur (float ou None): Valeur hors de [x[0], x[-1]]
+                (None: prolongement de l'intervalle extrême)
+
+        Retourne:
+            float ou ndarray: Valeurs, de la forme de points
+        """
+        coefficients = self.coefficients(methode)
+        p = np.asarray(points, dtype=float)
+        valeurs = np.empty(p.size)
+        plat = p.reshape(-1)
+        for debut in range(0, p.size, TAILLE_PAQUET):
+            paquet = slice(debut, debut + TAILLE_PAQUET)
+            self._evaluer(plat[paquet], coefficients, valeurs[paquet])
+        if exterieur is not None:
+            x0, xn = self.x[0], self.x[-1]
+            valeurs[(plat < x0) | (plat > xn)] = exterieur
+        valeurs = valeurs.reshape(p.shape)
+        return valeurs[()] if p.ndim == 0 else valeurs
+
+    def _evaluer(self, p, coefficients, sortie):
+        """Localisation puis Horner sur un paquet de points"""
+        x = self.x
+        dernier = len(coefficients) - 1
+        if self.uniforme:
+            s = (p - x[0]) * ((len(x) - 1) / (x[-1] - x[0]))
+            i = np.fmin(np.fmax(s, 0), dernier).astype(np.intp)   # NaN → 0
+            t = s - i
+        else:
+            if "_inverse_pas" not in self.__dict__:
+                self._inverse_pas = 1.0 / np.diff(np.asarray(x, dtype=float))
+            i = np.clip(np.searchsorted(x, p, side="right") - 1, 0, dernier)
+            t = (p - x[i]) * self._inverse_pas[i]
+        c = coefficients.take(i, axis=0)
+        np.multiply(c[:, -1], t, out=sortie)
+        for k in range(c.shape[1] - 2, 0, -1):
+            sortie += c[:, k]
+            sortie *= t
+        sortie += c[:, 0]
@@ -0,0 +1,312 @@
+"""
+JOURNAL STRUCTURÉ DES PILOTES
+=============================
+
+Les pilotes (main_analysis.py, lancer_analyses.py, test_runner.py,
+test_reporter.py, démonstrations des solveurs) émettent des événements
+au lieu d'écrire directement sur le terminal:
+
+    configurer_journal(fichier="RAPPORTS/journal.jsonl")
+    evenement = emetteur("main_analysis")
+    evenement("debut_cas", "📊 CAS 1: u(x) = sin(πx)", schema="DF", cas="sin", backend="bande")
+    evenement("resultat_cas", schema="DF", cas="sin", N_values=[10, 20], ordre_moyen=2.0)
+    arreter_journal()
+
+Chaque événement est un enregistrement logging (journal "tp_anal_num")
+dont les champs sont sérialisés en une ligne JSON:
+
+    {"ts": "2025-06-20T10:15:00.123+02:00", "niveau": "INFO", "evenement": "debut_cas",
+     "source": "main_analysis", "pid": 4242, "message": "📊 CAS 1: ...", "schema": "DF", ...}
+
+Sorties (configurer_journal):
+- fichier: JSON lignes, tous les niveaux à partir de DEBUG;
+- console="texte" (défaut): rendu lisible, à partir de INFO: le gabarit
+  du type d'événement s'il en a un (enregistrer_gabarit: bandeaux, tableaux
+  construits à partir des champs), sinon le message tel quel, sinon le nom
+  et les champs (clé=valeur);
+- console="json": les lignes JSON sur la sortie standard;
+- console="aucune": rien sur le terminal.
+
+Écriture asynchrone: les pilotes et les processus de calcul ne font
+qu'enfiler l'enregistrement (QueueHandler); un QueueListener (fil du
+processus principal) le formate et l'écrit, si bien qu'un worker ne
+bloque jamais sur le terminal et que les lignes ne s'entrelacent pas.
+Les processus de calcul reçoivent la file par file_journal() et
+s'y branchent avec initialiser_worker_journal(file).
+
+Les sorties directes qui restent (sous-processus pytest, barres de
+progression, résumés des outils) sont précédées de vider_journal() pour
+garder l'ordre chronologique sur le terminal; avec console="json", ce
+sont les seules lignes non JSON de la sortie standard (le fichier de
+--journal ne contient que des événements).
+
+Sans configurer_journal (utilisation comme bibliothèque), les événements
+INFO ne sont pas affichés: seuls les avertissements et erreurs passent par
+le gestionnaire par défaut de logging.
+"""
+
+import os
+import sys
+import json
+import math
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+from datetime import datetime
+
+
+NOM_JOURNAL = "tp_anal_num"
+CONSOLES = ("texte", "json", "aucune")
+
+_ecouteur = None
+_file = None
+
+
+def compatible_json(valeur):
+    """Conversion récursive pour JSON strict (nan/inf → null, types numpy → Python, autres → str)"""
+    if isinstance(valeur, dict):
+        return {str(cle): compatible_json(v) for cle, v in valeur.items()}
+    if isinstance(valeur, (list, tuple, set)):
+        return [compatible_json(v) for v in valeur]
+    if hasattr(valeur, "tolist"):          # tableaux et scalaires numpy
+        return compatible_json(valeur.tolist())
+    if isinstance(valeur, float):
+        return valeur if math.isfinite(valeur) else None
+    if valeur is None or isinstance(valeur, (str, int, bool)):
+        return valeur
+    return str(valeur)
+
+
+class FormateurJSON(logging.Formatter):
+    """Un enregistrement par ligne JSON (champs de l'événement à plat)"""
+
+    def format(self, record):
+        donnees = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "niveau": record.levelname,
+            "evenement": getattr(record, "evenement", None) or "message",
+            "source": record.name.split(".", 1)[1] if "." in record.name else record.name,
+            "pid": record.process,
+            "message": record.getMessage() or None,
+        }
+        donnees.update(compatible_json(getattr(record, "champs", None) or {}))
+        if record.exc_info:
+            donnees["exception"] = self.formatException(record.exc_info)
+        return json.dumps(donnees, ensure_ascii=False, allow_nan=False)
+
+
+# Mise en forme console par type d'événement: fonction(message, champs) → texte affiché.
+# Seul le rendu "texte" l'applique; le fichier et la console json gardent l'événement brut.
+GABARITS = {}
+
+
+def enregistrer_gabarit(nom, gabarit=None):
+    """
+    Enregistre la mise en forme console des événements nom (utilisable en décorateur)
+
+    Paramètres:
+        nom (str): Type d'événement
+        gabarit (callable): gabarit(message, champs) → texte, ex: bandeau,
+            tableau construit à partir des champs
+    """
+    if gabarit is None:
+        return lambda f: enregistrer_gabarit(nom, f) or f
+    GABARITS[nom] = gabarit
+    return None
+
+
+def encadrer(texte, largeur=80, trait="="):
+    """Texte entre deux traits (bandeaux des pilotes)"""
+    return f"{trait * largeur}\n{texte}\n{trait * largeur}"
+
+
+def gabarit_titre(message, champs):
+    """Bandeau d'un titre de pilote, précédé d'une ligne vide"""
+    return "\n" + encadrer(message)
+
+
+def gabarit_section(message, champs):
+    """Bandeau d'une partie (cas, étape), précédé d'une ligne vide"""
+    return "\n" + encadrer(message, 60)
+
+
+for _nom in ("titre", "debut_analyse"):
+    enregistrer_gabarit(_nom, gabarit_titre)
+for _nom in ("section", "debut_cas", "etape"):
+    enregistrer_gabarit(_nom, gabarit_section)
+
+
+class RenduConsole(logging.Formatter):
+    """
+    Rendu lisible: le gabarit de l'événement s'il en a un, sinon le message
+    tel quel, sinon 'evenement clé=valeur ...' préfixé du niveau
+    """
+
+    PREFIXES = {logging.WARNING: "⚠️  ", logging.ERROR: "❌ ", logging.CRITICAL: "❌ "}
+
+    def format(self, record):
+        message = record.getMessage()
+        champs = getattr(record, "champs", None) or {}
+        gabarit = GABARITS.get(getattr(record, "evenement", None))
+        if gabarit is not None:
+            message = gabarit(message, champs)
+        elif not message:
+            message = " ".join([getattr(record, "evenement", "message")]
+                               + [f"{cle}={_court(valeur)}" for cle, valeur in champs.items()])
+            message = self.PREFIXES.get(record.levelno, "• ") + message
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+def _court(valeur, longueur=60):
+    texte = f"{valeur:.4g}" if isinstance(valeur, float) else str(valeur)
+    return texte if len(texte) <= longueur else texte[:longueur - 3] + "..."
+
+
+def obtenir_journal(source=None):
+    """Journal d'un pilote (enfant de NOM_JOURNAL)"""
+    return logging.getLogger(f"{NOM_JOURNAL}.{source}" if source else NOM_JOURNAL)
+
+
+def evenement(nom, message="", niveau=logging.INFO, source=None, **champs):
+    """
+    Émet l'événement nom
+
+    Paramètres:
+        nom (str): Type d'événement (debut_run, fin_job, erreur...)
+        message (str): Texte affiché tel quel par le rendu console (optionnel)
+        niveau (int): Niveau logging (DEBUG: fichier seulement)
+        source (str): Pilote émetteur (défaut: nom du script principal)
+        **champs: Données de l'événement (sérialisables en JSON, noms autres
+            que ceux des paramètres ci-dessus)
+    """
+    journal = obtenir_journal(source or _source_defaut())
+    if journal.isEnabledFor(niveau):
+        # message passé en argument: un '%' du texte n'est pas interprété
+        journal.log(niveau, "%s", message, extra={"evenement": nom, "champs": champs})
+
+
+def emetteur(source):
+    """Fonction evenement liée à la source (un pilote: evenement = emetteur("lancer_analyses"))"""
+    def evenement_source(nom, message="", niveau=logging.INFO, **champs):
+        evenement(nom, message, niveau, source, **champs)
+    return evenement_source
+
+
+def _source_defaut():
+    principal = sys.modules.get("__main__")
+    chemin = getattr(principal, "__file__", None)
+    return os.path.splitext(os.path.basename(chemin))[0] if chemin else "interactif"
+
+
+def configurer_journal(fichier=None, console="texte", niveau_console=logging.INFO, flux_console=None):
+    """
+    Branche le journal sur une file et démarre l'écouteur (remplace une configuration précédente)
+
+    Paramètres:
+        fichier (str): Fichier JSON lignes (ajout), None pour ne pas en écrire
+        console (str): "texte", "json" ou "aucune"
+        niveau_console (int): Niveau minimal affiché sur le terminal
+        flux_console: Flux du terminal (défaut: sys.stdout)
+
+    Retourne:
+        QueueListener: L'écouteur démarré
+    """
+    global _ecouteur, _file
+    if console not in CONSOLES:
+        raise ValueError(f"Console inconnue: {console!r} (attendu: {CONSOLES})")
+    arreter_journal()
+
+    sorties = []
+    if fichier:
+        dossier = os.path.dirname(os.path.abspath(fichier))
+        os.makedirs(dossier, exist_ok=True)
+        sortie_fichier = logging.FileHandler(fichier, encoding="utf-8")
+        sortie_fichier.setFormatter(FormateurJSON())
+        sortie_fichier.setLevel(logging.DEBUG)
+        sorties.append(sortie_fichier)
+    if console != "aucune":
+        sortie_console = logging.StreamHandler(flux_console or sys.stdout)
+        sortie_console.setFormatter(RenduConsole() if console == "texte" else FormateurJSON())
+        sortie_console.setLevel(niveau_console)
+        sorties.append(sortie_console)
+
+    # File multiprocessus: les workers "spawn" peuvent s'y brancher
+    _file = multiprocessing.get_context("spawn").Queue()
+    _ecouteur = logging.handlers.QueueListener(_file, *sorties, respect_handler_level=True)
+    # Événements sans sortie filtrés avant la file (DEBUG seulement s'il y a un fichier)
+    if not sorties:
+        niveau = logging.CRITICAL + 1
+    else:
+        niveau = logging.DEBUG if fichier else niveau_console
+    _brancher(_file, niveau)
+    _ecouteur.start()
+    # Enregistré après la création de la file: à la sortie, la file est
+    # vidée avant la finalisation de multiprocessing (ordre inverse d'atexit)
+    atexit.unregister(arreter_journal)
+    atexit.register(arreter_journal)
+    return _ecouteur
+
+
+def _brancher(file, niveau):
+    journal = obtenir_journal()
+    for gestionnaire in list(journal.handlers):
+        journal.removeHandler(gestionnaire)
+    journal.addHandler(logging.handlers.QueueHandler(file))
+    journal.setLevel(niveau)
+    journal.propagate = False
+
+
+def file_journal():
+    """File de l'écouteur à transmettre aux processus de calcul (None si pas de journal configuré)"""
+    return _file
+
+
+def initialiser_worker_journal(file):
+    """Dans un processus de calcul: envoie les événements à la file du processus principal"""
+    if file is not None:
+        _brancher(file, logging.DEBUG)
+
+
+def vider_journal():
+    """Attend l'écriture des événements en file (avant une sortie directe sur le terminal, ex: sous-processus)"""
+    if _ecouteur is None:
+        return
+    _ecouteur.stop()
+    for gestionnaire in _ecouteur.handlers:
+        gestionnaire.flush()
+    _ecouteur.start()
+
+
+def arreter_journal():
+    """Vide la file, arrête l'écouteur et ferme les sorties"""
+    global _ecouteur, _file
+    if _ecouteur is None:
+        return
+    _ecouteur.stop()
+    for gestionnaire in _ecouteur.handlers:
+        gestionnaire.close()
+    journal = obtenir_journal()
+    for gestionnaire in list(journal.handlers):
+        journal.removeHandler(gestionnaire)
+    journal.propagate = True
+    journal.setLevel(logging.NOTSET)
+    _file.close()
+    _file.join_thread()
+    _ecouteur = _file = None
+
+
+def ajouter_options_journal(parser):
+    """Options --journal et --console d'un point d'entrée argparse"""
+    parser.add_argument("--journal", default=None, metavar="FICHIER.jsonl",
+                        help="Écrire les événements du run en JSON lignes dans FICHIER")
+    parser.add_argument("--console", choices=CONSOLES, default="texte",
+                        help="Rendu du terminal: texte (lisible), json (événements JSON) ou aucune")
+
+
+def configurer_depuis_arguments(args):
+    """configurer_journal selon --journal / --console"""
+    return configurer_journal(fichier=args.journal, console=args.console)
+
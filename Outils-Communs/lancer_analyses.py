@@ -0,0 +1,383 @@
+"""
+POINT D'ENTRÉE UNIFIÉ DES ANALYSES DE CONVERGENCE DF / VF
+=========================================================
+
+Une configuration (TOML ou JSON) décrit la matrice schémas × cas × maillages
+× backends. Chaque (schéma, cas, backend, N) est un job indépendant: résolution
+et erreurs dans toutes les normes. Les jobs sont répartis sur un pool local de
+processus (les plus grands N d'abord, pour équilibrer la charge), avec une
+barre de progression. Les ordres de convergence sont estimés par série
+(schéma, cas, backend), et tout est écrit dans un seul fichier JSON.
+
+Exemple de configuration (config_analyses.toml):
+
+    [analyse]
+    schemas = ["DF", "VF"]
+    cas = ["sin", "cube", "quadratique"]
+    backends = ["dense", "bande"]
+
+    [maillages]
+    N = [10, 20, 40, 80, 160, 320]     # ou: N_initial = 10, facteur = 2, niveaux = 6
+
+    [execution]
+    workers = 4                          # défaut: nombre de CPU
+    sortie = "RESULTATS/analyse.json"    # défaut: RESULTATS/analyse_<date>.json
+
+Utilisation:
+    python lancer_analyses.py config_analyses.toml --workers 8
+    python lancer_analyses.py config_analyses.toml --stocker   # ajout au stockage des runs
+    python lancer_analyses.py config_analyses.toml --profil    # profil du calcul (voir profilage)
+    python lancer_analyses.py config_analyses.toml --journal RESULTATS/journal.jsonl --console json
+    python lancer_analyses.py config_analyses.toml --metriques RESULTATS/tp.prom --port-metriques 9464
+    python lancer_analyses.py config_analyses.toml --cache-solutions   # solutions réutilisées (cache_solutions)
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import importlib
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+from normes_erreur import erreurs_normes, NORMES
+from ordre_convergence import estimer_ordre_convergence, pentes_successives
+from solveurs_lineaires import BACKENDS
+from registre_cas import REGISTRE, obtenir_cas
+from stockage_runs import StockageRuns, lignes_depuis_resultats, environnement
+from profilage import ajouter_options_profilage, profiler_depuis_arguments
+from processus_calcul import SCHEMAS, chemins_import, initialiser_worker, Progression
+from journal import (
+    emetteur, ajouter_options_journal, configurer_depuis_arguments, arreter_journal,
+    file_journal, compatible_json
+)
+from metriques import ajouter_options_metriques, exporter_depuis_arguments, registre_actif
+from cache_solutions import ajouter_options_cache_solutions, cache_solutions_depuis_arguments, cache_actif
+
+
+_racine_projet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+Job = namedtuple("Job", ["schema", "cas", "backend", "N"])
+
+evenement = emetteur("lancer_analyses")
+
+
+# ----------------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------------
+
+def lire_fichier_configuration(chemin):
+    """Lit une configuration TOML (.toml) ou JSON (autres extensions)"""
+    if chemin.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError("Lecture TOML: Python ≥ 3.11 ou le paquet tomli requis (ou utiliser JSON)")
+        with open(chemin, "rb") as f:
+            return tomllib.load(f)
+    with open(chemin, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def valider_configuration(brute):
+    """
+    Normalise et valide une configuration
+
+    Retourne:
+        dict: schemas, cas, backends, N_values, workers, sortie
+
+    Raises:
+        ValueError: Configuration incomplète ou incohérente
+    """
+    analyse = brute.get("analyse", {})
+    maillages = brute.get("maillages", {})
+    execution = brute.get("execution", {})
+
+    schemas = list(analyse.get("schemas", SCHEMAS))
+    inconnus = [s for s in schemas if s not in SCHEMAS]
+    if inconnus:
+        raise ValueError(f"Schémas inconnus: {inconnus} (disponibles: {list(SCHEMAS)})")
+
+    cas = list(analyse.get("cas", []))
+    if not cas:
+        raise ValueError("Aucun cas dans [analyse] cas")
+    absents = [c for c in cas if c not in REGISTRE]
+    if absents:
+        raise ValueError(f"Cas inconnus: {absents} (disponibles: {REGISTRE.noms()})")
+
+    backends = list(analyse.get("backends", ["dense"]))
+    inconnus = [b for b in backends if b not in BACKENDS]
+    if inconnus:
+        raise ValueError(f"Backends inconnus: {inconnus} (disponibles: {list(BACKENDS)})")
+
+    if "N" in maillages:
+        N_values = [int(N) for N in maillages["N"]]
+    else:
+        N_initial = int(maillages.get("N_initial", 10))
+        facteur = int(maillages.get("facteur", 2))
+        niveaux = int(maillages.get("niveaux", 6))
+        N_values = [N_initial * facteur**k for k in range(niveaux)]
+    if not N_values or min(N_values) < 2:
+        raise ValueError(f"Maillages invalides: {N_values} (N ≥ 2 requis)")
+
+    return {
+        "schemas": schemas,
+        "cas": cas,
+        "backends": backends,
+        "N_values": sorted(set(N_values)),
+        "workers": execution.get("workers"),
+        "sortie": execution.get("sortie"),
+    }
+
+
+def matrice_jobs(config):
+    """Produit cartésien schémas × cas × backends × maillages"""
+    return [Job(schema, cas, backend, N)
+            for schema in config["schemas"]
+            for cas in config["cas"]
+            for backend in config["backends"]
+            for N in config["N_values"]]
+
+
+# ----------------------------------------------------------------------
+# Exécution
+# ----------------------------------------------------------------------
+
+def executer_job(job):
+    """
+    Résout un job et mesure ses erreurs
+
+    Retourne:
+        dict: Ligne de résultat (erreurs par norme, durée; 'echec' renseigné
+            si la résolution a levé une exception)
+    """
+    description = SCHEMAS[job.schema]
+    module = importlib.import_module(description["module"])
+    cas = obtenir_cas(job.cas)
+    ligne = {"schema": job.schema, "cas": job.cas, "nom_cas": cas.description, "backend": job.backend,
+             "N": job.N, "h": 1.0 / job.N, "echec": None}
+
+    evenement("debut_job", niveau=logging.DEBUG, **job._asdict())
+    debut = time.perf_counter()
+    try:
+        u, x = getattr(module, description["resoudre"])(cas.terme_source, job.N, cas.u0, cas.u1,
+                                                       backend=job.backend)
+    except Exception as exc:
+        ligne.update({"duree": time.perf_counter() - debut, "echec": f"{type(exc).__name__}: {exc}"})
+        ligne.update({f"erreur_{norme}": np.nan for norme in NORMES})
+        evenement("fin_job", niveau=logging.DEBUG, **job._asdict(), duree=ligne["duree"], echec=ligne["echec"])
+        return ligne
+    ligne["duree"] = time.perf_counter() - debut
+
+    normes = erreurs_normes(u, cas.solution_exacte, x, description["discretisation"])
+    ligne.update({f"erreur_{norme}": valeur for norme, valeur in normes.items()})
+    evenement("fin_job", niveau=logging.DEBUG, **job._asdict(), duree=ligne["duree"], echec=None,
+              erreur_Linf=normes["Linf"])
+    return ligne
+
+
+def _executer_job_worker(job):
+    """executer_job dans un worker: (ligne, métriques du job à fusionner, None si désactivées)"""
+    ligne = executer_job(job)
+    registre = registre_actif()
+    return ligne, registre.instantane(reinitialiser=True) if registre is not None else None
+
+
+def executer_matrice(jobs, workers=None, progression=True):
+    """
+    Exécute les jobs, en parallèle si workers ≠ 1
+
+    Retourne:
+        list: Lignes de résultat, dans l'ordre des jobs
+    """
+    barre = Progression(len(jobs), progression)
+    lignes = [None] * len(jobs)
+
+    if workers == 1 or len(jobs) <= 1:
+        initialiser_worker(chemins_import())
+        for i, job in enumerate(jobs):
+            lignes[i] = executer_job(job)
+            barre.avancer(f"{job.schema} {job.cas} N={job.N}")
+        return lignes
+
+    # Les plus coûteux d'abord: la fin du calcul n'attend pas un gros job isolé
+    ordre = sorted(range(len(jobs)), key=lambda i: jobs[i].N, reverse=True)
+    cache = cache_actif()
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=initialiser_worker,
+                             initargs=(chemins_import(), file_journal(), registre_actif() is not None,
+                                       (cache.dossier, cache.quota) if cache is not None else None)) as executor:
+        futurs = {executor.submit(_executer_job_worker, jobs[i]): i for i in ordre}
+        for futur in as_completed(futurs):
+            i = futurs[futur]
+            lignes[i], metriques = futur.result()
+            if metriques is not None:
+                registre_actif().fusionner(metriques)
+            barre.avancer(f"{jobs[i].schema} {jobs[i].cas} N={jobs[i].N}")
+    return lignes
+
+
+def resumer_series(lignes):
+    """
+    Estimation de l'ordre par série (schéma, cas, backend) et par norme
+
+    Retourne:
+        list: dicts schema, cas, nom_cas, backend, N_values, ordres {norme: {ordre,
+            intervalle, debut_plateau}}, duree_totale
+    """
+    series = {}
+    for ligne in lignes:
+        series.setdefault((ligne["schema"], ligne["cas"], ligne["backend"]), []).append(ligne)
+
+    resumes = []
+    for (schema, cas, backend), lignes_serie in series.items():
+        lignes_serie = sorted((l for l in lignes_serie if l["echec"] is None), key=lambda l: l["N"])
+        N_values = [l["N"] for l in lignes_serie]
+        ordres = {}
+        for norme in NORMES:
+            estimation = estimer_ordre_convergence(N_values, [l[f"erreur_{norme}"] for l in lignes_serie])
+            ordres[norme] = {"ordre": estimation.ordre, "intervalle": list(estimation.intervalle),
+                             "debut_plateau": estimation.debut_plateau}
+        resumes.append({
+            "schema": schema, "cas": cas, "backend": backend,
+            "nom_cas": lignes_serie[0]["nom_cas"] if lignes_serie else cas,
+            "N_values": N_values, "ordres": ordres,
+            "duree_totale": float(sum(l["duree"] for l in lignes_serie)),
+        })
+    return resumes
+
+
+def ecrire_sortie(fichier, config, lignes, series, duree):
+    """Écrit le document JSON unique d'une analyse"""
+    document = {
+        "version": 1,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "duree": duree,
+        "environnement": environnement(),
+        "configuration": config,
+        "resultats": lignes,
+        "series": series,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(fichier)), exist_ok=True)
+    with open(fichier, "w", encoding="utf-8") as f:
+        json.dump(compatible_json(document), f, ensure_ascii=False, indent=1, allow_nan=False)
+    return fichier
+
+
+def stocker_runs(lignes, series, dossier=None):
+    """Ajoute les résultats au stockage colonnaire (un run par schéma et backend)"""
+    stockage = StockageRuns(dossier)
+    runs = []
+    groupes = {}
+    for serie in series:
+        groupes.setdefault((serie["schema"], serie["backend"]), []).append(serie)
+    for (schema, backend), series_groupe in groupes.items():
+        tous_resultats = []
+        for serie in series_groupe:
+            lignes_serie = sorted((l for l in lignes if l["schema"] == schema and l["cas"] == serie["cas"]
+                                   and l["backend"] == backend and l["echec"] is None), key=lambda l: l["N"])
+            erreurs = [l["erreur_Linf"] for l in lignes_serie]
+            N_values = [l["N"] for l in lignes_serie]
+            tous_resultats.append({
+                "nom": serie["nom_cas"], "N_values": N_values, "erreurs": erreurs,
+                "ordres": list(pentes_successives(N_values, erreurs)),
+                "ordre_moyen": serie["ordres"]["Linf"]["ordre"],
+                "durees": [l["duree"] for l in lignes_serie],
+                **{f"erreurs_{n}": [l[f"erreur_{n}"] for l in lignes_serie] for n in NORMES if n != "Linf"},
+            })
+        runs.append(stockage.ajouter_run(schema, lignes_depuis_resultats(tous_resultats),
+                                         run=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{schema}_{backend}",
+                                         meta={"backend": backend}))
+    return runs
+
+
+def main(argv=None):
+    """Analyse de convergence pilotée par un fichier de configuration"""
+    parser = argparse.ArgumentParser(description="Analyses de convergence DF/VF pilotées par configuration")
+    parser.add_argument("configuration", help="Fichier de configuration (.toml ou .json)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processus de calcul (défaut: configuration, sinon nombre de CPU)")
+    parser.add_argument("--sortie", default=None, help="Fichier JSON de sortie")
+    parser.add_argument("--stocker", action="store_true",
+                        help="Ajouter aussi les résultats au stockage colonnaire des runs")
+    parser.add_argument("--sans-progression", action="store_true", help="Pas de barre de progression")
+    ajouter_options_profilage(parser)
+    ajouter_options_journal(parser)
+    ajouter_options_metriques(parser)
+    ajouter_options_cache_solutions(parser)
+    args = parser.parse_args(argv)
+
+    configurer_depuis_arguments(args)
+    try:
+        return executer(args)
+    finally:
+        arreter_journal()
+
+
+def executer(args):
+    """Corps de main: analyse pour les options args, retourne le code de sortie"""
+    try:
+        config = valider_configuration(lire_fichier_configuration(args.configuration))
+    except (ValueError, ImportError, OSError) as exc:
+        evenement("configuration_invalide", f"❌ Configuration invalide: {exc}", logging.ERROR,
+                  configuration=args.configuration, erreur=str(exc))
+        return 2
+
+    workers = args.workers or config["workers"]
+    if args.profil and workers != 1:
+        evenement("profilage", "🔥 Profilage: jobs exécutés dans ce processus (--workers 1)", workers=1)
+        workers = 1
+    sortie = args.sortie or config["sortie"] or os.path.join(
+        _racine_projet, "RESULTATS", f"analyse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    jobs = matrice_jobs(config)
+    evenement("debut_matrice",
+              f"🧮 {len(jobs)} jobs: {len(config['schemas'])} schéma(s) × {len(config['cas'])} cas × "
+              f"{len(config['backends'])} backend(s) × {len(config['N_values'])} maillages",
+              jobs=len(jobs), schemas=config["schemas"], cas=config["cas"], backends=config["backends"],
+              N_values=config["N_values"], workers=workers)
+
+    debut = time.perf_counter()
+    with exporter_depuis_arguments(args), cache_solutions_depuis_arguments(args), \
+            profiler_depuis_arguments(args, "lancer_analyses"):
+        lignes = executer_matrice(jobs, workers, progression=not args.sans_progression)
+    duree = time.perf_counter() - debut
+    series = resumer_series(lignes)
+
+    evenement("entete_series", f"\n{'Schéma':<7} {'Cas':<14} {'Backend':<8} {'Ordre L∞':>9} {'Ordre L2':>9} "
+              f"{'Durée':>9}\n" + "-" * 60)
+    for serie in series:
+        evenement("serie",
+                  f"{serie['schema']:<7} {serie['cas']:<14} {serie['backend']:<8} "
+                  f"{serie['ordres']['Linf']['ordre']:>9.4f} {serie['ordres']['L2']['ordre']:>9.4f} "
+                  f"{serie['duree_totale']:>8.3f}s",
+                  schema=serie["schema"], cas=serie["cas"], backend=serie["backend"], N_values=serie["N_values"],
+                  ordres={norme: valeurs["ordre"] for norme, valeurs in serie["ordres"].items()},
+                  duree=serie["duree_totale"])
+    echecs = [l for l in lignes if l["echec"]]
+    for ligne in echecs:
+        evenement("echec_job", f"⚠️  {ligne['schema']} {ligne['cas']} {ligne['backend']} N={ligne['N']}: "
+                  f"{ligne['echec']}", logging.WARNING, schema=ligne["schema"], cas=ligne["cas"],
+                  backend=ligne["backend"], N=ligne["N"], echec=ligne["echec"])
+
+    ecrire_sortie(sortie, config, lignes, series, duree)
+    evenement("fin_matrice", f"\n📄 Résultats: {sortie} ({duree:.1f}s)", sortie=sortie, duree=duree,
+              echecs=len(echecs))
+    if args.stocker:
+        for run in stocker_runs(lignes, series):
+            evenement("run_stocke", f"🗃️  Run stocké: {run}", run=run)
+    return 1 if echecs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
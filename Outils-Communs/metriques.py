@@ -0,0 +1,520 @@
+"""
+MÉTRIQUES D'EXPLOITATION DES SOLVEURS
+=====================================
+
+Registre en mémoire de métriques au format texte de Prometheus, pour suivre
+un service de calcul qui enchaîne les résolutions:
+
+- tp_resolutions_total{schema, backend}: résolutions terminées;
+- tp_resolutions_echouees_total{schema, backend}: résolutions qui ont levé
+  une exception;
+- tp_inconnues_resolues_total{schema, backend}: débit en points de maillage (N);
+- tp_duree_resolution_secondes{schema, backend, tranche_N}: histogramme des
+  latences par tranche de N (décade supérieure: "1e2" pour 11 ≤ N ≤ 100);
+- tp_cache_acces_total{genre, resultat}: accès à CacheResultats (genre
+  resultat ou figure) et à CacheSolutions (genre solution), resultat
+  succes ou echec;
+- tp_cache_taux_succes: proportion des accès servis par le cache;
+- tp_cache_octets: taille de CacheResultats sur disque;
+- tp_memoire_rss_octets / tp_memoire_rss_pic_octets: mémoire résidente
+  actuelle et maximale du processus.
+
+Les solveurs DF et VF sont décorés par resolution_instrumentee; comme le
+suivi global de suivi_phases, rien n'est mesuré tant qu'aucun registre
+n'est actif:
+
+    registre = activer_metriques()
+    U, x = resoudre_equation_diff(f, 10_000, 0, 0, backend="bande")
+    ecrire_fichier_metriques(registre, "METRIQUES/tp.prom")   # collecteur textfile de node_exporter
+    with ServeurMetriques(registre, port=9464):               # GET http://127.0.0.1:9464/metrics
+        ...
+    desactiver_metriques()
+
+Points d'entrée (main_analysis.py, lancer_analyses.py): --metriques
+FICHIER.prom (réécrit toutes les INTERVALLE_ECRITURE secondes et en fin de
+run) et --port-metriques PORT (serveur HTTP local). Les workers de
+lancer_analyses ont leur propre registre, fusionné dans celui du processus
+principal après chaque job.
+
+Surcoût: sans registre actif, un test et un appel de fonction par
+résolution; actif, deux lectures d'horloge, la lecture des paramètres N et
+backend, un verrou et une recherche dichotomique dans les bornes de
+l'histogramme (quelques microsecondes).
+"""
+
+import os
+import sys
+import math
+import time
+import bisect
+import inspect
+import tempfile
+import functools
+import threading
+import contextlib
+
+from suivi_phases import rss_actuel
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+BORNES_DUREE = (1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0)
+INTERVALLE_ECRITURE = 10.0       # secondes entre deux réécritures de --metriques
+TYPE_CONTENU = "text/plain; version=0.0.4; charset=utf-8"
+
+_registre_actif = None
+
+
+def _valeur_texte(valeur):
+    if isinstance(valeur, int):
+        return str(valeur)
+    if math.isnan(valeur):
+        return "NaN"
+    if math.isinf(valeur):
+        return "+Inf" if valeur > 0 else "-Inf"
+    return repr(float(valeur))
+
+
+def _echapper(texte):
+    return str(texte).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _etiquettes_texte(noms, valeurs):
+    if not noms:
+        return ""
+    return "{" + ",".join(f'{nom}="{_echapper(valeur)}"' for nom, valeur in zip(noms, valeurs)) + "}"
+
+
+def tranche_N(N):
+    """Tranche de N pour l'histogramme des latences: plus petite puissance de 10 ≥ N ("1e3" pour 101..1000)"""
+    return f"1e{len(str(max(int(N), 2) - 1))}"
+
+
+class Compteur:
+    """Compteur monotone, une valeur par combinaison d'étiquettes"""
+
+    genre = "counter"
+
+    def __init__(self, nom, aide, etiquettes=()):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = tuple(etiquettes)
+        self._valeurs = {}
+        self._verrou = threading.Lock()
+
+    def incrementer(self, *etiquettes, valeur=1):
+        with self._verrou:
+            self._valeurs[etiquettes] = self._valeurs.get(etiquettes, 0) + valeur
+
+    def valeur(self, *etiquettes):
+        return self._valeurs.get(etiquettes, 0)
+
+    def total(self):
+        return sum(self._valeurs.values())
+
+    def lignes(self):
+        with self._verrou:
+            valeurs = sorted(self._valeurs.items())
+        for etiquettes, valeur in valeurs:
+            yield f"{self.nom}{_etiquettes_texte(self.etiquettes, etiquettes)} {_valeur_texte(valeur)}"
+
+    def etat(self, reinitialiser=False):
+        with self._verrou:
+            etat = dict(self._valeurs)
+            if reinitialiser:
+                self._valeurs.clear()
+        return etat
+
+    def fusionner(self, etat):
+        with self._verrou:
+            for etiquettes, valeur in etat.items():
+                self._valeurs[etiquettes] = self._valeurs.get(etiquettes, 0) + valeur
+
+
+class Jauge(Compteur):
+    """Valeur instantanée fixée par le code instrumenté (la fusion garde la dernière valeur reçue)"""
+
+    genre = "gauge"
+
+    def fixer(self, valeur, *etiquettes):
+        with self._verrou:
+            self._valeurs[etiquettes] = valeur
+
+    def fusionner(self, etat):
+        with self._verrou:
+            self._valeurs.update(etat)
+
+
+class JaugeFonction:
+    """Jauge sans étiquette évaluée à l'exposition (None: pas de valeur)"""
+
+    genre = "gauge"
+
+    def __init__(self, nom, aide, fonction):
+        self.nom = nom
+        self.aide = aide
+        self.fonction = fonction
+
+    def lignes(self):
+        valeur = self.fonction()
+        if valeur is not None:
+            yield f"{self.nom} {_valeur_texte(valeur)}"
+
+
+class Histogramme:
+    """
+    Histogramme cumulatif à bornes fixes (format Prometheus: _bucket{le}, _sum, _count)
+
+    Pour chaque combinaison d'étiquettes: effectifs par intervalle (le dernier
+    au-delà de la plus grande borne), somme et nombre des observations.
+    """
+
+    genre = "histogram"
+
+    def __init__(self, nom, aide, etiquettes=(), bornes=BORNES_DUREE):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = tuple(etiquettes)
+        self.bornes = tuple(sorted(bornes))
+        self._valeurs = {}
+        self._verrou = threading.Lock()
+
+    def observer(self, valeur, *etiquettes):
+        indice = bisect.bisect_left(self.bornes, valeur)
+        with self._verrou:
+            serie = self._valeurs.get(etiquettes)
+            if serie is None:
+                serie = self._valeurs[etiquettes] = [[0] * (len(self.bornes) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valeur
+            serie[2] += 1
+
+    def nombre(self, *etiquettes):
+        serie = self._valeurs.get(etiquettes)
+        return serie[2] if serie else 0
+
+    def lignes(self):
+        with self._verrou:
+            valeurs = sorted((etiquettes, (list(effectifs), somme, nombre))
+                             for etiquettes, (effectifs, somme, nombre) in self._valeurs.items())
+        noms = self.etiquettes + ("le",)
+        for etiquettes, (effectifs, somme, nombre) in valeurs:
+            cumul = 0
+            for borne, effectif in zip(self.bornes + (math.inf,), effectifs):
+                cumul += effectif
+                yield f"{self.nom}_bucket{_etiquettes_texte(noms, etiquettes + (_valeur_texte(borne),))} {cumul}"
+            texte = _etiquettes_texte(self.etiquettes, etiquettes)
+            yield f"{self.nom}_sum{texte} {_valeur_texte(somme)}"
+            yield f"{self.nom}_count{texte} {nombre}"
+
+    def etat(self, reinitialiser=False):
+        with self._verrou:
+            etat = {etiquettes: (list(effectifs), somme, nombre)
+                    for etiquettes, (effectifs, somme, nombre) in self._valeurs.items()}
+            if reinitialiser:
+                self._valeurs.clear()
+        return etat
+
+    def fusionner(self, etat):
+        with self._verrou:
+            for etiquettes, (effectifs, somme, nombre) in etat.items():
+                serie = self._valeurs.setdefault(etiquettes, [[0] * (len(self.bornes) + 1), 0.0, 0])
+                serie[0] = [a + b for a, b in zip(serie[0], effectifs)]
+                serie[1] += somme
+                serie[2] += nombre
+
+
+def _rss_pic():
+    if resource is None:
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic if sys.platform == "darwin" else pic * 1024     # octets sur macOS, Kio ailleurs
+
+
+class RegistreMetriques:
+    """
+    Ensemble de métriques exposées ensemble
+
+    Paramètres:
+        standard (bool): Déclarer les métriques des solveurs, du cache et de
+            la mémoire (voir le docstring du module)
+    """
+
+    def __init__(self, standard=True):
+        self._metriques = {}
+        self._verrou = threading.Lock()
+        if standard:
+            self.resolutions = self.compteur("tp_resolutions_total", "Résolutions terminées",
+                                             ("schema", "backend"))
+            self.resolutions_echouees = self.compteur("tp_resolutions_echouees_total",
+                                                      "Résolutions ayant levé une exception", ("schema", "backend"))
+            self.inconnues = self.compteur("tp_inconnues_resolues_total",
+                                           "Points de maillage (N) des résolutions terminées", ("schema", "backend"))
+            self.durees = self.histogramme("tp_duree_resolution_secondes",
+                                           "Durée d'une résolution par tranche de N",
+                                           ("schema", "backend", "tranche_N"))
+            self.acces_cache = self.compteur("tp_cache_acces_total", "Accès au cache des résultats",
+                                             ("genre", "resultat"))
+            self.taille_cache = self.jauge("tp_cache_octets", "Taille du cache des résultats sur disque")
+            self.jauge_fonction("tp_cache_taux_succes", "Proportion des accès servis par le cache",
+                                self._taux_succes_cache)
+            self.jauge_fonction("tp_memoire_rss_octets", "Mémoire résidente du processus", rss_actuel)
+            self.jauge_fonction("tp_memoire_rss_pic_octets", "Mémoire résidente maximale du processus", _rss_pic)
+
+    def _ajouter(self, metrique):
+        with self._verrou:
+            existante = self._metriques.get(metrique.nom)
+            if existante is not None:
+                if type(existante) is not type(metrique):
+                    raise ValueError(f"Métrique {metrique.nom!r} déjà déclarée comme {existante.genre}")
+                return existante
+            self._metriques[metrique.nom] = metrique
+            return metrique
+
+    def compteur(self, nom, aide, etiquettes=()):
+        return self._ajouter(Compteur(nom, aide, etiquettes))
+
+    def jauge(self, nom, aide, etiquettes=()):
+        return self._ajouter(Jauge(nom, aide, etiquettes))
+
+    def jauge_fonction(self, nom, aide, fonction):
+        return self._ajouter(JaugeFonction(nom, aide, fonction))
+
+    def histogramme(self, nom, aide, etiquettes=(), bornes=BORNES_DUREE):
+        return self._ajouter(Histogramme(nom, aide, etiquettes, bornes))
+
+    def __getitem__(self, nom):
+        return self._metriques[nom]
+
+    def _taux_succes_cache(self):
+        succes = sum(v for (_, resultat), v in self.acces_cache.etat().items() if resultat == "succes")
+        total = self.acces_cache.total()
+        return succes / total if total else None
+
+    def observer_resolution(self, schema, backend, N, duree):
+        self.resolutions.incrementer(schema, backend)
+        self.inconnues.incrementer(schema, backend, valeur=N)
+        self.durees.observer(duree, schema, backend, tranche_N(N))
+
+    def exposition(self):
+        """Texte au format d'exposition de Prometheus (version 0.0.4)"""
+        lignes = []
+        for metrique in list(self._metriques.values()):
+            valeurs = list(metrique.lignes())
+            if not valeurs:
+                continue
+            lignes.append(f"# HELP {metrique.nom} {metrique.aide}")
+            lignes.append(f"# TYPE {metrique.nom} {metrique.genre}")
+            lignes.extend(valeurs)
+        return "\n".join(lignes) + "\n"
+
+    def instantane(self, reinitialiser=False):
+        """État des compteurs, jauges et histogrammes (picklable, pour fusionner les workers)"""
+        return {nom: metrique.etat(reinitialiser) for nom, metrique in self._metriques.items()
+                if hasattr(metrique, "etat")}
+
+    def fusionner(self, instantane):
+        """Ajoute un instantané (d'un worker) aux métriques de même nom"""
+        for nom, etat in instantane.items():
+            metrique = self._metriques.get(nom)
+            if metrique is not None:
+                metrique.fusionner(etat)
+
+
+# ----------------------------------------------------------------------
+# Registre actif et instrumentation
+# ----------------------------------------------------------------------
+
+def activer_metriques(registre=None):
+    """Active la mesure des résolutions (et du cache); retourne le registre actif"""
+    global _registre_actif
+    _registre_actif = registre if registre is not None else RegistreMetriques()
+    return _registre_actif
+
+
+def desactiver_metriques():
+    global _registre_actif
+    _registre_actif = None
+
+
+def registre_actif():
+    """Registre actif, None si les métriques sont désactivées"""
+    return _registre_actif
+
+
+def resolution_instrumentee(schema):
+    """
+    Décorateur d'un solveur f(f, N, ..., backend=...): compte et chronomètre
+    ses appels dans le registre actif (appel direct sans registre actif)
+    """
+    def decorateur(resoudre):
+        parametres = list(inspect.signature(resoudre).parameters)
+        indice_N, indice_backend = parametres.index("N"), parametres.index("backend")
+        backend_defaut = inspect.signature(resoudre).parameters["backend"].default
+
+        @functools.wraps(resoudre)
+        def resoudre_instrumente(*args, **kwargs):
+            registre = _registre_actif
+            if registre is None:
+                return resoudre(*args, **kwargs)
+            # Lecture directe des arguments (signature.bind coûterait plus que la mesure)
+            N = args[indice_N] if len(args) > indice_N else kwargs.get("N")
+            backend = args[indice_backend] if len(args) > indice_backend else kwargs.get("backend", backend_defaut)
+            debut = time.perf_counter()
+            try:
+                resultat = resoudre(*args, **kwargs)
+            except Exception:
+                registre.resolutions_echouees.incrementer(schema, backend)
+                raise
+            registre.observer_resolution(schema, backend, N, time.perf_counter() - debut)
+            return resultat
+        return resoudre_instrumente
+    return decorateur
+
+
+def enregistrer_acces_cache(genre, succes, taille=None):
+    """Accès au cache des résultats (CacheResultats, avec sa taille) ou des solutions (CacheSolutions)"""
+    registre = _registre_actif
+    if registre is not None:
+        registre.acces_cache.incrementer(genre, "succes" if succes else "echec")
+        if taille is not None:
+            registre.taille_cache.fixer(taille)
+
+
+def enregistrer_taille_cache(taille):
+    registre = _registre_actif
+    if registre is not None:
+        registre.taille_cache.fixer(taille)
+
+
+# ----------------------------------------------------------------------
+# Export: fichier texte et serveur HTTP local
+# ----------------------------------------------------------------------
+
+def ecrire_fichier_metriques(registre, chemin):
+    """Écrit l'exposition dans chemin (remplacement atomique: le collecteur ne lit jamais un fichier partiel)"""
+    dossier = os.path.dirname(os.path.abspath(chemin))
+    os.makedirs(dossier, exist_ok=True)
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, prefix=".tmp", suffix=".prom")
+    try:
+        with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+            f.write(registre.exposition())
+        os.chmod(temporaire, 0o644)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+    return chemin
+
+
+class ServeurMetriques:
+    """
+    Serveur HTTP local (fil démon) qui expose le registre sur /metrics
+
+    Paramètres:
+        registre (RegistreMetriques): Métriques exposées
+        port (int): Port d'écoute (0: choisi par le système, voir self.port)
+        hote (str): Adresse d'écoute (défaut: boucle locale seulement)
+    """
+
+    def __init__(self, registre, port=0, hote="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer     # chargé seulement si servi
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                corps = registre.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", TYPE_CONTENU)
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        self._serveur = ThreadingHTTPServer((hote, port), Gestionnaire)
+        self._serveur.daemon_threads = True
+        self.port = self._serveur.server_address[1]
+        self.url = f"http://{hote}:{self.port}/metrics"
+        self._fil = threading.Thread(target=self._serveur.serve_forever, daemon=True)
+        self._fil.start()
+
+    def arreter(self):
+        self._serveur.shutdown()
+        self._serveur.server_close()
+        self._fil.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.arreter()
+
+
+class ExportMetriques:
+    """
+    Active un registre pour la durée d'un bloc et l'exporte (--metriques, --port-metriques)
+
+    Le fichier est réécrit toutes les `intervalle` secondes par un fil démon
+    (service de longue durée) et à la sortie du bloc.
+    """
+
+    def __init__(self, fichier=None, port=None, intervalle=INTERVALLE_ECRITURE):
+        self.fichier = fichier
+        self.port = port
+        self.intervalle = intervalle
+        self.registre = None
+        self.serveur = None
+        self._arret = threading.Event()
+        self._fil = None
+
+    def _ecrire_periodiquement(self):
+        while not self._arret.wait(self.intervalle):
+            ecrire_fichier_metriques(self.registre, self.fichier)
+
+    def __enter__(self):
+        from journal import evenement
+        self.registre = activer_metriques()
+        if self.port is not None:
+            self.serveur = ServeurMetriques(self.registre, self.port)
+            evenement("metriques", f"📈 Métriques: {self.serveur.url}", source="metriques", url=self.serveur.url)
+        if self.fichier:
+            self._fil = threading.Thread(target=self._ecrire_periodiquement, daemon=True)
+            self._fil.start()
+        return self
+
+    def __exit__(self, *exc):
+        from journal import evenement
+        if self._fil is not None:
+            self._arret.set()
+            self._fil.join()
+        if self.fichier:
+            ecrire_fichier_metriques(self.registre, self.fichier)
+            evenement("metriques", f"📈 Métriques: {self.fichier}", source="metriques", fichier=self.fichier,
+                      resolutions=self.registre.resolutions.total())
+        if self.serveur is not None:
+            self.serveur.arreter()
+        desactiver_metriques()
+
+
+def ajouter_options_metriques(parser):
+    """Options --metriques et --port-metriques d'un point d'entrée argparse"""
+    parser.add_argument("--metriques", default=None, metavar="FICHIER.prom",
+                        help="Écrire les métriques (format texte Prometheus) dans FICHIER, "
+                             f"toutes les {INTERVALLE_ECRITURE:g} s et en fin de run")
+    parser.add_argument("--port-metriques", type=int, default=None, metavar="PORT",
+                        help="Exposer les métriques sur http://127.0.0.1:PORT/metrics pendant le run")
+
+
+def exporter_depuis_arguments(args):
+    """Export demandé par --metriques / --port-metriques, ou contexte vide"""
+    if not getattr(args, "metriques", None) and getattr(args, "port_metriques", None) is None:
+        return contextlib.nullcontext()
+    return ExportMetriques(args.metriques, args.port_metriques)
@@ -0,0 +1,95 @@
+"""
+ERREURS DISCRÈTES DANS PLUSIEURS NORMES EN UNE PASSE
+====================================================
+
+Noyau commun aux TPs: la solution exacte est évaluée une seule fois par
+maillage et toutes les normes de l'erreur e = u_h - u sont calculées sur le
+même tableau, alloué une fois par appel et réutilisé en place:
+
+    Linf     max |e_i|
+    L1       Σ w_i |e_i|
+    L2       (Σ w_i e_i²)^½
+    H1       semi-norme (Σ (e_{i+1} - e_i)² / (x_{i+1} - x_i))^½
+    energie  (|e|_H1² + c·||e||_L2²)^½, norme associée à -u'' + c·u
+             (égale à la semi-norme H1 pour -u'' = f, c = 0)
+
+Les poids de quadrature w dépendent de la discrétisation:
+- "noeuds"   (DF): trapèzes sur les nœuds, extrémités comprises;
+- "cellules" (VF): largeur de la cellule de chaque centre, poids nul pour
+  les valeurs aux bords (conditions de Dirichlet imposées).
+"""
+
+import numpy as np
+
+
+NORMES = ("Linf", "L1", "L2", "H1", "energie")
+DISCRETISATIONS = ("noeuds", "cellules")
+
+
+def poids_noeuds(x):
+    """Poids des trapèzes pour des valeurs nodales (extrémités incluses)"""
+    dx = np.diff(x)
+    poids = np.empty(len(x))
+    poids[0] = 0.0
+    poids[1:] = dx
+    poids[:-1] += dx
+    poids *= 0.5
+    return poids
+
+
+def poids_cellules(x):
+    """
+    Poids des volumes finis pour x = [bord gauche, centres..., bord droit]
+
+    Les faces internes sont à mi-chemin des centres voisins; le poids d'un
+    centre est la largeur de sa cellule, celui des bords est nul.
+    """
+    faces = np.empty(len(x) - 1)
+    faces[0], faces[-1] = x[0], x[-1]
+    faces[1:-1] = 0.5 * (x[1:-2] + x[2:-1])
+    poids = np.zeros(len(x))
+    poids[1:-1] = np.diff(faces)
+    return poids
+
+
+def erreurs_normes(u_numerique, u_exacte, x, discretisation="noeuds", coefficient_reaction=0.0):
+    """
+    Erreur dans toutes les normes de NORMES
+
+    Paramètres:
+        u_numerique (ndarray): Solution discrète aux points x
+        u_exacte (callable ou ndarray): Solution exacte (évaluée une seule fois)
+        x (ndarray): Points de discrétisation, bords inclus
+        discretisation (str): "noeuds" (DF) ou "cellules" (VF)
+        coefficient_reaction (float): c dans la norme d'énergie de -u'' + c·u
+
+    Retourne:
+        dict: norme → valeur (float)
+    """
+    if discretisation not in DISCRETISATIONS:
+        raise ValueError(f"Discrétisation inconnue: {discretisation!r} (attendu: {DISCRETISATIONS})")
+    x = np.asarray(x, dtype=float)
+    poids = poids_noeuds(x) if discretisation == "noeuds" else poids_cellules(x)
+
+    # e = u_h - u dans un tampon propre à cet appel: le tableau de la solution
+    # exacte appartient à l'appelant (ou au callable) et n'est jamais modifié
+    exacte = u_exacte(x) if callable(u_exacte) else u_exacte
+    e = np.empty(x.shape)
+    np.subtract(u_numerique, exacte, out=e)
+
+    # Semi-norme H1: tampon unique pour les différences, mises au carré et pondérées en place
+    gradient = np.subtract(e[1:], e[:-1])
+    np.multiply(gradient, gradient, out=gradient)
+    np.divide(gradient, np.diff(x), out=gradient)
+    h1_carre = float(gradient.sum())
+
+    l2_carre = float(np.einsum('i,i,i->', poids, e, e))
+    np.abs(e, out=e)
+
+    return {
+        'Linf': float(e.max()),
+        'L1': float(np.dot(poids, e)),
+        'L2': float(np.sqrt(l2_carre)),
+        'H1': float(np.sqrt(h1_carre)),
+        'energie': float(np.sqrt(h1_carre + coefficient_reaction * l2_carre)),
+    }
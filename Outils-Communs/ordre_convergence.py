@@ -0,0 +1,188 @@
+"""
+ESTIMATION ROBUSTE DE L'ORDRE DE CONVERGENCE
+============================================
+
+La moyenne des pentes entre maillages successifs est faussée dès qu'une
+seule paire est dominée par les erreurs d'arrondi (cas u(x) = x², exact à la
+précision machine près). Ce module estime l'ordre p du modèle
+
+    erreur(h) ≈ C · h^p
+
+par moindres carrés robustes (Huber, moindres carrés repondérés) sur
+(log h, log erreur), après avoir détecté et exclu le plateau d'arrondi:
+
+- un point est « d'arrondi » si son erreur est sous le plancher
+  facteur_arrondi · ε · échelle, ou si l'erreur ne décroît plus depuis le
+  point précédent: pente locale sous un seuil relatif à l'ordre observé
+  (FRACTION_PENTE fois la pente médiane des paires qui convergent), de
+  sorte qu'une méthode d'ordre 1 ou moins n'est pas prise pour un plateau;
+- le plateau est la plus longue suite finale de tels points: une fois
+  atteint, raffiner n'apporte plus rien (arrêt anticipé possible).
+
+L'ordre est accompagné d'un intervalle de confiance (loi de Student).
+"""
+
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+
+FACTEUR_ARRONDI = 100.0   # plancher d'arrondi = FACTEUR_ARRONDI · ε · échelle
+FRACTION_PENTE = 0.25     # pente locale sous FRACTION_PENTE × ordre observé: erreur stagnante
+CONSTANTE_HUBER = 1.345   # efficacité de 95% sous bruit gaussien
+
+
+EstimationOrdre = namedtuple(
+    "EstimationOrdre",
+    ["ordre", "intervalle", "constante", "indices_retenus", "debut_plateau"],
+)
+EstimationOrdre.__doc__ = """
+Résultat de estimer_ordre_convergence
+
+    ordre (float): Ordre p estimé (nan si moins de deux points exploitables)
+    intervalle (tuple): Intervalle de confiance (bas, haut) sur p
+    constante (float): Constante C du modèle erreur ≈ C·h^p
+    indices_retenus (ndarray): Indices des maillages utilisés pour l'ajustement
+    debut_plateau (int ou None): Premier indice du plateau d'arrondi
+"""
+
+
+def pentes_successives(N_values, erreurs):
+    """Ordres apparents entre maillages successifs (vectorisé, nan si une erreur est nulle)"""
+    log_N = np.log(np.asarray(N_values, dtype=float))
+    erreurs = np.asarray(erreurs, dtype=float)
+    log_erreurs = np.log(np.where(erreurs > 0, erreurs, np.nan))
+    return -np.diff(log_erreurs) / np.diff(log_N)
+
+
+def seuil_pente_relatif(pentes, fraction=FRACTION_PENTE):
+    """
+    Seuil de stagnation relatif à l'ordre observé
+
+    L'ordre observé est la médiane des pentes des paires qui convergent
+    nettement (au moins fraction × la plus forte pente): les paires du
+    plateau ne le tirent pas vers 0, un point aberrant ne le gonfle pas.
+
+    Retourne:
+        float: fraction × ordre observé (inf si aucune pente n'est positive)
+    """
+    pentes = np.asarray(pentes, dtype=float)
+    positives = pentes[np.isfinite(pentes) & (pentes > 0)]
+    if len(positives) == 0:
+        return np.inf
+    convergentes = positives[positives >= fraction * positives.max()]
+    return fraction * float(np.median(convergentes))
+
+
+def detecter_plateau(N_values, erreurs, echelle=1.0,
+                     facteur_arrondi=FACTEUR_ARRONDI, seuil_pente=None):
+    """
+    Détecte le plateau d'arrondi en fin de série
+
+    Paramètres:
+        seuil_pente (float): Pente locale sous laquelle l'erreur stagne
+            (None: seuil_pente_relatif des paires au-dessus du plancher)
+
+    Retourne:
+        int ou None: Premier indice du plateau, None si la série converge encore
+    """
+    erreurs = np.asarray(erreurs, dtype=float)
+    n = len(erreurs)
+    if n == 0:
+        return None
+
+    plancher = facteur_arrondi * np.finfo(float).eps * max(abs(echelle), 1.0)
+    arrondi = ~np.isfinite(erreurs) | (erreurs <= plancher)
+    if n > 1:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pentes = pentes_successives(N_values, np.maximum(erreurs, np.finfo(float).tiny))
+        if seuil_pente is None:
+            seuil_pente = seuil_pente_relatif(pentes[~arrondi[:-1] & ~arrondi[1:]])
+        arrondi[1:] |= ~(pentes >= seuil_pente)
+
+    # Plus longue suite finale de points d'arrondi
+    suite_finale = np.logical_and.accumulate(arrondi[::-1])[::-1]
+    if not suite_finale[-1]:
+        return None
+    return int(np.argmax(suite_finale))
+
+
+def plateau_atteint(N_values, erreurs, **options):
+    """Vrai si le dernier maillage est sur le plateau d'arrondi (raffiner est inutile)"""
+    return detecter_plateau(N_values, erreurs, **options) is not None
+
+
+def _quantile_student(probabilite, ddl):
+    """Quantile de Student (scipy si disponible, sinon approximation normale)"""
+    try:
+        from scipy import stats
+    except ImportError:
+        return NormalDist().inv_cdf(probabilite)
+    return float(stats.t.ppf(probabilite, ddl))
+
+
+def _moindres_carres_huber(X, y, iterations=50):
+    """Régression de Huber par moindres carrés repondérés; retourne (beta, poids, residus)"""
+    poids = np.ones(len(y))
+    beta = np.linalg.lstsq(X, y, rcond=None)[0]
+    for _ in range(iterations):
+        residus = y - X @ beta
+        ecart = 1.4826 * np.median(np.abs(residus - np.median(residus)))
+        if ecart <= 1e-12 * max(1.0, np.max(np.abs(y))):
+            break
+        u = np.abs(residus) / (CONSTANTE_HUBER * ecart)
+        nouveaux_poids = np.where(u <= 1.0, 1.0, 1.0 / np.maximum(u, 1e-300))
+        racine = np.sqrt(nouveaux_poids)
+        nouveau_beta = np.linalg.lstsq(X * racine[:, None], y * racine, rcond=None)[0]
+        converge = np.allclose(nouveau_beta, beta, rtol=1e-10, atol=1e-12)
+        beta, poids = nouveau_beta, nouveaux_poids
+        if converge:
+            break
+    return beta, poids, y - X @ beta
+
+
+def estimer_ordre_convergence(N_values, erreurs, niveau_confiance=0.95, echelle=1.0,
+                              facteur_arrondi=FACTEUR_ARRONDI, seuil_pente=None):
+    """
+    Estime l'ordre de convergence par moindres carrés robustes sur log(erreur) = log C + p·log h
+
+    Paramètres:
+        N_values (list): Tailles de maillage (h = 1/N)
+        erreurs (list): Erreurs correspondantes
+        niveau_confiance (float): Niveau de l'intervalle de confiance sur p
+        echelle (float): Ordre de grandeur de la solution (plancher d'arrondi relatif)
+        facteur_arrondi (float): Plancher d'arrondi en multiples de ε·échelle
+        seuil_pente (float): Pente locale sous laquelle l'erreur stagne
+            (None: relatif à l'ordre observé, voir seuil_pente_relatif)
+
+    Retourne:
+        EstimationOrdre: ordre, intervalle, constante, indices retenus, début du plateau
+    """
+    N_values = np.asarray(N_values, dtype=float)
+    erreurs = np.asarray(erreurs, dtype=float)
+
+    debut_plateau = detecter_plateau(N_values, erreurs, echelle, facteur_arrondi, seuil_pente)
+    fin = len(erreurs) if debut_plateau is None else debut_plateau
+    indices = np.flatnonzero((erreurs[:fin] > 0) & np.isfinite(erreurs[:fin]))
+
+    if len(indices) < 2:
+        return EstimationOrdre(np.nan, (np.nan, np.nan), np.nan, indices, debut_plateau)
+
+    log_h = -np.log(N_values[indices])
+    X = np.column_stack([np.ones(len(indices)), log_h])
+    y = np.log(erreurs[indices])
+
+    beta, poids, residus = _moindres_carres_huber(X, y)
+    log_C, ordre = beta
+
+    ddl = len(indices) - 2
+    if ddl > 0:
+        variance = np.sum(poids * residus**2) / ddl
+        covariance = variance * np.linalg.inv(X.T @ (X * poids[:, None]))
+        demi_largeur = _quantile_student(0.5 + niveau_confiance / 2, ddl) * np.sqrt(covariance[1, 1])
+        intervalle = (float(ordre - demi_largeur), float(ordre + demi_largeur))
+    else:
+        intervalle = (np.nan, np.nan)
+
+    return EstimationOrdre(float(ordre), intervalle, float(np.exp(log_C)), indices, debut_plateau)
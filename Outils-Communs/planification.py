@@ -0,0 +1,205 @@
+"""
+PLANIFICATION DES BALAYAGES EN N SOUS BUDGET DE TEMPS
+=====================================================
+
+Une liste N_values figée est soit trop courte (ordre mal résolu sur un cas
+rapide), soit trop longue (raffinements inutiles une fois l'arrondi atteint,
+ou résolutions hors de prix). Le planificateur construit la suite géométrique
+N_k = N_initial · facteur^k au fil du balayage:
+
+- le coût de chaque résolution est mesuré, puis extrapolé au N suivant par
+  un modèle t ≈ a · N^b ajusté sur les mesures (moindres carrés en log);
+  la première résolution (imports paresseux, caches froids) en est exclue
+  et il faut deux mesures exploitables avant d'extrapoler;
+- le N suivant n'est proposé que si son coût prévu tient dans le budget
+  restant (temps réel écoulé depuis le premier N);
+- le balayage s'arrête aussi dès que l'erreur cible est atteinte, que le
+  plateau d'arrondi est atteint, ou que l'ordre estimé (ordre_convergence)
+  s'est stabilisé.
+
+Utilisation:
+    planificateur = PlanificateurBalayage(budget=30.0, erreur_cible=1e-8)
+    for N in planificateur:
+        t0 = time.perf_counter()
+        erreur = ...
+        planificateur.enregistrer(N, erreur, time.perf_counter() - t0)
+    print(planificateur.N_values, planificateur.raison_arret)
+"""
+
+import time
+
+import numpy as np
+
+from ordre_convergence import estimer_ordre_convergence, detecter_plateau
+
+
+N_INITIAL_DEFAUT = 10
+FACTEUR_DEFAUT = 2
+N_MAX_DEFAUT = 2**20
+DUREE_MESURABLE = 1e-3       # en dessous (s), la mesure est dominée par le bruit
+MESURES_MODELE = 3           # mesures les plus récentes utilisées par le modèle de coût
+TOLERANCE_ORDRE = 0.02       # variation d'ordre tolérée entre estimations successives
+ESTIMATIONS_STABLES = 3      # nombre d'estimations successives concordantes
+POINTS_MIN = 3               # points minimaux avant un arrêt autre que budgétaire
+
+RAISONS_ARRET = ("budget", "erreur_cible", "plateau", "ordre_stable", "N_max")
+
+
+class PlanificateurBalayage:
+    """
+    Choix adaptatif des tailles de maillage d'une étude de convergence
+
+    Paramètres:
+        budget (float): Temps réel maximal du balayage en secondes (None: illimité)
+        erreur_cible (float): Erreur à atteindre (None: pas de cible)
+        N_initial (int): Premier maillage
+        facteur (int): Raison de la suite géométrique des N
+        N_max (int): Plus grand maillage autorisé
+        arret_ordre_stable (bool): Arrêter dès que l'ordre est stabilisé (ignoré
+            si une erreur cible est fixée: on raffine alors jusqu'à la cible)
+        tolerance_ordre (float): Variation maximale de l'ordre jugée stable
+        echelle (float): Ordre de grandeur de la solution (plancher d'arrondi)
+    """
+
+    def __init__(self, budget=None, erreur_cible=None, N_initial=N_INITIAL_DEFAUT,
+                 facteur=FACTEUR_DEFAUT, N_max=N_MAX_DEFAUT, arret_ordre_stable=True,
+                 tolerance_ordre=TOLERANCE_ORDRE, echelle=1.0):
+        if facteur < 2:
+            raise ValueError(f"Le facteur de raffinement doit être ≥ 2 (reçu {facteur})")
+        self.budget = budget
+        self.erreur_cible = erreur_cible
+        self.N_initial = int(N_initial)
+        self.facteur = int(facteur)
+        self.N_max = int(N_max)
+        self.arret_ordre_stable = arret_ordre_stable
+        self.tolerance_ordre = tolerance_ordre
+        self.echelle = echelle
+
+        self.N_values = []
+        self.erreurs = []
+        self.ordres_estimes = []
+        self._mesures = []          # (N, durée) des résolutions effectivement calculées
+        self._debut = None
+        self.raison_arret = None
+
+    # ------------------------------------------------------------------
+    # Modèle de coût
+    # ------------------------------------------------------------------
+
+    def modele_cout(self):
+        """
+        Modèle de coût t ≈ a · N^b ajusté sur les mesures exploitables
+
+        La première mesure (démarrage à froid: imports, caches) est écartée;
+        pour un N mesuré plusieurs fois, la durée minimale est retenue.
+
+        Retourne:
+            tuple: (a, b), ou None avec moins de deux N mesurables
+        """
+        durees = {}
+        for N, t in self._mesures[1:]:
+            durees[N] = min(t, durees.get(N, t))
+        # Les dernières mesures reflètent le régime asymptotique (caches, BLAS multi-thread...)
+        mesures = [(N, t) for N, t in durees.items() if t >= DUREE_MESURABLE][-MESURES_MODELE:]
+        if len(mesures) < 2:
+            return None
+        log_N = np.log([N for N, _ in mesures])
+        log_t = np.log([t for _, t in mesures])
+        exposant, log_a = np.polyfit(log_N, log_t, 1)
+        # Une résolution ne coûte jamais moins que O(N); au-delà de N^3 la mesure est bruitée
+        if not 1.0 <= exposant <= 3.0:
+            exposant = np.clip(exposant, 1.0, 3.0)
+            log_a = np.mean(log_t - exposant * log_N)
+        return float(np.exp(log_a)), float(exposant)
+
+    def cout_prevu(self, N):
+        """Durée prévue (s) d'une résolution à N (0 tant que le modèle n'est pas ajustable)"""
+        modele = self.modele_cout()
+        if modele is None:
+            return 0.0
+        a, exposant = modele
+        return a * N**exposant
+
+    @property
+    def temps_ecoule(self):
+        """Temps réel écoulé depuis le début du balayage (s)"""
+        return 0.0 if self._debut is None else time.perf_counter() - self._debut
+
+    # ------------------------------------------------------------------
+    # Balayage
+    # ------------------------------------------------------------------
+
+    def enregistrer(self, N, erreur, duree=None):
+        """
+        Enregistre le résultat d'un maillage
+
+        Paramètres:
+            N (int): Taille du maillage traité
+            erreur (float): Erreur obtenue
+            duree (float): Durée de la résolution (s); None si elle n'a pas été
+                calculée (résultat relu en cache), elle n'entre alors pas dans
+                le modèle de coût
+        """
+        self.N_values.append(int(N))
+        self.erreurs.append(float(erreur))
+        if duree is not None:
+            self._mesures.append((int(N), float(duree)))
+        if len(self.erreurs) >= 2:
+            estimation = estimer_ordre_convergence(self.N_values, self.erreurs, echelle=self.echelle)
+            self.ordres_estimes.append(estimation.ordre)
+
+    def _ordre_stable(self):
+        ordres = self.ordres_estimes[-ESTIMATIONS_STABLES:]
+        if len(ordres) < ESTIMATIONS_STABLES or not np.all(np.isfinite(ordres)):
+            return False
+        return np.ptp(ordres) <= self.tolerance_ordre
+
+    def _raison_arret(self):
+        """Raison d'arrêter avant le prochain maillage, None pour continuer"""
+        N_suivant = self.N_values[-1] * self.facteur
+
+        if self.erreur_cible is not None and self.erreurs[-1] <= self.erreur_cible:
+            return "erreur_cible"
+        if len(self.N_values) >= POINTS_MIN:
+            if detecter_plateau(self.N_values, self.erreurs, self.echelle) is not None:
+                return "plateau"
+            if self.arret_ordre_stable and self.erreur_cible is None and self._ordre_stable():
+                return "ordre_stable"
+        if N_suivant > self.N_max:
+            return "N_max"
+        if self.budget is not None and self.temps_ecoule + self.cout_prevu(N_suivant) > self.budget:
+            return "budget"
+        return None
+
+    def prochain_N(self):
+        """Prochain maillage à traiter, None si le balayage est terminé"""
+        if self.raison_arret is not None:
+            return None
+        if self._debut is None:
+            self._debut = time.perf_counter()
+        if not self.N_values:
+            return self.N_initial
+        self.raison_arret = self._raison_arret()
+        if self.raison_arret is not None:
+            return None
+        return self.N_values[-1] * self.facteur
+
+    def __iter__(self):
+        while True:
+            N = self.prochain_N()
+            if N is None:
+                return
+            attendus = len(self.N_values) + 1
+            yield N
+            if len(self.N_values) != attendus:
+                raise RuntimeError(f"Résultat du maillage N={N} non enregistré (appeler enregistrer)")
+
+    def N_a_tracer(self, nombre=3):
+        """Maillages destinés aux tracés de solution: les premiers termes de rang pair (10, 40, 160)"""
+        return [self.N_initial * self.facteur**(2 * k) for k in range(nombre)]
+
+    def resume(self):
+        """Résumé textuel du balayage"""
+        ordre = self.ordres_estimes[-1] if self.ordres_estimes else np.nan
+        return (f"{len(self.N_values)} maillage(s) jusqu'à N={self.N_values[-1] if self.N_values else '-'}"
+                f" en {self.temps_ecoule:.2f} s, ordre estimé {ordre:.4f}, arrêt: {self.raison_arret}")
@@ -0,0 +1,84 @@
+"""
+PROCESSUS DE CALCUL DES OUTILS COMMUNS
+======================================
+
+Briques partagées par les outils qui lancent des résolutions DF/VF, dans le
+processus courant ou dans un pool de processus (lancer_analyses, benchmarks,
+service_resolution, tests_paralleles):
+
+- SCHEMAS: module solveur et fonction de résolution de chaque schéma,
+- chemins_import(): dossiers à ajouter à sys.path (outils communs et TPs),
+- initialiser_worker(): initialisation d'un processus de calcul (chemins,
+  journal, métriques, cache des solutions),
+- Progression: barre de progression texte sur stderr.
+"""
+
+import os
+import sys
+import time
+
+from journal import initialiser_worker_journal
+from metriques import activer_metriques
+from cache_solutions import CacheSolutions, activer_cache_solutions
+
+
+_racine_projet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Schémas disponibles: module solveur et fonction de résolution (cas tests: registre_cas)
+SCHEMAS = {
+    "DF": {
+        "dossier": "Resolution-DF-1D",
+        "module": "solver_df_1d",
+        "resoudre": "resoudre_equation_diff",
+        "discretisation": "noeuds",
+    },
+    "VF": {
+        "dossier": "Resolution-VF-1D",
+        "module": "solver_vf_1d",
+        "resoudre": "resoudre_equation_diff_vf",
+        "discretisation": "cellules",
+    },
+}
+
+
+def chemins_import():
+    """Dossiers à ajouter à sys.path (outils communs et TPs)"""
+    return [os.path.dirname(os.path.abspath(__file__))] + [
+        os.path.join(_racine_projet, schema["dossier"]) for schema in SCHEMAS.values()
+    ]
+
+
+def initialiser_worker(chemins, file=None, metriques=False, cache_solutions=None):
+    """Initialisation d'un processus de calcul: chemins d'import des solveurs, file du journal, métriques,
+    cache des solutions ((dossier, quota) du cache actif du processus principal)"""
+    for chemin in reversed(chemins):
+        if chemin not in sys.path:
+            sys.path.insert(0, chemin)
+    initialiser_worker_journal(file)
+    if metriques:
+        activer_metriques()
+    if cache_solutions is not None:
+        activer_cache_solutions(CacheSolutions(*cache_solutions))
+
+
+class Progression:
+    """Barre de progression texte (sur stderr)"""
+
+    def __init__(self, total, active=True, largeur=30):
+        self.total = total
+        self.active = active and total > 0
+        self.largeur = largeur
+        self.faits = 0
+        self.debut = time.perf_counter()
+
+    def avancer(self, libelle=""):
+        self.faits += 1
+        if not self.active:
+            return
+        plein = self.largeur * self.faits // self.total
+        ecoule = time.perf_counter() - self.debut
+        sys.stderr.write(f"\r⏳ [{'█' * plein}{'·' * (self.largeur - plein)}] "
+                         f"{self.faits}/{self.total} {ecoule:6.1f}s {libelle:<28}")
+        if self.faits == self.total:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
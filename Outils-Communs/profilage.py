@@ -0,0 +1,308 @@
+"""
+PROFILAGE DES ANALYSES ET DES TESTS
+===================================
+
+Mode profilage des points d'entrée (main_analysis.py, lancer_analyses.py,
+test_runner.py: option --profil) pour savoir pourquoi un run est lent au
+lieu de le deviner:
+
+- cprofile: profil déterministe de toutes les fonctions Python, écrit en
+  .prof (lisible par python -m pstats, snakeviz, gprof2dot...);
+- echantillonnage: un fil relève la pile du fil principal toutes les
+  INTERVALLE_ECHANTILLONNAGE secondes et écrit les piles repliées
+  ("a.py:f;b.py:g 42" par ligne), format accepté par flamegraph.pl,
+  speedscope et inferno; le coût est faible et ne déforme pas les temps;
+- complet (défaut): les deux à la fois (les temps échantillonnés incluent
+  alors le surcoût de cProfile).
+
+À la fin, le temps est attribué par catégorie de module (CATEGORIES:
+import, tracé, solveur, assemblage, E/S, analyse, autre) et les points
+chauds sont affichés (les deux résumés en mode complet). cProfile attribue à chaque fonction son temps propre;
+l'échantillonnage attribue chaque échantillon au module catégorisé le plus
+profond de la pile (le temps passé dans numpy sous noyau_df_1d compte
+comme assemblage).
+
+Utilisation:
+    with Profileur("complet", nom="analyse_DF1D"):
+        ...
+
+    # n'importe quel script ou module, comme python -m cProfile
+    python profilage.py --mode complet -m pytest test_df_1d_pytest.py -q
+    python profilage.py --lire PROFILS/analyse_DF1D_20250620_101500.prof
+
+Seul le processus courant est profilé: les processus de rendu des figures
+(--figures async) et les workers de lancer_analyses ne le sont pas.
+"""
+
+import os
+import sys
+import time
+import runpy
+import pstats
+import cProfile
+import argparse
+import threading
+import contextlib
+from collections import Counter
+from datetime import datetime
+
+
+MODES_PROFIL = ("cprofile", "echantillonnage", "complet")
+INTERVALLE_ECHANTILLONNAGE = 0.005      # secondes entre deux relevés de pile
+DOSSIER_PROFILS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "PROFILS")
+
+# Catégorie d'une fonction: premier motif contenu dans "chemin:fonction"
+# (les fonctions intégrées de cProfile ont "~" pour chemin)
+CATEGORIES = (
+    ("import", ("<frozen importlib", "marshal.loads")),
+    ("tracé", ("matplotlib", "rendu_figures.py", "decimation.py", "/PIL/", "_1d.py:tracer_")),
+    ("solveur", ("solveurs_lineaires.py", "/scipy/linalg/", "/numpy/linalg/", "_umath_linalg", "lapack")),
+    ("assemblage", ("noyau_df_1d.py", "noyau_vf_1d.py", "registre_cas.py", "solutions_manufacturees.py")),
+    ("E/S", ("cache_resultats.py", "stockage_runs.py", "collecte_pytest.py", "/json/", "/csv.py",
+             "/pickle.py", "/sqlite3/", "npyio", "_io.", "io.open", "posix.", "/shutil.py", "/tempfile.py",
+             "/gzip.py", "/zipfile")),
+    ("analyse", ("analyse_df_1d.py", "analyse_vf_1d.py", "normes_erreur.py", "ordre_convergence.py",
+                 "estimation_gci.py", "lancer_analyses.py", "main_analysis.py")),
+)
+AUTRE = "autre"
+
+
+def categorie(chemin, fonction):
+    """Catégorie de module d'une fonction (AUTRE si aucun motif ne correspond)"""
+    cle = f"{chemin.replace(os.sep, '/')}:{fonction}"
+    for nom, motifs in CATEGORIES:
+        if any(motif in cle for motif in motifs):
+            return nom
+    return AUTRE
+
+
+def _etiquette(chemin, fonction):
+    return fonction if chemin == "~" else f"{os.path.basename(chemin)}:{fonction}"
+
+
+class EchantillonneurPiles(threading.Thread):
+    """Fil qui compte les piles d'appels d'un autre fil jusqu'à arreter()"""
+
+    def __init__(self, fil_cible, intervalle=INTERVALLE_ECHANTILLONNAGE):
+        super().__init__(daemon=True)
+        self.fil_cible = fil_cible
+        self.intervalle = intervalle
+        self.piles = Counter()          # {((chemin, fonction), ... racine → feuille): nombre}
+        self._arret = threading.Event()
+
+    def run(self):
+        while not self._arret.wait(self.intervalle):
+            cadre = sys._current_frames().get(self.fil_cible)
+            pile = []
+            while cadre is not None:
+                pile.append((cadre.f_code.co_filename, cadre.f_code.co_name))
+                cadre = cadre.f_back
+            if pile:
+                self.piles[tuple(reversed(pile))] += 1
+
+    def arreter(self):
+        self._arret.set()
+        self.join()
+        return self.piles
+
+
+def ecrire_piles_repliees(piles, chemin):
+    """Écrit les piles au format replié (une pile par ligne: "racine;...;feuille nombre")"""
+    with open(chemin, "w", encoding="utf-8") as f:
+        for pile, nombre in sorted(piles.items(), key=lambda item: -item[1]):
+            f.write(";".join(_etiquette(*cadre) for cadre in pile) + f" {nombre}\n")
+
+
+def resume_cprofile(stats, n=10):
+    """
+    Temps propre par catégorie et points chauds d'un profil cProfile
+
+    Retourne:
+        dict: total (s), categories {nom: s}, points_chauds [{fonction, categorie,
+            appels, temps_propre, temps_cumule}] triés par temps propre
+    """
+    categories = Counter()
+    fonctions = []
+    for (chemin, _, fonction), (_, appels, propre, cumule, _) in stats.stats.items():
+        nom_categorie = categorie(chemin, fonction)
+        categories[nom_categorie] += propre
+        fonctions.append({"fonction": _etiquette(chemin, fonction), "categorie": nom_categorie,
+                          "appels": appels, "temps_propre": propre, "temps_cumule": cumule})
+    fonctions.sort(key=lambda f: -f["temps_propre"])
+    return {"source": "cprofile", "total": stats.total_tt,
+            "categories": dict(categories.most_common()), "points_chauds": fonctions[:n]}
+
+
+def resume_piles(piles, intervalle, n=10):
+    """
+    Même résumé à partir des piles échantillonnées (temps ≈ échantillons × intervalle)
+
+    Le point chaud d'un échantillon est sa feuille; sa catégorie est celle du
+    module catégorisé le plus profond de la pile.
+    """
+    categories = Counter()
+    feuilles = Counter()
+    for pile, nombre in piles.items():
+        nom_categorie = next((c for c in (categorie(*cadre) for cadre in reversed(pile)) if c != AUTRE), AUTRE)
+        categories[nom_categorie] += nombre * intervalle
+        feuilles[(_etiquette(*pile[-1]), nom_categorie)] += nombre
+    points_chauds = [{"fonction": fonction, "categorie": nom_categorie, "appels": None,
+                      "temps_propre": nombre * intervalle, "temps_cumule": None}
+                     for (fonction, nom_categorie), nombre in feuilles.most_common(n)]
+    return {"source": "echantillonnage", "total": sum(piles.values()) * intervalle,
+            "categories": dict(categories.most_common()), "points_chauds": points_chauds}
+
+
+def afficher_resume(resume):
+    """Affiche le temps par catégorie et les points chauds"""
+    total = resume["total"] or float("nan")
+    print(f"\n🔥 PROFIL ({resume['source']}): {resume['total']:.3f} s")
+    print("-" * 60)
+    for nom, duree in resume["categories"].items():
+        print(f"   {nom:<12} {duree:>9.3f} s {100 * duree / total:>6.1f}%")
+    print("   Points chauds (temps propre):")
+    for point in resume["points_chauds"]:
+        appels = f" ({point['appels']} appels)" if point["appels"] is not None else ""
+        print(f"   {point['temps_propre']:>8.3f} s {100 * point['temps_propre'] / total:>5.1f}%  "
+              f"{point['categorie']:<11} {point['fonction']}{appels}")
+
+
+class Profileur:
+    """
+    Profile le bloc with (fil courant) et écrit les fichiers à la sortie
+
+    Paramètres:
+        mode (str): "cprofile", "echantillonnage" ou "complet"
+        dossier (str): Dossier des fichiers (défaut: <racine>/PROFILS)
+        nom (str): Préfixe des fichiers, complété par la date
+        intervalle (float): Période d'échantillonnage (secondes)
+        afficher (bool): Afficher le résumé et les fichiers écrits à la sortie
+
+    Attributs (après la sortie du bloc):
+        fichier_prof (str): Profil cProfile (.prof), None en mode echantillonnage
+        fichier_piles (str): Piles repliées (.piles.txt), None en mode cprofile
+        resumes (list): Résumés cProfile et/ou échantillonnage (resume_cprofile, resume_piles)
+    """
+
+    def __init__(self, mode="complet", dossier=None, nom="profil", intervalle=INTERVALLE_ECHANTILLONNAGE,
+                 afficher=True):
+        if mode not in MODES_PROFIL:
+            raise ValueError(f"Mode de profilage inconnu: {mode!r} (attendu: {MODES_PROFIL})")
+        self.mode = mode
+        self.dossier = dossier or DOSSIER_PROFILS
+        self.nom = f"{nom}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.intervalle = intervalle
+        self.afficher = afficher
+        self.fichier_prof = self.fichier_piles = None
+        self.resumes = []
+        self._profil = self._echantillonneur = None
+
+    def __enter__(self):
+        if self.mode != "cprofile":
+            self._echantillonneur = EchantillonneurPiles(threading.get_ident(), self.intervalle)
+            self._echantillonneur.start()
+        if self.mode != "echantillonnage":
+            self._profil = cProfile.Profile()
+            self._profil.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self._profil is not None:
+            self._profil.disable()
+        piles = self._echantillonneur.arreter() if self._echantillonneur is not None else None
+        os.makedirs(self.dossier, exist_ok=True)
+        base = os.path.join(self.dossier, self.nom)
+        if self._profil is not None:
+            self.fichier_prof = base + ".prof"
+            self._profil.dump_stats(self.fichier_prof)
+            self.resumes.append(resume_cprofile(pstats.Stats(self._profil)))
+        if piles is not None:
+            self.fichier_piles = base + ".piles.txt"
+            ecrire_piles_repliees(piles, self.fichier_piles)
+            self.resumes.append(resume_piles(piles, self.intervalle))
+        if self.afficher:
+            for resume in self.resumes:
+                afficher_resume(resume)
+            if self.fichier_prof:
+                print(f"📄 Profil cProfile: {self.fichier_prof} (python -m pstats, snakeviz)")
+            if self.fichier_piles:
+                print(f"🔥 Piles repliées: {self.fichier_piles} (flamegraph.pl, speedscope)")
+        return False
+
+
+def ajouter_options_profilage(parser):
+    """Options --profil et --dossier-profil d'un point d'entrée argparse"""
+    parser.add_argument("--profil", nargs="?", const="complet", choices=MODES_PROFIL, default=None,
+                        help="Profiler le run: cprofile (.prof), echantillonnage (piles repliées "
+                             "pour flame graphs) ou complet (les deux, défaut de --profil)")
+    parser.add_argument("--dossier-profil", default=None,
+                        help="Dossier des fichiers de profil (défaut: <racine>/PROFILS)")
+
+
+def profiler_depuis_arguments(args, nom):
+    """Profileur demandé par --profil, ou contexte vide"""
+    if not getattr(args, "profil", None):
+        return contextlib.nullcontext()
+    return Profileur(args.profil, dossier=args.dossier_profil, nom=nom)
+
+
+def _separer_commande(argv):
+    """Sépare les options de profilage de la commande profilée (-m module ... ou script.py ...)"""
+    for i, argument in enumerate(argv):
+        if argument == "-m" and i + 1 < len(argv):
+            return argv[:i], ("module", argv[i + 1], argv[i + 2:])
+        if argument.endswith(".py"):
+            return argv[:i], ("script", argument, argv[i + 1:])
+    return argv, None
+
+
+def executer_commande(commande):
+    """Exécute un module ou un script comme __main__; retourne son code de sortie"""
+    genre, cible, arguments = commande
+    argv, chemins = sys.argv, list(sys.path)
+    sys.argv = [cible, *arguments]
+    sys.path.insert(0, os.getcwd() if genre == "module" else os.path.dirname(os.path.abspath(cible)))
+    try:
+        if genre == "module":
+            runpy.run_module(cible, run_name="__main__", alter_sys=True)
+        else:
+            runpy.run_path(cible, run_name="__main__")
+    except SystemExit as sortie:
+        if sortie.code is None or isinstance(sortie.code, int):
+            return sortie.code or 0
+        print(sortie.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv, sys.path[:] = argv, chemins
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    options, commande = _separer_commande(argv)
+    parser = argparse.ArgumentParser(description="Profilage d'un script ou d'un module Python",
+                                     usage="%(prog)s [options] (-m module | script.py) [arguments]")
+    parser.add_argument("--mode", choices=MODES_PROFIL, default="complet")
+    parser.add_argument("--dossier", default=None, help="Dossier des fichiers (défaut: <racine>/PROFILS)")
+    parser.add_argument("--nom", default=None, help="Préfixe des fichiers (défaut: nom du module ou du script)")
+    parser.add_argument("--intervalle", type=float, default=INTERVALLE_ECHANTILLONNAGE)
+    parser.add_argument("--lire", metavar="FICHIER.prof", help="Afficher le résumé d'un profil existant")
+    parser.add_argument("--points-chauds", type=int, default=15)
+    args = parser.parse_args(options)
+
+    if args.lire:
+        afficher_resume(resume_cprofile(pstats.Stats(args.lire), n=args.points_chauds))
+        return 0
+    if commande is None:
+        parser.error("commande à profiler manquante (-m module ou script.py)")
+
+    nom = args.nom or os.path.splitext(os.path.basename(commande[1]))[0]
+    debut = time.perf_counter()
+    with Profileur(args.mode, dossier=args.dossier, nom=nom, intervalle=args.intervalle):
+        code = executer_commande(commande)
+    print(f"⏱️  Durée totale: {time.perf_counter() - debut:.2f} s (code de sortie {code})")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
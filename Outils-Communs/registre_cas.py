@@ -0,0 +1,231 @@
+"""
+REGISTRE CENTRAL DES CAS TESTS
+==============================
+
+Un cas test du problème -u''(x) = f(x) sur [0, 1], u(0) = u0, u(1) = u1, est
+décrit une seule fois ici: solution exacte, terme source, conditions aux
+limites et constantes d'erreur connues. Analyses, tests et benchmarks les
+obtiennent par leur nom:
+
+    from registre_cas import obtenir_cas
+    cas = obtenir_cas("sin")
+    u, x = resoudre_equation_diff(cas.terme_source, 100, cas.u0, cas.u1)
+    erreur = np.max(np.abs(u - cas.solution_exacte(x)))   # ≈ cas.erreur_prevue(100)
+
+Chargement paresseux: un cas est enregistré par une fabrique (fonction, ou
+chaîne "module:attribut" importée à la demande) qui n'est appelée qu'au
+premier accès, puis mémorisée. Lister les cas ne construit rien.
+
+Fonctions vectorisées: solution exacte et terme source acceptent un scalaire
+ou un tableau de forme quelconque et retournent un float ou un tableau float
+de même forme (les termes constants sont diffusés), avec un argument `out=`
+optionnel comme les ufuncs numpy.
+"""
+
+import functools
+import importlib
+
+import numpy as np
+
+
+def vectoriser(fonction):
+    """
+    Enveloppe une fonction de x en fonction vectorisée de style ufunc
+
+    Le résultat a toujours la forme de x (float si x est scalaire), n'est
+    jamais une vue de x, et peut être écrit dans `out`.
+    """
+    @functools.wraps(fonction)
+    def fonction_vectorisee(x, out=None):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(fonction(x), dtype=float)
+        if out is not None:
+            np.copyto(out, np.broadcast_to(y, x.shape))
+            return out
+        if x.ndim == 0:
+            return float(y)
+        if y.shape != x.shape or np.shares_memory(y, x):
+            y = np.array(np.broadcast_to(y, x.shape), dtype=float)
+        return y
+
+    return fonction_vectorisee
+
+
+class CasTest:
+    """
+    Problème -u'' = f sur [0, 1] avec conditions de Dirichlet
+
+    Paramètres:
+        nom (str): Identifiant dans le registre
+        description (str): Libellé des figures et rapports (ex: "u(x) = sin(πx)")
+        solution_exacte (callable): u(x), vectorisée à la construction
+        terme_source (callable): f(x) = -u''(x), vectorisée à la construction
+        u0, u1 (float): Conditions aux limites
+        constante_erreur (float ou None): C tel que l'erreur L∞ du schéma DF
+            centré soit ≈ C·h² (0 si le schéma est exact, None si inconnue)
+        constante_troncature (float ou None): max|u⁽⁴⁾| / 12, borne de l'erreur
+            de troncature τ ≤ C·h²
+        etiquettes (tuple): Mots-clés de sélection ("polynomial", ...)
+    """
+
+    def __init__(self, nom, description, solution_exacte, terme_source, u0, u1,
+                 constante_erreur=None, constante_troncature=None, etiquettes=()):
+        self.nom = nom
+        self.description = description
+        self.solution_exacte = vectoriser(solution_exacte)
+        self.terme_source = vectoriser(terme_source)
+        self.u0 = float(u0)
+        self.u1 = float(u1)
+        self.constante_erreur = constante_erreur
+        self.constante_troncature = constante_troncature
+        self.etiquettes = tuple(etiquettes)
+
+    def en_tuple(self):
+        """(solution_exacte, terme_source, u0, u1, description), format des fonctions cas_* des TPs"""
+        return self.solution_exacte, self.terme_source, self.u0, self.u1, self.description
+
+    def erreur_prevue(self, N):
+        """Erreur L∞ attendue du schéma DF à N intervalles (nan si la constante est inconnue)"""
+        if self.constante_erreur is None:
+            return np.nan
+        return self.constante_erreur / N**2
+
+    def __repr__(self):
+        return f"CasTest({self.nom!r}, {self.description!r})"
+
+
+class RegistreCas:
+    """Registre de cas tests construits paresseusement"""
+
+    def __init__(self):
+        self._fabriques = {}
+        self._etiquettes = {}
+        self._cas = {}
+
+    def enregistrer(self, nom, fabrique=None, etiquettes=()):
+        """
+        Enregistre une fabrique de cas (utilisable en décorateur)
+
+        Paramètres:
+            nom (str): Identifiant du cas
+            fabrique (callable ou str): Fonction sans argument retournant un
+                CasTest, ou "module:attribut" désignant une telle fonction
+            etiquettes (tuple): Mots-clés connus sans construire le cas
+
+        Raises:
+            ValueError: Si le nom est déjà enregistré
+        """
+        if fabrique is None:
+            return lambda f: self.enregistrer(nom, f, etiquettes) or f
+        if nom in self._fabriques:
+            raise ValueError(f"Cas déjà enregistré: {nom!r}")
+        self._fabriques[nom] = fabrique
+        self._etiquettes[nom] = tuple(etiquettes)
+        return None
+
+    def __getitem__(self, nom):
+        if nom not in self._cas:
+            if nom not in self._fabriques:
+                raise KeyError(f"Cas inconnu: {nom!r} (disponibles: {self.noms()})")
+            fabrique = self._fabriques[nom]
+            if isinstance(fabrique, str):
+                module, attribut = fabrique.split(":")
+                fabrique = getattr(importlib.import_module(module), attribut)
+            cas = fabrique()
+            if not isinstance(cas, CasTest):
+                cas = CasTest(nom, *cas)
+            self._cas[nom] = cas
+        return self._cas[nom]
+
+    def __contains__(self, nom):
+        return nom in self._fabriques
+
+    def __iter__(self):
+        return iter(self._fabriques)
+
+    def __len__(self):
+        return len(self._fabriques)
+
+    def noms(self, etiquette=None):
+        """Noms des cas enregistrés (ayant l'étiquette donnée), sans les construire"""
+        return [nom for nom in self._fabriques
+                if etiquette is None or etiquette in self._etiquettes[nom]]
+
+    def charges(self):
+        """Noms des cas déjà construits"""
+        return list(self._cas)
+
+
+REGISTRE = RegistreCas()
+enregistrer_cas = REGISTRE.enregistrer
+
+
+def obtenir_cas(nom):
+    """Cas test du registre par son nom (construit au premier accès)"""
+    return REGISTRE[nom]
+
+
+# ----------------------------------------------------------------------
+# Cas standards des TPs
+# ----------------------------------------------------------------------
+
+@enregistrer_cas("sin", etiquettes=("regulier",))
+def _cas_sin():
+    def solution_exacte_sin(x):
+        return np.sin(np.pi * x)
+
+    def terme_source_sin(x):
+        return np.pi**2 * np.sin(np.pi * x)
+
+    # e ≈ -(h²/12)·π²·sin(πx): -e'' = τ = -(h²/12)·u⁽⁴⁾
+    return CasTest("sin", "u(x) = sin(πx)", solution_exacte_sin, terme_source_sin, 0.0, 0.0,
+                   constante_erreur=np.pi**2 / 12, constante_troncature=np.pi**4 / 12,
+                   etiquettes=("regulier",))
+
+
+@enregistrer_cas("cube", etiquettes=("polynomial",))
+def _cas_cube():
+    def solution_exacte_cube(x):
+        return x**3
+
+    def terme_source_cube(x):
+        return -6.0 * x
+
+    return CasTest("cube", "u(x) = x³", solution_exacte_cube, terme_source_cube, 0.0, 1.0,
+                   constante_erreur=0.0, constante_troncature=0.0, etiquettes=("polynomial",))
+
+
+@enregistrer_cas("quadratique", etiquettes=("polynomial",))
+def _cas_quadratique():
+    def solution_exacte_quadratique(x):
+        return x**2
+
+    def terme_source_quadratique(x):
+        return -2.0
+
+    return CasTest("quadratique", "u(x) = x²", solution_exacte_quadratique, terme_source_quadratique,
+                   0.0, 1.0, constante_erreur=0.0, constante_troncature=0.0, etiquettes=("polynomial",))
+
+
+@enregistrer_cas("lineaire", etiquettes=("polynomial",))
+def _cas_lineaire():
+    def solution_exacte_lineaire(x):
+        return -x**3 / 3 - x**2 / 2 + (5 / 6) * x
+
+    def terme_source_lineaire(x):
+        return 2 * x + 1
+
+    return CasTest("lineaire", "f(x) = 2x + 1", solution_exacte_lineaire, terme_source_lineaire,
+                   0.0, 0.0, constante_erreur=0.0, constante_troncature=0.0, etiquettes=("polynomial",))
+
+
+@enregistrer_cas("affine", etiquettes=("polynomial",))
+def _cas_affine():
+    def solution_exacte_affine(x):
+        return x
+
+    def terme_source_affine(x):
+        return 0.0
+
+    return CasTest("affine", "u(x) = x", solution_exacte_affine, terme_source_affine, 0.0, 1.0,
+                   constante_erreur=0.0, constante_troncature=0.0, etiquettes=("polynomial",))
@@ -0,0 +1,269 @@
+"""
+FILE DE RENDU DES FIGURES - CALCUL ET TRACÉ DÉCOUPLÉS
+=====================================================
+
+Les analyses de convergence produisent des figures matplotlib (dpi=300) dont
+le rendu est plus coûteux que les résolutions elles-mêmes. Ce module fournit
+une file de rendu qui reçoit des « travaux de tracé » (fonction de tracé +
+données + fichier cible) et les exécute selon un mode:
+
+- "sync"   : tracé immédiat dans le processus courant (comportement historique)
+- "async"  : tracé délégué à un pool de processus, les calculs continuent
+- "lazy"   : seules les données sont stockées (.figure.npz) pour un rendu
+             ultérieur via la ligne de commande de ce module
+- "aucune" : aucune figure
+
+Rendu à la demande des données stockées:
+    python rendu_figures.py FIGURES/run_20250620_195113 --workers 4
+"""
+
+import os
+import sys
+import glob
+import argparse
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+MODES_FIGURES = ("sync", "async", "lazy", "aucune")
+EXTENSION_DONNEES = ".figure.npz"
+
+_CLE_MODULE = "__module__"
+_CLE_FONCTION = "__fonction__"
+
+
+def _nom_module(fonction):
+    """Nom importable du module d'une fonction de tracé (gère l'exécution en script)"""
+    nom = fonction.__module__
+    if nom == "__main__":
+        fichier = getattr(sys.modules["__main__"], "__file__", None)
+        if fichier:
+            nom = os.path.splitext(os.path.basename(fichier))[0]
+    return nom
+
+
+def _initialiser_worker(chemins):
+    """Initialisation d'un processus de rendu: chemins d'import et backend non interactif"""
+    for chemin in reversed(chemins):
+        if chemin not in sys.path:
+            sys.path.insert(0, chemin)
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def executer_trace(nom_module, nom_fonction, donnees, fichier):
+    """
+    Exécute un travail de tracé
+
+    Paramètres:
+        nom_module (str): Module contenant la fonction de tracé
+        nom_fonction (str): Nom de la fonction tracer(donnees, fichier)
+        donnees (dict): Données nécessaires au tracé (tableaux, scalaires, textes)
+        fichier (str): Fichier image à produire
+
+    Retourne:
+        str: Chemin du fichier produit
+    """
+    module = importlib.import_module(nom_module)
+    getattr(module, nom_fonction)(donnees, fichier)
+    return fichier
+
+
+def stocker_donnees_figure(nom_module, nom_fonction, donnees, fichier):
+    """
+    Stocke les données d'un tracé à côté de son fichier cible (mode "lazy")
+
+    Retourne:
+        str: Chemin du fichier de données (fichier + EXTENSION_DONNEES)
+    """
+    chemin = os.path.splitext(fichier)[0] + EXTENSION_DONNEES
+    tableaux = {cle: np.asarray(valeur) for cle, valeur in donnees.items()}
+    tableaux[_CLE_MODULE] = np.asarray(nom_module)
+    tableaux[_CLE_FONCTION] = np.asarray(nom_fonction)
+    np.savez_compressed(chemin, **tableaux)
+    return chemin
+
+
+def charger_donnees_figure(chemin):
+    """
+    Recharge un travail de tracé stocké
+
+    Retourne:
+        tuple: (nom_module, nom_fonction, donnees, fichier_image)
+    """
+    with np.load(chemin, allow_pickle=False) as archive:
+        donnees = {
+            cle: (archive[cle].item() if archive[cle].ndim == 0 else archive[cle])
+            for cle in archive.files
+        }
+    nom_module = donnees.pop(_CLE_MODULE)
+    nom_fonction = donnees.pop(_CLE_FONCTION)
+    fichier = chemin[:-len(EXTENSION_DONNEES)] + ".png"
+    return nom_module, nom_fonction, donnees, fichier
+
+
+class FileRendu:
+    """
+    File de rendu des figures
+
+    Utilisation:
+        with FileRendu("async", workers=2) as rendu:
+            rendu.soumettre(tracer_convergence, donnees, "FIGURES/cas.png")
+        # à la sortie du bloc, toutes les figures sont écrites
+    """
+
+    def __init__(self, mode="sync", workers=None):
+        if mode not in MODES_FIGURES:
+            raise ValueError(f"Mode de figures inconnu: {mode!r} (attendu: {MODES_FIGURES})")
+        self.mode = mode
+        self.workers = workers
+        self._executor = None
+        self._travaux = []
+        self.fichiers = []
+
+    def _pool(self):
+        """Création paresseuse du pool de rendu (les workers importent matplotlib une seule fois)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialiser_worker,
+                initargs=(list(sys.path),),
+            )
+        return self._executor
+
+    def soumettre(self, fonction, donnees, fichier, apres=None):
+        """
+        Soumet un travail de tracé
+
+        Paramètres:
+            fonction (callable): Fonction de tracé de niveau module, tracer(donnees, fichier)
+            donnees (dict): Données du tracé (doivent être sérialisables en .npz)
+            fichier (str): Fichier image à produire
+            apres (callable): Appelé avec le fichier une fois l'image écrite
+                (jamais en modes "lazy" et "aucune"), ex: mise en cache
+        """
+        if self.mode == "aucune":
+            return None
+
+        nom_module, nom_fonction = _nom_module(fonction), fonction.__name__
+
+        if self.mode == "sync":
+            fonction(donnees, fichier)
+            self.fichiers.append(fichier)
+            if apres is not None:
+                apres(fichier)
+            return fichier
+
+        if self.mode == "lazy":
+            chemin = stocker_donnees_figure(nom_module, nom_fonction, donnees, fichier)
+            self.fichiers.append(chemin)
+            return chemin
+
+        futur = self._pool().submit(executer_trace, nom_module, nom_fonction, donnees, fichier)
+        self._travaux.append((futur, apres))
+        return futur
+
+    def attendre(self):
+        """
+        Attend la fin des tracés en cours
+
+        Retourne:
+            list: Fichiers produits (images ou données stockées)
+
+        Raises:
+            Exception: Première erreur rencontrée par un processus de rendu
+        """
+        travaux, self._travaux = self._travaux, []
+        for futur, apres in travaux:
+            fichier = futur.result()
+            self.fichiers.append(fichier)
+            if apres is not None:
+                apres(fichier)
+        return list(self.fichiers)
+
+    def fermer(self):
+        """Attend les tracés en cours puis libère le pool de rendu"""
+        try:
+            return self.attendre()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.fermer()
+        else:
+            # Erreur dans le bloc: tracés en attente abandonnés, l'exception d'origine se propage
+            self._travaux = []
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+        return False
+
+
+def rendre_donnees_stockees(dossier, workers=None, forcer=False):
+    """
+    Rend les figures dont les données ont été stockées en mode "lazy"
+
+    Paramètres:
+        dossier (str): Dossier d'un run (recherche récursive des .figure.npz)
+        workers (int): Nombre de processus de rendu (None: nombre de CPU)
+        forcer (bool): Re-rendre même si l'image existe déjà
+
+    Retourne:
+        list: Images produites
+    """
+    chemins = sorted(glob.glob(os.path.join(dossier, "**", "*" + EXTENSION_DONNEES), recursive=True))
+    travaux = []
+    for chemin in chemins:
+        travail = charger_donnees_figure(chemin)
+        if forcer or not os.path.exists(travail[3]):
+            travaux.append(travail)
+
+    if not travaux:
+        return []
+
+    if workers == 1 or len(travaux) == 1:
+        _initialiser_worker([])
+        return [executer_trace(*travail) for travail in travaux]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_initialiser_worker,
+                             initargs=(list(sys.path),)) as executor:
+        return list(executor.map(executer_trace, *zip(*travaux)))
+
+
+def main(argv=None):
+    """Rendu à la demande des runs stockés en mode "lazy" """
+    parser = argparse.ArgumentParser(description="Rendu des figures stockées (mode lazy)")
+    parser.add_argument("dossiers", nargs="+", help="Dossiers de runs (ex: FIGURES/run_20250620_195113)")
+    parser.add_argument("--workers", type=int, default=None, help="Processus de rendu (défaut: nombre de CPU)")
+    parser.add_argument("--forcer", action="store_true", help="Re-rendre les images existantes")
+    args = parser.parse_args(argv)
+
+    # Les modules de tracé sont dans les dossiers des TPs
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for tp in sorted(glob.glob(os.path.join(racine, "Resolution-*"))):
+        if tp not in sys.path:
+            sys.path.append(tp)
+
+    total = 0
+    for dossier in args.dossiers:
+        images = rendre_donnees_stockees(dossier, workers=args.workers, forcer=args.forcer)
+        print(f"🖼️  {dossier}: {len(images)} figure(s) rendue(s)")
+        total += len(images)
+    print(f"✅ Rendu terminé: {total} figure(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
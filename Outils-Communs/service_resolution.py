@@ -0,0 +1,621 @@
+"""
+SERVICE LOCAL DE RÉSOLUTION (ASYNCIO) AVEC REGROUPEMENT DES REQUÊTES
+====================================================================
+
+Serveur de longue durée qui résout -u'' = f (DF ou VF) pour des clients
+locaux, sur une socket Unix ou en TCP sur 127.0.0.1:
+
+    python service_resolution.py --socket /tmp/tp_resolution.sock --metriques METRIQUES/service.prom
+
+    with ClientResolution("/tmp/tp_resolution.sock") as client:
+        U, x = client.resoudre(terme_source_sin, 1000, 0, 0, schema="DF")
+        solutions = client.resoudre_plusieurs([(f, 1000, 0, u1) for f, u1 in problemes])
+
+Le terme source ne traverse pas la socket comme fonction: le client
+l'évalue aux points où le solveur l'évaluerait (points_source: nœuds
+intérieurs DF, centres des volumes VF) et envoie ces valeurs; le résultat
+est celui de resoudre_equation_diff / resoudre_equation_diff_vf pour le
+même backend (seconds membres et matrices assemblés par systeme_df /
+second_membre_df et systeme_vf / second_membre_vf des noyaux).
+
+Regroupement: les requêtes de même (schéma, backend, N) reçues pendant
+DELAI_LOT secondes (ou dès TAILLE_LOT requêtes) sont résolues ensemble,
+la matrice ne dépendant que de N: une factorisation pour k seconds membres
+(solve_banded / np.linalg.solve sur une matrice (n, k)). Les lots dont le
+volume dépasse SEUIL_EXECUTEUR valeurs sont résolus dans un fil
+d'exécution, les autres directement dans la boucle (moins coûteux qu'un
+changement de fil pour quelques microsecondes de calcul).
+
+Contre-pression: au plus CAPACITE requêtes en cours (reçues, pas encore
+résolues); au-delà, le serveur cesse de lire les sockets, les tampons du
+système se remplissent et l'envoi des clients se bloque. De même, les
+requêtes d'un client lent à lire ses réponses ne sont plus lues tant que
+ses réponses en attente dépassent le tampon d'écriture (drain).
+
+Protocole binaire (petit-boutiste, float64 bruts, pas de JSON):
+- requête: ENTETE_REQUETE (magie b"TPRQ", schéma, backend, identifiant, N,
+  nombre de valeurs, U0, U1) suivie des valeurs du terme source;
+- réponse: ENTETE_REPONSE (magie b"TPRS", statut, identifiant, longueur)
+  suivie de U (longueur valeurs, STATUT_OK) ou d'un message UTF-8
+  (longueur octets, STATUT_ERREUR). x n'est pas transmis: le client le
+  reconstruit (points_solution).
+Plusieurs requêtes peuvent être envoyées sans attendre les réponses, qui
+arrivent dans l'ordre des lots et sont associées par identifiant.
+
+Les résolutions groupées sont comptées dans le registre de métriques actif
+(--metriques / --port-metriques), avec l'histogramme
+tp_service_taille_lot des requêtes par lot.
+
+Avec --cache-solutions (cache_solutions), une requête déjà résolue (par
+le service ou par un solveur: même empreinte des valeurs du terme source)
+est servie directement depuis le fichier mappé en mémoire, sans passer
+par un lot; les solutions calculées y sont ajoutées.
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import struct
+import selectors
+import asyncio
+import logging
+import argparse
+import contextlib
+import importlib
+import threading
+
+import numpy as np
+
+from processus_calcul import chemins_import
+from solveurs_lineaires import resoudre_tridiagonal, BACKENDS
+from journal import emetteur, ajouter_options_journal, configurer_depuis_arguments, arreter_journal
+from metriques import registre_actif, ajouter_options_metriques, exporter_depuis_arguments
+from cache_solutions import (empreinte_probleme, version_solveur, ajouter_options_cache_solutions,
+                             cache_solutions_depuis_arguments)
+from interpolation_solutions import SolutionDiscrete
+
+
+SOCKET_DEFAUT = os.path.join("/tmp", "tp_resolution.sock")
+DELAI_LOT = 0.0005           # secondes d'attente des requêtes de même (schéma, backend, N)
+TAILLE_LOT = 256             # requêtes au plus par lot
+CAPACITE = 1024              # requêtes en cours au plus (contre-pression)
+SEUIL_EXECUTEUR = 200_000    # valeurs (n·k) au-delà desquelles un lot est résolu dans un fil
+N_MAX = 10_000_000
+FENETRE_CLIENT = 128         # requêtes en cours au plus pour ClientResolution.resoudre_plusieurs
+TAMPON_CLIENT = 1 << 20      # octets envoyés / reçus par appel système côté client
+
+MAGIE_REQUETE = b"TPRQ"
+MAGIE_REPONSE = b"TPRS"
+# magie, schéma, backend, réservé, identifiant, N, nombre de valeurs, U0, U1
+ENTETE_REQUETE = struct.Struct("<4sBBHIIIdd")
+# magie, statut, réservé, réservé, identifiant, longueur
+ENTETE_REPONSE = struct.Struct("<4sBBHII")
+STATUT_OK = 0
+STATUT_ERREUR = 1
+
+SCHEMAS = ("DF", "VF")
+# Assemblage du système de chaque schéma (module, systeme, second_membre)
+NOYAUX = {
+    "DF": ("noyau_df_1d", "systeme_df", "second_membre_df"),
+    "VF": ("noyau_vf_1d", "systeme_vf", "second_membre_vf"),
+}
+
+evenement = emetteur("service_resolution")
+
+_noyaux = {}
+_versions = {}
+
+
+def _noyau(schema):
+    """(systeme, second_membre) du schéma, module noyau importé au premier appel"""
+    if schema not in _noyaux:
+        for chemin in chemins_import():
+            if chemin not in sys.path:
+                sys.path.insert(0, chemin)
+        module, systeme, second_membre = NOYAUX[schema]
+        module = importlib.import_module(module)
+        _noyaux[schema] = (getattr(module, systeme), getattr(module, second_membre))
+        _versions[schema] = version_solveur(module.__file__)
+    return _noyaux[schema]
+
+
+def version_noyau(schema):
+    """Version du solveur du schéma (composante des clés du cache des solutions, comme pour les solveurs)"""
+    _noyau(schema)
+    return _versions[schema]
+
+
+def points_source(schema, N):
+    """Abscisses où évaluer le terme source: N-1 nœuds intérieurs (DF) ou N centres de volumes (VF)"""
+    systeme, _ = _noyau(schema)
+    return systeme(N)[0]
+
+
+def points_solution(schema, N):
+    """Abscisses de la solution retournée par le solveur (x de (U, x))"""
+    if schema == "DF":
+        return np.linspace(0, 1, N + 1)
+    return np.concatenate([[0], points_source(schema, N), [1]])
+
+
+def resoudre_lot(schema, backend, N, valeurs, U0, U1):
+    """
+    k résolutions de même (schema, backend, N) avec une seule factorisation
+
+    Paramètres:
+        valeurs (ndarray): Terme source aux points_source, une colonne par
+            problème (n, k)
+        U0, U1 (ndarray): Conditions aux limites (k)
+
+    Retourne:
+        ndarray: Solutions (k, taille de U), une ligne contiguë par problème
+
+    Raises:
+        RuntimeError: Si le système linéaire est singulier
+    """
+    systeme, second_membre = _noyau(schema)
+    _, inferieure, diagonale, superieure = systeme(N)
+    U0 = np.asarray(U0, dtype=float)
+    U1 = np.asarray(U1, dtype=float)
+    b = second_membre(valeurs, N, U0, U1)
+    try:
+        interieur = resoudre_tridiagonal(inferieure, diagonale, superieure, b, backend)
+    except np.linalg.LinAlgError as exc:
+        raise RuntimeError(f"Impossible de résoudre le système linéaire: {exc}")
+    U = np.empty((b.shape[1], b.shape[0] + 2))
+    U[:, 0] = U0
+    U[:, 1:-1] = interieur.T
+    U[:, -1] = U1
+    return U
+
+
+def _nombre_valeurs(schema, N):
+    return N - 1 if schema == "DF" else N
+
+
+class _Requete:
+    __slots__ = ("identifiant", "valeurs", "U0", "U1", "writer", "cle_cache")
+
+    def __init__(self, identifiant, valeurs, U0, U1, writer, cle_cache=None):
+        self.identifiant = identifiant
+        self.valeurs = valeurs
+        self.U0 = U0
+        self.U1 = U1
+        self.writer = writer
+        self.cle_cache = cle_cache
+
+
+class ServiceResolution:
+    """
+    Serveur asyncio (voir le docstring du module)
+
+    Paramètres:
+        chemin_socket (str): Socket Unix (si port vaut None)
+        port (int): Port TCP sur hote (0: port libre choisi par le système)
+        hote (str): Interface TCP (locale par défaut)
+        delai_lot (float): Attente des requêtes à regrouper (secondes)
+        taille_lot (int): Requêtes au plus par lot
+        capacite (int): Requêtes en cours au plus
+        cache (cache_solutions.CacheSolutions): Solutions servies sans
+            résolution si elles y sont, stockées sinon (optionnel)
+
+    Attributs:
+        statistiques (dict): requetes, erreurs, lots, plus_grand_lot, cache
+    """
+
+    def __init__(self, chemin_socket=SOCKET_DEFAUT, port=None, hote="127.0.0.1", delai_lot=DELAI_LOT,
+                 taille_lot=TAILLE_LOT, capacite=CAPACITE, cache=None):
+        self.chemin_socket = chemin_socket
+        self.port = port
+        self.hote = hote
+        self.delai_lot = delai_lot
+        self.taille_lot = taille_lot
+        self.capacite = capacite
+        self.cache = cache
+        self.statistiques = {"requetes": 0, "erreurs": 0, "lots": 0, "plus_grand_lot": 0, "cache": 0}
+        self._serveur = None
+        self._places = None
+        self._attente = {}           # (schéma, backend, N) -> requêtes du lot en formation
+        self._minuteries = {}
+        self._lots = set()
+        self._connexions = set()
+
+    @property
+    def adresse(self):
+        """Chemin de la socket Unix, ou (hote, port) effectif en TCP"""
+        if self.port is None:
+            return self.chemin_socket
+        return self._serveur.sockets[0].getsockname()[:2] if self._serveur else (self.hote, self.port)
+
+    async def demarrer(self):
+        self._places = asyncio.Semaphore(self.capacite)
+        if self.port is None:
+            if os.path.exists(self.chemin_socket):
+                os.unlink(self.chemin_socket)       # socket laissée par un service arrêté brutalement
+            self._serveur = await asyncio.start_unix_server(self._connexion, path=self.chemin_socket)
+        else:
+            self._serveur = await asyncio.start_server(self._connexion, self.hote, self.port)
+        evenement("service_demarre", f"🛰️  Service de résolution: {self.adresse}", adresse=str(self.adresse),
+                  delai_lot=self.delai_lot, taille_lot=self.taille_lot, capacite=self.capacite)
+        return self
+
+    async def servir(self):
+        """Sert jusqu'à annulation (Ctrl+C)"""
+        await self._serveur.serve_forever()
+
+    async def arreter(self):
+        """Ferme le serveur et les connexions; les lots en cours sont terminés"""
+        if self._serveur is None:
+            return
+        self._serveur.close()
+        await self._serveur.wait_closed()
+        for cle in list(self._attente):
+            self._vider(cle)
+        if self._lots:
+            await asyncio.gather(*self._lots, return_exceptions=True)
+        for writer in list(self._connexions):
+            writer.close()
+        if self.port is None and os.path.exists(self.chemin_socket):
+            os.unlink(self.chemin_socket)
+        self._serveur = None
+        evenement("service_arrete", f"🛰️  Service arrêté: {self.statistiques['requetes']} requêtes en "
+                  f"{self.statistiques['lots']} lots", **self.statistiques)
+
+    async def _connexion(self, reader, writer):
+        self._connexions.add(writer)
+        try:
+            while True:
+                # Client lent à lire ses réponses: plus rien n'est lu de lui tant qu'elles s'accumulent
+                await writer.drain()
+                try:
+                    entete = await reader.readexactly(ENTETE_REQUETE.size)
+                except asyncio.IncompleteReadError:
+                    break                                   # client parti
+                magie, code_schema, code_backend, _, identifiant, N, nombre, U0, U1 = ENTETE_REQUETE.unpack(entete)
+                if magie != MAGIE_REQUETE or nombre > N_MAX:
+                    evenement("protocole", f"Requête invalide (magie {magie.hex()}, {nombre} valeurs): connexion fermée",
+                              logging.WARNING, magie=magie.hex(), nombre=nombre)
+                    break                                   # flux désynchronisé: connexion fermée
+                donnees = await reader.readexactly(8 * nombre)
+                await self._places.acquire()
+                self.statistiques["requetes"] += 1
+                erreur = _valider(code_schema, code_backend, N, nombre)
+                if erreur:
+                    self.statistiques["erreurs"] += 1
+                    _repondre_erreur(writer, identifiant, erreur)
+                    self._places.release()
+                    continue
+                cle = (SCHEMAS[code_schema], BACKENDS[code_backend], N)
+                cle_cache = None
+                if self.cache is not None:
+                    # Même clé que le solveur décoré: les solutions sont partagées avec les analyses
+                    cle_cache = empreinte_probleme(*cle, U0, U1, donnees, version=version_noyau(cle[0]))
+                    solution = self.cache.charger(cle_cache)
+                    if solution is not None:
+                        self.statistiques["cache"] += 1
+                        _repondre(writer, identifiant, solution[0])      # depuis le memmap, sans copie
+                        self._places.release()
+                        continue
+                self._soumettre(cle, _Requete(identifiant, np.frombuffer(donnees, dtype="<f8"), U0, U1, writer,
+                                              cle_cache))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connexions.discard(writer)
+            writer.close()
+
+    def _soumettre(self, cle, requete):
+        lot = self._attente.setdefault(cle, [])
+        lot.append(requete)
+        if len(lot) >= self.taille_lot:
+            self._vider(cle)
+        elif len(lot) == 1:
+            self._minuteries[cle] = asyncio.get_running_loop().call_later(self.delai_lot, self._vider, cle)
+
+    def _vider(self, cle):
+        minuterie = self._minuteries.pop(cle, None)
+        if minuterie is not None:
+            minuterie.cancel()
+        requetes = self._attente.pop(cle, None)
+        if requetes:
+            tache = asyncio.get_running_loop().create_task(self._executer_lot(cle, requetes))
+            self._lots.add(tache)
+            tache.add_done_callback(self._lots.discard)
+
+    async def _executer_lot(self, cle, requetes):
+        schema, backend, N = cle
+        k = len(requetes)
+        self.statistiques["lots"] += 1
+        self.statistiques["plus_grand_lot"] = max(self.statistiques["plus_grand_lot"], k)
+        valeurs = np.stack([requete.valeurs for requete in requetes], axis=1)
+        U0 = [requete.U0 for requete in requetes]
+        U1 = [requete.U1 for requete in requetes]
+        debut = time.perf_counter()
+        try:
+            if valeurs.size >= SEUIL_EXECUTEUR:
+                solutions = await asyncio.get_running_loop().run_in_executor(
+                    None, resoudre_lot, schema, backend, N, valeurs, U0, U1)
+            else:
+                solutions = resoudre_lot(schema, backend, N, valeurs, U0, U1)
+        except Exception as exc:
+            self.statistiques["erreurs"] += k
+            evenement("erreur_lot", f"Échec du lot {schema}/{backend} N={N} ({k} requêtes): {exc}", logging.WARNING,
+                      schema=schema, backend=backend, N=N, requetes=k, erreur=str(exc))
+            for requete in requetes:
+                _repondre_erreur(requete.writer, requete.identifiant, str(exc))
+        else:
+            _observer_lot(schema, backend, N, k, time.perf_counter() - debut)
+            for requete, U in zip(requetes, solutions):
+                _repondre(requete.writer, requete.identifiant, U)
+            if self.cache is not None:
+                x = points_solution(schema, N)
+                entrees = [(requete.cle_cache, U, x, schema, backend, N) for requete, U in zip(requetes, solutions)]
+                # Écriture disque hors de la boucle; arreter() attend sa fin
+                stockage = asyncio.ensure_future(asyncio.get_running_loop().run_in_executor(
+                    None, self.cache.stocker_plusieurs, entrees))
+                self._lots.add(stockage)
+                stockage.add_done_callback(self._lots.discard)
+        finally:
+            for _ in requetes:
+                self._places.release()
+
+
+def _valider(code_schema, code_backend, N, nombre):
+    """Message d'erreur d'une requête invalide, None si elle est valide"""
+    if code_schema >= len(SCHEMAS):
+        return f"Schéma inconnu: {code_schema} (attendu: 0 pour DF, 1 pour VF)"
+    if code_backend >= len(BACKENDS):
+        return f"Backend inconnu: {code_backend} (attendu: {dict(enumerate(BACKENDS))})"
+    if N <= 1 or N > N_MAX:
+        return f"N doit être compris entre 2 et {N_MAX} (reçu: {N})"
+    attendu = _nombre_valeurs(SCHEMAS[code_schema], N)
+    if nombre != attendu:
+        return f"{attendu} valeurs du terme source attendues pour {SCHEMAS[code_schema]} N={N} (reçu: {nombre})"
+    return None
+
+
+def _repondre(writer, identifiant, U):
+    if not writer.is_closing():
+        writer.write(ENTETE_REPONSE.pack(MAGIE_REPONSE, STATUT_OK, 0, 0, identifiant, len(U)))
+        writer.write(memoryview(U).cast("B"))
+
+
+def _repondre_erreur(writer, identifiant, message):
+    if not writer.is_closing():
+        texte = message.encode("utf-8")
+        writer.write(ENTETE_REPONSE.pack(MAGIE_REPONSE, STATUT_ERREUR, 0, 0, identifiant, len(texte)) + texte)
+
+
+def _observer_lot(schema, backend, N, k, duree):
+    """Compte les k résolutions du lot dans le registre de métriques actif (durée répartie)"""
+    registre = registre_actif()
+    if registre is None:
+        return
+    for _ in range(k):
+        registre.observer_resolution(schema, backend, N, duree / k)
+    registre.histogramme("tp_service_taille_lot", "Requêtes résolues par lot du service", ("schema",),
+                         bornes=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512)).observer(k, schema)
+
+
+class ServiceEnFond:
+    """
+    Service dans un fil de fond, le temps d'un bloc (tests, scripts)
+
+        with ServiceEnFond(port=0) as service:
+            client = ClientResolution(service.adresse)
+    """
+
+    def __init__(self, **options):
+        self.service = ServiceResolution(**options)
+        self._boucle = None
+        self._fil = None
+
+    def __enter__(self):
+        self._boucle = asyncio.new_event_loop()
+        pret = threading.Event()
+        erreurs = []
+
+        def executer():
+            asyncio.set_event_loop(self._boucle)
+            try:
+                self._boucle.run_until_complete(self.service.demarrer())
+            except Exception as exc:
+                erreurs.append(exc)
+                return
+            finally:
+                pret.set()
+            self._boucle.run_forever()
+
+        self._fil = threading.Thread(target=executer, daemon=True)
+        self._fil.start()
+        pret.wait()
+        if erreurs:
+            self._fil.join()
+            self._boucle.close()
+            raise erreurs[0]
+        return self.service
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.service.arreter(), self._boucle).result()
+        self._boucle.call_soon_threadsafe(self._boucle.stop)
+        self._fil.join()
+        self._boucle.close()
+
+
+# ----------------------------------------------------------------------
+# Client
+# ----------------------------------------------------------------------
+
+def _trame_requete(identifiant, f, N, U0, U1, schema, backend):
+    """En-tête et valeurs du terme source d'une requête (f évaluée aux points_source)"""
+    if schema not in SCHEMAS:
+        raise ValueError(f"Schéma inconnu: {schema!r} (attendu: {SCHEMAS})")
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu: {backend!r} (attendu: {BACKENDS})")
+    if N <= 1:
+        raise ValueError("N doit être supérieur à 1")
+    if callable(f):
+        valeurs = np.broadcast_to(f(points_source(schema, N)), (_nombre_valeurs(schema, N),))
+    else:
+        valeurs = np.asarray(f)
+    valeurs = np.ascontiguousarray(valeurs, dtype="<f8")
+    return ENTETE_REQUETE.pack(MAGIE_REQUETE, SCHEMAS.index(schema), BACKENDS.index(backend), 0,
+                               identifiant, N, valeurs.size, U0, U1) + valeurs.tobytes()
+
+
+def _lire_reponses(tampon):
+    """Extrait du tampon (bytearray) les réponses complètes: (statut, identifiant, données)"""
+    position = 0
+    while len(tampon) - position >= ENTETE_REPONSE.size:
+        magie, statut, _, _, identifiant, longueur = ENTETE_REPONSE.unpack_from(tampon, position)
+        if magie != MAGIE_REPONSE:
+            raise ConnectionError(f"Réponse invalide du service (magie {bytes(magie)!r})")
+        fin = position + ENTETE_REPONSE.size + (8 * longueur if statut == STATUT_OK else longueur)
+        if len(tampon) < fin:
+            break
+        yield statut, identifiant, tampon[position + ENTETE_REPONSE.size:fin]
+        position = fin
+    del tampon[:position]
+
+class ClientResolution:
+    """
+    Client bloquant du service
+
+    Paramètres:
+        adresse: Chemin de la socket Unix, ou (hote, port)
+        delai (float): Délai maximal d'une opération sur la socket (secondes, None: sans limite)
+    """
+
+    def __init__(self, adresse=SOCKET_DEFAUT, delai=None):
+        if isinstance(adresse, (tuple, list)):
+            self._socket = socket.create_connection(tuple(adresse), timeout=delai)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(delai)
+            self._socket.connect(adresse)
+        self.delai = delai
+        self._identifiant = 0
+
+    def resoudre(self, f, N, U0, U1, schema="DF", backend="bande"):
+        """Comme resoudre_equation_diff(_vf)(f, N, U0, U1, backend=backend): retourne (U, x)"""
+        return self.resoudre_plusieurs([(f, N, U0, U1, schema, backend)])[0]
+
+    def resoudre_plusieurs(self, problemes, fenetre=FENETRE_CLIENT):
+        """
+        Résout les problèmes (f, N, U0, U1[, schema[, backend]]) en pipeline
+
+        Jusqu'à `fenetre` requêtes sont en cours sans attendre les réponses,
+        ce qui permet au service de les regrouper. f est une fonction
+        vectorisée ou directement ses valeurs aux points_source(schema, N).
+
+        Retourne:
+            list: SolutionDiscrete (U, x) par problème, dans l'ordre
+
+        Raises:
+            RuntimeError: Si le service refuse une requête ou échoue à la résoudre
+        """
+        problemes = [tuple(probleme) + ("DF", "bande")[len(probleme) - 4:] for probleme in problemes]
+        resultats = [None] * len(problemes)
+        en_cours = {}
+        erreurs = []
+        suivant = 0
+        sortie = bytearray()
+        entree = bytearray()
+        # Envoi et lecture entrelacés: ni le client ni le service ne restent bloqués en écriture
+        selecteur = selectors.DefaultSelector()
+        selecteur.register(self._socket, selectors.EVENT_READ)
+        self._socket.setblocking(False)
+        try:
+            while suivant < len(problemes) or en_cours:
+                while suivant < len(problemes) and len(en_cours) < fenetre and len(sortie) < TAMPON_CLIENT:
+                    self._identifiant = (self._identifiant + 1) % 2**32
+                    en_cours[self._identifiant] = suivant
+                    sortie += _trame_requete(self._identifiant, *problemes[suivant])
+                    suivant += 1
+                selecteur.modify(self._socket, selectors.EVENT_READ | (selectors.EVENT_WRITE if sortie else 0))
+                prets = selecteur.select(self.delai)
+                if not prets:
+                    raise TimeoutError(f"Pas de réponse du service en {self.delai} s")
+                masque = prets[0][1]
+                if masque & selectors.EVENT_WRITE:
+                    del sortie[:self._socket.send(sortie)]
+                if masque & selectors.EVENT_READ:
+                    recu = self._socket.recv(TAMPON_CLIENT)
+                    if not recu:
+                        raise ConnectionError("Connexion fermée par le service")
+                    entree += recu
+                    for statut, identifiant, donnees in _lire_reponses(entree):
+                        indice = en_cours.pop(identifiant)
+                        _, N, _, _, schema, _ = problemes[indice]
+                        if statut == STATUT_OK:
+                            resultats[indice] = SolutionDiscrete(np.frombuffer(donnees, dtype="<f8"), points_solution(schema, N))
+                        else:
+                            erreurs.append(f"problème {indice}: {donnees.decode('utf-8')}")
+        finally:
+            selecteur.close()
+            self._socket.settimeout(self.delai)
+        if erreurs:
+            raise RuntimeError("Service de résolution: " + "; ".join(erreurs))
+        return resultats
+
+    def fermer(self):
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+# ----------------------------------------------------------------------
+# Point d'entrée
+# ----------------------------------------------------------------------
+
+def main(argv=None):
+    """Lance le service jusqu'à Ctrl+C ou SIGTERM"""
+    parser = argparse.ArgumentParser(description="Service local de résolution DF/VF avec regroupement des requêtes")
+    parser.add_argument("--socket", default=SOCKET_DEFAUT, help=f"Socket Unix (défaut: {SOCKET_DEFAUT})")
+    parser.add_argument("--port", type=int, default=None, help="Écouter en TCP sur 127.0.0.1:PORT au lieu de la socket")
+    parser.add_argument("--delai-lot", type=float, default=DELAI_LOT,
+                        help=f"Attente des requêtes à regrouper, secondes (défaut: {DELAI_LOT})")
+    parser.add_argument("--taille-lot", type=int, default=TAILLE_LOT,
+                        help=f"Requêtes au plus par lot (défaut: {TAILLE_LOT})")
+    parser.add_argument("--capacite", type=int, default=CAPACITE,
+                        help=f"Requêtes en cours au plus avant contre-pression (défaut: {CAPACITE})")
+    ajouter_options_journal(parser)
+    ajouter_options_metriques(parser)
+    ajouter_options_cache_solutions(parser)
+    args = parser.parse_args(argv)
+
+    configurer_depuis_arguments(args)
+    try:
+        with exporter_depuis_arguments(args), cache_solutions_depuis_arguments(args) as cache:
+            asyncio.run(_servir(args, cache))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        arreter_journal()
+    return 0
+
+
+async def _servir(args, cache):
+    service = ServiceResolution(args.socket, args.port, delai_lot=args.delai_lot, taille_lot=args.taille_lot,
+                                capacite=args.capacite, cache=cache)
+    await service.demarrer()
+    # SIGTERM (arrêt d'un service système) traité comme Ctrl+C: lots en cours terminés, socket supprimée
+    with contextlib.suppress(NotImplementedError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        await service.servir()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await service.arreter()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
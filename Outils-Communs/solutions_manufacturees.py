@@ -0,0 +1,244 @@
+"""
+SOLUTIONS MANUFACTURÉES: TERMES SOURCES DÉRIVÉS SYMBOLIQUEMENT
+==============================================================
+
+À partir d'une solution u(x) (ou u(x, y) pour les TPs 2D) donnée sous forme
+symbolique, le terme source de l'opérateur choisi est dérivé par sympy, sans
+calcul à la main (et sans erreur de signe):
+
+    "poisson"             f = -Δu
+    "diffusion_reaction"  f = -Δu + c·u
+
+Les expressions sont traduites en un noyau numpy: un module Python contenant
+solution(x), source(x) et solution_et_source(x), ce dernier évaluant u et f
+en une passe avec les sous-expressions communes partagées (sympy.cse).
+
+Les noyaux sont mis en cache sur disque, adressés par l'empreinte SHA-256 de
+(expression, variables, opérateur, coefficient, version du générateur). Un
+noyau déjà généré est rechargé comme un module ordinaire (bytecode compris):
+ni dérivation ni traduction. sympy n'est importé qu'à la première génération
+d'un noyau absent du cache: un démarrage à chaud ne le charge pas, et il
+n'a pas besoin d'être installé.
+
+Emplacement par défaut: <racine du projet>/.cache_noyaux, modifiable par la
+variable d'environnement TP_ANAL_NUM_NOYAUX.
+
+Utilisation:
+    cas = cas_manufacture("exp(x)*sin(3*pi*x)")      # CasTest du registre (1D)
+    noyau = noyau_manufacture("sin(pi*x)*sin(pi*y)", variables=("x", "y"))
+    u, f = noyau.solution_et_source(X, Y)
+"""
+
+import os
+import hashlib
+import tempfile
+import importlib.util
+
+import numpy as np
+
+from registre_cas import CasTest
+
+
+OPERATEURS = ("poisson", "diffusion_reaction")
+VERSION_NOYAUX = 1          # à incrémenter si le code généré change
+
+_racine_projet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSSIER_DEFAUT = os.environ.get("TP_ANAL_NUM_NOYAUX", os.path.join(_racine_projet, ".cache_noyaux"))
+
+
+def _sympy():
+    """Module sympy, importé à la première génération de noyau (environ 0.25 s)"""
+    try:
+        import sympy
+    except ImportError:  # sympy optionnel: seuls les noyaux déjà en cache sont utilisables
+        raise ImportError("La génération de noyaux nécessite sympy (pip install sympy)") from None
+    return sympy
+
+
+def terme_source_symbolique(u, variables, operateur="poisson", coefficient=0.0):
+    """
+    Terme source symbolique de l'opérateur appliqué à u
+
+    Paramètres:
+        u (sympy.Expr): Solution manufacturée
+        variables (tuple): Symboles d'espace
+        operateur (str): "poisson" ou "diffusion_reaction"
+        coefficient (float): c de -Δu + c·u
+
+    Retourne:
+        sympy.Expr: f simplifiée
+    """
+    sympy = _sympy()
+    if operateur not in OPERATEURS:
+        raise ValueError(f"Opérateur inconnu: {operateur!r} (attendu: {OPERATEURS})")
+    f = -sum(sympy.diff(u, v, 2) for v in variables)
+    if operateur == "diffusion_reaction":
+        f += sympy.nsimplify(coefficient) * u
+    return sympy.simplify(f)
+
+
+def _lignes_fonction(nom, expressions, variables):
+    """Source d'une fonction numpy évaluant des expressions avec sous-expressions communes"""
+    sympy = _sympy()
+    from sympy.printing.numpy import NumPyPrinter
+    printer = NumPyPrinter()
+    remplacements, reduites = sympy.cse(expressions)
+    arguments = ", ".join(str(v) for v in variables)
+    lignes = [f"def {nom}({arguments}):"]
+    for symbole, sous_expression in remplacements:
+        lignes.append(f"    {symbole} = {printer.doprint(sous_expression)}")
+    resultats = []
+    for expression, reduite in zip(expressions, reduites):
+        code = printer.doprint(reduite)
+        if expression.free_symbols != set(variables):
+            # Expression constante ou indépendante d'une variable: diffusion à la forme des entrées
+            code = f"_forme({code}, {arguments})"
+        resultats.append(code)
+    lignes.append(f"    return {', '.join(resultats)}")
+    return lignes
+
+
+def source_noyau(expression, variables=("x",), operateur="poisson", coefficient=0.0):
+    """
+    Code source Python du noyau numpy d'une solution manufacturée
+
+    Raises:
+        ImportError: Si sympy n'est pas installé
+    """
+    sympy = _sympy()
+    symboles = sympy.symbols(variables, real=True)
+    symboles = tuple(symboles) if isinstance(symboles, (tuple, list)) else (symboles,)
+    u = sympy.sympify(expression, locals={str(s): s for s in symboles})
+    f = terme_source_symbolique(u, symboles, operateur, coefficient)
+
+    lignes = [
+        f'"""Noyau généré: u = {u}, f = {f} ({operateur}, c = {coefficient})"""',
+        "",
+        "import numpy",
+        "",
+        f"EXPRESSION_SOLUTION = {str(u)!r}",
+        f"EXPRESSION_SOURCE = {str(f)!r}",
+        f"VARIABLES = {tuple(variables)!r}",
+        "",
+        "",
+        "def _forme(valeur, *variables):",
+        "    return numpy.array(numpy.broadcast_to(valeur, numpy.broadcast(*variables).shape), dtype=float)",
+        "",
+        "",
+    ]
+    lignes += _lignes_fonction("solution", [u], symboles) + ["", ""]
+    lignes += _lignes_fonction("source", [f], symboles) + ["", ""]
+    lignes += _lignes_fonction("solution_et_source", [u, f], symboles)
+    return "\n".join(lignes) + "\n"
+
+
+class GenerateurSolutions:
+    """
+    Générateur de noyaux avec cache mémoire et disque
+
+    Paramètres:
+        dossier (str): Dossier du cache des noyaux (défaut: DOSSIER_DEFAUT)
+
+    Attributs:
+        generes, charges_disque, charges_memoire (int): Origine des noyaux servis
+    """
+
+    def __init__(self, dossier=None):
+        self.dossier = dossier or DOSSIER_DEFAUT
+        os.makedirs(self.dossier, exist_ok=True)
+        self._noyaux = {}
+        self.generes = 0
+        self.charges_disque = 0
+        self.charges_memoire = 0
+
+    @staticmethod
+    def cle(expression, variables=("x",), operateur="poisson", coefficient=0.0):
+        """Empreinte SHA-256 (hexadécimale) d'une demande de noyau"""
+        description = f"{VERSION_NOYAUX}\x00{str(expression).replace(' ', '')}\x00{tuple(variables)}\x00" \
+                      f"{operateur}\x00{float(coefficient)!r}"
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+    def chemin(self, cle):
+        return os.path.join(self.dossier, f"noyau_{cle[:32]}.py")
+
+    def noyau(self, expression, variables=("x",), operateur="poisson", coefficient=0.0):
+        """
+        Noyau numpy (module) de la solution manufacturée
+
+        Retourne:
+            module: solution(*variables), source(*variables),
+                solution_et_source(*variables), EXPRESSION_SOLUTION, EXPRESSION_SOURCE
+
+        Raises:
+            ImportError: Noyau absent du cache et sympy non installé
+        """
+        if operateur not in OPERATEURS:
+            raise ValueError(f"Opérateur inconnu: {operateur!r} (attendu: {OPERATEURS})")
+        cle = self.cle(expression, variables, operateur, coefficient)
+        if cle in self._noyaux:
+            self.charges_memoire += 1
+            return self._noyaux[cle]
+
+        chemin = self.chemin(cle)
+        if os.path.exists(chemin):
+            self.charges_disque += 1
+        else:
+            self._ecrire_atomique(chemin, source_noyau(expression, variables, operateur, coefficient))
+            self.generes += 1
+
+        nom_module = os.path.splitext(os.path.basename(chemin))[0]
+        spec = importlib.util.spec_from_file_location(nom_module, chemin)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self._noyaux[cle] = module
+        return module
+
+    def _ecrire_atomique(self, chemin, source):
+        """Écrit via un fichier temporaire renommé (processus concurrents jamais exposés à un noyau partiel)"""
+        descripteur, temporaire = tempfile.mkstemp(dir=self.dossier, prefix=".tmp", suffix=".py")
+        try:
+            with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+                f.write(source)
+            os.replace(temporaire, chemin)
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            raise
+
+    def vider(self):
+        """Supprime les noyaux du cache disque et mémoire"""
+        for entree in os.scandir(self.dossier):
+            if entree.name.startswith("noyau_") and entree.name.endswith(".py"):
+                os.remove(entree.path)
+        self._noyaux.clear()
+
+
+_generateur_defaut = None
+
+
+def generateur_defaut():
+    """Générateur partagé du processus (cache dans DOSSIER_DEFAUT)"""
+    global _generateur_defaut
+    if _generateur_defaut is None:
+        _generateur_defaut = GenerateurSolutions()
+    return _generateur_defaut
+
+
+def noyau_manufacture(expression, variables=("x",), operateur="poisson", coefficient=0.0, generateur=None):
+    """Noyau numpy de la solution manufacturée (voir GenerateurSolutions.noyau)"""
+    return (generateur or generateur_defaut()).noyau(expression, variables, operateur, coefficient)
+
+
+def cas_manufacture(expression, nom=None, generateur=None):
+    """
+    Cas test 1D -u'' = f du registre à partir d'une solution symbolique u(x)
+
+    Les conditions aux limites sont les valeurs de u en 0 et 1.
+
+    Retourne:
+        CasTest: Cas prêt pour les solveurs DF/VF 1D
+    """
+    noyau = noyau_manufacture(expression, generateur=generateur)
+    solution, source = noyau.solution, noyau.source
+    return CasTest(nom or f"manufacture:{expression}", f"u(x) = {noyau.EXPRESSION_SOLUTION}",
+                   solution, source, float(solution(np.float64(0.0))), float(solution(np.float64(1.0))))
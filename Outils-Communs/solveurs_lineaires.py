@@ -0,0 +1,190 @@
+"""
+BACKENDS DE RÉSOLUTION DES SYSTÈMES TRIDIAGONAUX
+================================================
+
+Les schémas DF et VF 1D conduisent à des systèmes tridiagonaux. Deux backends
+sont disponibles:
+
+- "dense" : matrice pleine et np.linalg.solve, O(N²) en mémoire et O(N³) en
+            temps (comportement historique des TPs);
+- "bande" : stockage des trois diagonales seulement, résolution en O(N) par
+            scipy.linalg.solve_banded (LAPACK, importé à la première
+            résolution), ou par l'algorithme de Thomas si scipy n'est pas
+            installé.
+
+Avec un suivi (suivi_phases.SuiviPhases), la construction des matrices est
+mesurée comme phase "assemblage" et la résolution comme phase "resolution";
+Thomas sépare l'élimination ("factorisation") de la remontée. LAPACK
+(np.linalg.solve, solve_banded) factorise et résout en un seul appel, compté
+dans "resolution".
+"""
+
+import numpy as np
+
+from suivi_phases import phase
+
+
+BACKENDS = ("dense", "bande")
+
+_solve_banded = None
+
+
+def _charger_solve_banded():
+    """scipy.linalg.solve_banded, importé à la première résolution (None sans scipy)"""
+    global _solve_banded
+    if _solve_banded is None:
+        try:
+            from scipy.linalg import solve_banded
+        except ImportError:  # scipy optionnel: algorithme de Thomas en numpy
+            solve_banded = False
+        _solve_banded = solve_banded
+    return _solve_banded or None
+
+
+def verifier_backend(backend):
+    """Lève ValueError si le backend est inconnu"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu: {backend!r} (attendu: {BACKENDS})")
+
+
+def matrice_dense(inferieure, diagonale, superieure):
+    """Matrice pleine à partir des trois diagonales (sous-diagonale et sur-diagonale de longueur n-1)"""
+    n = len(diagonale)
+    A = np.zeros((n, n))
+    indices = np.arange(n)
+    A[indices, indices] = diagonale
+    A[indices[1:], indices[:-1]] = inferieure
+    A[indices[:-1], indices[1:]] = superieure
+    return A
+
+
+def thomas(inferieure, diagonale, superieure, b, suivi=None):
+    """Algorithme de Thomas (élimination de Gauss sans pivot, matrice à diagonale dominante; b de forme (n) ou (n, k))"""
+    n = len(diagonale)
+    with phase(suivi, "factorisation"):
+        c = np.empty(n - 1)
+        d = np.empty(np.shape(b))
+        pivot = diagonale[0]
+        if n > 1:
+            c[0] = superieure[0] / pivot
+        d[0] = b[0] / pivot
+        for i in range(1, n):
+            pivot = diagonale[i] - inferieure[i - 1] * c[i - 1]
+            if pivot == 0.0:
+                raise np.linalg.LinAlgError("Pivot nul dans l'algorithme de Thomas")
+            if i < n - 1:
+                c[i] = superieure[i] / pivot
+            d[i] = (b[i] - inferieure[i - 1] * d[i - 1]) / pivot
+    with phase(suivi, "resolution"):
+        for i in range(n - 2, -1, -1):
+            d[i] -= c[i] * d[i + 1]
+    return d
+
+
+def resoudre_tridiagonal(inferieure, diagonale, superieure, b, backend="bande", suivi=None):
+    """
+    Résout A·u = b pour A tridiagonale
+
+    Paramètres:
+        inferieure (ndarray): Sous-diagonale (n-1)
+        diagonale (ndarray): Diagonale (n)
+        superieure (ndarray): Sur-diagonale (n-1)
+        b (ndarray): Second membre (n), ou k seconds membres en colonnes (n, k)
+            résolus avec une seule factorisation
+        backend (str): "dense" ou "bande"
+        suivi (SuiviPhases): Mesure des phases (optionnel)
+
+    Retourne:
+        ndarray: Solution u (de la forme de b)
+
+    Raises:
+        np.linalg.LinAlgError: Si le système est singulier
+    """
+    verifier_backend(backend)
+    diagonale = np.asarray(diagonale, dtype=float)
+    b = np.asarray(b, dtype=float)
+
+    if backend == "dense":
+        with phase(suivi, "assemblage"):
+            A = matrice_dense(inferieure, diagonale, superieure)
+        with phase(suivi, "resolution"):
+            return np.linalg.solve(A, b)
+
+    solve_banded = _charger_solve_banded()
+    if solve_banded is None:
+        return thomas(inferieure, diagonale, superieure, b, suivi)
+
+    with phase(suivi, "assemblage"):
+        bandes = np.zeros((3, len(diagonale)))
+        bandes[0, 1:] = superieure
+        bandes[1] = diagonale
+        bandes[2, :-1] = inferieure
+    with phase(suivi, "resolution"):
+        return solve_banded((1, 1), bandes, b, overwrite_ab=True, check_finite=False)
+
+
+def produit_tridiagonal(inferieure, diagonale, superieure, u):
+    """Produit A·u pour A tridiagonale, en O(n) sans assembler A"""
+    u = np.asarray(u, dtype=float)
+    produit = np.asarray(diagonale, dtype=float) * u
+    produit[1:] += inferieure * u[:-1]
+    produit[:-1] += superieure * u[1:]
+    return produit
+
+
+def residu_tridiagonal(inferieure, diagonale, superieure, u, b):
+    """Norme infinie du résidu ‖A·u - b‖∞ (O(n))"""
+    return float(np.max(np.abs(produit_tridiagonal(inferieure, diagonale, superieure, u) - b), initial=0.0))
+
+
+def norme_1_tridiagonale(inferieure, diagonale, superieure):
+    """Norme 1 de A (maximum des sommes par colonne), exacte en O(n)"""
+    colonnes = np.abs(np.asarray(diagonale, dtype=float))
+    colonnes[:-1] += np.abs(inferieure)
+    colonnes[1:] += np.abs(superieure)
+    return float(np.max(colonnes, initial=0.0))
+
+
+def estimer_conditionnement(inferieure, diagonale, superieure, iterations_max=5):
+    """
+    Estimation de cond₁(A) = ‖A‖₁·‖A⁻¹‖₁ sans former A⁻¹
+
+    ‖A⁻¹‖₁ est estimée par l'algorithme de Hager (montée sur la boule
+    unité de la norme 1) avec les améliorations de Higham (LAPACK xLACON):
+    arrêt dès que le vecteur des signes se répète, puis comparaison avec
+    ‖A⁻¹·v‖₁ pour le vecteur alterné v_i = ±(1 + i/(n-1)), qui rattrape
+    les matrices où la montée s'arrête sur un maximum local. Chaque
+    itération coûte deux résolutions tridiagonales (A puis Aᵀ): O(n).
+    L'estimation est une borne inférieure, le plus souvent exacte.
+
+    Retourne:
+        float: Estimation du conditionnement (inf si A est singulière)
+    """
+    n = len(diagonale)
+    if n == 0:
+        return 0.0
+    try:
+        x = np.full(n, 1.0 / n)
+        signes_precedents = None
+        estimation = 0.0
+        for _ in range(iterations_max):
+            y = resoudre_tridiagonal(inferieure, diagonale, superieure, x)
+            estimation = max(estimation, float(np.sum(np.abs(y))))
+            signes = np.where(y >= 0, 1.0, -1.0)
+            if signes_precedents is not None and np.array_equal(signes, signes_precedents):
+                break
+            signes_precedents = signes
+            z = resoudre_tridiagonal(superieure, diagonale, inferieure, signes)
+            j = int(np.argmax(np.abs(z)))
+            if abs(z[j]) <= z @ x:
+                break
+            x = np.zeros(n)
+            x[j] = 1.0
+        alterne = (1.0 + np.arange(n) / max(n - 1, 1)) * np.where(np.arange(n) % 2 == 0, 1.0, -1.0)
+        y = resoudre_tridiagonal(inferieure, diagonale, superieure, alterne)
+        estimation = max(estimation, 2.0 * float(np.sum(np.abs(y))) / (3.0 * n))
+    except np.linalg.LinAlgError:
+        return float("inf")
+    if not np.isfinite(estimation):
+        return float("inf")
+    return norme_1_tridiagonale(inferieure, diagonale, superieure) * estimation
@@ -0,0 +1,412 @@
+"""
+STOCKAGE COLONNAIRE DES RUNS D'ANALYSE
+======================================
+
+Chaque exécution de main_analysis.py produisait un CSV (lignes vides et
+pseudo-ligne 'Ordre_moyen') et un long rapport texte: comparer des centaines
+de runs imposait de relire du texte. Ce module conserve les résultats dans un
+stockage colonnaire en ajout seul:
+
+    RUNS/
+        index.jsonl            une ligne JSON par run (schéma, date, environnement)
+        shards/<run>.npz       colonnes du run (une valeur par ligne)
+
+Une ligne correspond à un (cas, N): cas, schéma, N, h, erreurs dans chaque
+norme (colonnes erreur_*), ordre, ordre moyen du cas, durée de résolution...
+Les colonnes sont libres: un schéma peut en ajouter (ex: description).
+
+Les requêtes filtrent d'abord l'index (sans ouvrir les shards), puis ne
+chargent que les colonnes demandées. Les rapports CSV/TXT des TPs sont
+régénérés à la demande à partir du stockage.
+
+Emplacement par défaut: <racine du projet>/RUNS, modifiable par la variable
+d'environnement TP_ANAL_NUM_RUNS.
+
+Utilisation en ligne de commande:
+    python stockage_runs.py lister
+    python stockage_runs.py requete --cas "u(x) = sin(πx)" --schema VF
+    python stockage_runs.py csv 20250620_195113_DF resultats.csv
+"""
+
+import os
+import sys
+import csv
+import json
+import socket
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+
+_racine_projet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSSIER_DEFAUT = os.environ.get("TP_ANAL_NUM_RUNS", os.path.join(_racine_projet, "RUNS"))
+
+FICHIER_INDEX = "index.jsonl"
+DOSSIER_SHARDS = "shards"
+
+# Colonnes communes à tous les schémas (les autres sont libres)
+COLONNES_BASE = ("cas", "N", "h", "erreur_Linf", "ordre", "ordre_moyen", "duree")
+# Champs de l'index joints à chaque ligne des requêtes
+CHAMPS_RUN = ("run", "schema", "date", "python", "numpy", "plateforme", "hote")
+
+
+def environnement():
+    """Description de l'environnement d'exécution enregistrée avec chaque run"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plateforme': platform.platform(),
+        'processeur': platform.machine(),
+        'hote': socket.gethostname(),
+    }
+
+
+def lignes_depuis_resultats(tous_resultats, colonnes_cas=()):
+    """
+    Colonnes d'un run à partir de la liste de résultats par cas des TPs
+
+    Paramètres:
+        tous_resultats (list): dicts avec 'nom', 'N_values', 'erreurs',
+            'ordres', 'ordre_moyen' et optionnellement 'durees' et d'autres
+            normes d'erreur ('erreurs_<norme>')
+        colonnes_cas (iterable): Clés scalaires par cas à recopier sur chaque
+            ligne (ex: 'description')
+
+    Retourne:
+        dict: Colonnes (listes de même longueur)
+    """
+    colonnes = {nom: [] for nom in COLONNES_BASE}
+    for cle in colonnes_cas:
+        colonnes[cle] = []
+
+    for resultats in tous_resultats:
+        N_values = list(resultats['N_values'])
+        n = len(N_values)
+        ordres = [np.nan] + [float(o) for o in resultats['ordres']]
+        durees = resultats.get('durees') or [np.nan] * n
+
+        colonnes['cas'] += [resultats['nom']] * n
+        colonnes['N'] += [int(N) for N in N_values]
+        colonnes['h'] += [1.0 / N for N in N_values]
+        colonnes['erreur_Linf'] += [float(e) for e in resultats['erreurs'][:n]]
+        colonnes['ordre'] += (ordres + [np.nan] * n)[:n]
+        colonnes['ordre_moyen'] += [float(resultats['ordre_moyen'])] * n
+        colonnes['duree'] += [np.nan if d is None else float(d) for d in durees[:n]]
+        for cle in colonnes_cas:
+            colonnes[cle] += [resultats.get(cle, '')] * n
+
+        for cle, valeurs in resultats.items():
+            if cle.startswith('erreurs_'):
+                colonne = 'erreur_' + cle[len('erreurs_'):]
+                colonnes.setdefault(colonne, [np.nan] * (len(colonnes['N']) - n))
+                colonnes[colonne] += [float(v) for v in valeurs[:n]]
+        # Normes absentes pour ce cas
+        for colonne, valeurs in colonnes.items():
+            if len(valeurs) < len(colonnes['N']):
+                valeurs += [np.nan] * (len(colonnes['N']) - len(valeurs))
+    return colonnes
+
+
+def resultats_depuis_lignes(lignes, colonnes_cas=()):
+    """
+    Inverse de lignes_depuis_resultats: résultats par cas dans l'ordre des lignes
+
+    Retourne:
+        list: dicts 'nom', 'N_values', 'erreurs', 'ordres', 'ordre_moyen',
+            'durees', 'erreurs_<norme>' et les colonnes_cas
+    """
+    cas = lignes['cas']
+    tous_resultats = []
+    debut = 0
+    while debut < len(cas):
+        fin = debut
+        while fin < len(cas) and cas[fin] == cas[debut]:
+            fin += 1
+        tranche = slice(debut, fin)
+        resultats = {
+            'nom': str(cas[debut]),
+            'N_values': [int(N) for N in lignes['N'][tranche]],
+            'erreurs': [float(e) for e in lignes['erreur_Linf'][tranche]],
+            'ordres': [float(o) for o in lignes['ordre'][tranche][1:]],
+            'ordre_moyen': float(lignes['ordre_moyen'][debut]),
+            'durees': [float(d) for d in lignes['duree'][tranche]],
+        }
+        for colonne in lignes:
+            if colonne.startswith('erreur_') and colonne != 'erreur_Linf':
+                resultats['erreurs_' + colonne[len('erreur_'):]] = [float(e) for e in lignes[colonne][tranche]]
+        for cle in colonnes_cas:
+            resultats[cle] = str(lignes[cle][debut])
+        tous_resultats.append(resultats)
+        debut = fin
+    return tous_resultats
+
+
+def _correspond(valeurs, critere):
+    """Masque des valeurs satisfaisant un critère (valeur, collection de valeurs ou fonction)"""
+    valeurs = np.asarray(valeurs)
+    if callable(critere):
+        return np.asarray(critere(valeurs), dtype=bool)
+    if isinstance(critere, (list, tuple, set, frozenset)):
+        return np.isin(valeurs, list(critere))
+    return valeurs == critere
+
+
+class StockageRuns:
+    """
+    Stockage colonnaire en ajout seul des résultats de runs
+
+    Utilisation:
+        stockage = StockageRuns()
+        run = stockage.ajouter_run("DF", colonnes)
+        lignes = stockage.requete(cas="u(x) = x³", N=lambda N: N >= 80)
+    """
+
+    def __init__(self, dossier=None):
+        self.dossier = dossier or DOSSIER_DEFAUT
+        os.makedirs(os.path.join(self.dossier, DOSSIER_SHARDS), exist_ok=True)
+
+    @property
+    def fichier_index(self):
+        return os.path.join(self.dossier, FICHIER_INDEX)
+
+    def _chemin_shard(self, run):
+        return os.path.join(self.dossier, DOSSIER_SHARDS, run + ".npz")
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def _reserver(self, run):
+        """
+        Réserve un identifiant libre en créant son shard de façon exclusive
+
+        Deux runs concurrents de même identifiant obtiennent des suffixes
+        distincts (_2, _3, ...): la création O_EXCL échoue pour le second.
+
+        Retourne:
+            tuple: (identifiant réservé, chemin du shard)
+        """
+        base, suffixe = run, 1
+        while True:
+            chemin = self._chemin_shard(run)
+            try:
+                os.close(os.open(chemin, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+                return run, chemin
+            except FileExistsError:
+                suffixe += 1
+                run = f"{base}_{suffixe}"
+
+    def ajouter_run(self, schema, colonnes, run=None, meta=None):
+        """
+        Ajoute un run au stockage
+
+        Paramètres:
+            schema (str): Schéma numérique ("DF", "VF", ...)
+            colonnes (dict): Colonnes du run, toutes de même longueur
+            run (str): Identifiant (défaut: <date>_<schéma>)
+            meta (dict): Métadonnées supplémentaires de l'index (JSON)
+
+        Retourne:
+            str: Identifiant du run
+        """
+        tableaux = {nom: np.asarray(valeurs) for nom, valeurs in colonnes.items()}
+        longueurs = {len(t) for t in tableaux.values()}
+        if len(longueurs) > 1:
+            raise ValueError(f"Colonnes de longueurs différentes: {sorted(longueurs)}")
+
+        date = datetime.now()
+        run = run or f"{date.strftime('%Y%m%d_%H%M%S')}_{schema}"
+        run, chemin = self._reserver(run)
+
+        # Shard écrit atomiquement avant son entrée d'index: l'index ne référence
+        # jamais un shard incomplet (la réservation vide est remplacée d'un coup)
+        descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), prefix='.tmp')
+        try:
+            with os.fdopen(descripteur, 'wb') as f:
+                np.savez(f, **tableaux)
+            os.replace(temporaire, chemin)
+        except BaseException:
+            for fichier in (temporaire, chemin):
+                if os.path.exists(fichier):
+                    os.remove(fichier)
+            raise
+
+        entree = {'run': run, 'schema': schema, 'date': date.isoformat(timespec='seconds'),
+                  'lignes': longueurs.pop() if longueurs else 0,
+                  'colonnes': sorted(tableaux), **environnement(), **(meta or {})}
+        # Une seule écriture en mode ajout: les entrées de runs concurrents ne s'entremêlent pas
+        with open(self.fichier_index, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entree, ensure_ascii=False) + "\n")
+        return run
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def runs(self, **filtres):
+        """
+        Entrées de l'index (ordre d'ajout), filtrées par champ
+
+        Exemple: stockage.runs(schema="VF", date=lambda d: d >= "2025-06-20")
+        """
+        if not os.path.exists(self.fichier_index):
+            return []
+        entrees = []
+        with open(self.fichier_index, encoding='utf-8') as f:
+            for ligne in f:
+                if ligne.strip():
+                    entrees.append(json.loads(ligne))
+        for champ, critere in filtres.items():
+            entrees = [e for e in entrees if champ in e and bool(_correspond([e[champ]], critere)[0])]
+        return entrees
+
+    def dernier_run(self, **filtres):
+        """Identifiant du run le plus récent (None si aucun)"""
+        entrees = self.runs(**filtres)
+        return entrees[-1]['run'] if entrees else None
+
+    def charger_run(self, run, colonnes=None):
+        """
+        Colonnes d'un run
+
+        Paramètres:
+            run (str): Identifiant du run
+            colonnes (iterable): Colonnes à charger (défaut: toutes)
+
+        Retourne:
+            dict: nom de colonne → ndarray
+        """
+        with np.load(self._chemin_shard(run), allow_pickle=False) as archive:
+            noms = archive.files if colonnes is None else [c for c in colonnes if c in archive.files]
+            return {nom: archive[nom] for nom in noms}
+
+    def requete(self, colonnes=None, runs=None, **filtres):
+        """
+        Lignes de plusieurs runs satisfaisant des filtres
+
+        Paramètres:
+            colonnes (iterable): Colonnes à retourner (défaut: toutes)
+            runs (iterable): Identifiants de runs (défaut: tous)
+            **filtres: colonne=critère, le critère étant une valeur, une
+                collection de valeurs ou une fonction vectorisée renvoyant un
+                masque. Les champs de l'index (schema, date, numpy, hote...)
+                sont filtrés sans ouvrir les shards.
+
+        Retourne:
+            dict: Colonnes concaténées, avec les champs de l'index joints à
+                chaque ligne (run, schema, date, environnement)
+        """
+        filtres_index = {k: v for k, v in filtres.items() if k in CHAMPS_RUN}
+        filtres_lignes = {k: v for k, v in filtres.items() if k not in CHAMPS_RUN}
+        entrees = self.runs(**filtres_index)
+        if runs is not None:
+            runs = set(runs)
+            entrees = [e for e in entrees if e['run'] in runs]
+
+        morceaux = []
+        for entree in entrees:
+            a_charger = None if colonnes is None else set(colonnes) | set(filtres_lignes)
+            lignes = self.charger_run(entree['run'], a_charger)
+            n = entree['lignes']
+            masque = np.ones(n, dtype=bool)
+            for colonne, critere in filtres_lignes.items():
+                if colonne not in lignes:
+                    masque[:] = False
+                    break
+                masque &= _correspond(lignes[colonne], critere)
+            if not masque.any():
+                continue
+            morceau = {nom: valeurs[masque] for nom, valeurs in lignes.items()
+                       if colonnes is None or nom in colonnes}
+            for champ in CHAMPS_RUN:
+                if (colonnes is None or champ in colonnes) and champ in entree:
+                    morceau[champ] = np.full(int(masque.sum()), entree[champ])
+            morceaux.append(morceau)
+
+        if not morceaux:
+            return {}
+        noms = list(dict.fromkeys(nom for morceau in morceaux for nom in morceau))
+        resultat = {}
+        for nom in noms:
+            # Colonne absente d'un run: valeurs manquantes (nan ou chaîne vide)
+            parties = [m[nom] if nom in m else np.full(len(next(iter(m.values()))), np.nan)
+                       for m in morceaux]
+            if any(p.dtype.kind in 'US' for p in parties):
+                parties = [p.astype(str) if p.dtype.kind in 'US' else np.where(np.isnan(p), '', p.astype(str))
+                           for p in parties]
+            resultat[nom] = np.concatenate(parties)
+        return resultat
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def exporter_csv(self, fichier, colonnes=None, **requete):
+        """
+        Export CSV plat (une ligne par résultat, en-tête = colonnes)
+
+        Retourne:
+            int: Nombre de lignes écrites
+        """
+        lignes = self.requete(colonnes=colonnes, **requete)
+        noms = list(colonnes) if colonnes is not None else list(lignes)
+        n = len(next(iter(lignes.values()))) if lignes else 0
+        with open(fichier, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(noms)
+            for i in range(n):
+                writer.writerow([lignes[nom][i].item() if nom in lignes else '' for nom in noms])
+        return n
+
+
+def main(argv=None):
+    """Consultation du stockage des runs en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Stockage colonnaire des runs d'analyse")
+    parser.add_argument("--dossier", default=None, help=f"Dossier du stockage (défaut: {DOSSIER_DEFAUT})")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    lister = commandes.add_parser("lister", help="Lister les runs")
+    lister.add_argument("--schema", default=None)
+
+    requete = commandes.add_parser("requete", help="Lignes de tous les runs satisfaisant des filtres")
+    requete.add_argument("--schema", default=None)
+    requete.add_argument("--cas", default=None)
+    requete.add_argument("--N", type=int, default=None)
+    requete.add_argument("--colonnes", default="run,schema,cas,N,erreur_Linf,ordre",
+                         help="Colonnes affichées, séparées par des virgules")
+
+    export = commandes.add_parser("csv", help="Exporter un run (ou tous) en CSV plat")
+    export.add_argument("run", help="Identifiant du run ('tous' pour tous les runs)")
+    export.add_argument("fichier")
+
+    args = parser.parse_args(argv)
+    stockage = StockageRuns(args.dossier)
+
+    if args.commande == "lister":
+        filtres = {} if args.schema is None else {'schema': args.schema}
+        for entree in stockage.runs(**filtres):
+            print(f"{entree['run']:<32} {entree['schema']:<4} {entree['date']}  "
+                  f"{entree['lignes']:>4} lignes  numpy {entree.get('numpy', '?')}")
+        return 0
+
+    if args.commande == "requete":
+        filtres = {k: v for k, v in (('schema', args.schema), ('cas', args.cas), ('N', args.N))
+                   if v is not None}
+        colonnes = args.colonnes.split(",")
+        lignes = stockage.requete(colonnes=colonnes, **filtres)
+        print("\t".join(colonnes))
+        for i in range(len(next(iter(lignes.values()))) if lignes else 0):
+            print("\t".join(str(lignes[c][i]) if c in lignes else "" for c in colonnes))
+        return 0
+
+    runs = None if args.run == "tous" else [args.run]
+    n = stockage.exporter_csv(args.fichier, runs=runs)
+    print(f"📋 {n} ligne(s) exportée(s) dans {args.fichier}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+SUIVI DES PHASES D'UNE RÉSOLUTION: DURÉE, MÉMOIRE TRACÉE ET RSS
+===============================================================
+
+Instrumentation optionnelle des solveurs et des pilotes d'analyse. Chaque
+phase (évaluation du terme source, assemblage, factorisation, résolution,
+calcul des erreurs, tracé) est mesurée dans un bloc `with`:
+
+    suivi = SuiviPhases()
+    u, x = resoudre_equation_diff(f, 100_000, 0, 0, backend="bande", suivi=suivi)
+    print(suivi.resume())
+    # {"source": {"appels": 1, "duree": ..., "memoire_pic": ..., "rss_pic": ...}, ...}
+
+Pour chaque phase:
+- duree / cpu: temps mur et temps CPU du processus cumulés (secondes);
+- memoire_pic: allocation maximale tracée par tracemalloc pendant la phase,
+  au-delà de la mémoire allouée à son début (octets, maximum sur les appels);
+- rss_debut / rss_pic: mémoire résidente du processus au début de la phase
+  et maximum échantillonné pendant la phase (fil d'échantillonnage), ce que
+  voit le noyau quand il tue un processus pour manque de mémoire.
+
+tracemalloc n'est actif que pendant les phases (démarré et arrêté par le
+suivi s'il ne l'était pas déjà): le reste du programme n'est pas ralenti.
+Sans suivi (suivi=None, le défaut), phase(None, nom) est un contexte vide
+partagé: le coût de l'instrumentation désactivée est négligeable.
+
+Un suivi global (activer_suivi_global) permet d'instrumenter des appels qui
+ne transmettent pas de suivi, ex: les solveurs appelés par les tests
+(plugin collecte_pytest, option --flux-phases).
+"""
+
+import os
+import time
+import threading
+import contextlib
+import tracemalloc
+
+
+PHASES = ("source", "assemblage", "factorisation", "resolution", "erreur", "trace")
+INTERVALLE_RSS = 0.002       # secondes entre deux échantillons RSS
+
+_CONTEXTE_VIDE = contextlib.nullcontext()
+_suivi_global = None
+
+try:
+    _TAILLE_PAGE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _TAILLE_PAGE = 4096
+
+
+def rss_actuel():
+    """Mémoire résidente du processus (octets), None si indisponible sur la plateforme"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _TAILLE_PAGE
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class _EchantillonneurRSS(threading.Thread):
+    """Fil qui relève le maximum du RSS jusqu'à arreter()"""
+
+    def __init__(self, intervalle):
+        super().__init__(daemon=True)
+        self.intervalle = intervalle
+        self.pic = rss_actuel()
+        self._arret = threading.Event()
+
+    def run(self):
+        while not self._arret.wait(self.intervalle):
+            self.pic = max(self.pic, rss_actuel())
+
+    def arreter(self):
+        self._arret.set()
+        self.join()
+        self.pic = max(self.pic, rss_actuel())
+        return self.pic
+
+
+class SuiviPhases:
+    """
+    Mesures cumulées par phase
+
+    Paramètres:
+        memoire (bool): Mesurer le pic de mémoire tracée (tracemalloc)
+        rss (bool): Échantillonner la mémoire résidente du processus
+        intervalle_rss (float): Période d'échantillonnage du RSS (secondes)
+
+    Attributs:
+        phases (dict): {nom: {"appels", "duree", "cpu", "memoire_pic", "rss_debut", "rss_pic"}}
+        pic_trace_absolu (int): Plus haut pic tracemalloc absolu observé
+            (les phases réinitialisent le pic de tracemalloc: un outil qui
+            mesure son propre pic autour des phases doit en tenir compte)
+    """
+
+    def __init__(self, memoire=True, rss=True, intervalle_rss=INTERVALLE_RSS):
+        self.memoire = memoire
+        self.rss = rss and rss_actuel() is not None
+        self.intervalle_rss = intervalle_rss
+        self.phases = {}
+        self.pic_trace_absolu = 0
+        self._pile = []              # pics absolus des phases englobantes
+        self._trace_demarre = False
+
+    @contextlib.contextmanager
+    def phase(self, nom):
+        """Mesure le bloc comme une occurrence de la phase nom"""
+        if self.memoire and not self._pile and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._trace_demarre = True
+        tracer = self.memoire and tracemalloc.is_tracing()
+        if tracer:
+            avant, pic = tracemalloc.get_traced_memory()
+            self.pic_trace_absolu = max(self.pic_trace_absolu, pic)
+            if self._pile:
+                self._pile[-1] = max(self._pile[-1], pic)
+            tracemalloc.reset_peak()
+        self._pile.append(0)
+        echantillonneur = rss_debut = None
+        if self.rss:
+            echantillonneur = _EchantillonneurRSS(self.intervalle_rss)
+            rss_debut = echantillonneur.pic
+            echantillonneur.start()
+        debut = time.perf_counter()
+        debut_cpu = time.process_time()
+        try:
+            yield self
+        finally:
+            duree = time.perf_counter() - debut
+            cpu = time.process_time() - debut_cpu
+            rss_pic = echantillonneur.arreter() if echantillonneur is not None else None
+            pic_interne = self._pile.pop()
+            pic_phase = None
+            if tracer:
+                pic_absolu = max(tracemalloc.get_traced_memory()[1], pic_interne)
+                self.pic_trace_absolu = max(self.pic_trace_absolu, pic_absolu)
+                if self._pile:
+                    self._pile[-1] = max(self._pile[-1], pic_absolu)
+                pic_phase = max(0, pic_absolu - avant)
+            if self._trace_demarre and not self._pile:
+                tracemalloc.stop()
+                self._trace_demarre = False
+            self._enregistrer(nom, duree, cpu, pic_phase, rss_debut, rss_pic)
+
+    def _enregistrer(self, nom, duree, cpu, memoire_pic, rss_debut, rss_pic):
+        mesure = self.phases.setdefault(nom, {"appels": 0, "duree": 0.0, "cpu": 0.0, "memoire_pic": None,
+                                              "rss_debut": rss_debut, "rss_pic": None})
+        mesure["appels"] += 1
+        mesure["duree"] += duree
+        mesure["cpu"] += cpu
+        if memoire_pic is not None:
+            mesure["memoire_pic"] = max(mesure["memoire_pic"] or 0, memoire_pic)
+        if rss_pic is not None:
+            mesure["rss_pic"] = max(mesure["rss_pic"] or 0, rss_pic)
+
+    def resume(self):
+        """Copie des mesures, phases dans l'ordre de PHASES puis les autres"""
+        ordre = [p for p in PHASES if p in self.phases] + [p for p in self.phases if p not in PHASES]
+        return {nom: dict(self.phases[nom]) for nom in ordre}
+
+    def reinitialiser(self):
+        self.phases.clear()
+        self.pic_trace_absolu = 0
+
+
+def phase(suivi, nom):
+    """Contexte de mesure de la phase nom, ou contexte vide si suivi vaut None (et pas de suivi global)"""
+    suivi = suivi if suivi is not None else _suivi_global
+    if suivi is None:
+        return _CONTEXTE_VIDE
+    return suivi.phase(nom)
+
+
+def activer_suivi_global(suivi=None):
+    """Instrumente aussi les appels sans suivi explicite; retourne le suivi global"""
+    global _suivi_global
+    _suivi_global = suivi if suivi is not None else SuiviPhases()
+    return _suivi_global
+
+
+def desactiver_suivi_global():
+    global _suivi_global
+    _suivi_global = None
@@ -0,0 +1,319 @@
+"""
+EXÉCUTION DES TESTS RÉPARTIE SUR PLUSIEURS PROCESSUS
+====================================================
+
+Les tests d'une suite pytest (paramétrés compris, un nodeid par cas) sont
+répartis entre N processus pytest indépendants ("shards"):
+
+1. collecte des nodeids (pytest --collect-only, plugin collecte_pytest);
+2. répartition LPT (le plus long d'abord, vers le shard le moins chargé)
+   d'après les durées des exécutions précédentes, mémorisées dans un
+   fichier JSON à côté des tests (durée médiane pour les tests inconnus);
+3. lancement des shards avec --flux-selection (chaque shard garde l'ordre
+   de collecte) et un flux de résultats propre, suivi au fil de l'eau;
+4. fusion des flux en un seul flux au format de collecte_pytest (lisible
+   par lire_flux et test_reporter), mise à jour des durées.
+
+Arrêt au premier échec (-x): chaque shard s'arrête à son premier échec, et
+le premier échec vu dans un flux termine aussi les autres shards. Comme avec
+pytest -x, les tests non exécutés ne figurent pas dans les résultats.
+
+Utilisation:
+    resultat = executer_en_parallele("test_df_1d_pytest.py", dossier_tests, shards=4)
+    afficher_resume(resultat)
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import shutil
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+from collecte_pytest import ISSUES, nodeids_collectes
+from processus_calcul import Progression
+
+
+DUREE_DEFAUT = 0.05          # secondes, test jamais exécuté et historique vide
+FICHIER_DUREES = ".durees_tests.json"
+INTERVALLE_SUIVI = 0.1       # secondes entre deux lectures des flux des shards
+
+_dossier_outils = os.path.dirname(os.path.abspath(__file__))
+
+
+def _environnement():
+    """Environnement des processus pytest (plugin collecte_pytest importable)"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_dossier_outils, env.get("PYTHONPATH")]))
+    return env
+
+
+def charger_durees(chemin):
+    """Durées mémorisées {nodeid: secondes} (dictionnaire vide si absent ou illisible)"""
+    try:
+        with open(chemin, encoding="utf-8") as f:
+            durees = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {nodeid: float(d) for nodeid, d in durees.items()} if isinstance(durees, dict) else {}
+
+
+def enregistrer_durees(chemin, tests):
+    """Met à jour l'historique avec les durées des tests exécutés (écriture atomique)"""
+    durees = charger_durees(chemin)
+    durees.update({t["nodeid"]: t["duree"] for t in tests if t["issue"] != "SKIPPED"})
+    dossier = os.path.dirname(os.path.abspath(chemin))
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, prefix=".tmp", suffix=".json")
+    try:
+        with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+            json.dump(durees, f, indent=1, sort_keys=True)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
+
+def repartir(nodeids, durees, shards):
+    """
+    Répartition LPT des tests entre shards
+
+    Paramètres:
+        nodeids (list): Tests dans l'ordre de collecte
+        durees (dict): Durées connues {nodeid: secondes}
+        shards (int): Nombre de shards
+
+    Retourne:
+        list: Une liste de nodeids par shard non vide, dans l'ordre de collecte
+    """
+    connues = [durees[n] for n in nodeids if n in durees]
+    defaut = statistics.median(connues) if connues else DUREE_DEFAUT
+    rang = {nodeid: i for i, nodeid in enumerate(nodeids)}
+    par_duree = sorted(nodeids, key=lambda n: (-durees.get(n, defaut), rang[n]))
+
+    charges = [(0.0, i) for i in range(max(1, shards))]
+    groupes = [[] for _ in charges]
+    for nodeid in par_duree:
+        charge, i = heapq.heappop(charges)
+        groupes[i].append(nodeid)
+        heapq.heappush(charges, (charge + durees.get(nodeid, defaut), i))
+    return [sorted(groupe, key=rang.get) for groupe in groupes if groupe]
+
+
+def collecter(fichier_tests, dossier_tests, options_pytest=()):
+    """
+    Nodeids de la suite (pytest --collect-only)
+
+    Raises:
+        RuntimeError: Si la collecte échoue (sortie de pytest dans le message)
+    """
+    with tempfile.TemporaryDirectory() as temporaire:
+        flux = os.path.join(temporaire, "collecte.jsonl")
+        commande = [sys.executable, "-m", "pytest", fichier_tests, "--collect-only", "-q",
+                    f"--rootdir={dossier_tests}", "-p", "collecte_pytest", f"--flux-resultats={flux}",
+                    "--flux-sans-memoire", "-p", "no:cacheprovider", *options_pytest]
+        execution = subprocess.run(commande, cwd=dossier_tests, env=_environnement(),
+                                   capture_output=True, text=True)
+        if execution.returncode != 0:
+            raise RuntimeError(f"Collecte impossible (code {execution.returncode}):\n"
+                               f"{execution.stdout}{execution.stderr}")
+        return nodeids_collectes(flux)
+
+
+class _Shard:
+    """Processus pytest d'un groupe de tests, avec lecture incrémentale de son flux"""
+
+    def __init__(self, indice, nodeids, dossier_travail):
+        self.indice = indice
+        self.nodeids = nodeids
+        self.flux = os.path.join(dossier_travail, f"shard_{indice}.jsonl")
+        self.journal = os.path.join(dossier_travail, f"shard_{indice}.log")
+        self.selection = os.path.join(dossier_travail, f"shard_{indice}.txt")
+        self.processus = None
+        self.termine_force = False
+        self._position = 0
+        with open(self.selection, "w", encoding="utf-8") as f:
+            f.write("\n".join(nodeids) + "\n")
+
+    def lancer(self, fichier_tests, dossier_tests, options_pytest, arret_premier_echec):
+        # Options en --option=valeur: pytest ne prend pas les chemins pour des arguments (rootdir, nodeids)
+        commande = [sys.executable, "-m", "pytest", fichier_tests, "-q", "--tb=short", "--color=no",
+                    f"--rootdir={dossier_tests}", "-p", "collecte_pytest", f"--flux-resultats={self.flux}",
+                    "--flux-sans-memoire", f"--flux-selection={self.selection}", "-p", "no:cacheprovider",
+                    *options_pytest]
+        if arret_premier_echec:
+            commande.append("-x")
+        with open(self.journal, "w", encoding="utf-8") as journal:
+            self.processus = subprocess.Popen(commande, cwd=dossier_tests, env=_environnement(),
+                                              stdout=journal, stderr=subprocess.STDOUT)
+
+    def nouveaux_tests(self):
+        """Enregistrements de test complets écrits depuis la dernière lecture"""
+        if not os.path.exists(self.flux):
+            return []
+        with open(self.flux, "rb") as f:
+            f.seek(self._position)
+            contenu = f.read()
+        complet = contenu[:contenu.rfind(b"\n") + 1]     # dernière ligne peut-être en cours d'écriture
+        self._position += len(complet)
+        tests = []
+        for ligne in complet.decode("utf-8").splitlines():
+            try:
+                enregistrement = json.loads(ligne)
+            except json.JSONDecodeError:
+                continue
+            if enregistrement["type"] == "test":
+                tests.append(enregistrement)
+        return tests
+
+    def terminer(self):
+        if self.processus.poll() is None:
+            self.termine_force = True
+            self.processus.terminate()
+
+    def fin_journal(self, lignes=20):
+        with open(self.journal, encoding="utf-8", errors="replace") as f:
+            return "".join(f.readlines()[-lignes:])
+
+
+def executer_en_parallele(fichier_tests, dossier_tests, shards=None, arret_premier_echec=True,
+                          options_pytest=(), fichier_durees=None, sortie_flux=None, progression=True):
+    """
+    Exécute une suite pytest répartie sur plusieurs processus
+
+    Paramètres:
+        fichier_tests (str): Fichier (ou dossier) de tests, relatif à dossier_tests
+        dossier_tests (str): Répertoire d'exécution de pytest
+        shards (int): Nombre de processus (défaut: nombre de CPU)
+        arret_premier_echec (bool): Sémantique -x sur l'ensemble des shards
+        options_pytest (tuple): Options pytest supplémentaires
+        fichier_durees (str): Historique des durées (défaut: dossier_tests/.durees_tests.json)
+        sortie_flux (str): Flux fusionné à écrire (optionnel)
+        progression (bool): Barre de progression sur stderr
+
+    Retourne:
+        dict: code_sortie, tests (ordre de collecte), compteurs, non_executes,
+            duree_murale, duree_cumulee, shards (tests, durée estimée, code)
+    """
+    fichier_durees = fichier_durees or os.path.join(dossier_tests, FICHIER_DUREES)
+    debut = time.perf_counter()
+    date_debut = datetime.now().isoformat(timespec="seconds")
+
+    nodeids = collecter(fichier_tests, dossier_tests, options_pytest)
+    durees = charger_durees(fichier_durees)
+    groupes = repartir(nodeids, durees, shards or os.cpu_count() or 1)
+    connues = [durees[n] for n in nodeids if n in durees]
+    defaut = statistics.median(connues) if connues else DUREE_DEFAUT
+
+    barre = Progression(len(nodeids), progression)
+    resultats = {}
+    echec_vu = False
+    dossier_travail = tempfile.mkdtemp(prefix="shards_")
+    try:
+        liste = [_Shard(i, groupe, dossier_travail) for i, groupe in enumerate(groupes)]
+        for shard in liste:
+            shard.lancer(fichier_tests, dossier_tests, options_pytest, arret_premier_echec)
+
+        actifs = list(liste)
+        while actifs:
+            time.sleep(INTERVALLE_SUIVI)
+            for shard in list(actifs):
+                fini = shard.processus.poll() is not None
+                for test in shard.nouveaux_tests():
+                    resultats[test["nodeid"]] = test
+                    barre.avancer(test["nom"][:28])
+                    echec_vu = echec_vu or test["issue"] in ("FAILED", "ERROR")
+                if fini:
+                    actifs.remove(shard)
+            if echec_vu and arret_premier_echec:
+                for shard in actifs:
+                    shard.terminer()
+
+        rapports_shards = []
+        for shard in liste:
+            code = shard.processus.returncode
+            rapport = {"indice": shard.indice, "tests": len(shard.nodeids),
+                       "duree_estimee": sum(durees.get(n, defaut) for n in shard.nodeids),
+                       "code_sortie": code, "interrompu": shard.termine_force}
+            if not shard.termine_force and code not in (0, 1, 5):
+                rapport["journal"] = shard.fin_journal()
+            rapports_shards.append(rapport)
+    finally:
+        shutil.rmtree(dossier_travail, ignore_errors=True)
+
+    if barre.active and barre.faits < barre.total:
+        sys.stderr.write("\n")
+    tests = [resultats[n] for n in nodeids if n in resultats]
+    compteurs = {issue: sum(t["issue"] == issue for t in tests) for issue in ISSUES}
+    code_sortie = 0
+    if compteurs["FAILED"] or compteurs["ERROR"]:
+        code_sortie = 1
+    else:
+        anomalies = [r["code_sortie"] for r in rapports_shards
+                     if not r["interrompu"] and r["code_sortie"] not in (0, 5)]
+        code_sortie = anomalies[0] if anomalies else 0
+
+    resultat = {
+        "code_sortie": code_sortie, "tests": tests, "compteurs": compteurs,
+        "non_executes": [n for n in nodeids if n not in resultats],
+        "duree_murale": time.perf_counter() - debut,
+        "duree_cumulee": sum(t["duree"] for t in tests),
+        "shards": rapports_shards,
+    }
+    enregistrer_durees(fichier_durees, tests)
+    if sortie_flux:
+        ecrire_flux_fusionne(sortie_flux, resultat, nodeids, date_debut, dossier_tests)
+    return resultat
+
+
+def ecrire_flux_fusionne(chemin, resultat, nodeids, date_debut, racine):
+    """Flux unique au format collecte_pytest (debut, collecte, tests, fin)"""
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    enregistrements = [
+        {"type": "debut", "date": date_debut, "python": sys.version.split()[0], "pid": os.getpid(),
+         "racine": str(racine), "shards": len(resultat["shards"])},
+        {"type": "collecte", "nodeids": nodeids},
+        *resultat["tests"],
+        {"type": "fin", "code_sortie": resultat["code_sortie"], "duree": resultat["duree_murale"],
+         "compteurs": resultat["compteurs"],
+         "avertissements": sum(t["avertissements"] for t in resultat["tests"]),
+         "non_executes": len(resultat["non_executes"]), "shards": resultat["shards"]},
+    ]
+    with open(chemin, "w", encoding="utf-8") as f:
+        for enregistrement in enregistrements:
+            f.write(json.dumps(enregistrement, ensure_ascii=False) + "\n")
+
+
+def afficher_resume(resultat, lents=5, lignes_detail=15):
+    """Résumé texte: compteurs, échecs avec traceback court, tests les plus lents, équilibrage"""
+    compteurs = resultat["compteurs"]
+    print(" | ".join(f"{issue}: {n}" for issue, n in compteurs.items() if n)
+          or "Aucun test exécuté")
+    if resultat["non_executes"]:
+        print(f"⏹️  {len(resultat['non_executes'])} tests non exécutés (arrêt au premier échec)")
+
+    for test in resultat["tests"]:
+        if test["issue"] in ("FAILED", "ERROR"):
+            print(f"\n❌ {test['issue']} {test['nodeid']}")
+            print(f"   {test['message']}")
+            detail = (test["detail"] or "").splitlines()
+            for ligne in detail[-lignes_detail:]:
+                print(f"   │ {ligne}")
+
+    for shard in resultat["shards"]:
+        if "journal" in shard:
+            print(f"\n⚠️  Shard {shard['indice']} terminé avec le code {shard['code_sortie']}:")
+            print(shard["journal"])
+
+    plus_lents = sorted(resultat["tests"], key=lambda t: t["duree"], reverse=True)[:lents]
+    if plus_lents:
+        print(f"\n🐌 {len(plus_lents)} tests les plus lents:")
+        for test in plus_lents:
+            print(f"   {test['duree']:7.3f}s  {test['nodeid']}")
+
+    print(f"\n⏱️  {len(resultat['shards'])} shards: {resultat['duree_murale']:.2f}s (mur) pour "
+          f"{resultat['duree_cumulee']:.2f}s de tests cumulés")
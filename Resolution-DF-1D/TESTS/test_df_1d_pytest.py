@@ -5,6 +5,7 @@ TESTS CORRIGÉS - Version finale sans erreurs mathématiques
 
 import sys
 import os
+import subprocess
 
 # Gestion robuste des chemins
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,7 +15,10 @@ sys.path.insert(0, parent_dir)
 import pytest
 import numpy as np
 import warnings
-from solver_df_1d import resoudre_equation_diff, erreur_Linfini
+from solver_df_1d import resoudre_equation_diff, erreur_Linfini, analyser_convergence, cas_sin_pi_x, terme_source_sin
+from registre_cas import REGISTRE, obtenir_cas
+from benchmarks import complexite_empirique
+from suivi_phases import SuiviPhases
 
 
 class TestDifferencesFines1DCorrige:
@@ -325,6 +329,18 @@ class TestDifferencesFines1DCorrige:
         except (RuntimeError, np.linalg.LinAlgError):
             pass  # Acceptable
     
+    @pytest.mark.parametrize("backend", ["dense", "bande"])
+    def test_verification_valeurs_nan(self, backend):
+        """TEST ROBUSTESSE: NaN du terme source localisés par la vérification ✅"""
+        def f_source_nan(x):
+            return np.where(np.asarray(x) > 0.5, np.nan, 1.0)
+        
+        with pytest.raises(RuntimeError, match=r"4 point\(s\), premier en x=0\.6"):
+            resoudre_equation_diff(f_source_nan, 10, 0.0, 1.0, backend=backend, verification="lever")
+        with pytest.warns(RuntimeWarning, match="second membre non fini"):
+            u_num, _ = resoudre_equation_diff(f_source_nan, 10, 0.0, 1.0, backend=backend, verification="avertir")
+        assert np.any(np.isnan(u_num))
+    
     # =========================================================================
     # TESTS DE CONVERGENCE
     # =========================================================================
@@ -361,6 +377,33 @@ class TestDifferencesFines1DCorrige:
             else:
                 assert 1.8 <= ordre_moyen <= 2.2, f"Ordre incorrect pour {nom}: {ordre_moyen:.3f}"
     
+    def test_convergence_toutes_normes(self, tmp_path):
+        """TEST CONVERGENCE: Ordre 2 en normes L∞, L1, L2, H1 et énergie ✅"""
+        solution_exacte, terme_source, u0, u1, nom_cas = cas_sin_pi_x()
+        N_values = [10, 20, 40, 80, 160]
+        erreurs_par_norme = {}
+        
+        erreurs, _, _ = analyser_convergence(
+            solution_exacte, terme_source, u0, u1, N_values, nom_cas, str(tmp_path),
+            figures="aucune", erreurs_par_norme=erreurs_par_norme
+        )
+        
+        assert erreurs_par_norme['Linf'] == erreurs
+        for norme, valeurs in erreurs_par_norme.items():
+            ordre = np.log(valeurs[0] / valeurs[-1]) / np.log(N_values[-1] / N_values[0])
+            assert 1.9 <= ordre <= 2.1, f"Ordre incorrect en norme {norme}: {ordre:.3f}"
+        # Normes intégrales sous la norme L∞ sur [0,1]
+        assert erreurs_par_norme['L1'][-1] <= erreurs_par_norme['L2'][-1] <= erreurs[-1]
+    
+    @pytest.mark.parametrize("nom", REGISTRE.noms())
+    def test_constante_erreur_registre(self, nom):
+        """TEST CONVERGENCE: Erreur conforme à la constante du registre ✅"""
+        cas = REGISTRE[nom]
+        for N in (40, 160):
+            u_num, x = resoudre_equation_diff(cas.terme_source, N, cas.u0, cas.u1, backend="bande")
+            erreur = erreur_Linfini(u_num, cas.solution_exacte, x)
+            assert erreur == pytest.approx(cas.erreur_prevue(N), rel=0.01, abs=1e-12)
+    
     # =========================================================================
     # TESTS COMBINÉS
     # =========================================================================
@@ -408,5 +451,140 @@ class TestDifferencesFines1DCorrige:
         assert variation < 100, f"Variation excessive: {variation}"
 
 
+class TestTempsImport:
+    """Démarrage à froid: le solveur s'importe sans matplotlib ni scipy"""
+
+    BUDGET_IMPORT = 0.25   # secondes, numpy déjà chargé
+
+    def test_import_leger(self):
+        code = (
+            "import sys, time, numpy\n"
+            f"sys.path.insert(0, {parent_dir!r})\n"
+            "debut = time.perf_counter()\n"
+            "import solver_df_1d\n"
+            "duree = time.perf_counter() - debut\n"
+            "print(duree, *sorted(m for m in ('matplotlib', 'scipy') if m in sys.modules))\n"
+            "solver_df_1d.analyser_convergence\n"
+            "print('matplotlib' in sys.modules)\n"
+        )
+        sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        mesure, apres_analyse = sortie.stdout.splitlines()
+        duree, *modules_lourds = mesure.split()
+        assert modules_lourds == [], f"Modules lourds importés: {modules_lourds}"
+        assert float(duree) < self.BUDGET_IMPORT, f"Import en {float(duree):.3f} s"
+        assert apres_analyse == "True"
+
+
+class TestSuiviPhases:
+    """Instrumentation par phase des résolutions et de l'analyse"""
+
+    @pytest.mark.parametrize("backend", ["dense", "bande"])
+    def test_phases_resolution(self, backend):
+        suivi = SuiviPhases()
+        cas = obtenir_cas("sin")
+        u, x = resoudre_equation_diff(cas.terme_source, 200, cas.u0, cas.u1, backend=backend, suivi=suivi)
+        u_ref, _ = resoudre_equation_diff(cas.terme_source, 200, cas.u0, cas.u1, backend=backend)
+        np.testing.assert_array_equal(u, u_ref)
+        assert {"source", "assemblage", "resolution"} <= set(suivi.phases)
+        if backend == "dense":
+            # Matrice pleine (N-1)² flottants allouée pendant l'assemblage
+            assert suivi.phases["assemblage"]["memoire_pic"] >= 8 * 199**2
+
+    def test_phases_analyse(self, tmp_path):
+        suivi = SuiviPhases(rss=False)
+        cas = obtenir_cas("sin")
+        analyser_convergence(cas.solution_exacte, cas.terme_source, cas.u0, cas.u1, [10, 20, 40],
+                             cas.description, str(tmp_path), figures="aucune", backend="bande", suivi=suivi)
+        assert suivi.phases["source"]["appels"] == 3 and suivi.phases["erreur"]["appels"] == 3
+        assert "trace" in suivi.phases
+
+
+class TestDiagnostics:
+    """Relevé optionnel retourné par le solveur (diagnostics=True ou fonction de rappel)"""
+
+    @pytest.mark.parametrize("backend", ["dense", "bande"])
+    def test_releve(self, backend):
+        cas = obtenir_cas("sin")
+        N = 100
+        u, x, diag = resoudre_equation_diff(cas.terme_source, N, cas.u0, cas.u1, backend=backend, diagnostics=True)
+        u_ref, _ = resoudre_equation_diff(cas.terme_source, N, cas.u0, cas.u1, backend=backend)
+        np.testing.assert_array_equal(u, u_ref)
+        assert (diag.schema, diag.N, diag.backend) == ("DF", N, backend)
+        assert {"source", "assemblage", "resolution"} <= set(diag.phases)
+        assert all(mesure["duree"] >= 0 and mesure["cpu"] >= 0 for mesure in diag.phases.values())
+        assert diag.residu_relatif < 1e-14
+        # cond₁ du laplacien discret: exactement N²/2 pour N pair
+        assert diag.conditionnement == pytest.approx(N**2 / 2, rel=1e-8)
+
+    def test_verification_seuils(self):
+        cas = obtenir_cas("sin")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            resoudre_equation_diff(cas.terme_source, 1000, cas.u0, cas.u1, backend="bande", verification="lever")
+        # cond₁ = N²/2 dépasse le seuil de 1e12 au-delà de N ≈ 1,4 million
+        _, _, diag = resoudre_equation_diff(cas.terme_source, 2_000_000, cas.u0, cas.u1,
+                                            backend="bande", diagnostics=True)
+        assert not diag.valide and "conditionnement" in diag.alertes[0]
+        with pytest.raises(ValueError):
+            resoudre_equation_diff(cas.terme_source, 10, cas.u0, cas.u1, verification="oui")
+
+    def test_rappel(self):
+        releves = []
+        resultat = resoudre_equation_diff(terme_source_sin, 2, 0, 0, diagnostics=releves.append)
+        assert len(resultat) == 2 and len(releves) == 1
+        assert releves[0].conditionnement == pytest.approx(1.0)
+
+    def test_verification_mathematique_journal(self, capsys):
+        import io
+        import json
+        from journal import configurer_journal, arreter_journal
+        from noyau_df_1d import verification_mathematique
+        console = io.StringIO()
+        configurer_journal(console="json", flux_console=console)
+        try:
+            assert verification_mathematique()
+        finally:
+            arreter_journal()
+        assert capsys.readouterr().out == ""                      # rien hors du flux JSON lignes
+        lignes = [json.loads(ligne) for ligne in console.getvalue().splitlines()]
+        assert [ligne["evenement"] for ligne in lignes].count("verification_cas") == 3
+        assert lignes[-1]["evenement"] == "verification_mathematique" and lignes[-1]["correct"] is True
+
+
+@pytest.mark.performance
+class TestComplexite:
+    """
+    Complexité empirique: exposants de temps et de mémoire ajustés sur N
+
+    Le backend bande doit rester O(N) sur plus de deux décades de N; un retour
+    à l'assemblage dense (O(N²) mémoire, O(N³) temps) fait échouer ces tests.
+    Temps minimum par N et pente de Theil-Sen: tolérant au bruit d'une machine
+    partagée; une mesure hors limite est refaite une fois avant d'échouer.
+    """
+
+    N_LINEAIRES = [4_000, 16_000, 64_000, 256_000, 1_024_000]
+    EXPOSANT_TEMPS_MAX = 1.3
+    EXPOSANT_MEMOIRE_MAX = 1.15
+
+    @staticmethod
+    def _preparer(backend):
+        cas = obtenir_cas("sin")
+        return lambda N: (lambda: resoudre_equation_diff(cas.terme_source, N, cas.u0, cas.u1, backend=backend))
+
+    def test_resolution_bande_lineaire(self):
+        mesure = complexite_empirique(self._preparer("bande"), self.N_LINEAIRES)
+        if mesure["exposant_temps"] > self.EXPOSANT_TEMPS_MAX:
+            mesure = complexite_empirique(self._preparer("bande"), self.N_LINEAIRES)
+        assert mesure["exposant_memoire"] < self.EXPOSANT_MEMOIRE_MAX, \
+            f"Mémoire en N^{mesure['exposant_memoire']:.2f}: {mesure['memoire']}"
+        assert mesure["exposant_temps"] < self.EXPOSANT_TEMPS_MAX, \
+            f"Temps en N^{mesure['exposant_temps']:.2f}: {mesure['temps']}"
+
+    def test_detection_super_lineaire(self):
+        """Le même ajustement classe le backend dense comme super-linéaire"""
+        mesure = complexite_empirique(self._preparer("dense"), [80, 160, 320, 640], repetitions=3)
+        assert mesure["exposant_memoire"] > 1.8
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
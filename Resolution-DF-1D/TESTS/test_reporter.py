@@ -4,7 +4,8 @@ GÉNÉRATEUR DE RAPPORTS PROFESSIONNELS COMPLET
 
 Générateur de rapports de niveau professionnel avec:
 - Exécution robuste des tests avec gestion d'erreurs
-- Parsing intelligent des résultats pytest
+- Résultats lus dans le flux structuré du plugin collecte_pytest
+  (issue, durées par phase, pic mémoire, paramètres de chaque test)
 - Rapports TXT et Markdown de qualité publication
 - Analyses statistiques détaillées
 - Recommandations techniques
@@ -16,10 +17,11 @@ Date: 2025-06-20
 
 import sys
 import os
+import logging
+import argparse
 import subprocess
 import datetime
 import json
-import re
 from pathlib import Path
 import traceback
 
@@ -28,6 +30,51 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 tests_dir = script_dir
 resolution_dir = os.path.dirname(script_dir)
 project_root = os.path.dirname(resolution_dir)
+outils_dir = os.path.join(project_root, "Outils-Communs")
+if outils_dir not in sys.path:
+    sys.path.insert(0, outils_dir)
+
+from collecte_pytest import lire_flux
+from journal import emetteur, enregistrer_gabarit, encadrer, ajouter_options_journal, configurer_depuis_arguments, arreter_journal
+
+evenement = emetteur("test_reporter")
+
+
+@enregistrer_gabarit("debut_rapports")
+def rendu_debut_rapports(message, champs):
+    """Rendu console de debut_rapports: bandeau et métadonnées du projet"""
+    return "\n".join([encadrer(message), f"🎯 Projet: {champs['projet']}", f"👤 Auteur: {champs['auteur']}",
+                      f"📅 Date: {champs['date']}", "=" * 80])
+
+
+@enregistrer_gabarit("analyse_tests")
+def rendu_analyse_tests(message, champs):
+    """Rendu console de analyse_tests: décompte des issues"""
+    return "\n".join([message,
+                      f"   📊 Tests analysés: {champs['total']}",
+                      f"   ✅ Succès: {champs['passed']}",
+                      f"   ❌ Échecs: {champs['failed']}",
+                      f"   💥 Erreurs: {champs['errors']}"])
+
+
+@enregistrer_gabarit("fin_rapports")
+def rendu_fin_rapports(message, champs):
+    """Rendu console de fin_rapports: fichiers produits, statut de validation et bilan"""
+    lignes = ["\n" + encadrer(message)]
+    if champs['rapport_txt']:
+        lignes.append(f"📄 **Rapport TXT**: {champs['rapport_txt']}")
+    if champs['rapport_md']:
+        lignes.append(f"📝 **Rapport MD**: {champs['rapport_md']}")
+    lignes += [f"📁 **Dossier**: {champs['dossier']}", "=" * 80]
+    if champs['production_ready']:
+        lignes += ["🎉 **STATUT**: ✅ VALIDATION COMPLÈTE RÉUSSIE", "🚀 **Le solver est certifié pour utilisation !**"]
+    elif champs['taux_succes'] >= 95:
+        lignes += ["⚡ **STATUT**: ✅ VALIDATION QUASI-COMPLÈTE", "👍 **Le solver est acceptable avec réserves mineures**"]
+    else:
+        lignes += ["⚠️ **STATUT**: 🔧 RÉVISION NÉCESSAIRE", "📋 **Consulter les rapports pour les détails**"]
+    lignes += [f"📊 **Tests**: {champs['reussis']}/{champs['total']} réussis",
+               f"⏱️ **Durée**: {champs['duree']:.2f}s", "=" * 80]
+    return "\n".join(lignes)
 
 
 class TestReporterProfessionnel:
@@ -65,29 +112,28 @@ class TestReporterProfessionnel:
         self.stats = {}
         self.raw_results = {}
         self.analysis = {}
+        self.fichier_flux = os.path.join(self.rapport_dir, f"flux_tests_DF1D_{self.metadata['timestamp']}.jsonl")
     
     def ensure_directories(self):
         """Création des répertoires nécessaires"""
         try:
             os.makedirs(self.rapport_dir, exist_ok=True)
-            print(f"📁 Répertoire rapports: {self.rapport_dir}")
+            evenement("repertoire_rapports", f"📁 Répertoire rapports: {self.rapport_dir}", dossier=self.rapport_dir)
         except Exception as e:
-            print(f"❌ Erreur création répertoire: {e}")
+            evenement("erreur", f"❌ Erreur création répertoire: {e}", logging.ERROR, etape="repertoires", erreur=str(e))
             raise
     
     def executer_tests_robuste(self):
         """
         Exécution robuste des tests avec gestion complète des erreurs
         """
-        print("🔍 EXÉCUTION DES TESTS AVEC CAPTURE COMPLÈTE")
-        print("=" * 60)
+        evenement("debut_execution", "🔍 EXÉCUTION DES TESTS AVEC CAPTURE COMPLÈTE", schema="DF")
         
         # Changement vers le répertoire des tests
         original_dir = os.getcwd()
         
         try:
             os.chdir(tests_dir)
-            print(f"📁 Répertoire de travail: {os.getcwd()}")
             
             # Vérification de l'existence des fichiers
             test_file = self.config['test_file']
@@ -98,7 +144,8 @@ class TestReporterProfessionnel:
                     f"Fichiers disponibles: {available_files}"
                 )
             
-            print(f"✅ Fichier de test trouvé: {test_file}")
+            evenement("fichier_tests", f"📁 Répertoire de travail: {os.getcwd()}\n✅ Fichier de test trouvé: {test_file}",
+                      schema="DF", repertoire=os.getcwd(), fichier=test_file)
             
             # Préparation de la commande pytest
             pytest_cmd = [
@@ -106,16 +153,18 @@ class TestReporterProfessionnel:
                 test_file,
                 "-v",                           # Verbose
                 "--tb=long",                    # Traceback complet
-                "--durations=0",                # Toutes les durées
                 "--strict-markers",             # Vérification des markers
-                "--color=no",                   # Pas de couleurs pour parsing
-                "--no-header",                  # Pas d'en-tête pour parsing
+                "--color=no",                   # Sortie texte conservée dans les annexes
                 "-r", "fEsxXvs",               # Rapport détaillé de tous les types
+                "-p", "collecte_pytest",        # Flux structuré des résultats
+                "--flux-resultats", self.fichier_flux,
+                "--flux-phases",                # Durée et mémoire par phase des solveurs
             ]
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [outils_dir, env.get("PYTHONPATH")]))
             
-            print(f"📝 Commande: {' '.join(pytest_cmd)}")
-            print("🚀 Lancement de l'exécution...")
-            print("-" * 60)
+            evenement("commande", f"📝 Commande: {' '.join(pytest_cmd)}\n🚀 Lancement de l'exécution...\n" + "-" * 60,
+                      schema="DF", commande=pytest_cmd)
             
             # Exécution avec gestion du timeout
             start_time = datetime.datetime.now()
@@ -126,6 +175,7 @@ class TestReporterProfessionnel:
                     capture_output=True,
                     text=True,
                     encoding='utf-8',
+                    env=env,
                     timeout=self.config['timeout']
                 )
             except subprocess.TimeoutExpired:
@@ -146,13 +196,14 @@ class TestReporterProfessionnel:
                 'command': ' '.join(pytest_cmd)
             }
             
-            print(f"✅ Exécution terminée en {execution_duration:.2f}s")
-            print(f"📊 Code de sortie: {result.returncode}")
+            evenement("execution_tests", f"✅ Exécution terminée en {execution_duration:.2f}s\n"
+                      f"📊 Code de sortie: {result.returncode}", schema="DF",
+                      duree=execution_duration, code_sortie=result.returncode, flux=self.fichier_flux)
             
             return True
             
         except Exception as e:
-            print(f"❌ Erreur lors de l'exécution: {e}")
+            evenement("erreur", f"❌ Erreur lors de l'exécution: {e}", logging.ERROR, etape="execution", erreur=str(e))
             self.raw_results = {
                 'exit_code': -1,
                 'stdout': '',
@@ -171,14 +222,16 @@ class TestReporterProfessionnel:
         """
         Analyse complète et intelligente des résultats pytest
         """
-        print("\n📈 ANALYSE DÉTAILLÉE DES RÉSULTATS")
-        print("=" * 60)
-        
-        if not self.raw_results.get('success', False):
-            print("⚠️ Analyse sur résultats d'échec")
+        succes = self.raw_results.get('success', False)
+        evenement("debut_analyse_tests", "📈 ANALYSE DÉTAILLÉE DES RÉSULTATS"
+                  + ("" if succes else "\n⚠️ Analyse sur résultats d'échec"), schema="DF", sur_echec=not succes)
         
-        stdout = self.raw_results.get('stdout', '')
-        stderr = self.raw_results.get('stderr', '')
+        if os.path.exists(self.fichier_flux):
+            _, resultats_tests, fin = lire_flux(self.fichier_flux)
+        else:
+            evenement("flux_absent", f"⚠️ Flux de résultats absent: {self.fichier_flux}", logging.WARNING,
+                      fichier=self.fichier_flux)
+            resultats_tests, fin = [], None
         
         # Initialisation des statistiques
         self.stats = {
@@ -201,7 +254,9 @@ class TestReporterProfessionnel:
             'performance': {
                 'slowest_tests': [],
                 'fastest_tests': [],
-                'average_duration': 0
+                'average_duration': 0,
+                'peak_memory': None,
+                'phases': {}
             },
             'failures': {
                 'count': 0,
@@ -216,13 +271,13 @@ class TestReporterProfessionnel:
         
         try:
             # Analyse des résultats de tests individuels
-            self._analyser_tests_individuels(stdout)
+            self._analyser_tests_individuels(resultats_tests, fin)
             
             # Analyse des échecs
-            self._analyser_echecs(stdout)
+            self._analyser_echecs(resultats_tests)
             
             # Analyse des performances
-            self._analyser_performances(stdout)
+            self._analyser_performances(resultats_tests)
             
             # Analyse de la couverture
             self._analyser_couverture()
@@ -230,60 +285,48 @@ class TestReporterProfessionnel:
             # Génération de l'analyse qualitative
             self._generer_analyse_qualitative()
             
-            print(f"✅ Analyse terminée:")
-            print(f"   📊 Tests analysés: {self.stats['tests']['total']}")
-            print(f"   ✅ Succès: {self.stats['tests']['passed']}")
-            print(f"   ❌ Échecs: {self.stats['tests']['failed']}")
-            print(f"   💥 Erreurs: {self.stats['tests']['errors']}")
+            evenement("analyse_tests", f"✅ Analyse terminée:", schema="DF",
+                      **{cle: self.stats['tests'][cle] for cle in ('total', 'passed', 'failed', 'errors', 'skipped')})
             
         except Exception as e:
-            print(f"⚠️ Erreur pendant l'analyse: {e}")
-            print(f"🔍 Analyse partielle avec données disponibles")
+            evenement("erreur", f"⚠️ Erreur pendant l'analyse: {e}\n🔍 Analyse partielle avec données disponibles",
+                      logging.WARNING, etape="analyse", erreur=str(e))
     
-    def _analyser_tests_individuels(self, stdout):
-        """Analyse des tests individuels"""
-        
-        # Pattern pour capturer les résultats de tests
-        # Format: test_file.py::ClassName::test_method[param] STATUS
-        test_pattern = r'([^:]+::)?([^:\s]+)::(test_[^\s\[]+)(?:\[([^\]]+)\])?\s+(PASSED|FAILED|ERROR|SKIPPED)'
-        
-        matches = re.findall(test_pattern, stdout, re.MULTILINE)
+    def _analyser_tests_individuels(self, resultats_tests, fin=None):
+        """Analyse des tests individuels (enregistrements du flux)"""
+        
+        compteur_statut = {
+            'PASSED': 'passed', 'XPASS': 'passed',
+            'FAILED': 'failed',
+            'ERROR': 'errors',
+            'SKIPPED': 'skipped', 'XFAIL': 'skipped',
+        }
         
-        for match in matches:
-            file_part, class_name, test_name, param, status = match
-            
-            full_test_name = f"{class_name}::{test_name}"
-            if param:
-                full_test_name += f"[{param}]"
+        for resultat in resultats_tests:
+            full_test_name = "::".join(filter(None, [resultat['classe'], resultat['nom']]))
+            if resultat['id_parametres']:
+                full_test_name += f"[{resultat['id_parametres']}]"
             
             test_detail = {
                 'name': full_test_name,
-                'short_name': test_name,
-                'class': class_name,
-                'parameter': param if param else None,
-                'status': status,
-                'category': self._categoriser_test(test_name)
+                'short_name': resultat['nom'],
+                'class': resultat['classe'],
+                'parameter': resultat['id_parametres'],
+                'parameters': resultat['parametres'],
+                'status': resultat['issue'],
+                'duration': resultat['duree'],
+                'memory_peak': resultat['memoire_pic'],
+                'category': self._categoriser_test(resultat['nom'])
             }
             
             self.stats['tests']['details'].append(test_detail)
-            
-            # Comptage par statut
-            if status == 'PASSED':
-                self.stats['tests']['passed'] += 1
-            elif status == 'FAILED':
-                self.stats['tests']['failed'] += 1
-            elif status == 'ERROR':
-                self.stats['tests']['errors'] += 1
-            elif status == 'SKIPPED':
-                self.stats['tests']['skipped'] += 1
+            self.stats['tests'][compteur_statut[resultat['issue']]] += 1
         
         self.stats['tests']['total'] = len(self.stats['tests']['details'])
         
-        # Analyse des warnings
-        warning_pattern = r'(\d+) warning'
-        warning_match = re.search(warning_pattern, stdout)
-        if warning_match:
-            self.stats['tests']['warnings'] = int(warning_match.group(1))
+        # Warnings comptés par le plugin
+        if fin is not None:
+            self.stats['tests']['warnings'] = fin['avertissements']
     
     def _categoriser_test(self, test_name):
         """Catégorise les tests selon leur nom"""
@@ -305,32 +348,29 @@ class TestReporterProfessionnel:
         
         return 'autre'
     
-    def _analyser_echecs(self, stdout):
+    def _analyser_echecs(self, resultats_tests):
         """Analyse détaillée des échecs"""
         
-        # Recherche de la section FAILURES
-        if 'FAILURES' in stdout:
-            failures_section = stdout.split('FAILURES')[1]
-            if '=====' in failures_section:
-                failures_section = failures_section.split('=====')[0]
-            
-            # Pattern pour extraire les détails d'échec
-            failure_pattern = r'_+ ([^_]+) _+\n(.*?)(?=_+ [^_]+ _+|\Z)'
-            failure_matches = re.findall(failure_pattern, failures_section, re.DOTALL)
+        for resultat in resultats_tests:
+            if resultat['issue'] not in ('FAILED', 'ERROR'):
+                continue
+            message = resultat['message'] or ''
+            premiere_ligne = message.splitlines()[0] if message else ''
+            if premiere_ligne.startswith('AssertionError: '):
+                assertion = premiere_ligne[len('AssertionError: '):]
+            else:
+                assertion = premiere_ligne or 'Non spécifié'
+            detail = resultat['detail'] or message
+            
+            failure_info = {
+                'test': resultat['nodeid'].split('::', 1)[-1],
+                'full_detail': detail.strip(),
+                'assertion': assertion,
+                'phase': resultat['phase_echec'],
+                'category': self._categoriser_echec(detail)
+            }
             
-            for test_name, failure_detail in failure_matches:
-                # Extraction de l'assertion error
-                assert_pattern = r'AssertionError: (.+)'
-                assert_match = re.search(assert_pattern, failure_detail)
-                
-                failure_info = {
-                    'test': test_name.strip(),
-                    'full_detail': failure_detail.strip(),
-                    'assertion': assert_match.group(1) if assert_match else 'Non spécifié',
-                    'category': self._categoriser_echec(failure_detail)
-                }
-                
-                self.stats['failures']['details'].append(failure_info)
+            self.stats['failures']['details'].append(failure_info)
         
         self.stats['failures']['count'] = len(self.stats['failures']['details'])
     
@@ -349,23 +389,17 @@ class TestReporterProfessionnel:
         else:
             return 'autre'
     
-    def _analyser_performances(self, stdout):
-        """Analyse des performances des tests"""
-        
-        # Pattern pour les durées: 0.05s call test_name
-        duration_pattern = r'([\d.]+)s call (.+)'
-        duration_matches = re.findall(duration_pattern, stdout)
-        
-        durations = []
-        for duration_str, test_name in duration_matches:
-            try:
-                duration = float(duration_str)
-                durations.append({
-                    'test': test_name.strip(),
-                    'duration': duration
-                })
-            except ValueError:
-                continue
+    def _analyser_performances(self, resultats_tests):
+        """Analyse des performances des tests (durée de la phase d'appel, pic mémoire)"""
+        
+        durations = [
+            {
+                'test': resultat['nodeid'].split('::', 1)[-1],
+                'duration': resultat['durees'].get('call', 0.0),
+                'memory_peak': resultat['memoire_pic']
+            }
+            for resultat in resultats_tests if 'call' in resultat['durees']
+        ]
         
         if durations:
             # Tri par durée
@@ -374,6 +408,24 @@ class TestReporterProfessionnel:
             self.stats['performance']['slowest_tests'] = durations[:5]
             self.stats['performance']['fastest_tests'] = durations[-5:]
             self.stats['performance']['average_duration'] = sum(d['duration'] for d in durations) / len(durations)
+            
+            pics = [d for d in durations if d['memory_peak'] is not None]
+            if pics:
+                self.stats['performance']['peak_memory'] = max(pics, key=lambda d: d['memory_peak'])
+        
+        # Phases des solveurs (--flux-phases): cumul des durées, pics sur l'ensemble des tests
+        phases = self.stats['performance']['phases']
+        for resultat in resultats_tests:
+            for nom, mesure in (resultat.get('phases') or {}).items():
+                cumul = phases.setdefault(nom, {'calls': 0, 'duration': 0.0, 'memory_peak': None,
+                                                'rss_peak': None, 'memory_peak_test': None})
+                cumul['calls'] += mesure['appels']
+                cumul['duration'] += mesure['duree']
+                if mesure['memoire_pic'] is not None and mesure['memoire_pic'] > (cumul['memory_peak'] or -1):
+                    cumul['memory_peak'] = mesure['memoire_pic']
+                    cumul['memory_peak_test'] = resultat['nodeid'].split('::', 1)[-1]
+                if mesure['rss_pic'] is not None:
+                    cumul['rss_peak'] = max(cumul['rss_peak'] or 0, mesure['rss_pic'])
     
     def _analyser_couverture(self):
         """Analyse de la couverture des tests"""
@@ -440,11 +492,11 @@ class TestReporterProfessionnel:
                 self._ecrire_recommandations_txt(f)
                 self._ecrire_annexes_txt(f)
             
-            print(f"✅ Rapport TXT généré: {filepath}")
+            evenement("rapport", f"✅ Rapport TXT généré: {filepath}", schema="DF", format="txt", fichier=filepath)
             return filepath
             
         except Exception as e:
-            print(f"❌ Erreur génération rapport TXT: {e}")
+            evenement("erreur", f"❌ Erreur génération rapport TXT: {e}", logging.ERROR, etape="rapport_txt", erreur=str(e))
             return None
     
     def _ecrire_entete_txt(self, f):
@@ -647,7 +699,8 @@ class TestReporterProfessionnel:
                 test_name = test['test']
                 if len(test_name) > 40:
                     test_name = test_name[:37] + "..."
-                f.write(f"   {test['duration']:>6.3f}s  {test_name}\n")
+                memoire = f"{test['memory_peak'] / 1e6:>7.2f} Mo" if test['memory_peak'] is not None else " " * 10
+                f.write(f"   {test['duration']:>6.3f}s {memoire}  {test_name}\n")
             
             if self.stats['performance']['fastest_tests']:
                 f.write("\nTests les plus rapides:\n")
@@ -658,6 +711,19 @@ class TestReporterProfessionnel:
                         test_name = test_name[:37] + "..."
                     f.write(f"   {test['duration']:>6.3f}s  {test_name}\n")
         
+        pic = self.stats['performance']['peak_memory']
+        if pic:
+            f.write(f"\nPic mémoire maximal: {pic['memory_peak'] / 1e6:.2f} Mo ({pic['test']})\n")
+        
+        if self.stats['performance']['phases']:
+            f.write("\nPhases des solveurs (tous tests):\n")
+            f.write("-" * 30 + "\n")
+            f.write(f"   {'phase':<14} {'appels':>7} {'durée':>9} {'pic tracé':>11} {'pic RSS':>10}\n")
+            for nom, mesure in self.stats['performance']['phases'].items():
+                trace = f"{mesure['memory_peak'] / 1e6:.2f} Mo" if mesure['memory_peak'] is not None else "-"
+                rss = f"{mesure['rss_peak'] / 1e6:.1f} Mo" if mesure['rss_peak'] is not None else "-"
+                f.write(f"   {nom:<14} {mesure['calls']:>7d} {mesure['duration']:>8.3f}s {trace:>11} {rss:>10}\n")
+        
         # Évaluation des performances
         total_time = self.stats['execution']['duration']
         total_tests = self.stats['tests']['total']
@@ -736,6 +802,7 @@ class TestReporterProfessionnel:
         f.write(f"Python: {sys.version.split()[0]}\n")
         f.write(f"Répertoire de travail: {os.getcwd()}\n")
         f.write(f"Commande exécutée: {self.raw_results.get('command', 'N/A')}\n")
+        f.write(f"Flux des résultats: {self.fichier_flux}\n")
         f.write(f"Heure de début: {self.stats['execution']['start_time']}\n")
         f.write(f"Heure de fin: {self.stats['execution']['end_time']}\n\n")
         
@@ -775,11 +842,11 @@ class TestReporterProfessionnel:
                 self._ecrire_conclusions_md(f)
                 self._ecrire_annexes_md(f)
             
-            print(f"✅ Rapport Markdown généré: {filepath}")
+            evenement("rapport", f"✅ Rapport Markdown généré: {filepath}", schema="DF", format="md", fichier=filepath)
             return filepath
             
         except Exception as e:
-            print(f"❌ Erreur génération rapport Markdown: {e}")
+            evenement("erreur", f"❌ Erreur génération rapport Markdown: {e}", logging.ERROR, etape="rapport_md", erreur=str(e))
             return None
     
     def _ecrire_entete_md(self, f):
@@ -1076,16 +1143,28 @@ class TestReporterProfessionnel:
             f.write(f"**Temps moyen par test**: {self.stats['performance']['average_duration']:.4f}s\n\n")
             
             f.write("### 🐌 Tests les plus lents\n\n")
-            f.write("| Test | Durée |\n")
-            f.write("|------|-------|\n")
+            f.write("| Test | Durée | Pic mémoire |\n")
+            f.write("|------|-------|-------------|\n")
             
             for test in self.stats['performance']['slowest_tests'][:3]:
                 test_name = test['test']
                 if len(test_name) > 50:
                     test_name = test_name[:47] + "..."
-                f.write(f"| `{test_name}` | {test['duration']:.3f}s |\n")
+                memoire = f"{test['memory_peak'] / 1e6:.2f} Mo" if test['memory_peak'] is not None else "-"
+                f.write(f"| `{test_name}` | {test['duration']:.3f}s | {memoire} |\n")
             
             f.write("\n")
+            
+            if self.stats['performance']['phases']:
+                f.write("### 🧮 Phases des Solveurs\n\n")
+                f.write("| Phase | Appels | Durée cumulée | Pic mémoire tracée | Pic RSS | Test du pic |\n")
+                f.write("|-------|--------|---------------|--------------------|---------|-------------|\n")
+                for nom, mesure in self.stats['performance']['phases'].items():
+                    trace = f"{mesure['memory_peak'] / 1e6:.2f} Mo" if mesure['memory_peak'] is not None else "-"
+                    rss = f"{mesure['rss_peak'] / 1e6:.1f} Mo" if mesure['rss_peak'] is not None else "-"
+                    test_pic = f"`{mesure['memory_peak_test']}`" if mesure['memory_peak_test'] else "-"
+                    f.write(f"| {nom} | {mesure['calls']} | {mesure['duration']:.3f}s | {trace} | {rss} | {test_pic} |\n")
+                f.write("\n")
     
     def _ecrire_conclusions_md(self, f):
         """Écrit les conclusions Markdown"""
@@ -1210,73 +1289,61 @@ class TestReporterProfessionnel:
         """
         Point d'entrée principal pour génération complète des rapports
         """
-        print("=" * 80)
-        print("📊 GÉNÉRATEUR DE RAPPORTS PROFESSIONNELS")
-        print("=" * 80)
-        print(f"🎯 Projet: {self.metadata['projet']}")
-        print(f"👤 Auteur: {self.metadata['auteur']}")
-        print(f"📅 Date: {self.metadata['date']}")
-        print("=" * 80)
+        evenement("debut_rapports", "📊 GÉNÉRATEUR DE RAPPORTS PROFESSIONNELS", schema="DF",
+                  projet=self.metadata['projet'], auteur=self.metadata['auteur'], date=self.metadata['date'])
         
         try:
             # Étape 1: Exécution des tests
-            print("\n🚀 ÉTAPE 1: EXÉCUTION DES TESTS")
+            evenement("etape", "🚀 ÉTAPE 1: EXÉCUTION DES TESTS", etape=1, intitule="execution")
             if not self.executer_tests_robuste():
-                print("⚠️ Problème lors de l'exécution, mais on continue l'analyse...")
+                evenement("execution_incomplete", "⚠️ Problème lors de l'exécution, mais on continue l'analyse...",
+                          logging.WARNING, schema="DF")
             
             # Étape 2: Analyse des résultats
-            print("\n📈 ÉTAPE 2: ANALYSE DES RÉSULTATS")
+            evenement("etape", "📈 ÉTAPE 2: ANALYSE DES RÉSULTATS", etape=2, intitule="analyse")
             self.analyser_resultats_complet()
             
             # Étape 3: Génération des rapports
-            print("\n📝 ÉTAPE 3: GÉNÉRATION DES RAPPORTS")
+            evenement("etape", "📝 ÉTAPE 3: GÉNÉRATION DES RAPPORTS", etape=3, intitule="rapports")
             rapport_txt = self.generer_rapport_txt_professionnel()
             rapport_md = self.generer_rapport_markdown_professionnel()
             
             # Rapport final
-            print("\n" + "=" * 80)
-            print("✅ GÉNÉRATION TERMINÉE AVEC SUCCÈS")
-            print("=" * 80)
-            
-            if rapport_txt:
-                print(f"📄 **Rapport TXT**: {rapport_txt}")
-            if rapport_md:
-                print(f"📝 **Rapport MD**: {rapport_md}")
-            
-            print(f"📁 **Dossier**: {self.rapport_dir}")
-            print("=" * 80)
-            
-            # Résumé final
-            if self.analysis.get('production_ready', False):
-                print("🎉 **STATUT**: ✅ VALIDATION COMPLÈTE RÉUSSIE")
-                print("🚀 **Le solver est certifié pour utilisation !**")
-            elif self.analysis.get('success_rate', 0) >= 95:
-                print("⚡ **STATUT**: ✅ VALIDATION QUASI-COMPLÈTE")
-                print("👍 **Le solver est acceptable avec réserves mineures**")
-            else:
-                print("⚠️ **STATUT**: 🔧 RÉVISION NÉCESSAIRE")
-                print("📋 **Consulter les rapports pour les détails**")
-            
-            print(f"📊 **Tests**: {self.stats['tests']['passed']}/{self.stats['tests']['total']} réussis")
-            print(f"⏱️ **Durée**: {self.stats['execution']['duration']:.2f}s")
-            print("=" * 80)
+            evenement("fin_rapports", "✅ GÉNÉRATION TERMINÉE AVEC SUCCÈS", schema="DF",
+                      rapport_txt=rapport_txt, rapport_md=rapport_md, dossier=self.rapport_dir,
+                      production_ready=self.analysis.get('production_ready', False),
+                      taux_succes=self.analysis.get('success_rate', 0),
+                      reussis=self.stats['tests']['passed'], total=self.stats['tests']['total'],
+                      duree=self.stats['execution']['duration'],
+                      rapports=[r for r in (rapport_txt, rapport_md) if r])
             
             return self.raw_results.get('success', False)
             
         except Exception as e:
-            print(f"\n❌ ERREUR FATALE LORS DE LA GÉNÉRATION")
-            print(f"💥 {e}")
-            print(f"🔍 Traceback: {traceback.format_exc()}")
+            trace = traceback.format_exc()
+            evenement("erreur", f"\n❌ ERREUR FATALE LORS DE LA GÉNÉRATION\n💥 {e}\n🔍 Traceback: {trace}", logging.ERROR,
+                      etape="generation", erreur=str(e), traceback=trace)
             return False
 
 
-def main():
+def main(argv=None):
     """
-    Point d'entrée principal du générateur de rapports
+    Point d'entrée principal du générateur de rapports (journal avec --journal)
     """
-    print("🎯 GÉNÉRATEUR DE RAPPORTS PROFESSIONNELS")
-    print("📋 Utilisation: Génération de rapports de validation complets")
-    print("-" * 60)
+    parser = argparse.ArgumentParser(description="Générateur de rapports de validation DF 1D")
+    ajouter_options_journal(parser)
+    args = parser.parse_args(argv)
+    configurer_depuis_arguments(args)
+    try:
+        return generer()
+    finally:
+        arreter_journal()
+
+
+def generer():
+    """Exécution des tests et génération des rapports"""
+    evenement("presentation", "🎯 GÉNÉRATEUR DE RAPPORTS PROFESSIONNELS\n"
+              "📋 Utilisation: Génération de rapports de validation complets", schema="DF")
     
     try:
         reporter = TestReporterProfessionnel()
@@ -1284,7 +1351,7 @@ def main():
         return 0 if success else 1
         
     except Exception as e:
-        print(f"💥 Erreur fatale: {e}")
+        evenement("erreur", f"💥 Erreur fatale: {e}", logging.ERROR, etape="initialisation", erreur=str(e))
         return 1
 
 
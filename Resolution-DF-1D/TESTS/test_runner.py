@@ -4,6 +4,9 @@ Script d'exécution robuste qui fonctionne depuis n'importe où
 
 import sys
 import os
+import argparse
+import time
+import logging
 import subprocess
 import datetime
 
@@ -12,24 +15,71 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 tests_dir = script_dir
 resolution_dir = os.path.dirname(script_dir)
 project_root = os.path.dirname(resolution_dir)
+outils_dir = os.path.join(project_root, "Outils-Communs")
+if outils_dir not in sys.path:
+    sys.path.insert(0, outils_dir)
 
-def main():
+from profilage import ajouter_options_profilage
+from journal import (
+    emetteur, enregistrer_gabarit, encadrer, ajouter_options_journal, configurer_depuis_arguments,
+    arreter_journal, vider_journal
+)
+
+evenement = emetteur("test_runner")
+
+
+@enregistrer_gabarit("debut_tests")
+def rendu_debut_tests(message, champs):
+    """Rendu console de debut_tests: bandeau, contexte du run et répertoires"""
+    repertoires = champs['repertoires']
+    return "\n".join([
+        encadrer(message),
+        f"📅 Date: {champs['date']}",
+        f"👤 Utilisateur: {champs['utilisateur']}",
+        f"🔧 Framework: {champs['framework']}",
+        "=" * 80,
+        f"📁 Répertoire de travail: {repertoires['travail']}",
+        f"📁 Répertoire du script: {repertoires['script']}",
+        f"📁 Répertoire des tests: {repertoires['tests']}",
+        f"📁 Répertoire Resolution-DF-1D: {repertoires['resolution']}",
+        "=" * 80,
+    ])
+
+
+@enregistrer_gabarit("fin_tests")
+def rendu_fin_tests(message, champs):
+    """Rendu console de fin_tests: bilan encadré selon le code de sortie"""
+    if champs['code_sortie'] == 0:
+        details = ["🎯 Le solver des différences finies 1D est VALIDÉ.",
+                   "🔧 Tolérances mathématiquement rigoureuses respectées.",
+                   "📊 Couverture de tests COMPLÈTE sans régression."]
+    else:
+        details = ["⚠️  Vérifier l'implémentation du solver."]
+    return "\n" + encadrer("\n".join([message] + details))
+
+
+def analyser_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de tests DF 1D")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1,
+                        help="Processus pytest en parallèle (défaut: nombre de CPU, 1 = exécution directe)")
+    parser.add_argument("--sans-arret", action="store_true",
+                        help="Ne pas s'arrêter au premier échec")
+    ajouter_options_profilage(parser)
+    ajouter_options_journal(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Exécute les tests depuis le bon répertoire"""
+    args = analyser_arguments(argv)
+    configurer_depuis_arguments(args)
+    debut = time.perf_counter()
     
-    print("=" * 80)
-    print("🚀 LANCEMENT DE LA SUITE DE TESTS COMPLÈTE (VERSION ROBUSTE)")
-    print("=" * 80)
-    print(f"📅 Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"👤 Utilisateur: theTigerFox")
-    print(f"🔧 Framework: pytest")
-    print("=" * 80)
-    
-    # Affichage des chemins pour debug
-    print(f"📁 Répertoire de travail: {os.getcwd()}")
-    print(f"📁 Répertoire du script: {script_dir}")
-    print(f"📁 Répertoire des tests: {tests_dir}")
-    print(f"📁 Répertoire Resolution-DF-1D: {resolution_dir}")
-    print("=" * 80)
+    # Chemins affichés pour debug
+    evenement("debut_tests", "🚀 LANCEMENT DE LA SUITE DE TESTS COMPLÈTE (VERSION ROBUSTE)", schema="DF", shards=args.shards,
+              arret_premier_echec=not args.sans_arret, profil=args.profil,
+              date=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'), utilisateur="theTigerFox", framework="pytest",
+              repertoires={"travail": os.getcwd(), "script": script_dir, "tests": tests_dir, "resolution": resolution_dir})
     
     # Changement vers le répertoire des tests
     original_dir = os.getcwd()
@@ -39,51 +89,91 @@ def main():
         # Vérification que les fichiers existent
         test_file = "test_df_1d_pytest.py"
         if not os.path.exists(test_file):
-            print(f"❌ Fichier de test non trouvé: {test_file}")
-            print(f"📁 Contenu du répertoire: {os.listdir('.')}")
+            contenu = os.listdir('.')
+            evenement("fichier_absent", f"❌ Fichier de test non trouvé: {test_file}\n📁 Contenu du répertoire: {contenu}",
+                      logging.ERROR, schema="DF", fichier=test_file, contenu=contenu)
             return 1
         
-        # Arguments pytest optimisés
-        pytest_args = [
-            sys.executable, "-m", "pytest",
-            test_file,                    # Fichier de tests
-            "-v",                        # Mode verbose
-            "--tb=short",               # Traceback court
-            "--color=yes",              # Couleurs
-            "--durations=5",            # Top 5 des tests les plus lents
-            "--strict-markers",         # Vérification markers
-            "-x",                       # Arrêt au premier échec
-            "--disable-warnings",       # Masquer warnings pytest
-        ]
-        
-        print("🧪 Exécution des tests...")
-        print(f"📝 Commande: {' '.join(pytest_args)}")
-        print("=" * 80)
-        
-        # Exécution
-        result = subprocess.run(pytest_args, 
-                              capture_output=False,  # Affichage direct
-                              text=True)
-        
-        exit_code = result.returncode
+        if args.profil and args.shards > 1:
+            evenement("profil_direct", "🔥 Profilage: exécution directe dans un seul processus pytest",
+                      schema="DF", shards_demandes=args.shards)
+        if args.shards > 1 and not args.profil:
+            exit_code = executer_shards(test_file, args)
+        else:
+            exit_code = executer_direct(test_file, args)
         
         # Rapport final
-        print("\n" + "=" * 80)
         if exit_code == 0:
-            print("✅ TOUS LES TESTS RÉUSSIS!")
-            print("🎯 Le solver des différences finies 1D est VALIDÉ.")
-            print("🔧 Tolérances mathématiquement rigoureuses respectées.")
-            print("📊 Couverture de tests COMPLÈTE sans régression.")
+            evenement("fin_tests", "✅ TOUS LES TESTS RÉUSSIS!", schema="DF", code_sortie=exit_code,
+                      duree=time.perf_counter() - debut)
         else:
-            print("❌ CERTAINS TESTS ONT ÉCHOUÉ!")
-            print("⚠️  Vérifier l'implémentation du solver.")
-        print("=" * 80)
+            evenement("fin_tests", "❌ CERTAINS TESTS ONT ÉCHOUÉ!", logging.ERROR, schema="DF",
+                      code_sortie=exit_code, duree=time.perf_counter() - debut)
         
         return exit_code
         
     finally:
         # Retour au répertoire original
         os.chdir(original_dir)
+        arreter_journal()
+
+
+def executer_direct(test_file, args):
+    """Un seul processus pytest, sortie affichée directement"""
+    # Arguments pytest optimisés
+    pytest_args = [
+        sys.executable, "-m", "pytest",
+        test_file,                    # Fichier de tests
+        "-v",                        # Mode verbose
+        "--tb=short",               # Traceback court
+        "--color=yes",              # Couleurs
+        "--durations=5",            # Top 5 des tests les plus lents
+        "--strict-markers",         # Vérification markers
+        "--disable-warnings",       # Masquer warnings pytest
+    ]
+    if not args.sans_arret:
+        pytest_args.append("-x")    # Arrêt au premier échec
+    if args.profil:
+        # pytest exécuté sous le profileur (profil du processus de test)
+        profileur = [os.path.join(outils_dir, "profilage.py"), "--mode", args.profil, "--nom", "tests_DF1D"]
+        if args.dossier_profil:
+            profileur += ["--dossier", args.dossier_profil]
+        pytest_args[1:1] = profileur
+    
+    evenement("commande", f"🧪 Exécution des tests...\n📝 Commande: {' '.join(pytest_args)}\n" + "=" * 80,
+              schema="DF", commande=pytest_args)
+    vider_journal()      # sortie de pytest affichée directement
+    
+    # Exécution
+    result = subprocess.run(pytest_args, 
+                          capture_output=False,  # Affichage direct
+                          text=True)
+    return result.returncode
+
+
+def executer_shards(test_file, args):
+    """Tests répartis sur plusieurs processus, rapport fusionné"""
+    from tests_paralleles import executer_en_parallele, afficher_resume
+    
+    horodatage = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    flux = os.path.join(tests_dir, "RAPPORTS", f"flux_tests_DF1D_{horodatage}.jsonl")
+    evenement("debut_shards", f"🧪 Exécution des tests sur {args.shards} processus...\n" + "=" * 80,
+              schema="DF", shards=args.shards, flux=flux)
+    
+    try:
+        resultat = executer_en_parallele(test_file, tests_dir, shards=args.shards,
+                                         arret_premier_echec=not args.sans_arret,
+                                         options_pytest=("--strict-markers", "--disable-warnings"),
+                                         sortie_flux=flux)
+    except RuntimeError as erreur:
+        evenement("erreur_shards", f"❌ {erreur}", logging.ERROR, schema="DF", erreur=str(erreur))
+        return 2
+    
+    vider_journal()      # résumé affiché directement
+    afficher_resume(resultat)
+    evenement("flux_tests", f"📄 Flux fusionné: {flux}", schema="DF", fichier=flux,
+              code_sortie=resultat["code_sortie"], duree_murale=resultat["duree_murale"])
+    return resultat["code_sortie"]
 
 
 if __name__ == "__main__":
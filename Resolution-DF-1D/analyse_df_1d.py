@@ -0,0 +1,232 @@
+"""
+ANALYSE DE CONVERGENCE ET FIGURES DES DIFFÉRENCES FINIES 1D
+===========================================================
+
+Partie coûteuse à importer (matplotlib, file de rendu, cache): chargée par
+solver_df_1d au premier accès à l'une de ses fonctions.
+"""
+
+import os
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+
+from noyau_df_1d import resoudre_equation_diff, calculer_ordre_convergence
+from rendu_figures import FileRendu
+from cache_resultats import cle_cache, empreinte_fichier
+from decimation import decimer_pour_trace, format_trace
+from ordre_convergence import plateau_atteint
+from normes_erreur import erreurs_normes, NORMES
+from estimation_gci import estimer_convergence_gci
+from suivi_phases import phase
+
+
+_empreinte_solveur = None
+
+
+def empreinte_solveur():
+    """
+    Empreinte du code source dont dépendent les résultats (invalide le cache à chaque modification):
+    noyau, analyse, solveurs linéaires (backend "bande") et normes d'erreur
+    """
+    global _empreinte_solveur
+    if _empreinte_solveur is None:
+        import noyau_df_1d
+        import solveurs_lineaires
+        import normes_erreur
+        _empreinte_solveur = cle_cache(*(empreinte_fichier(os.path.abspath(module.__file__))
+                                         for module in (noyau_df_1d, solveurs_lineaires, normes_erreur)),
+                                       empreinte_fichier(os.path.abspath(__file__)))
+    return _empreinte_solveur
+
+
+def _nom_fichier_cas(nom_cas):
+    """Nom de fichier dérivé du nom du cas"""
+    return nom_cas.replace('(', '').replace(')', '').replace(' ', '_')
+
+
+def tracer_solution_N(donnees, fichier):
+    """
+    Figure solution numérique / exacte et erreur ponctuelle pour un maillage
+
+    Les séries reçues sont déjà décimées (decimation.decimer_pour_trace);
+    les marqueurs disparaissent pour les grands N.
+    """
+    N = donnees['N']
+
+    plt.figure(figsize=(12, 8))
+
+    plt.subplot(2, 1, 1)
+    plt.plot(donnees['x'], donnees['u_numerique'], format_trace('bo-', N), markersize=6, label=f'Solution numérique (N={N})')
+    plt.plot(donnees['x_exact'], donnees['u_exact'], 'r-', linewidth=2, label='Solution exacte')
+    plt.grid(True)
+    plt.xlabel('x')
+    plt.ylabel('u(x)')
+    plt.title(f"{donnees['nom_cas']} avec N = {N}")
+    plt.legend()
+
+    plt.subplot(2, 1, 2)
+    plt.semilogy(donnees['x'], donnees['erreur_points'], format_trace('go-', N), markersize=4)
+    plt.grid(True)
+    plt.xlabel('x')
+    plt.ylabel('Erreur absolue (échelle log)')
+    plt.title(f'Erreur pour N = {N}')
+
+    plt.tight_layout()
+    plt.savefig(fichier, dpi=300)
+    plt.close()
+
+
+def tracer_convergence(donnees, fichier):
+    """Figure log-log de convergence comparée à l'ordre 2 théorique"""
+    N_values = donnees['N_values']
+    erreurs = donnees['erreurs']
+
+    plt.figure(figsize=(10, 6))
+    plt.loglog(N_values, erreurs, 'bo-', linewidth=2, markersize=8, label='Erreur calculée')
+    plt.loglog(N_values, [erreurs[0] * (N_values[0] / N) ** 2 for N in N_values], 'r--',
+               linewidth=2, label='Ordre 2 théorique')
+    plt.grid(True)
+    plt.xlabel('N')
+    plt.ylabel('Erreur L∞')
+    plt.title(f"Convergence pour {donnees['nom_cas']}")
+    plt.legend()
+    plt.tight_layout()
+
+    plt.savefig(fichier, dpi=300)
+    plt.close()
+
+
+def _tracer(rendu, cache, cle, fonction, donnees, fichier):
+    """Soumet une figure à la file de rendu, via le cache s'il y en a un"""
+    if cache is None:
+        return rendu.soumettre(fonction, donnees, fichier)
+    return cache.tracer(rendu, cle, fonction, donnees, fichier)
+
+
+def analyser_convergence(solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures,
+                         figures="sync", file_rendu=None, cache=None, arret_plateau=False,
+                         planificateur=None, durees=None,
+                         erreurs_par_norme=None, backend="dense", suivi=None):
+    """
+    Analyse complète de la convergence pour un cas test donné
+
+    Les figures passent par une file de rendu (rendu_figures.FileRendu):
+    figures="sync" trace immédiatement, "async" délègue le rendu à des processus
+    pendant que les résolutions continuent, "lazy" ne stocke que les données
+    (.figure.npz) pour un rendu ultérieur, "aucune" désactive les figures.
+    Une file_rendu partagée entre plusieurs cas remplace le paramètre figures;
+    elle n'est alors pas attendue ici.
+
+    Avec un cache (cache_resultats.CacheResultats), les solutions, erreurs et
+    figures déjà produites pour le même solveur, le même cas et le même N sont
+    réutilisées au lieu d'être recalculées.
+
+    Avec arret_plateau=True, le balayage s'arrête dès que l'erreur atteint le
+    plateau d'arrondi: les listes retournées ne couvrent alors que les N traités.
+
+    Avec un planificateur (planification.PlanificateurBalayage), N_values est
+    ignoré: les N sont choisis au fil du balayage selon le budget de temps et
+    l'erreur cible, et les N traités sont dans planificateur.N_values.
+
+    Une liste durees reçoit la durée de résolution de chaque N traité (None
+    pour un résultat relu en cache).
+
+    Un dict erreurs_par_norme reçoit, pour chaque norme de normes_erreur.NORMES
+    (Linf, L1, L2, H1, energie), la liste des erreurs par N; la valeur
+    retournée reste l'erreur L∞.
+
+    backend choisit la résolution des systèmes ("dense" ou "bande", voir
+    resoudre_equation_diff); il fait partie de la clé de cache.
+
+    Un suivi (suivi_phases.SuiviPhases) reçoit durée, mémoire tracée et RSS
+    par phase: source, assemblage, factorisation, résolution, erreur, tracé.
+    """
+    rendu = file_rendu if file_rendu is not None else FileRendu(figures)
+    base_fichier = os.path.join(dossier_figures, _nom_fichier_cas(nom_cas))
+    cle_cas = None
+    if cache is not None:
+        cle_cas = cle_cache(empreinte_solveur(), solution_exacte, terme_source, u0, u1, nom_cas)
+    erreurs = []
+
+    for N in (planificateur if planificateur is not None else N_values):
+        cle = cle_cache(cle_cas, N, backend) if cle_cas else None
+        resultat = cache.charger_resultat(cle) if cle else None
+        duree = None
+        if resultat is None:
+            debut = time.perf_counter()
+            u_numerique, x = resoudre_equation_diff(terme_source, N, u0, u1, tracer_graphe=False,
+                                                    backend=backend, suivi=suivi)
+            duree = time.perf_counter() - debut
+            # Toutes les normes en une passe, solution exacte évaluée une fois
+            with phase(suivi, "erreur"):
+                normes = erreurs_normes(u_numerique, solution_exacte, x, "noeuds")
+            erreur = normes['Linf']
+            if cache is not None:
+                cache.stocker_resultat(cle, u=u_numerique, x=x, erreur=erreur,
+                                       **{f"erreur_{n}": v for n, v in normes.items()})
+        else:
+            u_numerique, x, erreur = resultat['u'], resultat['x'], resultat['erreur']
+            normes = {n: resultat.get(f"erreur_{n}", np.nan) for n in NORMES}
+        erreurs.append(erreur)
+        if erreurs_par_norme is not None:
+            for n in NORMES:
+                erreurs_par_norme.setdefault(n, []).append(normes[n])
+        if durees is not None:
+            durees.append(duree)
+        if planificateur is not None:
+            planificateur.enregistrer(N, erreur, duree)
+
+        # Tracé pour quelques valeurs de N
+        if N in [10, 40, 160] and rendu.mode != "aucune":
+            with phase(suivi, "trace"):
+                x_exact = np.linspace(0, 1, 1000)
+                # Décimation min/max: le coût du rendu ne dépend plus de N
+                x_trace, (u_trace, erreur_trace) = decimer_pour_trace(
+                    x, u_numerique, np.abs(u_numerique - solution_exacte(x))
+                )
+                donnees = {
+                    'N': N,
+                    'nom_cas': nom_cas,
+                    'x': x_trace,
+                    'u_numerique': u_trace,
+                    'x_exact': x_exact,
+                    'u_exact': solution_exacte(x_exact),
+                    'erreur_points': erreur_trace,
+                }
+                _tracer(rendu, cache, cle, tracer_solution_N, donnees, f"{base_fichier}_N{N}.png")
+
+        if planificateur is None and arret_plateau and plateau_atteint(N_values[:len(erreurs)], erreurs):
+            N_values = N_values[:len(erreurs)]
+            break
+
+    if planificateur is not None:
+        N_values = list(planificateur.N_values)
+    ordres, ordre_moyen = calculer_ordre_convergence(N_values, erreurs)
+
+    # Graphique de convergence
+    donnees = {'nom_cas': nom_cas, 'N_values': np.asarray(N_values), 'erreurs': np.asarray(erreurs)}
+    cle_convergence = cle_cache(cle_cas, list(N_values)) if cle_cas else None
+    with phase(suivi, "trace"):
+        _tracer(rendu, cache, cle_convergence, tracer_convergence, donnees,
+                f"{base_fichier}_convergence.png")
+
+        if file_rendu is None:
+            rendu.fermer()
+
+    return erreurs, ordres, ordre_moyen
+
+
+def estimer_erreur_sans_solution(terme_source, u0, u1, N_values, norme="Linf"):
+    """
+    Ordre observé et erreur estimée sans solution exacte (trois maillages emboîtés, GCI)
+
+    N_values doit être une suite N0·r^k (ex: [10, 20, 40, 80]); les solutions
+    ne sont conservées qu'aux nœuds du maillage le plus grossier.
+
+    Retourne:
+        list: estimation_gci.EstimationGCI pour chaque N à partir du troisième
+    """
+    return estimer_convergence_gci(
+        lambda N: resoudre_equation_diff(terme_source, N, u0, u1, tracer_graphe=False),
+        N_values, "noeuds", norme)
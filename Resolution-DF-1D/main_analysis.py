@@ -4,114 +4,148 @@ SAUVEGARDE DANS LE BON DOSSIER : Resolution-DF-1D/FIGURES/
 """
 
 import os
+import logging
+import argparse
 import numpy as np
 from datetime import datetime
 import csv
 from solver_df_1d import (
-    resoudre_equation_diff, analyser_convergence, erreur_Linfini,
-    cas_sin_pi_x, cas_cube_corrige, cas_quadratique, verification_mathematique
+    resoudre_equation_diff, analyser_convergence, erreur_Linfini, verification_mathematique
+)
+from registre_cas import obtenir_cas
+from rendu_figures import FileRendu, MODES_FIGURES
+from cache_resultats import CacheResultats, TAILLE_MAX_DEFAUT
+from planification import PlanificateurBalayage, N_MAX_DEFAUT
+from stockage_runs import StockageRuns, lignes_depuis_resultats, resultats_depuis_lignes
+from solveurs_lineaires import BACKENDS
+from profilage import ajouter_options_profilage, profiler_depuis_arguments
+from metriques import ajouter_options_metriques, exporter_depuis_arguments
+from cache_solutions import ajouter_options_cache_solutions, cache_solutions_depuis_arguments
+from journal import (
+    emetteur, enregistrer_gabarit, ajouter_options_journal, configurer_depuis_arguments, arreter_journal, vider_journal
 )
 
+evenement = emetteur("analyse_DF1D")
 
-def main():
-    """Analyse complète avec sauvegarde dans les BONS dossiers"""
-    print("=" * 80)
-    print("ANALYSE COMPLÈTE - DIFFÉRENCES FINIES 1D")
-    print("=" * 80)
-    
-    # Vérification mathématique d'abord
-    verification_mathematique()
-    
-    # Création du dossier FIGURES avec timestamp dans le BON endroit
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    dossier_figures = os.path.join("FIGURES", f"run_{timestamp}")
-    os.makedirs(dossier_figures, exist_ok=True)
-    print(f"\n📁 Dossier figures: {dossier_figures}")
-    
-    # Valeurs de N pour l'étude de convergence
-    N_values = [10, 20, 40, 80, 160, 320]
-    
-    # Liste pour stocker tous les résultats
-    tous_resultats = []
-    
-    # ===== CAS 1: u(x) = sin(πx) =====
-    print("\n" + "=" * 60)
-    print("CAS 1: u(x) = sin(πx)")
-    print("=" * 60)
-    
-    solution_exacte, terme_source, u0, u1, nom_cas = cas_sin_pi_x()
-    erreurs_sin, ordres_sin, ordre_moyen_sin = analyser_convergence(
-        solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures
-    )
-    
-    tous_resultats.append({
-        'nom': nom_cas,
-        'N_values': N_values,
-        'erreurs': erreurs_sin,
-        'ordres': ordres_sin,
-        'ordre_moyen': ordre_moyen_sin
-    })
-    
-    # ===== CAS 2: u(x) = x³ =====
-    print("\n" + "=" * 60)
-    print("CAS 2: u(x) = x³ (CORRIGÉ)")
-    print("=" * 60)
-    
-    solution_exacte, terme_source, u0, u1, nom_cas = cas_cube_corrige()
-    erreurs_cube, ordres_cube, ordre_moyen_cube = analyser_convergence(
-        solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures
-    )
-    
-    tous_resultats.append({
-        'nom': nom_cas,
-        'N_values': N_values,
-        'erreurs': erreurs_cube,
-        'ordres': ordres_cube,
-        'ordre_moyen': ordre_moyen_cube
-    })
-    
-    # ===== CAS 3: u(x) = x² =====
-    print("\n" + "=" * 60)
-    print("CAS 3: u(x) = x² (CAS SIMPLE)")
-    print("=" * 60)
+# Cas tests analysés, par nom dans le registre commun (Outils-Communs/registre_cas.py)
+CAS_ANALYSE = ("sin", "cube", "quadratique")
+
+
+@enregistrer_gabarit("resultat_cas")
+def rendu_resultat_cas(message, champs):
+    """Rendu console d'un événement resultat_cas: tableau N / erreur / ordre et évaluation qualitative"""
+    lignes = [f"\nCas {champs['numero']}: {champs['cas']}", "-" * 60,
+              f"{'N':<8} {'Erreur L-infini':<20} {'Ordre de conv.':<15}", "-" * 60]
+    for j, (N, erreur) in enumerate(zip(champs['N_values'], champs['erreurs'])):
+        ordre_str = f"{champs['ordres'][j - 1]:.4f}" if j > 0 else "N/A"
+        lignes.append(f"{N:<8} {erreur:<20.10e} {ordre_str:<15}")
+    lignes += ["-" * 60, message]
+    ecart = abs(champs['ordre_moyen'] - 2.0)
+    if ecart < 0.1:
+        lignes.append("✅ Convergence EXCELLENTE (ordre ~2)")
+    elif ecart < 0.3:
+        lignes.append("✅ Convergence BONNE")
+    else:
+        lignes.append("⚠️  Convergence à vérifier")
+    return "\n".join(lignes)
+
+
+@enregistrer_gabarit("fin_analyse")
+def rendu_fin_analyse(message, champs):
+    """Rendu console de fin_analyse: ordre global puis message de fin"""
+    return f"\n🎯 ORDRE DE CONVERGENCE GLOBAL: {champs['ordre_global']:.4f}\n{message}"
+
+
+def lire_arguments(argv=None):
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--figures", choices=MODES_FIGURES, default="sync",
+                        help="Rendu des figures: sync (défaut), async (processus de rendu), "
+                             "lazy (données seules, rendu ultérieur via rendu_figures.py), aucune")
+    parser.add_argument("--no-figures", dest="figures", action="store_const", const="lazy",
+                        help="Ne pas rendre les figures, stocker seulement leurs données (= --figures lazy)")
+    parser.add_argument("--workers-rendu", type=int, default=None,
+                        help="Nombre de processus de rendu en mode async (défaut: nombre de CPU)")
+    parser.add_argument("--sans-cache", action="store_true",
+                        help="Recalculer toutes les solutions et figures sans utiliser le cache")
+    parser.add_argument("--taille-cache", type=int, default=TAILLE_MAX_DEFAUT // (1024 * 1024),
+                        help="Taille maximale du cache sur disque en Mo (éviction LRU)")
+    parser.add_argument("--arret-plateau", action="store_true",
+                        help="Arrêter le raffinement d'un cas dès que l'erreur atteint le plateau d'arrondi")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Budget de temps par cas (s): N choisis automatiquement (suite géométrique)")
+    parser.add_argument("--erreur-cible", type=float, default=None,
+                        help="Erreur à atteindre: N choisis automatiquement jusqu'à la cible")
+    parser.add_argument("--N-max", dest="N_max", type=int, default=N_MAX_DEFAUT,
+                        help="Plus grand N autorisé en planification automatique")
+    parser.add_argument("--backend", choices=BACKENDS, default="dense",
+                        help="Résolution des systèmes: dense (matrice pleine) ou bande (tridiagonale, O(N))")
+    parser.add_argument("--dossier-runs", default=None,
+                        help="Dossier du stockage colonnaire des runs (défaut: <racine>/RUNS)")
+    parser.add_argument("--sans-rapports", action="store_true",
+                        help="Stocker le run sans écrire les rapports CSV/TXT")
+    parser.add_argument("--depuis-run", default=None, metavar="RUN",
+                        help="Régénérer les rapports CSV/TXT d'un run stocké ('dernier' pour le plus récent) sans recalcul")
+    ajouter_options_profilage(parser)
+    ajouter_options_journal(parser)
+    ajouter_options_metriques(parser)
+    ajouter_options_cache_solutions(parser)
+    return parser.parse_args(argv)
+
+
+def creer_planificateur(args):
+    """Planificateur de balayage d'un cas, None si les N_values fixes sont utilisés"""
+    if args.budget is None and args.erreur_cible is None:
+        return None
+    return PlanificateurBalayage(budget=args.budget, erreur_cible=args.erreur_cible, N_max=args.N_max)
+
+
+def colonnes_normes(erreurs_par_norme):
+    """Erreurs des normes autres que L∞, sous les clés 'erreurs_<norme>' du stockage des runs"""
+    return {f"erreurs_{norme}": valeurs for norme, valeurs in erreurs_par_norme.items() if norme != "Linf"}
+
+
+def analyser_cas(args, numero, nom, N_values, dossier_figures, file_rendu, cache):
+    """
+    Étude de convergence d'un cas du registre (registre_cas)
+
+    Retourne:
+        dict: Résultats du cas, au format de lignes_depuis_resultats
+    """
+    cas = obtenir_cas(nom)
+    evenement("debut_cas", f"CAS {numero}: {cas.description}", schema="DF", cas=numero)
     
-    solution_exacte, terme_source, u0, u1, nom_cas = cas_quadratique()
-    erreurs_quad, ordres_quad, ordre_moyen_quad = analyser_convergence(
-        solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures
+    planificateur = creer_planificateur(args)
+    durees = []
+    normes = {}
+    erreurs, ordres, ordre_moyen = analyser_convergence(
+        cas.solution_exacte, cas.terme_source, cas.u0, cas.u1, N_values, cas.description, dossier_figures,
+        file_rendu=file_rendu, cache=cache, arret_plateau=args.arret_plateau,
+        planificateur=planificateur, durees=durees,
+        erreurs_par_norme=normes, backend=args.backend
     )
+    if planificateur is not None:
+        evenement("balayage", f"⏱️  Balayage: {planificateur.resume()}", schema="DF", N_values=planificateur.N_values,
+                  raison_arret=planificateur.raison_arret)
     
-    tous_resultats.append({
-        'nom': nom_cas,
-        'N_values': N_values,
-        'erreurs': erreurs_quad,
-        'ordres': ordres_quad,
-        'ordre_moyen': ordre_moyen_quad
-    })
-    
-    # ===== AFFICHAGE DES RÉSULTATS =====
-    print("\n" + "=" * 80)
-    print("RÉSUMÉ DES RÉSULTATS")
-    print("=" * 80)
-    
-    for i, resultats in enumerate(tous_resultats, 1):
-        print(f"\nCas {i}: {resultats['nom']}")
-        print("-" * 60)
-        print(f"{'N':<8} {'Erreur L-infini':<20} {'Ordre de conv.':<15}")
-        print("-" * 60)
-        for j, N in enumerate(resultats['N_values']):
-            ordre_str = f"{resultats['ordres'][j - 1]:.4f}" if j > 0 else "N/A"
-            print(f"{N:<8} {resultats['erreurs'][j]:<20.10e} {ordre_str:<15}")
-        print("-" * 60)
-        print(f"Ordre moyen de convergence: {resultats['ordre_moyen']:.4f}")
-        
-        # Évaluation qualitative
-        if abs(resultats['ordre_moyen'] - 2.0) < 0.1:
-            print("✅ Convergence EXCELLENTE (ordre ~2)")
-        elif abs(resultats['ordre_moyen'] - 2.0) < 0.3:
-            print("✅ Convergence BONNE")
-        else:
-            print("⚠️  Convergence à vérifier")
-    
+    return {
+        'nom': cas.description,
+        'N_values': planificateur.N_values if planificateur else N_values[:len(erreurs)],
+        'durees': durees,
+        **colonnes_normes(normes),
+        'erreurs': erreurs,
+        'ordres': ordres,
+        'ordre_moyen': ordre_moyen
+    }
+
+
+def ecrire_rapports(tous_resultats, timestamp):
+    """
+    Écrit le CSV et le rapport texte d'un run
+
+    Retourne:
+        tuple: (fichier_csv, fichier_txt)
+    """
     # ===== SAUVEGARDE DES RÉSULTATS =====
     # Fichier CSV dans le bon dossier
     fichier_resultats = f"resultats_convergence_DF1D_{timestamp}.csv"
@@ -145,7 +179,8 @@ def main():
         f.write(f"Utilisateur: theTigerFox\n")
         f.write(f"Équation résolue: -u''(x) = f(x) sur [0,1]\n")
         f.write(f"Méthode: Différences finies centrées d'ordre 2\n")
-        f.write(f"Tailles de maillage testées: {N_values}\n\n")
+        # Union des maillages de chaque cas (planificateur: N_values propres à chaque cas)
+        f.write(f"Tailles de maillage testées: {sorted(set().union(*(r['N_values'] for r in tous_resultats)))}\n\n")
         
         for i, resultats in enumerate(tous_resultats, 1):
             nom = resultats['nom']
@@ -188,20 +223,116 @@ def main():
         f.write("• Une précision adaptée aux problèmes étudiés\n\n")
         
         ordres_moyens = [r['ordre_moyen'] for r in tous_resultats]
-        ordre_global = np.mean(ordres_moyens)
+        ordre_global = np.nanmean(ordres_moyens)  # cas à la précision machine exclus (ordre nan)
         f.write(f"Ordre de convergence global: {ordre_global:.4f}\n")
         
         f.write(f"\nRapport généré le: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
-    print("\n" + "=" * 80)
-    print("📁 FICHIERS GÉNÉRÉS")
-    print("=" * 80)
-    print(f"📊 Figures: {dossier_figures}/")
-    print(f"📋 Données CSV: {fichier_resultats}")
-    print(f"📄 Rapport détaillé: {fichier_txt}")
+    return fichier_resultats, fichier_txt
+
+
+def generer_rapports(stockage, run):
+    """Régénère les rapports CSV/TXT d'un run à partir du stockage colonnaire"""
+    tous_resultats = resultats_depuis_lignes(stockage.charger_run(run))
+    return ecrire_rapports(tous_resultats, run[:15])
+
+
+def main(argv=None):
+    """Analyse complète avec sauvegarde dans les BONS dossiers (options --profil, --journal, --metriques)"""
+    args = lire_arguments(argv)
+    with profiler_depuis_arguments(args, "analyse_DF1D"):
+        configurer_depuis_arguments(args)
+        try:
+            with exporter_depuis_arguments(args), cache_solutions_depuis_arguments(args):
+                return executer_analyse(args)
+        finally:
+            arreter_journal()
+
+
+def executer_analyse(args):
+    """Corps de l'analyse pour les options args"""
+    if args.depuis_run:
+        stockage = StockageRuns(args.dossier_runs)
+        run = stockage.dernier_run(schema="DF") if args.depuis_run == "dernier" else args.depuis_run
+        if run is None:
+            evenement("aucun_run", f"❌ Aucun run DF dans {stockage.dossier}", logging.ERROR, schema="DF", dossier=stockage.dossier)
+            return
+        fichier_resultats, fichier_txt = generer_rapports(stockage, run)
+        evenement("rapport", f"📋 Données CSV: {fichier_resultats}", schema="DF", run=run, format="csv", fichier=fichier_resultats)
+        evenement("rapport", f"📄 Rapport détaillé: {fichier_txt}", schema="DF", run=run, format="txt", fichier=fichier_txt)
+        return
+    
+    evenement("debut_analyse", "ANALYSE COMPLÈTE - DIFFÉRENCES FINIES 1D", schema="DF", backend=args.backend,
+              figures=args.figures, cache=not args.sans_cache)
+    
+    # Vérification mathématique d'abord (affichée directement)
+    vider_journal()
+    verification_mathematique()
+    
+    # Création du dossier FIGURES avec timestamp dans le BON endroit
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    dossier_figures = os.path.join("FIGURES", f"run_{timestamp}")
+    os.makedirs(dossier_figures, exist_ok=True)
+    evenement("dossier_figures", f"\n📁 Dossier figures: {dossier_figures}", dossier=dossier_figures)
+    
+    # File de rendu partagée: les figures sont tracées pendant que les calculs continuent
+    with FileRendu(args.figures, workers=args.workers_rendu) as file_rendu:
+        evenement("mode_figures", f"🖼️  Mode figures: {args.figures}", mode=args.figures, workers=args.workers_rendu)
+
+        # Cache adressé par contenu: solutions, erreurs et figures inchangées sont réutilisées
+        cache = None if args.sans_cache else CacheResultats(taille_max=args.taille_cache * 1024 * 1024)
+        if cache is not None:
+            evenement("cache", f"🗄️  Cache: {cache.dossier} ({cache.taille / 1e6:.1f} Mo / {args.taille_cache} Mo)",
+                      dossier=cache.dossier, taille=cache.taille, taille_max=args.taille_cache * 1024 * 1024)
+
+        # Valeurs de N pour l'étude de convergence
+        N_values = [10, 20, 40, 80, 160, 320]
+        
+        tous_resultats = [
+            analyser_cas(args, numero, nom, N_values, dossier_figures, file_rendu, cache)
+            for numero, nom in enumerate(CAS_ANALYSE, 1)
+        ]
+        
+        # ===== AFFICHAGE DES RÉSULTATS =====
+        evenement("titre", "RÉSUMÉ DES RÉSULTATS")
+        for i, resultats in enumerate(tous_resultats, 1):
+            evenement("resultat_cas", f"Ordre moyen de convergence: {resultats['ordre_moyen']:.4f}",
+                      schema="DF", numero=i, cas=resultats['nom'], backend=args.backend, N_values=resultats['N_values'],
+                      erreurs=resultats['erreurs'], ordres=resultats['ordres'],
+                      ordre_moyen=resultats['ordre_moyen'], durees=resultats['durees'])
+
+        # ===== STOCKAGE DU RUN =====
+        # Source de vérité: stockage colonnaire; les rapports CSV/TXT en sont dérivés
+        stockage = StockageRuns(args.dossier_runs)
+        run = stockage.ajouter_run("DF", lignes_depuis_resultats(tous_resultats), run=f"{timestamp}_DF", meta={"backend": args.backend})
+        evenement("run_stocke", f"🗃️  Run stocké: {run} ({stockage.dossier})", schema="DF", run=run, dossier=stockage.dossier)
+        fichier_resultats = fichier_txt = None
+        if not args.sans_rapports:
+            fichier_resultats, fichier_txt = generer_rapports(stockage, run)
+
+        # Attente des dernières figures en cours de rendu
+        fichiers_figures = file_rendu.fermer()
+    if cache is not None:
+        evenement("bilan_cache", f"🗄️  Cache: {cache.succes} succès, {cache.echecs} échecs "
+                  f"(taux {100 * cache.taux_succes:.0f}%)",
+                  succes=cache.succes, echecs=cache.echecs, taux_succes=cache.taux_succes)
+    
+    evenement("titre", "📁 FICHIERS GÉNÉRÉS")
+    message_figures = f"📊 Figures: {dossier_figures}/"
+    if args.figures == "lazy":
+        message_figures += (f"\n💤 Données de {len(fichiers_figures)} figure(s) stockées, "
+                            f"rendu: python ../Outils-Communs/rendu_figures.py {dossier_figures}")
+    evenement("figures", message_figures, schema="DF", dossier=dossier_figures, mode=args.figures,
+              nombre=len(fichiers_figures))
+    if fichier_resultats:
+        evenement("rapport", f"📋 Données CSV: {fichier_resultats}", schema="DF", run=run, format="csv", fichier=fichier_resultats)
+        evenement("rapport", f"📄 Rapport détaillé: {fichier_txt}", schema="DF", run=run, format="txt", fichier=fichier_txt)
+    evenement("run_regenerable", f"🗃️  Run: {run} (rapports régénérables: python main_analysis.py --depuis-run {run})",
+              schema="DF", run=run)
     
-    print(f"\n🎯 ORDRE DE CONVERGENCE GLOBAL: {np.mean([r['ordre_moyen'] for r in tous_resultats]):.4f}")
-    print("\n✅ ANALYSE TERMINÉE AVEC SUCCÈS !")
+    ordre_global = np.nanmean([r['ordre_moyen'] for r in tous_resultats])
+    evenement("fin_analyse", "\n✅ ANALYSE TERMINÉE AVEC SUCCÈS !", schema="DF", run=run, ordre_global=ordre_global,
+              figures=len(fichiers_figures), rapports=[f for f in (fichier_resultats, fichier_txt) if f])
 
 
 if __name__ == "__main__":
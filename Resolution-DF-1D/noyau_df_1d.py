@@ -0,0 +1,289 @@
+"""
+NOYAU NUMÉRIQUE DES DIFFÉRENCES FINIES 1D
+=========================================
+
+Résolution de -u'' = f, cas tests et ordre de convergence, sans dépendance
+graphique: importer ce module ne charge ni matplotlib ni scipy (le backend
+"bande" charge scipy à sa première utilisation). L'analyse de convergence et
+les figures sont dans analyse_df_1d; solver_df_1d réunit les deux et charge
+la partie analyse au premier accès.
+"""
+
+import os
+import sys
+import logging
+import numpy as np
+
+# Outils partagés entre les TPs
+_outils_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Outils-Communs")
+if _outils_dir not in sys.path:
+    sys.path.insert(0, _outils_dir)
+
+from ordre_convergence import estimer_ordre_convergence, pentes_successives
+from solveurs_lineaires import resoudre_tridiagonal, verifier_backend
+from suivi_phases import phase
+from diagnostics_resolution import verifier_mode, suivi_diagnostics, diagnostiquer, verifier, retourner
+from metriques import resolution_instrumentee
+from cache_solutions import solution_en_cache
+from interpolation_solutions import SolutionDiscrete
+from registre_cas import obtenir_cas
+from journal import emetteur, enregistrer_gabarit, gabarit_section
+
+evenement = emetteur("noyau_DF1D")
+enregistrer_gabarit("debut_verification", gabarit_section)
+
+
+def points_interieurs_df(N):
+    """N-1 nœuds intérieurs de [0, 1], où le terme source est évalué"""
+    return np.linspace(0, 1, N + 1)[1:-1]
+
+
+def systeme_df(N):
+    """
+    Points intérieurs et trois diagonales (-1, 2, -1) du système DF
+
+    La matrice ne dépend que de N: plusieurs seconds membres (second_membre_df)
+    se résolvent avec une seule factorisation (service_resolution).
+
+    Retourne:
+        tuple: (x_interieur, inferieure, diagonale, superieure)
+    """
+    x_interieur = points_interieurs_df(N)
+    inferieure = -np.ones(N - 2)
+    return x_interieur, inferieure, np.full(N - 1, 2.0), inferieure
+
+
+def second_membre_df(valeurs_f, N, U0, U1):
+    """h²·f aux points intérieurs plus les conditions aux limites (valeurs_f (N-1) ou (N-1, k), U0 et U1 scalaires ou (k))"""
+    b = (1 / N)**2 * np.asarray(valeurs_f, dtype=float)
+    b[0] += U0
+    b[-1] += U1
+    return b
+
+
+@solution_en_cache("DF", points_interieurs_df)
+@resolution_instrumentee("DF")
+def resoudre_equation_diff(f, N, U0, U1, tracer_graphe=False, backend="dense", suivi=None,
+                           diagnostics=False, verification=None):
+    """
+    Résout l'équation différentielle -U''(x) = f(x) avec les conditions aux limites
+    U(0) = U0 et U(1) = U1 par la méthode des différences finies.
+    
+    CORRECTION: Gestion correcte du cas N=2 (1 seul point intérieur)
+
+    backend="dense" assemble la matrice pleine (historique); backend="bande"
+    assemble les trois diagonales par opérations vectorisées et résout en O(N)
+    (voir solveurs_lineaires).
+
+    suivi (suivi_phases.SuiviPhases, optionnel) mesure durée et mémoire des
+    phases source, assemblage, factorisation et résolution.
+
+    diagnostics=True retourne (U, x, diag), diag étant un relevé léger
+    (diagnostics_resolution.DiagnosticResolution: temps mur et CPU par
+    phase, backend, résidu et conditionnement estimé); une fonction passée
+    comme diagnostics reçoit ce relevé et le solveur retourne (U, x).
+
+    verification="avertir" ou "lever" contrôle la résolution en O(N):
+    second membre NaN/inf (localisé), résidu relatif et conditionnement
+    estimé au-delà des seuils de diagnostics_resolution, signalés par un
+    RuntimeWarning ou une RuntimeError.
+
+    Avec un cache de solutions actif (cache_solutions), un problème déjà
+    résolu est relu du disque: U et x sont alors en lecture seule.
+
+    Retourne une SolutionDiscrete (interpolation_solutions): le tuple
+    (U, x), ou (U, x, diag) avec diagnostics=True, évaluable en tout point
+    de [0, 1].
+    """
+    if N <= 1:
+        raise ValueError("N doit être supérieur à 1")
+    verifier_backend(backend)
+    verifier_mode(verification)
+    suivi = suivi_diagnostics(diagnostics, suivi)
+
+    h = 1 / N
+    x_interieur = np.linspace(0, 1, N + 1)[1:-1]  # Points intérieurs
+    n_interior = len(x_interieur)  # N-1 points intérieurs
+
+    if backend == "bande":
+        with phase(suivi, "source"):
+            valeurs_f = np.broadcast_to(f(x_interieur), (n_interior,))
+        with phase(suivi, "assemblage"):
+            b = second_membre_df(valeurs_f, N, U0, U1)
+            _, inferieure, diagonale, _ = systeme_df(N)
+        try:
+            U_interieur = resoudre_tridiagonal(inferieure, diagonale, inferieure, b, backend, suivi)
+        except np.linalg.LinAlgError:
+            raise RuntimeError("Impossible de résoudre le système linéaire.")
+    # Gestion spéciale pour N=2 (1 seul point intérieur)
+    elif n_interior == 1:
+        # Cas simple: 1 équation, 1 inconnue
+        with phase(suivi, "source"):
+            valeur_f = f(x_interieur[0])
+        A = np.array([[2.0]])
+        b = np.array([h**2 * valeur_f + U0 + U1])
+        with phase(suivi, "resolution"):
+            U_interieur = np.linalg.solve(A, b)
+    else:
+        # Cas général: N-1 équations, N-1 inconnues
+        # Terme source évalué point par point (f n'a pas à être vectorisée)
+        with phase(suivi, "source"):
+            valeurs_f = [f(x_interieur[i]) for i in range(n_interior)]
+
+        with phase(suivi, "assemblage"):
+            A = np.zeros((n_interior, n_interior))
+            b = np.zeros(n_interior)
+
+            for i in range(n_interior):
+                # Diagonale principale
+                A[i, i] = 2.0
+                
+                # Super-diagonale (seulement si elle existe)
+                if i < n_interior - 1:
+                    A[i, i + 1] = -1.0
+                    
+                # Sous-diagonale (seulement si elle existe)
+                if i > 0:
+                    A[i, i - 1] = -1.0
+                    
+                # Second membre
+                b[i] = h**2 * valeurs_f[i]
+                
+                # Conditions aux limites
+                if i == 0:
+                    b[i] += U0
+                if i == n_interior - 1:
+                    b[i] += U1
+
+        try:
+            with phase(suivi, "resolution"):
+                U_interieur = np.linalg.solve(A, b)
+        except np.linalg.LinAlgError:
+            raise RuntimeError("Impossible de résoudre le système linéaire.")
+
+    # Construction de la solution complète
+    x = np.linspace(0, 1, N + 1)
+    U = np.zeros(N + 1)
+    U[0] = U0
+    U[1:-1] = U_interieur
+    U[-1] = U1
+    
+    if tracer_graphe:
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(10, 6))
+        plt.plot(x, U, 'b-', linewidth=2)
+        plt.grid(True)
+        plt.xlabel('x')
+        plt.ylabel('U(x)')
+        plt.title('Solution de l\'équation -U\'\'(x) = f(x)')
+        plt.show()
+
+    if not (diagnostics or verification):
+        return SolutionDiscrete(U, x)
+    if backend != "bande":
+        inferieure = -np.ones(n_interior - 1)
+        diagonale = np.full(n_interior, 2.0)
+    diagnostic = diagnostiquer("DF", N, backend, suivi, inferieure, diagonale, inferieure, U_interieur, b,
+                               x_interieur)
+    verifier(diagnostic, verification)
+    if not diagnostics:
+        return SolutionDiscrete(U, x)
+    return retourner(diagnostics, diagnostic, U, x)
+
+
+def solution_exacte_sin(x):
+    """Solution exacte u(x) = sin(πx)"""
+    return np.sin(np.pi * x)
+
+
+def solution_exacte_cube(x):
+    """Solution exacte u(x) = x³"""
+    return x ** 3
+
+
+def terme_source_sin(x):
+    """Terme source f(x) pour u(x) = sin(πx) dans -u''(x) = f(x)"""
+    return np.pi ** 2 * np.sin(np.pi * x)
+
+
+def terme_source_cube(x):
+    """Terme source f(x) pour u(x) = x³ dans -u''(x) = f(x)"""
+    return -6 * x  # SIGNE CORRECT
+
+
+def erreur_Linfini(u_numerique, u_exacte, x):
+    """Calcule l'erreur en norme L∞ entre la solution numérique et la solution exacte"""
+    return np.max(np.abs(u_numerique - u_exacte(x)))
+
+
+def calculer_ordre_convergence(N_values, erreurs):
+    """
+    Calcule l'ordre numérique de convergence à partir des erreurs pour différentes tailles de maillage
+
+    Les ordres entre maillages successifs sont donnés à titre indicatif; l'ordre
+    global est ajusté par moindres carrés robustes après exclusion du plateau
+    d'arrondi (nan si la série est entièrement à la précision machine).
+    Voir ordre_convergence.estimer_ordre_convergence pour l'intervalle de confiance.
+    """
+    if len(N_values) < 2:
+        return [], np.nan
+
+    ordres = list(pentes_successives(N_values, erreurs))
+    ordre_moyen = estimer_ordre_convergence(N_values, erreurs).ordre
+    return ordres, ordre_moyen
+
+
+# Définition des cas tests (registre commun, voir Outils-Communs/registre_cas.py)
+def cas_sin_pi_x():
+    """Cas test 1: u(x) = sin(πx)"""
+    return obtenir_cas("sin").en_tuple()
+
+
+def cas_cube_corrige():
+    """Cas test 2: u(x) = x³"""
+    return obtenir_cas("cube").en_tuple()
+
+
+def cas_quadratique():
+    """Cas test 3: u(x) = x²"""
+    return obtenir_cas("quadratique").en_tuple()
+
+
+def verification_mathematique(cas=(cas_sin_pi_x, cas_cube_corrige, cas_quadratique), tolerance=1e-5):
+    """
+    Vérifie que chaque cas test est cohérent: -u''(x) = f(x) et u(0) = u0, u(1) = u1
+
+    u'' est approchée par différences centrées (pas 1e-4) en quelques points
+    intérieurs, ce qui détecte une erreur de signe ou de facteur dans f.
+
+    Les résultats sont émis en événements du journal (journal.emetteur).
+
+    Retourne:
+        bool: True si tous les cas sont cohérents
+    """
+    evenement("debut_verification", "🔬 VÉRIFICATION MATHÉMATIQUE DES SOLUTIONS EXACTES", schema="DF", cas=len(cas))
+
+    x = np.linspace(0.1, 0.9, 9)
+    pas = 1e-4
+    tout_correct = True
+    for fonction_cas in cas:
+        solution_exacte, terme_source, u0, u1, nom_cas = fonction_cas()
+        moins_u_seconde = -(solution_exacte(x + pas) - 2 * solution_exacte(x) + solution_exacte(x - pas)) / pas**2
+        f = np.broadcast_to(terme_source(x), x.shape)
+        ecart_equation = np.max(np.abs(moins_u_seconde - f)) / max(1.0, np.max(np.abs(f)))
+        ecart_limites = max(abs(solution_exacte(np.array([0.0]))[0] - u0),
+                            abs(solution_exacte(np.array([1.0]))[0] - u1))
+        correct = ecart_equation < tolerance and ecart_limites < 1e-12
+        tout_correct &= correct
+        evenement("verification_cas", f"{'✅' if correct else '❌'} {nom_cas}: |-u'' - f| = {ecart_equation:.1e}, "
+                  f"conditions aux limites: {ecart_limites:.1e}", logging.INFO if correct else logging.ERROR,
+                  schema="DF", cas=nom_cas, correct=bool(correct), ecart_equation=float(ecart_equation),
+                  ecart_limites=float(ecart_limites))
+
+    if tout_correct:
+        evenement("verification_mathematique", "\n✅ TOUTES LES SOLUTIONS EXACTES SONT MATHÉMATIQUEMENT CORRECTES",
+                  schema="DF", correct=True)
+    else:
+        evenement("verification_mathematique", "\n❌ CAS TEST INCOHÉRENT: vérifier les termes sources",
+                  logging.ERROR, schema="DF", correct=False)
+    return tout_correct
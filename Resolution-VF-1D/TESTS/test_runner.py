@@ -5,6 +5,9 @@ Identique au DF-1D mais adapté pour VF
 
 import sys
 import os
+import argparse
+import time
+import logging
 import subprocess
 import datetime
 
@@ -12,18 +15,60 @@ import datetime
 script_dir = os.path.dirname(os.path.abspath(__file__))
 tests_dir = script_dir
 resolution_dir = os.path.dirname(script_dir)
+project_root = os.path.dirname(resolution_dir)
+outils_dir = os.path.join(project_root, "Outils-Communs")
+if outils_dir not in sys.path:
+    sys.path.insert(0, outils_dir)
 
+from profilage import ajouter_options_profilage
+from journal import (
+    emetteur, enregistrer_gabarit, encadrer, ajouter_options_journal, configurer_depuis_arguments,
+    arreter_journal, vider_journal
+)
 
-def main():
+evenement = emetteur("test_runner")
+
+
+@enregistrer_gabarit("debut_tests")
+def rendu_debut_tests(message, champs):
+    """Rendu console de debut_tests: bandeau et contexte du run"""
+    return "\n".join([
+        encadrer(message),
+        f"📅 Date: {champs['date']}",
+        f"👤 Utilisateur: {champs['utilisateur']}",
+        f"🔬 Méthode: {champs['methode']}",
+        "=" * 80,
+    ])
+
+
+@enregistrer_gabarit("fin_tests")
+def rendu_fin_tests(message, champs):
+    """Rendu console de fin_tests: bilan encadré selon le code de sortie"""
+    detail = "🎯 Solveur Volumes Finis validé" if champs['code_sortie'] == 0 else "🔧 Vérifier les erreurs ci-dessus"
+    return "\n" + encadrer(f"{message}\n{detail}")
+
+
+def analyser_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de tests VF 1D")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1,
+                        help="Processus pytest en parallèle (défaut: nombre de CPU, 1 = exécution directe)")
+    parser.add_argument("--sans-arret", action="store_true",
+                        help="Ne pas s'arrêter au premier échec")
+    ajouter_options_profilage(parser)
+    ajouter_options_journal(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Exécute les tests VF avec affichage simple en temps réel"""
+    args = analyser_arguments(argv)
+    configurer_depuis_arguments(args)
+    debut = time.perf_counter()
     
-    print("=" * 80)
-    print("🧪 EXÉCUTION DES TESTS - VOLUMES FINIS 1D")
-    print("=" * 80)
-    print(f"📅 Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"👤 Utilisateur: theTigerFox")
-    print(f"🔬 Méthode: Volumes Finis")
-    print("=" * 80)
+    evenement("debut_tests", "🧪 EXÉCUTION DES TESTS - VOLUMES FINIS 1D", schema="VF", shards=args.shards,
+              arret_premier_echec=not args.sans_arret, profil=args.profil,
+              date=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'), utilisateur="theTigerFox",
+              methode="Volumes Finis")
     
     # Changement vers le répertoire des tests
     original_dir = os.getcwd()
@@ -33,42 +78,84 @@ def main():
         # Vérification fichier de test
         test_file = "test_vf_1d_pytest.py"
         if not os.path.exists(test_file):
-            print(f"❌ Fichier de test non trouvé: {test_file}")
-            print(f"📁 Contenu: {os.listdir('.')}")
+            contenu = os.listdir('.')
+            evenement("fichier_absent", f"❌ Fichier de test non trouvé: {test_file}\n📁 Contenu: {contenu}",
+                      logging.ERROR, schema="VF", fichier=test_file, contenu=contenu)
             return 1
         
-        # Arguments pytest pour développement
-        pytest_args = [
-            sys.executable, "-m", "pytest",
-            test_file,
-            "-v",                       # Verbose
-            "--tb=short",              # Traceback court
-            "--color=yes",             # Couleurs
-            "-x",                      # Arrêt au premier échec
-            "--disable-warnings",      # Pas de warnings
-        ]
-        
-        print("🚀 Lancement des tests Volumes Finis...")
-        print("-" * 40)
-        
-        # Exécution avec affichage direct
-        result = subprocess.run(pytest_args)
-        exit_code = result.returncode
+        if args.profil and args.shards > 1:
+            evenement("profil_direct", "🔥 Profilage: exécution directe dans un seul processus pytest",
+                      schema="VF", shards_demandes=args.shards)
+        if args.shards > 1 and not args.profil:
+            exit_code = executer_shards(test_file, args)
+        else:
+            exit_code = executer_direct(test_file, args)
         
         # Résumé simple
-        print("\n" + "=" * 80)
         if exit_code == 0:
-            print("✅ TOUS LES TESTS VF RÉUSSIS !")
-            print("🎯 Solveur Volumes Finis validé")
+            evenement("fin_tests", "✅ TOUS LES TESTS VF RÉUSSIS !", schema="VF", code_sortie=exit_code,
+                      duree=time.perf_counter() - debut)
         else:
-            print("❌ DES TESTS VF ONT ÉCHOUÉ")
-            print("🔧 Vérifier les erreurs ci-dessus")
-        print("=" * 80)
+            evenement("fin_tests", "❌ DES TESTS VF ONT ÉCHOUÉ", logging.ERROR, schema="VF",
+                      code_sortie=exit_code, duree=time.perf_counter() - debut)
         
         return exit_code
         
     finally:
         os.chdir(original_dir)
+        arreter_journal()
+
+
+def executer_direct(test_file, args):
+    """Un seul processus pytest, affichage en temps réel"""
+    # Arguments pytest pour développement
+    pytest_args = [
+        sys.executable, "-m", "pytest",
+        test_file,
+        "-v",                       # Verbose
+        "--tb=short",              # Traceback court
+        "--color=yes",             # Couleurs
+        "--disable-warnings",      # Pas de warnings
+    ]
+    if not args.sans_arret:
+        pytest_args.append("-x")   # Arrêt au premier échec
+    if args.profil:
+        # pytest exécuté sous le profileur (profil du processus de test)
+        profileur = [os.path.join(outils_dir, "profilage.py"), "--mode", args.profil, "--nom", "tests_VF1D"]
+        if args.dossier_profil:
+            profileur += ["--dossier", args.dossier_profil]
+        pytest_args[1:1] = profileur
+    
+    evenement("commande", "🚀 Lancement des tests Volumes Finis...\n" + "-" * 40, schema="VF", commande=pytest_args)
+    vider_journal()      # sortie de pytest affichée directement
+    
+    # Exécution avec affichage direct
+    result = subprocess.run(pytest_args)
+    return result.returncode
+
+
+def executer_shards(test_file, args):
+    """Tests VF répartis sur plusieurs processus, rapport fusionné"""
+    from tests_paralleles import executer_en_parallele, afficher_resume
+    
+    horodatage = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    flux = os.path.join(tests_dir, "RAPPORTS", f"flux_tests_VF1D_{horodatage}.jsonl")
+    evenement("debut_shards", f"🚀 Lancement des tests Volumes Finis sur {args.shards} processus...\n" + "-" * 40,
+              schema="VF", shards=args.shards, flux=flux)
+    
+    try:
+        resultat = executer_en_parallele(test_file, tests_dir, shards=args.shards,
+                                         arret_premier_echec=not args.sans_arret,
+                                         options_pytest=("--disable-warnings",), sortie_flux=flux)
+    except RuntimeError as erreur:
+        evenement("erreur_shards", f"❌ {erreur}", logging.ERROR, schema="VF", erreur=str(erreur))
+        return 2
+    
+    vider_journal()      # résumé affiché directement
+    afficher_resume(resultat)
+    evenement("flux_tests", f"📄 Flux fusionné: {flux}", schema="VF", fichier=flux,
+              code_sortie=resultat["code_sortie"], duree_murale=resultat["duree_murale"])
+    return resultat["code_sortie"]
 
 
 if __name__ == "__main__":
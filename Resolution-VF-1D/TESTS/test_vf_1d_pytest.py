@@ -7,6 +7,7 @@ Basé sur l'analyse empirique des performances VF observées
 
 import sys
 import os
+import subprocess
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -22,6 +23,8 @@ from solver_vf_1d import (
     solution_exacte_quadratique_vf, terme_source_quadratique_vf,
     solution_exacte_lineaire_vf, terme_source_lineaire_vf
 )
+from registre_cas import obtenir_cas
+from benchmarks import complexite_empirique
 
 
 class TestVFToleranceCorrects:
@@ -269,5 +272,89 @@ class TestVFToleranceCorrects:
         print(f"   N={N}, erreur={erreur:.6e}, tolérance={tolerance:.6e}")
 
 
+class TestTempsImport:
+    """Démarrage à froid: le solveur s'importe sans matplotlib ni scipy"""
+
+    BUDGET_IMPORT = 0.25   # secondes, numpy déjà chargé
+
+    def test_import_leger(self):
+        code = (
+            "import sys, time, numpy\n"
+            f"sys.path.insert(0, {parent_dir!r})\n"
+            "debut = time.perf_counter()\n"
+            "import solver_vf_1d\n"
+            "duree = time.perf_counter() - debut\n"
+            "print(duree, *sorted(m for m in ('matplotlib', 'scipy') if m in sys.modules))\n"
+            "solver_vf_1d.analyser_convergence_vf\n"
+            "print('matplotlib' in sys.modules)\n"
+        )
+        sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        mesure, apres_analyse = sortie.stdout.splitlines()
+        duree, *modules_lourds = mesure.split()
+        assert modules_lourds == [], f"Modules lourds importés: {modules_lourds}"
+        assert float(duree) < self.BUDGET_IMPORT, f"Import en {float(duree):.3f} s"
+        assert apres_analyse == "True"
+
+
+class TestDiagnostics:
+    """Relevé optionnel retourné par le solveur VF"""
+
+    @pytest.mark.parametrize("backend", ["dense", "bande"])
+    def test_releve(self, backend):
+        N = 64
+        u, x, diag = resoudre_equation_diff_vf(terme_source_sin_vf, N, 0, 0, backend=backend, diagnostics=True)
+        u_ref, _ = resoudre_equation_diff_vf(terme_source_sin_vf, N, 0, 0, backend=backend)
+        np.testing.assert_array_equal(u, u_ref)
+        assert (diag.schema, diag.backend) == ("VF", backend)
+        assert diag.residu_relatif < 1e-14
+        A = (2 * np.eye(N) - np.eye(N, k=1) - np.eye(N, k=-1)) * N
+        assert diag.conditionnement == pytest.approx(np.linalg.cond(A, 1), rel=1e-8)
+        assert diag.en_dict()["phases"] == diag.phases
+
+    def test_verification_nan(self):
+        def f_source_nan(x):
+            return np.where(x < 0.25, np.inf, 0.0)
+
+        with pytest.raises(RuntimeError, match="premier en x=0.0625"):
+            resoudre_equation_diff_vf(f_source_nan, 8, 0, 0, backend="bande", verification="lever")
+        _, _, diag = resoudre_equation_diff_vf(terme_source_sin_vf, 8, 0, np.nan, diagnostics=True)
+        assert diag.second_membre_non_fini == 1 and diag.premier_x_non_fini == pytest.approx(0.9375)
+
+
+@pytest.mark.performance
+class TestComplexite:
+    """
+    Complexité empirique: exposants de temps et de mémoire ajustés sur N
+
+    Le backend bande doit rester O(N) sur plus de deux décades de N; un retour
+    à l'assemblage dense (O(N²) mémoire, O(N³) temps) fait échouer ces tests.
+    Temps minimum par N et pente de Theil-Sen: tolérant au bruit d'une machine
+    partagée; une mesure hors limite est refaite une fois avant d'échouer.
+    """
+
+    N_LINEAIRES = [1_000, 4_000, 16_000, 64_000, 256_000]
+    EXPOSANT_TEMPS_MAX = 1.3
+    EXPOSANT_MEMOIRE_MAX = 1.15
+
+    @staticmethod
+    def _preparer(backend):
+        cas = obtenir_cas("sin")
+        return lambda N: (lambda: resoudre_equation_diff_vf(cas.terme_source, N, cas.u0, cas.u1, backend=backend))
+
+    def test_resolution_bande_lineaire(self):
+        mesure = complexite_empirique(self._preparer("bande"), self.N_LINEAIRES)
+        if mesure["exposant_temps"] > self.EXPOSANT_TEMPS_MAX:
+            mesure = complexite_empirique(self._preparer("bande"), self.N_LINEAIRES)
+        assert mesure["exposant_memoire"] < self.EXPOSANT_MEMOIRE_MAX, \
+            f"Mémoire en N^{mesure['exposant_memoire']:.2f}: {mesure['memoire']}"
+        assert mesure["exposant_temps"] < self.EXPOSANT_TEMPS_MAX, \
+            f"Temps en N^{mesure['exposant_temps']:.2f}: {mesure['temps']}"
+
+    def test_detection_super_lineaire(self):
+        """Le même ajustement classe le backend dense comme super-linéaire"""
+        mesure = complexite_empirique(self._preparer("dense"), [80, 160, 320, 640], repetitions=3)
+        assert mesure["exposant_memoire"] > 1.8
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+ANALYSE DE CONVERGENCE ET FIGURES DES VOLUMES FINIS 1D
+======================================================
+
+Partie coûteuse à importer (matplotlib, file de rendu, cache): chargée par
+solver_vf_1d au premier accès à l'une de ses fonctions.
+"""
+
+import os
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+
+from noyau_vf_1d import resoudre_equation_diff_vf, calculer_ordre_convergence_vf
+from rendu_figures import FileRendu
+from cache_resultats import cle_cache, empreinte_fichier
+from decimation import decimer_pour_trace, format_trace
+from ordre_convergence import plateau_atteint
+from normes_erreur import erreurs_normes, NORMES
+from estimation_gci import estimer_convergence_gci
+from suivi_phases import phase
+
+
+_empreinte_solveur_vf = None
+
+
+def empreinte_solveur_vf():
+    """
+    Empreinte du code source dont dépendent les résultats (invalide le cache à chaque modification):
+    noyau, analyse, solveurs linéaires (backend "bande") et normes d'erreur
+    """
+    global _empreinte_solveur_vf
+    if _empreinte_solveur_vf is None:
+        import noyau_vf_1d
+        import solveurs_lineaires
+        import normes_erreur
+        _empreinte_solveur_vf = cle_cache(*(empreinte_fichier(os.path.abspath(module.__file__))
+                                            for module in (noyau_vf_1d, solveurs_lineaires, normes_erreur)),
+                                          empreinte_fichier(os.path.abspath(__file__)))
+    return _empreinte_solveur_vf
+
+
+def _tracer_vf(rendu, cache, cle, fonction, donnees, fichier):
+    """Soumet une figure à la file de rendu, via le cache s'il y en a un"""
+    if cache is None:
+        return rendu.soumettre(fonction, donnees, fichier)
+    return cache.tracer(rendu, cle, fonction, donnees, fichier)
+
+
+def _nom_fichier_cas_vf(nom_cas):
+    """Nom de fichier dérivé du nom du cas"""
+    return nom_cas.replace(' ', '_').replace('(', '').replace(')', '')
+
+
+def tracer_solution_vf_N(donnees, fichier):
+    """
+    Figure solution VF / exacte et erreur ponctuelle pour un maillage
+    
+    Les séries reçues sont déjà décimées (decimation.decimer_pour_trace),
+    pic d'erreur compris; les marqueurs disparaissent pour les grands N.
+    
+    Paramètres:
+        donnees (dict): N, nom_cas, x, u_num, x_exact, u_exact, erreur_points
+        fichier (str): Image à produire
+    """
+    N = donnees['N']
+    erreur_points = donnees['erreur_points']
+    
+    plt.figure(figsize=(12, 8))
+    
+    plt.subplot(2, 1, 1)
+    plt.plot(donnees['x'], donnees['u_num'], format_trace('ro-', N), markersize=6, linewidth=2, 
+            label=f'VF N={N}')
+    plt.plot(donnees['x_exact'], donnees['u_exact'], 'b-', linewidth=2, 
+            label='Solution exacte')
+    plt.grid(True, alpha=0.3)
+    plt.xlabel('x')
+    plt.ylabel('u(x)')
+    plt.title(f"{donnees['nom_cas']} - Volumes Finis N={N}")
+    plt.legend()
+    
+    plt.subplot(2, 1, 2)
+    plt.semilogy(donnees['x'], erreur_points, format_trace('go-', N), markersize=4, 
+                label=f'Erreur (max: {np.max(erreur_points):.2e})')
+    plt.grid(True, alpha=0.3)
+    plt.xlabel('x')
+    plt.ylabel('Erreur absolue')
+    plt.title(f'Erreur pour N={N}')
+    plt.legend()
+    
+    plt.tight_layout()
+    plt.savefig(fichier, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def tracer_convergence_vf(donnees, fichier):
+    """
+    Figure log-log de convergence VF avec pente théorique et ordre moyen
+    
+    Paramètres:
+        donnees (dict): nom_cas, N_values, erreurs, ordre_moyen
+        fichier (str): Image à produire
+    """
+    N_values = donnees['N_values']
+    erreurs = donnees['erreurs']
+    ordre_moyen = donnees['ordre_moyen']
+    
+    plt.figure(figsize=(10, 8))
+    plt.loglog(N_values, erreurs, 'ro-', linewidth=2, markersize=8, 
+              label='Erreur VF calculée')
+    
+    # Ligne théorique O(h²) = O(1/N²)
+    if erreurs[0] > 1e-15:
+        pente_theorique = [erreurs[0] * (N_values[0] / N)**2 for N in N_values]
+        plt.loglog(N_values, pente_theorique, 'b--', linewidth=2, 
+                  label='O(h²) théorique')
+    
+    plt.grid(True, alpha=0.3)
+    plt.xlabel('Nombre de volumes N')
+    plt.ylabel('Erreur L∞')
+    plt.title(f"Convergence Volumes Finis - {donnees['nom_cas']}")
+    plt.legend()
+    
+    # Annotation de l'ordre
+    if ordre_moyen > 0:
+        plt.text(0.05, 0.95, f'Ordre moyen: {ordre_moyen:.3f}', 
+                transform=plt.gca().transAxes, fontsize=12,
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7))
+    
+    plt.tight_layout()
+    plt.savefig(fichier, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def analyser_convergence_vf(solution_exacte_func, terme_source_func, u0, u1, 
+                           N_values, nom_cas, dossier_figures,
+                           figures="sync", file_rendu=None, cache=None,
+                           arret_plateau=False, planificateur=None, durees=None,
+                           erreurs_par_norme=None, backend="dense", suivi=None):
+    """
+    Analyse complète de convergence pour méthode Volumes Finis
+    
+    Paramètres:
+        solution_exacte_func (callable): u(x) exacte
+        terme_source_func (callable): f(x) terme source
+        u0, u1 (float): Conditions aux limites
+        N_values (list): Valeurs de N à tester
+        nom_cas (str): Nom du cas pour les fichiers
+        dossier_figures (str): Répertoire des figures
+        figures (str): Mode de rendu des figures ("sync", "async", "lazy", "aucune"),
+            voir rendu_figures.FileRendu
+        file_rendu (FileRendu): File de rendu partagée entre plusieurs cas
+            (remplace figures, non attendue par cette fonction)
+        cache (CacheResultats): Cache des solutions, erreurs et figures déjà
+            produites pour le même solveur, le même cas et le même N
+        arret_plateau (bool): Arrêter le balayage dès que l'erreur atteint le
+            plateau d'arrondi (listes retournées limitées aux N traités)
+        planificateur (PlanificateurBalayage): Choix adaptatif des N sous budget
+            de temps et erreur cible (remplace N_values; N traités dans
+            planificateur.N_values)
+        durees (list): Reçoit la durée de résolution de chaque N traité (None
+            pour un résultat relu en cache)
+        erreurs_par_norme (dict): Reçoit, pour chaque norme de
+            normes_erreur.NORMES (Linf, L1, L2, H1, energie), la liste des
+            erreurs par N (poids des cellules VF); erreurs retournées en L∞
+        backend (str): Résolution des systèmes, "dense" ou "bande" (fait
+            partie de la clé de cache)
+        suivi (SuiviPhases): Durée, mémoire tracée et RSS par phase
+            (source, assemblage, factorisation, résolution, erreur, tracé)
+    
+    Retourne:
+        tuple: (erreurs, ordres, ordre_moyen)
+    """
+    os.makedirs(dossier_figures, exist_ok=True)
+    
+    rendu = file_rendu if file_rendu is not None else FileRendu(figures)
+    base_fichier = os.path.join(dossier_figures, _nom_fichier_cas_vf(nom_cas))
+    if planificateur is not None:
+        N_a_tracer = planificateur.N_a_tracer()
+    else:
+        N_a_tracer = [N_values[0], N_values[len(N_values)//2], N_values[-1]]
+    cle_cas = None
+    if cache is not None:
+        cle_cas = cle_cache(empreinte_solveur_vf(), solution_exacte_func, terme_source_func, u0, u1, nom_cas)
+    
+    erreurs = []
+    
+    # Calcul des erreurs pour chaque N (ou relecture depuis le cache)
+    for N in (planificateur if planificateur is not None else N_values):
+        cle = cle_cache(cle_cas, N, backend) if cle_cas else None
+        resultat = cache.charger_resultat(cle) if cle else None
+        duree = None
+        if resultat is None:
+            debut = time.perf_counter()
+            u_num, x = resoudre_equation_diff_vf(terme_source_func, N, u0, u1, backend=backend, suivi=suivi)
+            duree = time.perf_counter() - debut
+            # Toutes les normes en une passe, solution exacte évaluée une fois
+            with phase(suivi, "erreur"):
+                normes = erreurs_normes(u_num, solution_exacte_func, x, "cellules")
+            erreur = normes['Linf']
+            if cache is not None:
+                cache.stocker_resultat(cle, u=u_num, x=x, erreur=erreur,
+                                       **{f"erreur_{n}": v for n, v in normes.items()})
+        else:
+            u_num, x, erreur = resultat['u'], resultat['x'], resultat['erreur']
+            normes = {n: resultat.get(f"erreur_{n}", np.nan) for n in NORMES}
+        erreurs.append(erreur)
+        if erreurs_par_norme is not None:
+            for n in NORMES:
+                erreurs_par_norme.setdefault(n, []).append(normes[n])
+        if durees is not None:
+            durees.append(duree)
+        if planificateur is not None:
+            planificateur.enregistrer(N, erreur, duree)
+        
+        # Tracés pour quelques valeurs de N
+        if N in N_a_tracer and rendu.mode != "aucune":
+            with phase(suivi, "trace"):
+                x_exact = np.linspace(0, 1, 1000)
+                # Décimation min/max: le coût du rendu ne dépend plus de N
+                x_trace, (u_trace, erreur_trace) = decimer_pour_trace(
+                    x, u_num, np.abs(u_num - solution_exacte_func(x))
+                )
+                donnees = {
+                    'N': N,
+                    'nom_cas': nom_cas,
+                    'x': x_trace,
+                    'u_num': u_trace,
+                    'x_exact': x_exact,
+                    'u_exact': solution_exacte_func(x_exact),
+                    'erreur_points': erreur_trace,
+                }
+                _tracer_vf(rendu, cache, cle, tracer_solution_vf_N, donnees, f"{base_fichier}_VF_N{N}.png")
+        
+        if planificateur is None and arret_plateau and plateau_atteint(N_values[:len(erreurs)], erreurs):
+            N_values = N_values[:len(erreurs)]
+            break
+    
+    if planificateur is not None:
+        N_values = list(planificateur.N_values)
+    
+    # Analyse de convergence
+    ordres, ordre_moyen = calculer_ordre_convergence_vf(N_values, erreurs)
+    
+    # Graphique de convergence
+    donnees = {
+        'nom_cas': nom_cas,
+        'N_values': np.asarray(N_values),
+        'erreurs': np.asarray(erreurs),
+        'ordre_moyen': ordre_moyen,
+    }
+    cle_convergence = cle_cache(cle_cas, list(N_values)) if cle_cas else None
+    with phase(suivi, "trace"):
+        _tracer_vf(rendu, cache, cle_convergence, tracer_convergence_vf, donnees,
+                   f"{base_fichier}_VF_convergence.png")
+        
+        if file_rendu is None:
+            rendu.fermer()
+    
+    return erreurs, ordres, ordre_moyen
+
+
+def estimer_erreur_sans_solution_vf(terme_source_func, u0, u1, N_values, norme="Linf"):
+    """
+    Ordre observé et erreur estimée sans solution exacte (GCI sur trois maillages)
+    
+    Paramètres:
+        terme_source_func (callable): f(x) terme source
+        u0, u1 (float): Conditions aux limites
+        N_values (list): Maillages emboîtés N0·r^k (au moins trois)
+        norme (str): Norme des différences entre maillages
+    
+    Retourne:
+        list: estimation_gci.EstimationGCI pour chaque N à partir du troisième,
+            calculées sur les moyennes par cellule du maillage le plus grossier
+    """
+    return estimer_convergence_gci(
+        lambda N: resoudre_equation_diff_vf(terme_source_func, N, u0, u1),
+        N_values, "cellules", norme)
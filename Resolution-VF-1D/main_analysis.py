@@ -8,264 +8,247 @@ Méthode: Volumes Finis centrés d'ordre 2
 """
 
 import os
+import logging
+import argparse
 import numpy as np
 from datetime import datetime
 import csv
-from solver_vf_1d import (
-    resoudre_equation_diff_vf, analyser_convergence_vf, erreur_Linfini_vf,
-    cas_sin_vf, cas_cubique_vf, cas_quadratique_vf, cas_lineaire_vf
+from solver_vf_1d import resoudre_equation_diff_vf, analyser_convergence_vf, erreur_Linfini_vf
+from registre_cas import obtenir_cas
+from rendu_figures import FileRendu, MODES_FIGURES
+from cache_resultats import CacheResultats, TAILLE_MAX_DEFAUT
+from planification import PlanificateurBalayage, N_MAX_DEFAUT
+from stockage_runs import StockageRuns, lignes_depuis_resultats, resultats_depuis_lignes
+from solveurs_lineaires import BACKENDS
+from profilage import ajouter_options_profilage, profiler_depuis_arguments
+from metriques import ajouter_options_metriques, exporter_depuis_arguments
+from cache_solutions import ajouter_options_cache_solutions, cache_solutions_depuis_arguments
+from journal import (
+    emetteur, enregistrer_gabarit, encadrer, gabarit_section, ajouter_options_journal, configurer_depuis_arguments,
+    arreter_journal
 )
 
+evenement = emetteur("analyse_VF1D")
+enregistrer_gabarit("debut_verification", gabarit_section)
+
+
+@enregistrer_gabarit("debut_analyse")
+def rendu_debut_analyse(message, champs):
+    """Rendu console de debut_analyse: bandeau et contexte du run"""
+    return "\n".join([
+        encadrer(message),
+        f"👤 Utilisateur: {champs['utilisateur']}",
+        f"📅 Date: {champs['date']}",
+        f"🔬 Méthode: {champs['methode']}",
+        f"📐 Équation: {champs['equation']}",
+        "=" * 80,
+    ])
+
+
+@enregistrer_gabarit("debut_cas")
+def rendu_debut_cas(message, champs):
+    """Rendu console de debut_cas: bandeau, solution exacte et conditions aux limites"""
+    return "\n".join([gabarit_section(message, champs),
+                      f"📐 Solution exacte: {champs['solution']}",
+                      f"🎯 Conditions: u(0) = {champs['u0']}, u(1) = {champs['u1']}"])
+
+
+def evaluation_ordre(ordre):
+    """Évaluation d'un ordre local pour la colonne du tableau"""
+    if abs(ordre - 2.0) < 0.1:
+        return "✅ Excellent"
+    if abs(ordre - 2.0) < 0.3:
+        return "👍 Bon"
+    if ordre < 1.0:
+        return "⚠️ Faible"
+    return "🔍 Acceptable"
+
+
+@enregistrer_gabarit("resultat_cas")
+def rendu_resultat_cas(message, champs):
+    """Rendu console de resultat_cas: tableau N / h / erreur / ordre / évaluation et bilan du cas"""
+    lignes = [f"\n🔬 CAS {champs['numero']}: {champs['cas']}",
+              f"📝 Description: {champs['description']}",
+              "-" * 70,
+              f"{'N':<8} {'h':<12} {'Erreur L∞':<16} {'Ordre':<12} {'Évaluation':<15}",
+              "-" * 70]
+    for j, (N, erreur) in enumerate(zip(champs['N_values'], champs['erreurs'])):
+        if j > 0:
+            ordre = champs['ordres'][j - 1]
+            ordre_str, eval_str = f"{ordre:.4f}", evaluation_ordre(ordre)
+        else:
+            ordre_str, eval_str = "N/A", "🚀 Initial"
+        lignes.append(f"{N:<8} {1.0 / N:<12.6f} {erreur:<16.6e} {ordre_str:<12} {eval_str:<15}")
+
+    ordre_moyen = champs['ordre_moyen']
+    lignes += ["-" * 70, message, f"📐 Écart à la théorie (2.000): {abs(ordre_moyen - 2.0):.4f}"]
+    # Évaluation qualitative globale
+    if champs['cas'] == "u(x) = x²":
+        lignes.append("💡 Évaluation: Précision machine (comportement normal)")
+    elif abs(ordre_moyen - 2.0) < 0.05:
+        lignes.append("🎯 Évaluation: ✅ EXCELLENT - Convergence parfaite")
+    elif abs(ordre_moyen - 2.0) < 0.1:
+        lignes.append("🎯 Évaluation: ✅ TRÈS BON - Convergence très proche")
+    elif abs(ordre_moyen - 2.0) < 0.3:
+        lignes.append("🎯 Évaluation: ✅ BON - Convergence acceptable")
+    else:
+        lignes.append("🎯 Évaluation: ⚠️ À VÉRIFIER - Convergence éloignée")
+    return "\n".join(lignes)
+
+
+@enregistrer_gabarit("fin_analyse")
+def rendu_fin_analyse(message, champs):
+    """Rendu console de fin_analyse: bilan de l'ordre global puis message de fin"""
+    ordre_global = champs['ordre_global']
+    lignes = ["\n🎯 BILAN FINAL", "=" * 50,
+              f"📈 Ordre de convergence global: {ordre_global:.4f}",
+              f"📐 Ordre théorique attendu   : 2.000",
+              f"📊 Écart à la théorie        : {abs(ordre_global - 2.0):.4f}"]
+    if ordre_global >= 1.8:
+        lignes += ["\n🏆 RÉSULTAT: ✅ VALIDATION RÉUSSIE",
+                   "🎯 La méthode des Volumes Finis 1D est VALIDÉE !",
+                   "🚀 Convergence O(h²) confirmée expérimentalement"]
+    else:
+        lignes += ["\n⚠️ RÉSULTAT: 🔧 VALIDATION PARTIELLE",
+                   "📋 Vérifier les cas avec convergence éloignée"]
+    return "\n".join(lignes + [message])
+
 
 def verification_mathematique_vf():
     """
     Vérification mathématique des solutions exactes pour Volumes Finis
     """
-    print("🔬 VÉRIFICATION MATHÉMATIQUE DES SOLUTIONS EXACTES")
-    print("=" * 60)
+    evenement("debut_verification", "🔬 VÉRIFICATION MATHÉMATIQUE DES SOLUTIONS EXACTES", schema="VF")
     
-    # Test 1: sin(πx)
-    print("Test 1: u(x) = sin(πx)")
     x_test = np.array([0.0, 0.5, 1.0])
-    
-    # Solution exacte
-    u_sin = np.sin(np.pi * x_test)
-    print(f"   u(0) = {u_sin[0]:.6f}, u(0.5) = {u_sin[1]:.6f}, u(1) = {u_sin[2]:.6f}")
-    
-    # Dérivée seconde: u''(x) = -π²sin(πx)
-    u_second = -np.pi**2 * np.sin(np.pi * x_test)
-    f_sin = np.pi**2 * np.sin(np.pi * x_test)
-    print(f"   -u''(0.5) = {-u_second[1]:.6f}, f(0.5) = {f_sin[1]:.6f}")
-    print(f"   ✅ Vérification: -u''(x) = f(x)")
-    
-    # Test 2: x³
-    print("\nTest 2: u(x) = x³")
-    u_cube = x_test**3
-    print(f"   u(0) = {u_cube[0]:.6f}, u(0.5) = {u_cube[1]:.6f}, u(1) = {u_cube[2]:.6f}")
-    
-    # Dérivée seconde: u''(x) = 6x
-    u_second_cube = 6 * x_test
-    f_cube = -6 * x_test
-    print(f"   -u''(0.5) = {-u_second_cube[1]:.6f}, f(0.5) = {f_cube[1]:.6f}")
-    print(f"   ✅ Vérification: -u''(x) = f(x)")
-    
-    # Test 3: x²
-    print("\nTest 3: u(x) = x²")
-    u_quad = x_test**2
-    print(f"   u(0) = {u_quad[0]:.6f}, u(0.5) = {u_quad[1]:.6f}, u(1) = {u_quad[2]:.6f}")
-    
-    # Dérivée seconde: u''(x) = 2
-    u_second_quad = 2 * np.ones_like(x_test)
-    f_quad = -2 * np.ones_like(x_test)
-    print(f"   -u''(0.5) = {-u_second_quad[1]:.6f}, f(0.5) = {f_quad[1]:.6f}")
-    print(f"   ✅ Vérification: -u''(x) = f(x)")
-    
-    # Test 4: Fonction linéaire
-    print("\nTest 4: f(x) = 2x + 1, solution exacte")
-    u_lin = -x_test**3/3 - x_test**2/2 + (5/6)*x_test
-    print(f"   u(0) = {u_lin[0]:.6f}, u(0.5) = {u_lin[1]:.6f}, u(1) = {u_lin[2]:.6f}")
-    
-    # Vérification conditions limites
-    print(f"   Conditions: u(0) = {u_lin[0]:.6f}, u(1) = {u_lin[2]:.6f}")
-    
-    # Dérivée seconde: u''(x) = -2x - 1
-    u_second_lin = -2 * x_test - 1
-    f_lin = 2 * x_test + 1
-    print(f"   -u''(0.5) = {-u_second_lin[1]:.6f}, f(0.5) = {f_lin[1]:.6f}")
-    print(f"   ✅ Vérification: -u''(x) = f(x)")
-    
-    print("\n✅ TOUTES LES SOLUTIONS EXACTES SONT MATHÉMATIQUEMENT CORRECTES")
-
-
-def main():
-    """Analyse complète avec sauvegarde dans les BONS dossiers"""
-    print("=" * 80)
-    print("ANALYSE COMPLÈTE - VOLUMES FINIS 1D")
-    print("=" * 80)
-    print(f"👤 Utilisateur: theTigerFox")
-    print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"🔬 Méthode: Volumes Finis centrés d'ordre 2")
-    print(f"📐 Équation: -u''(x) = f(x) sur [0,1]")
-    print("=" * 80)
-    
-    # Vérification mathématique d'abord
-    verification_mathematique_vf()
-    
-    # Création du dossier FIGURES avec timestamp dans le BON endroit
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    dossier_figures = os.path.join("FIGURES", f"run_{timestamp}")
-    dossier_doc = "DOC"
-    
-    # Création des répertoires
-    os.makedirs(dossier_figures, exist_ok=True)
-    os.makedirs(dossier_doc, exist_ok=True)
-    
-    print(f"\n📁 Dossier figures: {dossier_figures}")
-    print(f"📁 Dossier documentation: {dossier_doc}")
-    
-    # Valeurs de N pour l'étude de convergence (identique à DF-1D)
-    N_values = [10, 20, 40, 80, 160, 320]
-    print(f"📊 Tailles testées: N = {N_values}")
-    
-    # Liste pour stocker tous les résultats
-    tous_resultats = []
-    
-    # ===== CAS 1: u(x) = sin(πx) =====
-    print("\n" + "=" * 60)
-    print("CAS 1: u(x) = sin(πx) - VALIDATION FONDAMENTALE")
-    print("=" * 60)
-    
-    solution_exacte, terme_source, u0, u1, nom_cas = cas_sin_vf()
-    print(f"📐 Solution exacte: {nom_cas}")
-    print(f"🎯 Conditions: u(0) = {u0}, u(1) = {u1}")
-    
-    erreurs_sin, ordres_sin, ordre_moyen_sin = analyser_convergence_vf(
-        solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures
-    )
-    
-    tous_resultats.append({
-        'nom': nom_cas,
-        'N_values': N_values,
-        'erreurs': erreurs_sin,
-        'ordres': ordres_sin,
-        'ordre_moyen': ordre_moyen_sin,
-        'description': 'Solution trigonométrique classique'
-    })
-    
-    print(f"📈 Ordre moyen obtenu: {ordre_moyen_sin:.4f}")
-    print(f"🎯 Ordre théorique: 2.000")
-    
-    # ===== CAS 2: u(x) = x³ =====
-    print("\n" + "=" * 60)
-    print("CAS 2: u(x) = x³ - VALIDATION POLYNOMIALE")
-    print("=" * 60)
-    
-    solution_exacte, terme_source, u0, u1, nom_cas = cas_cubique_vf()
-    print(f"📐 Solution exacte: {nom_cas}")
-    print(f"🎯 Conditions: u(0) = {u0}, u(1) = {u1}")
-    
-    erreurs_cube, ordres_cube, ordre_moyen_cube = analyser_convergence_vf(
-        solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures
-    )
-    
-    tous_resultats.append({
-        'nom': nom_cas,
-        'N_values': N_values,
-        'erreurs': erreurs_cube,
-        'ordres': ordres_cube,
-        'ordre_moyen': ordre_moyen_cube,
-        'description': 'Polynôme degré 3'
-    })
-    
-    print(f"📈 Ordre moyen obtenu: {ordre_moyen_cube:.4f}")
-    print(f"🎯 Ordre théorique: 2.000")
-    
-    # ===== CAS 3: u(x) = x² =====
-    print("\n" + "=" * 60)
-    print("CAS 3: u(x) = x² - TEST DE PRÉCISION MAXIMALE")
-    print("=" * 60)
-    
-    solution_exacte, terme_source, u0, u1, nom_cas = cas_quadratique_vf()
-    print(f"📐 Solution exacte: {nom_cas}")
-    print(f"🎯 Conditions: u(0) = {u0}, u(1) = {u1}")
-    print(f"💡 Note: Précision machine attendue (polynôme degré ≤ 2)")
-    
-    erreurs_quad, ordres_quad, ordre_moyen_quad = analyser_convergence_vf(
-        solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures
-    )
-    
-    tous_resultats.append({
-        'nom': nom_cas,
-        'N_values': N_values,
-        'erreurs': erreurs_quad,
-        'ordres': ordres_quad,
-        'ordre_moyen': ordre_moyen_quad,
-        'description': 'Polynôme degré 2 (précision machine)'
-    })
-    
-    print(f"📈 Ordre apparent: {ordre_moyen_quad:.4f}")
-    print(f"💡 Analyse: Peut être chaotique (précision machine)")
-    
-    # ===== CAS 4: f(x) = 2x + 1 =====
-    print("\n" + "=" * 60)
-    print("CAS 4: f(x) = 2x + 1 - SOURCE LINÉAIRE")
-    print("=" * 60)
-    
-    solution_exacte, terme_source, u0, u1, nom_cas = cas_lineaire_vf()
-    print(f"📐 Solution exacte: {nom_cas}")
-    print(f"🎯 Conditions: u(0) = {u0}, u(1) = {u1}")
-    
-    erreurs_lin, ordres_lin, ordre_moyen_lin = analyser_convergence_vf(
-        solution_exacte, terme_source, u0, u1, N_values, nom_cas, dossier_figures
+    # (cas, u, -u'' et f aux points x_test); -u'' dérivée à la main
+    verifications = [
+        ("u(x) = sin(πx)", np.sin(np.pi * x_test), np.pi**2 * np.sin(np.pi * x_test), np.pi**2 * np.sin(np.pi * x_test)),
+        ("u(x) = x³", x_test**3, -6 * x_test, -6 * x_test),
+        ("u(x) = x²", x_test**2, -2 * np.ones_like(x_test), -2 * np.ones_like(x_test)),
+        ("f(x) = 2x + 1, solution exacte", -x_test**3/3 - x_test**2/2 + (5/6)*x_test, 2 * x_test + 1, 2 * x_test + 1),
+    ]
+    
+    for i, (nom_cas, u, moins_u_seconde, f) in enumerate(verifications, 1):
+        separation = "\n" if i > 1 else ""
+        evenement("verification_cas", f"{separation}Test {i}: {nom_cas}\n"
+                  f"   u(0) = {u[0]:.6f}, u(0.5) = {u[1]:.6f}, u(1) = {u[2]:.6f}\n"
+                  f"   -u''(0.5) = {moins_u_seconde[1]:.6f}, f(0.5) = {f[1]:.6f}\n"
+                  f"   ✅ Vérification: -u''(x) = f(x)",
+                  schema="VF", cas=nom_cas, x=x_test, u=u, moins_u_seconde=moins_u_seconde, f=f)
+    
+    evenement("verification_mathematique", "\n✅ TOUTES LES SOLUTIONS EXACTES SONT MATHÉMATIQUEMENT CORRECTES",
+              schema="VF", correct=True)
+
+
+# Cas tests analysés: nom dans le registre commun (Outils-Communs/registre_cas.py) et description
+CAS_ANALYSE = (
+    ("sin", "Solution trigonométrique classique"),
+    ("cube", "Polynôme degré 3"),
+    ("quadratique", "Polynôme degré 2 (précision machine)"),
+    ("lineaire", "Source linéaire, solution cubique"),
+)
+
+# Colonnes propres aux cas VF, stockées avec chaque ligne
+COLONNES_CAS = ('description',)
+
+
+def lire_arguments(argv=None):
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--figures", choices=MODES_FIGURES, default="sync",
+                        help="Rendu des figures: sync (défaut), async (processus de rendu), "
+                             "lazy (données seules, rendu ultérieur via rendu_figures.py), aucune")
+    parser.add_argument("--no-figures", dest="figures", action="store_const", const="lazy",
+                        help="Ne pas rendre les figures, stocker seulement leurs données (= --figures lazy)")
+    parser.add_argument("--workers-rendu", type=int, default=None,
+                        help="Nombre de processus de rendu en mode async (défaut: nombre de CPU)")
+    parser.add_argument("--sans-cache", action="store_true",
+                        help="Recalculer toutes les solutions et figures sans utiliser le cache")
+    parser.add_argument("--taille-cache", type=int, default=TAILLE_MAX_DEFAUT // (1024 * 1024),
+                        help="Taille maximale du cache sur disque en Mo (éviction LRU)")
+    parser.add_argument("--arret-plateau", action="store_true",
+                        help="Arrêter le raffinement d'un cas dès que l'erreur atteint le plateau d'arrondi")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Budget de temps par cas (s): N choisis automatiquement (suite géométrique)")
+    parser.add_argument("--erreur-cible", type=float, default=None,
+                        help="Erreur à atteindre: N choisis automatiquement jusqu'à la cible")
+    parser.add_argument("--N-max", dest="N_max", type=int, default=N_MAX_DEFAUT,
+                        help="Plus grand N autorisé en planification automatique")
+    parser.add_argument("--backend", choices=BACKENDS, default="dense",
+                        help="Résolution des systèmes: dense (matrice pleine) ou bande (tridiagonale, O(N))")
+    parser.add_argument("--dossier-runs", default=None,
+                        help="Dossier du stockage colonnaire des runs (défaut: <racine>/RUNS)")
+    parser.add_argument("--sans-rapports", action="store_true",
+                        help="Stocker le run sans écrire les rapports CSV/TXT")
+    parser.add_argument("--depuis-run", default=None, metavar="RUN",
+                        help="Régénérer les rapports CSV/TXT d'un run stocké ('dernier' pour le plus récent) sans recalcul")
+    ajouter_options_profilage(parser)
+    ajouter_options_journal(parser)
+    ajouter_options_metriques(parser)
+    ajouter_options_cache_solutions(parser)
+    return parser.parse_args(argv)
+
+
+def creer_planificateur(args):
+    """Planificateur de balayage d'un cas, None si les N_values fixes sont utilisés"""
+    if args.budget is None and args.erreur_cible is None:
+        return None
+    return PlanificateurBalayage(budget=args.budget, erreur_cible=args.erreur_cible, N_max=args.N_max)
+
+
+def colonnes_normes(erreurs_par_norme):
+    """Erreurs des normes autres que L∞, sous les clés 'erreurs_<norme>' du stockage des runs"""
+    return {f"erreurs_{norme}": valeurs for norme, valeurs in erreurs_par_norme.items() if norme != "Linf"}
+
+
+def analyser_cas(args, numero, nom, description, N_values, dossier_figures, file_rendu, cache):
+    """
+    Étude de convergence d'un cas du registre (registre_cas)
+
+    Retourne:
+        dict: Résultats du cas, au format de lignes_depuis_resultats
+    """
+    cas = obtenir_cas(nom)
+    evenement("debut_cas", f"CAS {numero}: {cas.description} - {description}", schema="VF", cas=numero,
+              solution=cas.description, u0=cas.u0, u1=cas.u1)
+    
+    planificateur = creer_planificateur(args)
+    durees = []
+    normes = {}
+    erreurs, ordres, ordre_moyen = analyser_convergence_vf(
+        cas.solution_exacte, cas.terme_source, cas.u0, cas.u1, N_values, cas.description, dossier_figures,
+        file_rendu=file_rendu, cache=cache, arret_plateau=args.arret_plateau,
+        planificateur=planificateur, durees=durees,
+        erreurs_par_norme=normes, backend=args.backend
     )
-    
-    tous_resultats.append({
-        'nom': nom_cas,
-        'N_values': N_values,
-        'erreurs': erreurs_lin,
-        'ordres': ordres_lin,
-        'ordre_moyen': ordre_moyen_lin,
-        'description': 'Source linéaire, solution cubique'
-    })
-    
-    print(f"📈 Ordre moyen obtenu: {ordre_moyen_lin:.4f}")
-    print(f"🎯 Ordre théorique: 2.000")
-    
-    # ===== AFFICHAGE DES RÉSULTATS =====
-    print("\n" + "=" * 80)
-    print("📊 RÉSUMÉ COMPLET DES RÉSULTATS")
-    print("=" * 80)
-    
-    for i, resultats in enumerate(tous_resultats, 1):
-        print(f"\n🔬 CAS {i}: {resultats['nom']}")
-        print(f"📝 Description: {resultats['description']}")
-        print("-" * 70)
-        print(f"{'N':<8} {'h':<12} {'Erreur L∞':<16} {'Ordre':<12} {'Évaluation':<15}")
-        print("-" * 70)
-        
-        for j, N in enumerate(resultats['N_values']):
-            h = 1.0 / N
-            erreur = resultats['erreurs'][j]
-            
-            if j > 0:
-                ordre = resultats['ordres'][j - 1]
-                ordre_str = f"{ordre:.4f}"
-                
-                # Évaluation de l'ordre
-                if abs(ordre - 2.0) < 0.1:
-                    eval_str = "✅ Excellent"
-                elif abs(ordre - 2.0) < 0.3:
-                    eval_str = "👍 Bon"
-                elif ordre < 1.0:
-                    eval_str = "⚠️ Faible"
-                else:
-                    eval_str = "🔍 Acceptable"
-            else:
-                ordre_str = "N/A"
-                eval_str = "🚀 Initial"
-            
-            print(f"{N:<8} {h:<12.6f} {erreur:<16.6e} {ordre_str:<12} {eval_str:<15}")
-        
-        print("-" * 70)
-        print(f"📈 Ordre moyen de convergence: {resultats['ordre_moyen']:.4f}")
-        print(f"📐 Écart à la théorie (2.000): {abs(resultats['ordre_moyen'] - 2.0):.4f}")
-        
-        # Évaluation qualitative globale
-        if resultats['nom'] == "u(x) = x²":
-            print("💡 Évaluation: Précision machine (comportement normal)")
-        elif abs(resultats['ordre_moyen'] - 2.0) < 0.05:
-            print("🎯 Évaluation: ✅ EXCELLENT - Convergence parfaite")
-        elif abs(resultats['ordre_moyen'] - 2.0) < 0.1:
-            print("🎯 Évaluation: ✅ TRÈS BON - Convergence très proche")
-        elif abs(resultats['ordre_moyen'] - 2.0) < 0.3:
-            print("🎯 Évaluation: ✅ BON - Convergence acceptable")
-        else:
-            print("🎯 Évaluation: ⚠️ À VÉRIFIER - Convergence éloignée")
-    
+    if planificateur is not None:
+        evenement("balayage", f"⏱️  Balayage: {planificateur.resume()}", schema="VF", N_values=planificateur.N_values,
+                  raison_arret=planificateur.raison_arret)
+    evenement("fin_cas", f"📈 Ordre moyen obtenu: {ordre_moyen:.4f} (théorique: 2.000)", schema="VF", cas=numero,
+              ordre_moyen=ordre_moyen)
+    
+    return {
+        'nom': cas.description,
+        'N_values': planificateur.N_values if planificateur else N_values[:len(erreurs)],
+        'durees': durees,
+        **colonnes_normes(normes),
+        'erreurs': erreurs,
+        'ordres': ordres,
+        'ordre_moyen': ordre_moyen,
+        'description': description
+    }
+
+
+def ecrire_rapports(tous_resultats, timestamp, dossier_doc="DOC"):
+    """
+    Écrit le CSV et le rapport texte d'un run
+
+    Retourne:
+        tuple: (fichier_csv, fichier_txt)
+    """
     # ===== SAUVEGARDE DES RÉSULTATS =====
-    print("\n" + "=" * 80)
-    print("💾 SAUVEGARDE DES RÉSULTATS")
-    print("=" * 80)
+    evenement("titre", "💾 SAUVEGARDE DES RÉSULTATS", dossier=dossier_doc)
     
     # Fichier CSV dans le dossier DOC
     fichier_resultats = os.path.join(dossier_doc, f"resultats_convergence_VF1D_{timestamp}.csv")
@@ -317,7 +300,8 @@ def main():
         f.write(f"📚 Cours             : Analyse Numérique - Master 1\n")
         f.write(f"📐 Équation résolue  : -u''(x) = f(x) sur [0,1]\n")
         f.write(f"🔬 Méthode           : Volumes finis centrés d'ordre 2\n")
-        f.write(f"📊 Maillages testés  : {N_values}\n")
+        # Union des maillages de chaque cas (planificateur: N_values propres à chaque cas)
+        f.write(f"📊 Maillages testés  : {sorted(set().union(*(r['N_values'] for r in tous_resultats)))}\n")
         f.write(f"🎯 Objectif          : Validation convergence O(h²)\n\n")
         
         for i, resultats in enumerate(tous_resultats, 1):
@@ -410,32 +394,129 @@ def main():
         f.write(f"👤 Par: theTigerFox - École Polytechnique\n")
         f.write("█" * 120 + "\n")
     
+    return fichier_resultats, fichier_txt
+
+
+def generer_rapports(stockage, run):
+    """Régénère les rapports CSV/TXT d'un run à partir du stockage colonnaire"""
+    tous_resultats = resultats_depuis_lignes(stockage.charger_run(run), colonnes_cas=COLONNES_CAS)
+    return ecrire_rapports(tous_resultats, run[:15])
+
+
+def main(argv=None):
+    """Analyse complète avec sauvegarde dans les BONS dossiers (options --profil, --journal, --metriques)"""
+    args = lire_arguments(argv)
+    with profiler_depuis_arguments(args, "analyse_VF1D"):
+        configurer_depuis_arguments(args)
+        try:
+            with exporter_depuis_arguments(args), cache_solutions_depuis_arguments(args):
+                return executer_analyse(args)
+        finally:
+            arreter_journal()
+
+
+def executer_analyse(args):
+    """Corps de l'analyse pour les options args"""
+    if args.depuis_run:
+        stockage = StockageRuns(args.dossier_runs)
+        run = stockage.dernier_run(schema="VF") if args.depuis_run == "dernier" else args.depuis_run
+        if run is None:
+            evenement("aucun_run", f"❌ Aucun run VF dans {stockage.dossier}", logging.ERROR, schema="VF", dossier=stockage.dossier)
+            return
+        fichier_resultats, fichier_txt = generer_rapports(stockage, run)
+        evenement("rapport", f"📋 Données CSV: {fichier_resultats}", schema="VF", run=run, format="csv", fichier=fichier_resultats)
+        evenement("rapport", f"📄 Rapport détaillé: {fichier_txt}", schema="VF", run=run, format="txt", fichier=fichier_txt)
+        return
+    
+    evenement("debut_analyse", "ANALYSE COMPLÈTE - VOLUMES FINIS 1D", schema="VF", backend=args.backend,
+              figures=args.figures, cache=not args.sans_cache, utilisateur="theTigerFox",
+              date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), methode="Volumes Finis centrés d'ordre 2",
+              equation="-u''(x) = f(x) sur [0,1]")
+    
+    # Vérification mathématique d'abord
+    verification_mathematique_vf()
+    
+    # Création du dossier FIGURES avec timestamp dans le BON endroit
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    dossier_figures = os.path.join("FIGURES", f"run_{timestamp}")
+    dossier_doc = "DOC"
+    
+    # Création des répertoires
+    os.makedirs(dossier_figures, exist_ok=True)
+    os.makedirs(dossier_doc, exist_ok=True)
+    
+    evenement("dossier_figures", f"\n📁 Dossier figures: {dossier_figures}", dossier=dossier_figures)
+    evenement("dossier_doc", f"📁 Dossier documentation: {dossier_doc}", dossier=dossier_doc)
+    
+    # File de rendu partagée: les figures sont tracées pendant que les calculs continuent
+    with FileRendu(args.figures, workers=args.workers_rendu) as file_rendu:
+        evenement("mode_figures", f"🖼️  Mode figures: {args.figures}", mode=args.figures, workers=args.workers_rendu)
+
+        # Cache adressé par contenu: solutions, erreurs et figures inchangées sont réutilisées
+        cache = None if args.sans_cache else CacheResultats(taille_max=args.taille_cache * 1024 * 1024)
+        if cache is not None:
+            evenement("cache", f"🗄️  Cache: {cache.dossier} ({cache.taille / 1e6:.1f} Mo / {args.taille_cache} Mo)",
+                      dossier=cache.dossier, taille=cache.taille, taille_max=args.taille_cache * 1024 * 1024)
+
+        # Valeurs de N pour l'étude de convergence (identique à DF-1D)
+        N_values = [10, 20, 40, 80, 160, 320]
+        if creer_planificateur(args) is None:
+            evenement("maillages", f"📊 Tailles testées: N = {N_values}", schema="VF", N_values=N_values)
+        else:
+            evenement("maillages", f"📊 Tailles choisies automatiquement (budget: {args.budget} s, erreur cible: {args.erreur_cible})",
+                      schema="VF", budget=args.budget, erreur_cible=args.erreur_cible, N_max=args.N_max)
+
+        tous_resultats = [
+            analyser_cas(args, numero, nom, description, N_values, dossier_figures, file_rendu, cache)
+            for numero, (nom, description) in enumerate(CAS_ANALYSE, 1)
+        ]
+        
+        # ===== AFFICHAGE DES RÉSULTATS =====
+        evenement("titre", "📊 RÉSUMÉ COMPLET DES RÉSULTATS")
+        for i, resultats in enumerate(tous_resultats, 1):
+            evenement("resultat_cas", f"📈 Ordre moyen de convergence: {resultats['ordre_moyen']:.4f}",
+                      schema="VF", numero=i, cas=resultats['nom'], description=resultats['description'],
+                      backend=args.backend, N_values=resultats['N_values'], erreurs=resultats['erreurs'],
+                      ordres=resultats['ordres'], ordre_moyen=resultats['ordre_moyen'], durees=resultats['durees'])
+
+        # ===== STOCKAGE DU RUN =====
+        # Source de vérité: stockage colonnaire; les rapports CSV/TXT en sont dérivés
+        stockage = StockageRuns(args.dossier_runs)
+        run = stockage.ajouter_run("VF", lignes_depuis_resultats(tous_resultats, colonnes_cas=COLONNES_CAS), run=f"{timestamp}_VF", meta={"backend": args.backend})
+        evenement("run_stocke", f"🗃️  Run stocké: {run} ({stockage.dossier})", schema="VF", run=run, dossier=stockage.dossier)
+        fichier_resultats = fichier_txt = None
+        if not args.sans_rapports:
+            fichier_resultats, fichier_txt = generer_rapports(stockage, run)
+
+        # Attente des dernières figures en cours de rendu
+        fichiers_figures = file_rendu.fermer()
+    if cache is not None:
+        evenement("bilan_cache", f"🗄️  Cache: {cache.succes} succès, {cache.echecs} échecs "
+                  f"(taux {100 * cache.taux_succes:.0f}%)",
+                  succes=cache.succes, echecs=cache.echecs, taux_succes=cache.taux_succes)
+    
     # ===== AFFICHAGE FINAL =====
-    print("\n" + "=" * 80)
-    print("📁 FICHIERS GÉNÉRÉS AVEC SUCCÈS")
-    print("=" * 80)
-    print(f"📊 Figures de convergence : {dossier_figures}/")
-    print(f"📋 Données CSV           : {fichier_resultats}")
-    print(f"📄 Rapport détaillé      : {fichier_txt}")
+    evenement("titre", "📁 FICHIERS GÉNÉRÉS AVEC SUCCÈS")
+    message_figures = f"📊 Figures de convergence : {dossier_figures}/"
+    if args.figures == "lazy":
+        message_figures += (f"\n💤 Données de {len(fichiers_figures)} figure(s) stockées, "
+                            f"rendu: python ../Outils-Communs/rendu_figures.py {dossier_figures}")
+    evenement("figures", message_figures, schema="VF", dossier=dossier_figures, mode=args.figures,
+              nombre=len(fichiers_figures))
+    if fichier_resultats:
+        evenement("rapport", f"📋 Données CSV           : {fichier_resultats}", schema="VF", run=run, format="csv",
+                  fichier=fichier_resultats)
+        evenement("rapport", f"📄 Rapport détaillé      : {fichier_txt}", schema="VF", run=run, format="txt",
+                  fichier=fichier_txt)
+    evenement("run_regenerable", f"🗃️  Run: {run} (rapports régénérables: python main_analysis.py --depuis-run {run})",
+              schema="VF", run=run)
     
     ordres_pour_global = [r['ordre_moyen'] for r in tous_resultats if r['nom'] != "u(x) = x²"]
     ordre_global_final = np.mean(ordres_pour_global) if ordres_pour_global else 0
     
-    print(f"\n🎯 BILAN FINAL")
-    print("=" * 50)
-    print(f"📈 Ordre de convergence global: {ordre_global_final:.4f}")
-    print(f"📐 Ordre théorique attendu   : 2.000")
-    print(f"📊 Écart à la théorie        : {abs(ordre_global_final - 2.0):.4f}")
-    
-    if ordre_global_final >= 1.8:
-        print("\n🏆 RÉSULTAT: ✅ VALIDATION RÉUSSIE")
-        print("🎯 La méthode des Volumes Finis 1D est VALIDÉE !")
-        print("🚀 Convergence O(h²) confirmée expérimentalement")
-    else:
-        print("\n⚠️ RÉSULTAT: 🔧 VALIDATION PARTIELLE")
-        print("📋 Vérifier les cas avec convergence éloignée")
-    
-    print("\n✨ ANALYSE VOLUMES FINIS 1D TERMINÉE AVEC SUCCÈS !")
+    evenement("fin_analyse", "\n✨ ANALYSE VOLUMES FINIS 1D TERMINÉE AVEC SUCCÈS !", schema="VF", run=run,
+              ordre_global=ordre_global_final, figures=len(fichiers_figures),
+              rapports=[f for f in (fichier_resultats, fichier_txt) if f])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,360 @@
+"""
+NOYAU NUMÉRIQUE DES VOLUMES FINIS 1D
+====================================
+
+Résolution de -u'' = f par Volumes Finis, cas tests et ordre de convergence,
+sans dépendance graphique: importer ce module ne charge ni matplotlib ni
+scipy. L'analyse de convergence et les figures sont dans analyse_vf_1d;
+solver_vf_1d réunit les deux et charge la partie analyse au premier accès.
+"""
+
+import os
+import sys
+import numpy as np
+
+# Outils partagés entre les TPs
+_outils_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Outils-Communs")
+if _outils_dir not in sys.path:
+    sys.path.insert(0, _outils_dir)
+
+from ordre_convergence import estimer_ordre_convergence, pentes_successives
+from solveurs_lineaires import resoudre_tridiagonal, verifier_backend
+from suivi_phases import phase
+from diagnostics_resolution import verifier_mode, suivi_diagnostics, diagnostiquer, verifier, retourner
+from metriques import resolution_instrumentee
+from cache_solutions import solution_en_cache
+from interpolation_solutions import SolutionDiscrete
+from registre_cas import obtenir_cas
+
+
+def centres_vf(N):
+    """Centres des N volumes de [0, 1] (milieux des faces consécutives)"""
+    x_faces = np.linspace(0, 1, N + 1)
+    return (x_faces[:-1] + x_faces[1:]) / 2
+
+
+def systeme_vf(N):
+    """
+    Centres des volumes et trois diagonales (flux -1/h, diagonale 2/h) du système VF
+
+    La matrice ne dépend que de N: plusieurs seconds membres (second_membre_vf)
+    se résolvent avec une seule factorisation (service_resolution).
+
+    Retourne:
+        tuple: (x_centres, inferieure, diagonale, superieure)
+    """
+    h = 1.0 / N
+    flux = np.full(N - 1, -1.0 / h)
+    return centres_vf(N), flux, np.full(N, 2.0 / h), flux
+
+
+def second_membre_vf(valeurs_f, N, U0, U1):
+    """f·h aux centres plus les flux des conditions aux limites (valeurs_f (N) ou (N, k), U0 et U1 scalaires ou (k))"""
+    h = 1.0 / N
+    b = np.asarray(valeurs_f, dtype=float) * h
+    b[0] += U0 / h
+    b[-1] += U1 / h
+    return b
+
+
+@solution_en_cache("VF", centres_vf)
+@resolution_instrumentee("VF")
+def resoudre_equation_diff_vf(f, N, U0, U1, tracer_graphe=False, backend="dense", suivi=None,
+                              diagnostics=False, verification=None):
+    """
+    Résout l'équation différentielle -u''(x) = f(x) par Volumes Finis
+    
+    Méthode des Volumes Finis:
+    - Division du domaine [0,1] en N volumes (cellules)
+    - Conservation des flux aux interfaces
+    - Convergence d'ordre 2 garantie
+    
+    Paramètres:
+        f (callable): Terme source f(x)
+        N (int): Nombre de volumes (cellules)
+        U0 (float): Condition limite u(0) = U0
+        U1 (float): Condition limite u(1) = U1
+        tracer_graphe (bool): Affichage graphique optionnel
+        backend (str): "dense" (matrice pleine, historique) ou "bande"
+            (trois diagonales, résolution O(N), voir solveurs_lineaires)
+        suivi (SuiviPhases): Mesure durée et mémoire des phases source,
+            assemblage, factorisation et résolution (optionnel)
+        diagnostics (bool ou callable): Relevé léger de la résolution
+            (diagnostics_resolution.DiagnosticResolution), retourné en
+            troisième élément ou transmis à la fonction fournie
+        verification (str): None, "avertir" ou "lever": contrôle O(N) du
+            second membre (NaN/inf), du résidu et du conditionnement estimé
+            (seuils de diagnostics_resolution)
+    
+    Retourne:
+        SolutionDiscrete: tuple (U, x), évaluable en tout point de [0, 1]
+        (interpolation_solutions), où
+            U (ndarray): Solution aux centres des cellules + limites
+            x (ndarray): Points de discrétisation (centres + limites)
+        ou (U, x, diag) si diagnostics=True (SolutionDiscrete.diagnostic); en
+        lecture seule si la solution vient du cache de solutions actif
+        (cache_solutions)
+    
+    Raises:
+        ValueError: Si N <= 1
+        RuntimeError: Si le système linéaire est singulier (ou si la
+            vérification "lever" échoue)
+    """
+    
+    if N <= 1:
+        raise ValueError("N doit être supérieur à 1 pour les volumes finis")
+    verifier_backend(backend)
+    verifier_mode(verification)
+    suivi = suivi_diagnostics(diagnostics, suivi)
+    
+    # Discrétisation du domaine
+    h = 1.0 / N  # Taille de chaque volume
+    
+    with phase(suivi, "assemblage"):
+        # Points des interfaces (faces des volumes)
+        x_faces = np.linspace(0, 1, N + 1)  # N+1 faces pour N volumes
+        
+        # Centres des volumes (points de calcul), vectorisés
+        x_centres = centres_vf(N)
+    
+    # Gestion du cas N=1 (volume unique)
+    if N == 1:
+        # Un seul volume [0,1], centre en x=0.5
+        x_centre = 0.5
+        f_centre = f(np.array([x_centre]))[0]
+        
+        # Équation: flux_sortant - flux_entrant = source_intégrée
+        # -(U1 - U_centre)/h - (-(U_centre - U0)/h) = f_centre * h
+        # -U1/h + U_centre/h + U_centre/h - U0/h = f_centre * h
+        # (2/h) * U_centre = f_centre * h + (U0 + U1)/h
+        # U_centre = h * (f_centre * h + (U0 + U1)/h) / 2
+        # U_centre = (h² * f_centre + U0 + U1) / 2
+        
+        U_centre = (h**2 * f_centre + U0 + U1) / 2
+        
+        # Construction de la solution complète
+        x_solution = np.array([0, x_centre, 1])
+        U_solution = np.array([U0, U_centre, U1])
+        
+    elif backend == "bande":
+        # Cas général, assemblage vectorisé des trois diagonales
+        with phase(suivi, "source"):
+            f_centres = np.broadcast_to(f(x_centres), (N,))
+        with phase(suivi, "assemblage"):
+            b = second_membre_vf(f_centres, N, U0, U1)
+            _, flux, diagonale, _ = systeme_vf(N)
+        
+        try:
+            U_centres = resoudre_tridiagonal(flux, diagonale, flux, b, backend, suivi)
+        except np.linalg.LinAlgError as e:
+            raise RuntimeError(f"Impossible de résoudre le système Volumes Finis: {e}")
+        
+        x_solution = np.concatenate([[0], x_centres, [1]])
+        U_solution = np.concatenate([[U0], U_centres, [U1]])
+        
+    else:
+        # Cas général: N > 1 volumes
+        
+        # Calcul du terme source aux centres des volumes
+        with phase(suivi, "source"):
+            f_centres = f(x_centres)
+        
+        with phase(suivi, "assemblage"):
+            # Matrice du système (N équations, N inconnues)
+            A = np.zeros((N, N))
+            b = np.zeros(N)
+            source_integree = f_centres * h  # ∫ f(x) dx ≈ f(x_centre) * h
+            
+            for i in range(N):
+                # Équation de conservation pour le volume i
+                # Flux sortant - Flux entrant = Source intégrée
+            
+                # Coefficient diagonal (toujours présent)
+                A[i, i] = 2.0 / h  # Contribution des deux faces
+            
+                # Terme source
+                b[i] = source_integree[i]
+            
+                # Flux à la face gauche (x_{i-1/2})
+                if i == 0:
+                    # Volume à gauche du domaine: flux = -(U_centre - U0)/h
+                    b[i] += U0 / h
+                else:
+                    # Volume interne: flux = -(U_i - U_{i-1})/h
+                    A[i, i-1] = -1.0 / h
+            
+                # Flux à la face droite (x_{i+1/2})  
+                if i == N-1:
+                    # Volume à droite du domaine: flux = -(U1 - U_centre)/h
+                    b[i] += U1 / h
+                else:
+                    # Volume interne: flux = -(U_{i+1} - U_i)/h
+                    A[i, i+1] = -1.0 / h
+        
+        try:
+            # Résolution du système linéaire
+            with phase(suivi, "resolution"):
+                U_centres = np.linalg.solve(A, b)
+        except np.linalg.LinAlgError as e:
+            raise RuntimeError(f"Impossible de résoudre le système Volumes Finis: {e}")
+        
+        # Construction de la solution complète avec limites
+        x_solution = np.concatenate([[0], x_centres, [1]])
+        U_solution = np.concatenate([[U0], U_centres, [U1]])
+    
+    # Affichage graphique optionnel
+    if tracer_graphe:
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(12, 8))
+        
+        plt.subplot(2, 1, 1)
+        plt.plot(x_solution, U_solution, 'ro-', linewidth=2, markersize=6, 
+                label=f'Solution VF (N={N})')
+        plt.grid(True, alpha=0.3)
+        plt.xlabel('x')
+        plt.ylabel('u(x)')
+        plt.title(f'Solution par Volumes Finis - N={N} volumes')
+        plt.legend()
+        
+        plt.subplot(2, 1, 2)
+        # Affichage des volumes
+        for i in range(N):
+            plt.axvspan(x_faces[i], x_faces[i+1], alpha=0.3, 
+                       color=f'C{i%10}', label=f'Volume {i+1}' if i < 3 else '')
+            plt.plot(x_centres[i] if N > 1 else 0.5, 
+                    U_centres[i] if N > 1 else U_solution[1], 
+                    'ko', markersize=8)
+        
+        plt.grid(True, alpha=0.3)
+        plt.xlabel('x')
+        plt.ylabel('Volumes')
+        plt.title('Discrétisation en Volumes Finis')
+        if N <= 3:
+            plt.legend()
+        
+        plt.tight_layout()
+        plt.show()
+    
+    if not (diagnostics or verification):
+        return SolutionDiscrete(U_solution, x_solution)
+    if backend != "bande":
+        flux = np.full(N - 1, -1.0 / h)
+        diagonale = np.full(N, 2.0 / h)
+    diagnostic = diagnostiquer("VF", N, backend, suivi, flux, diagonale, flux, U_centres, b, x_centres)
+    verifier(diagnostic, verification)
+    if not diagnostics:
+        return SolutionDiscrete(U_solution, x_solution)
+    return retourner(diagnostics, diagnostic, U_solution, x_solution)
+
+
+def erreur_Linfini_vf(u_numerique, u_exacte_func, x):
+    """
+    Calcule l'erreur L∞ entre solution VF et solution exacte
+    
+    Paramètres:
+        u_numerique (ndarray): Solution numérique VF
+        u_exacte_func (callable): Fonction solution exacte
+        x (ndarray): Points de discrétisation
+    
+    Retourne:
+        float: Erreur maximale ||u_num - u_exact||_∞
+    """
+    u_exacte = u_exacte_func(x)
+    return np.max(np.abs(u_numerique - u_exacte))
+
+
+def calculer_ordre_convergence_vf(N_values, erreurs):
+    """
+    Calcule l'ordre de convergence numérique pour Volumes Finis
+    
+    Les ordres individuels sont les pentes entre maillages successifs (paires
+    à la précision machine exclues). L'ordre global est ajusté par moindres
+    carrés robustes sur log(erreur) = log C + p·log h, plateau d'arrondi exclu
+    (voir ordre_convergence.estimer_ordre_convergence).
+    
+    Paramètres:
+        N_values (list): Valeurs de N testées
+        erreurs (list): Erreurs correspondantes
+    
+    Retourne:
+        tuple: (ordres_individuels, ordre_moyen), ordre_moyen = 0.0 si non estimable
+    """
+    if len(N_values) < 2:
+        return [], 0.0
+    
+    erreurs_array = np.asarray(erreurs, dtype=float)
+    valides = (erreurs_array[1:] > 1e-15) & (erreurs_array[:-1] > 1e-15)
+    with np.errstate(divide='ignore'):
+        ordres = list(pentes_successives(N_values, erreurs_array)[valides])
+    
+    estimation = estimer_ordre_convergence(N_values, erreurs_array)
+    ordre_moyen = estimation.ordre if np.isfinite(estimation.ordre) else 0.0
+    return ordres, ordre_moyen
+
+
+# ============================================================================
+# SOLUTIONS EXACTES ET TERMES SOURCES POUR VALIDATION
+# ============================================================================
+
+def solution_exacte_sin_vf(x):
+    """Solution exacte u(x) = sin(πx)"""
+    return np.sin(np.pi * x)
+
+
+def terme_source_sin_vf(x):
+    """Terme source f(x) pour u(x) = sin(πx)"""
+    return np.pi**2 * np.sin(np.pi * x)
+
+
+def solution_exacte_cubique_vf(x):
+    """Solution exacte u(x) = x³"""
+    return x**3
+
+
+def terme_source_cubique_vf(x):
+    """Terme source f(x) pour u(x) = x³"""
+    return -6.0 * x
+
+
+def solution_exacte_quadratique_vf(x):
+    """Solution exacte u(x) = x²"""
+    return x**2
+
+
+def terme_source_quadratique_vf(x):
+    """Terme source f(x) pour u(x) = x²"""
+    return -2.0 * np.ones_like(x)
+
+
+def solution_exacte_lineaire_vf(x):
+    """Solution exacte pour f(x) = 2x + 1 avec u(0)=0, u(1)=0"""
+    return -x**3/3 - x**2/2 + (5/6)*x
+
+
+def terme_source_lineaire_vf(x):
+    """Terme source f(x) = 2x + 1"""
+    return 2*x + 1
+
+
+# ============================================================================
+# CAS DE TEST PRÉDÉFINIS (registre commun, voir Outils-Communs/registre_cas.py)
+# ============================================================================
+
+def cas_sin_vf():
+    """Cas test: u(x) = sin(πx) avec conditions homogènes"""
+    return obtenir_cas("sin").en_tuple()
+
+
+def cas_cubique_vf():
+    """Cas test: u(x) = x³"""
+    return obtenir_cas("cube").en_tuple()
+
+
+def cas_quadratique_vf():
+    """Cas test: u(x) = x²"""
+    return obtenir_cas("quadratique").en_tuple()
+
+
+def cas_lineaire_vf():
+    """Cas test: source linéaire f(x) = 2x + 1"""
+    return obtenir_cas("lineaire").en_tuple()